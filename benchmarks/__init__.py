@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+
+"""
+Набор тестов производительности UDecimal.
+
+Запуск: python -m benchmarks [--suite ИМЯ] [--quick] [--output ФАЙЛ] [--baseline ФАЙЛ]
+"""
@@ -0,0 +1,82 @@
+# __main__.py
+
+import argparse
+import json
+import platform
+import sys
+
+from . import (
+    bench_chains,
+    bench_compiler,
+    bench_covariance,
+    bench_dataframe,
+    bench_fit,
+    bench_format,
+    bench_import,
+    bench_linalg,
+    bench_memory,
+    bench_operators,
+    bench_parallel,
+    bench_reactive,
+    bench_threads,
+    bench_transcendental,
+)
+from .common import compare
+
+SUITES = {
+    'operators': bench_operators,
+    'chains': bench_chains,
+    'compile': bench_compiler,
+    'covariance': bench_covariance,
+    'dataframe': bench_dataframe,
+    'fit': bench_fit,
+    'format': bench_format,
+    'import': bench_import,
+    'linalg': bench_linalg,
+    'transcendental': bench_transcendental,
+    'memory': bench_memory,
+    'parallel': bench_parallel,
+    'reactive': bench_reactive,
+    'threads': bench_threads,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Тесты производительности UDecimal.")
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help="Набор тестов (можно указать несколько раз; по умолчанию — все).")
+    parser.add_argument('--quick', action='store_true', help="Сокращённое число повторений.")
+    parser.add_argument('--output', help="Файл для сохранения результатов в формате JSON.")
+    parser.add_argument('--baseline', help="Файл JSON с базовой линией для сравнения.")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Допустимое относительное ухудшение (по умолчанию 0.1).")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.suite or sorted(SUITES):
+        results.update(SUITES[name].run(quick=args.quick))
+    report = {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform()},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if not args.baseline:
+        for name, item in results.items():
+            print(f"{name:45s} {item['value']:14.6g} {item['unit']}")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    regressions = 0
+    for name, old, new, change, regression in compare(results, baseline, args.tolerance):
+        regressions += regression
+        mark = "РЕГРЕССИЯ" if regression else ""
+        print(f"{name:45s} {old:14.6g} -> {new:14.6g} {change:+8.1%} {mark}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# bench_chains.py
+
+"""
+Длинные цепочки накопления: рост числа базовых переменных (contributors) и
+стоимость учёта ковариаций при вычислении неопределённости.
+"""
+
+from udecimal import UDecimal
+
+from .common import duration, metric
+
+
+def _sum_chain(length, correlated):
+    xs = [UDecimal('1.0', '0.01') for _ in range(length)]
+    if correlated:
+        for a, b in zip(xs, xs[1:]):
+            a.set_covariance(b, '0.00001')
+
+    def chain():
+        total = xs[0]
+        for x in xs[1:]:
+            total = total + x
+        return total.uncertainty
+    return chain
+
+
+def _product_chain(length):
+    x = UDecimal('1.0001', '0.0001')
+    y = UDecimal('0.9999', '0.0001')
+
+    def chain():
+        total = x
+        for _ in range(length):
+            total = total * y + x
+        return total.uncertainty
+    return chain
+
+
+def run(quick=False):
+    lengths = (100, 1000) if quick else (100, 1000, 5000)
+    results = {}
+    for length in lengths:
+        results[f'chains.sum.{length}'] = metric(duration(_sum_chain(length, False)), 's', False)
+        results[f'chains.sum_correlated.{length}'] = metric(duration(_sum_chain(length, True)), 's', False)
+        results[f'chains.product.{length}'] = metric(duration(_product_chain(length)), 's', False)
+    return results
@@ -0,0 +1,39 @@
+# bench_compiler.py
+
+"""
+Вычисление одной формулы над многими наборами аргументов: прямой вызов функции,
+воспроизведение ленты udecimal.compile и пакетное воспроизведение над массивами.
+"""
+
+from udecimal import UDecimal, UDecimalArray, compile, localcontext
+
+from .common import metric, throughput
+
+
+def _formula(x, y, z):
+    return x * y / z + (y - x) ** 2 - z * 3
+
+
+def run(quick=False):
+    number = 2000 if quick else 20000
+    size = 10000 if quick else 100000
+    compiled = compile(_formula)
+    results = {}
+    for backend in ('decimal', 'float', 'fixed'):
+        with localcontext(backend=backend):
+            x = UDecimal('1.5', '0.1')
+            y = UDecimal('2.5', '0.2')
+            z = UDecimal('3.5', '0.3')
+            direct = throughput(lambda: _formula(x, y, z), number)
+            replay = throughput(lambda: compiled(x, y, z), number)
+            results[f'compile.{backend}.direct'] = metric(direct, 'evals/s', True)
+            results[f'compile.{backend}.replay'] = metric(replay, 'evals/s', True)
+            # Ускорение скалярного воспроизведения относительно прямого вызова
+            results[f'compile.{backend}.speedup'] = metric(replay / direct, 'x', True)
+    with localcontext(backend='float'):
+        xs = UDecimalArray([1.5] * size, 0.1)
+        ys = UDecimalArray([2.5] * size, 0.2)
+        zs = UDecimalArray([3.5] * size, 0.3)
+        results['compile.float.arrays'] = metric(
+            size * throughput(lambda: compiled(xs, ys, zs).uncertainties, 1, repeat=3), 'evals/s', True)
+    return results
@@ -0,0 +1,34 @@
+# bench_covariance.py
+
+"""
+Совместная ковариационная и корреляционная матрицы производных величин в бэкенде 'float':
+каждый результат — сумма произведений случайно выбранных листов, часть листов связана
+загруженной корреляционной матрицей.
+"""
+
+import random
+
+from udecimal import UDecimal, correlation_matrix, covariance_matrix, localcontext, set_correlation_matrix, usum
+
+from .common import duration, metric
+
+
+def run(quick=False):
+    outputs, leaves = (200, 2000) if quick else (1000, 10000)
+    rng = random.Random(1)
+    results = {}
+    with localcontext(backend='float'):
+        x = [UDecimal(rng.random() + 1, 0.01) for _ in range(leaves)]
+        correlated = leaves // 10
+        set_correlation_matrix(x[:correlated], [[1.0 if i == j else 0.2 for j in range(correlated)]
+                                                for i in range(correlated)])
+        quantities = [usum([x[i] * x[(i + 1) % leaves] for i in rng.sample(range(leaves), 50)])
+                      for _ in range(outputs)]
+        for quantity in quantities:
+            # Карты производных строятся заранее: измеряется только сборка J·C·Jᵀ
+            quantity.uncertainty
+        results[f'covariance.matrix.{outputs}x{leaves}'] = metric(
+            duration(lambda: covariance_matrix(quantities)), 's', False)
+        results[f'covariance.correlation.{outputs}x{leaves}'] = metric(
+            duration(lambda: correlation_matrix(quantities)), 's', False)
+    return results
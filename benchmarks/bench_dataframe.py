@@ -0,0 +1,46 @@
+# bench_dataframe.py
+
+"""
+Столбцы величин: суммы и средние UDecimalArray по группам, groupby над столбцом
+типа udecimal и запись таблицы в Parquet с чтением. Наборы pandas и Parquet
+пропускаются, если pandas или pyarrow не установлены.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from udecimal import UDecimalArray
+
+from .common import duration, metric
+
+
+def run(quick=False):
+    size = 100000 if quick else 1000000
+    rng = np.random.default_rng(1)
+    values = rng.random(size)
+    groups = rng.integers(0, 1000, size)
+    array = UDecimalArray(values, 0.01)
+    results = {
+        f'dataframe.array_sum.{size}': metric(duration(lambda: array.sum().uncertainty), 's', False),
+        f'dataframe.array_group_mean.{size}': metric(
+            duration(lambda: array.mean(groups).uncertainties), 's', False),
+    }
+    try:
+        import pandas as pd
+        from udecimal.dataframe import UDecimalExtensionArray
+    except ImportError:
+        return results
+    frame = pd.DataFrame({'k': groups, 'x': UDecimalExtensionArray(array)})
+    results[f'dataframe.groupby_sum.{size}'] = metric(
+        duration(lambda: frame.groupby('k')['x'].sum()), 's', False)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return results
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'table.parquet')
+        results[f'dataframe.parquet_roundtrip.{size}'] = metric(
+            duration(lambda: (frame.to_parquet(path), pd.read_parquet(path))), 's', False)
+    return results
@@ -0,0 +1,34 @@
+# bench_fit.py
+
+"""
+Подгонка по большому числу точек: линейная и нелинейная (Левенберг — Марквардт)
+над массивом UDecimalArray и нелинейная над списком величин UDecimal.
+"""
+
+import numpy as np
+
+from udecimal import UDecimal, UDecimalArray, localcontext
+from udecimal import fit
+
+from .common import duration, metric
+
+
+def _decay(x, amplitude, rate):
+    return amplitude * np.exp(-rate * x)
+
+
+def run(quick=False):
+    size = 10000 if quick else 100000
+    rng = np.random.default_rng(1)
+    x = np.linspace(0, 10, size)
+    values = _decay(x, 5.0, 0.3) + rng.normal(0, 0.05, size)
+    results = {}
+    with localcontext(backend='float'):
+        points = UDecimalArray(values, 0.05)
+        items = [UDecimal(v, 0.05) for v in values.tolist()]
+        results[f'fit.linear.{size}'] = metric(duration(lambda: fit.linear(x, points, 3)), 's', False)
+        results[f'fit.nonlinear.{size}'] = metric(
+            duration(lambda: fit.nonlinear(_decay, x, points, [1.0, 0.1])), 's', False)
+        results[f'fit.nonlinear_list.{size}'] = metric(
+            duration(lambda: fit.nonlinear(_decay, x, items, [1.0, 0.1])), 's', False)
+    return results
@@ -0,0 +1,33 @@
+# bench_format.py
+
+"""
+Форматирование величин: f-строки со спецификацией '.2u' и потоковая запись
+столбцов UDecimalArray и списков UDecimal в CSV.
+"""
+
+import io
+
+import numpy as np
+
+from udecimal import UDecimal, UDecimalArray, localcontext
+from udecimal import formatting
+
+from .common import duration, metric, throughput
+
+
+def run(quick=False):
+    size = 10000 if quick else 100000
+    rng = np.random.default_rng(1)
+    values = rng.random(size)
+    results = {}
+    x = UDecimal('1234.56789', '0.01234')
+    results['format.fstring'] = metric(throughput(lambda: f"{x:.2u}", 10000), 'ops/s', True)
+    results['format.concise'] = metric(throughput(lambda: f"{x:.2uS}", 10000), 'ops/s', True)
+    with localcontext(backend='float'):
+        array = UDecimalArray(values, 0.001)
+        items = [UDecimal(v, 0.001) for v in values.tolist()]
+    results[f'format.write_array.{size}'] = metric(
+        duration(lambda: formatting.write(io.StringIO(), array)), 's', False)
+    results[f'format.write_list.{size}'] = metric(
+        duration(lambda: formatting.write(io.StringIO(), items)), 's', False)
+    return results
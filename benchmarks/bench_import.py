@@ -0,0 +1,39 @@
+# bench_import.py
+
+"""
+Время холодного импорта пакета (python -X importtime) и модули, загружаемые при импорте.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+from .common import metric
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time(statement='import udecimal', module='udecimal'):
+    """
+    Измеряет время импорта в новом процессе интерпретатора.
+
+    :param statement: Выполняемый код.
+    :param module: Модуль, накопленное время импорта которого возвращается.
+    :return: Время импорта в микросекундах.
+    """
+    env = dict(os.environ, PYTHONPATH=_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                               env=env, capture_output=True, text=True, check=True)
+    for line in completed.stderr.splitlines():
+        match = re.match(r'import time:\s*\d+ \|\s*(\d+) \| ' + re.escape(module) + '$', line)
+        if match:
+            return int(match.group(1))
+    raise RuntimeError(f"Модуль {module!r} не найден в выводе -X importtime.")
+
+
+def run(quick=False):
+    repeat = 3 if quick else 10
+    return {
+        'import.udecimal': metric(min(import_time() for _ in range(repeat)), 'us', False),
+    }
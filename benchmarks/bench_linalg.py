@@ -0,0 +1,33 @@
+# bench_linalg.py
+
+"""
+Матричные операции udecimal.linalg над матрицами независимых величин в бэкенде 'float':
+решение системы (с совместной ковариацией решения и без неё) и произведение матриц.
+"""
+
+import random
+
+from udecimal import UDecimal, localcontext
+from udecimal import linalg
+
+from .common import duration, metric
+
+
+def _matrix(rows, columns, diagonal=0.0):
+    rng = random.Random(1)
+    return [[UDecimal(rng.random() + (diagonal if i == j else 0.0), 0.01) for j in range(columns)]
+            for i in range(rows)]
+
+
+def run(quick=False):
+    size = 50 if quick else 200
+    results = {}
+    with localcontext(backend='float'):
+        a = _matrix(size, size, diagonal=size)
+        b = [row[0] for row in _matrix(size, 1)]
+        c = _matrix(size, size)
+        results[f'linalg.solve.{size}'] = metric(duration(lambda: linalg.solve(a, b)), 's', False)
+        results[f'linalg.solve_covariance.{size}'] = metric(
+            duration(lambda: linalg.solve(a, b, covariance=True)), 's', False)
+        results[f'linalg.matmul.{size}'] = metric(duration(lambda: linalg.matmul(a, c)), 's', False)
+    return results
@@ -0,0 +1,76 @@
+# bench_memory.py
+
+"""
+Стоимость создания и удаления экземпляров UDecimal и занимаемая ими память.
+
+Запуск: python -m benchmarks.bench_memory [N]
+"""
+
+import gc
+import sys
+import timeit
+import tracemalloc
+
+from udecimal import UDecimal
+
+from .common import metric
+
+
+def bytes_per_instance(factory, count):
+    """
+    Возвращает среднее число байт, выделяемых на один объект, созданный factory(),
+    и пиковый объём памяти при создании count объектов.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count, peak - before
+
+
+def _lifecycle(factory, count):
+    """
+    Число циклов создания и удаления объекта в секунду.
+    """
+    def cycle():
+        for _ in range(count):
+            factory()
+    return count / min(timeit.repeat(cycle, number=1, repeat=3))
+
+
+def run(quick=False):
+    count = 2000 if quick else 20000
+    x = UDecimal('1.5', '0.1')
+    y = UDecimal('2.5', '0.2')
+    factories = {
+        'leaf': lambda: UDecimal('1.5', '0.1'),
+        'derived_scalar': lambda: x + 1,
+        'derived_product': lambda: x * y,
+    }
+    results = {}
+    for name, factory in factories.items():
+        size, peak = bytes_per_instance(factory, count)
+        results[f'memory.{name}.bytes'] = metric(size, 'B', False)
+        results[f'memory.{name}.peak'] = metric(peak, 'B', False)
+        results[f'memory.{name}.lifecycle'] = metric(_lifecycle(factory, count), 'ops/s', True)
+    return results
+
+
+def main(count=20000):
+    x = UDecimal('1.5', '0.1')
+    y = UDecimal('2.5', '0.2')
+    results = {
+        'leaf': bytes_per_instance(lambda: UDecimal('1.5', '0.1'), count)[0],
+        'derived_scalar': bytes_per_instance(lambda: x + 1, count)[0],
+        'derived_product': bytes_per_instance(lambda: x * y, count)[0],
+    }
+    for name, size in results.items():
+        print(f"{name:16s} {size:8.1f} байт/экземпляр")
+    return results
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,32 @@
+# bench_operators.py
+
+"""
+Пропускная способность арифметических операторов UDecimal.
+"""
+
+from udecimal import UDecimal, localcontext
+
+from .common import metric, throughput
+
+_OPERATORS = {
+    'add': lambda a, b: a + b,
+    'sub': lambda a, b: a - b,
+    'mul': lambda a, b: a * b,
+    'truediv': lambda a, b: a / b,
+    'pow': lambda a, b: a ** b,
+}
+
+
+def run(quick=False):
+    number = 2000 if quick else 20000
+    results = {}
+    for backend in ('decimal', 'fixed', 'float'):
+        with localcontext(backend=backend):
+            x = UDecimal('1.5', '0.1')
+            y = UDecimal('2.5', '0.2')
+            for name, op in _OPERATORS.items():
+                results[f'operators.{backend}.{name}.udecimal'] = metric(
+                    throughput(lambda: op(x, y), number), 'ops/s', True)
+                results[f'operators.{backend}.{name}.scalar'] = metric(
+                    throughput(lambda: op(x, 2), number), 'ops/s', True)
+    return results
@@ -0,0 +1,39 @@
+# bench_parallel.py
+
+"""
+Масштабирование udecimal.parallel.map с числом процессов: число вызовов модели в секунду
+для 1, 2, 4, ... процессов (не больше числа процессоров).
+"""
+
+import os
+import time
+
+from udecimal import UDecimal, parallel
+
+from .common import metric
+
+
+def _model(x, y):
+    total = x
+    for _ in range(20):
+        total = (total * y).sin() + x / y
+    return total
+
+
+def run(quick=False):
+    calls = 200 if quick else 2000
+    x = UDecimal('1.1', '0.1')
+    y = UDecimal('2.2', '0.2')
+    x.set_covariance(y, '0.01')
+    xs = [x + k for k in range(calls)]
+    ys = [y * (k + 1) for k in range(calls)]
+    cpus = os.cpu_count() or 1
+    results = {}
+    workers = 1
+    while workers <= cpus:
+        start = time.perf_counter()
+        parallel.map(_model, xs, ys, workers=workers)
+        elapsed = time.perf_counter() - start
+        results[f'parallel.map.workers_{workers}'] = metric(calls / elapsed, 'calls/s', True)
+        workers *= 2
+    return results
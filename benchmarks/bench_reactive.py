@@ -0,0 +1,51 @@
+# bench_reactive.py
+
+"""
+Реактивный режим в бэкенде 'float': модель из тысяч выходных величин над тысячами входов,
+в которой на каждом шаге изменяется одна входная переменная. Сравнивается пересчёт всех
+выходов после UDecimal.update с построением модели заново.
+"""
+
+import itertools
+
+from udecimal import UDecimal, localcontext
+
+from .common import duration, metric
+
+
+def _model(inputs):
+    size = len(inputs)
+    return [(inputs[i] * inputs[(i + 1) % size]).ln() + inputs[(i + 7) % size].sin() for i in range(size)]
+
+
+def _read(outputs):
+    for output in outputs:
+        output.value
+        output.uncertainty
+
+
+def run(quick=False):
+    size = 500 if quick else 5000
+    results = {}
+    with localcontext(backend='float'):
+        inputs = [UDecimal(float(i + 1), 0.01) for i in range(size)]
+        results[f'reactive.rebuild.{size}'] = metric(duration(lambda: _read(_model(inputs))), 's', False)
+    with localcontext(backend='float', reactive=True):
+        outputs = _model(inputs)
+    _read(outputs)
+    ticks = itertools.count()
+
+    def tick():
+        k = next(ticks)
+        inputs[k % size].update(value=float(k % size + 2))
+        _read(outputs)
+
+    results[f'reactive.update_value.{size}'] = metric(duration(tick), 's', False)
+
+    def calibrate():
+        k = next(ticks)
+        inputs[k % size].update(uncertainty=0.01 + k % 3 * 0.001)
+        _read(outputs)
+
+    results[f'reactive.update_uncertainty.{size}'] = metric(duration(calibrate), 's', False)
+    return results
@@ -0,0 +1,38 @@
+# bench_threads.py
+
+"""
+Масштабирование с числом потоков: создание величин, установка ковариаций и вычисление
+неопределённостей при общем хранилище ковариаций. В сборках CPython с GIL пропускная
+способность не растёт с числом потоков; тест показывает накладные расходы синхронизации,
+а в сборках без GIL — масштабирование.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from udecimal import UDecimal
+
+from .common import metric
+
+
+def _work(count, shared):
+    for _ in range(count):
+        x = UDecimal('2.0', '0.2')
+        y = UDecimal('3.0', '0.3')
+        x.set_covariance(y, '0.01')
+        (x * y + shared).uncertainty
+        x.remove_covariance(y)
+
+
+def run(quick=False):
+    count = 500 if quick else 5000
+    shared = UDecimal('1.0', '0.1')
+    results = {}
+    for threads in (1, 2, 4, 8):
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            start = time.perf_counter()
+            for future in [executor.submit(_work, count, shared) for _ in range(threads)]:
+                future.result()
+            elapsed = time.perf_counter() - start
+        results[f'threads.mixed.threads_{threads}'] = metric(threads * count / elapsed, 'ops/s', True)
+    return results
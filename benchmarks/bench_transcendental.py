@@ -0,0 +1,27 @@
+# bench_transcendental.py
+
+"""
+Стоимость трансцендентных функций при разной точности вычислений.
+"""
+
+from udecimal import UDecimal, localcontext
+
+from .common import metric, throughput
+
+_FUNCTIONS = ('ln', 'exp', 'sin', 'cos', 'tan', 'log10')
+
+# Бэкенд и точность: float, стандартная точность decimal, точность по умолчанию и высокая
+_PRECISIONS = (('float', None), ('decimal', 28), ('decimal', 110), ('decimal', 500))
+
+
+def run(quick=False):
+    number = 200 if quick else 2000
+    results = {}
+    for backend, prec in _PRECISIONS:
+        with localcontext(backend=backend, prec=prec):
+            x = UDecimal('0.7', '0.01')
+            label = backend if prec is None else f'{backend}{prec}'
+            for name in _FUNCTIONS:
+                func = getattr(x, name)
+                results[f'transcendental.{label}.{name}'] = metric(throughput(func, number), 'ops/s', True)
+    return results
@@ -0,0 +1,51 @@
+# common.py
+
+import timeit
+
+
+def metric(value, unit, higher_is_better):
+    """
+    Описание одного измерения в отчёте.
+
+    :param value: Измеренное значение.
+    :param unit: Единица измерения.
+    :param higher_is_better: Считается ли рост значения улучшением.
+    """
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def throughput(func, number, repeat=5):
+    """
+    Возвращает число вызовов func в секунду (лучший результат из repeat замеров).
+    """
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return number / best
+
+
+def duration(func, repeat=3):
+    """
+    Возвращает минимальное время выполнения func в секундах.
+    """
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Сравнивает результаты с базовой линией.
+
+    :param results: Словарь измерений {имя: metric(...)}.
+    :param baseline: Словарь измерений базовой линии того же формата.
+    :param tolerance: Допустимое относительное ухудшение (0.1 — 10 %).
+    :return: Список строк сравнения (имя, базовое значение, новое значение,
+             относительное изменение в сторону улучшения, признак регрессии).
+    """
+    rows = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None or not reference['value']:
+            continue
+        change = current['value'] / reference['value'] - 1
+        if not current['higher_is_better']:
+            change = reference['value'] / current['value'] - 1 if current['value'] else float('inf')
+        rows.append((name, reference['value'], current['value'], change, change < -tolerance))
+    return rows
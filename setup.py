@@ -11,7 +11,7 @@ setup(
     long_description=open('README.md', encoding='utf-8').read(),
     long_description_content_type='text/markdown',
     url='https://github.com/skyfet/udecimal',
-    packages=find_packages(),
+    packages=find_packages(exclude=('benchmarks', 'benchmarks.*')),
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
@@ -20,10 +20,18 @@ setup(
     python_requires='>=3.6',
     install_requires=[
         'mpmath>=1.2.1',
+        'numpy>=1.17',
     ],
     extras_require={
         'dev': [
             'pytest>=6.0'
         ],
+        'pandas': [
+            'pandas>=2.1',
+        ],
+        'arrow': [
+            'pandas>=2.1',
+            'pyarrow>=12',
+        ],
     },
 )
@@ -0,0 +1,179 @@
+# test_array.py
+
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from udecimal import UDecimal, UDecimalArray
+
+
+class TestUDecimalArray(unittest.TestCase):
+    def test_float_arithmetic_matches_scalar(self):
+        """
+        Тестирование совпадения поэлементной арифметики с арифметикой UDecimal.
+        """
+        a = UDecimalArray([1.0, 2.0, 3.0], [0.1, 0.2, 0.3])
+        b = UDecimalArray([4.0, 5.0, 6.0], 0.1)
+        for result, op in ((a + b, lambda x, y: x + y), (a - b, lambda x, y: x - y),
+                           (a * b, lambda x, y: x * y), (a / b, lambda x, y: x / y),
+                           (a ** b, lambda x, y: x ** y)):
+            for i in range(3):
+                expected = op(UDecimal(a.values[i], a.uncertainties[i]), UDecimal(b.values[i], b.uncertainties[i]))
+                self.assertAlmostEqual(result.values[i], float(expected.value), places=10)
+                self.assertAlmostEqual(result.uncertainties[i], float(expected.uncertainty), places=10)
+
+    def test_functions_and_scalars(self):
+        """
+        Тестирование математических функций и трансляции скаляров.
+        """
+        a = UDecimalArray([0.5, 1.0], [0.01, 0.02])
+        np.testing.assert_allclose(a.sin().uncertainties, np.abs(np.cos(a.values)) * a.uncertainties)
+        np.testing.assert_allclose(a.exp().uncertainties, np.exp(a.values) * a.uncertainties)
+        np.testing.assert_allclose(a.ln().uncertainties, a.uncertainties / a.values)
+        np.testing.assert_allclose((2 * a + 1).uncertainties, 2 * a.uncertainties)
+        np.testing.assert_allclose((a - a).uncertainties, [0.0, 0.0])
+
+        x = UDecimal('2.0', '0.1')
+        scaled = a * x
+        expected = np.sqrt(2.0 ** 2 * a.uncertainties ** 2 + (a.values * 0.1) ** 2)
+        np.testing.assert_allclose(scaled.uncertainties, expected)
+
+    def test_decimal_path(self):
+        """
+        Тестирование высокоточного пути на Decimal.
+        """
+        a = UDecimalArray(['1.0', '2.0'], ['0.1', '0.1'])
+        self.assertEqual(a.dtype, object)
+        squared = a * a
+        self.assertEqual(squared.values[1], Decimal('4.00'))
+        self.assertEqual(squared.uncertainties[1], Decimal('0.40'))
+        ln = a.ln()
+        self.assertAlmostEqual(float(ln.uncertainties[1]), 0.05, places=20)
+
+    def test_list_roundtrip_preserves_covariances(self):
+        """
+        Тестирование сохранения ковариаций при преобразовании в список и обратно.
+        """
+        u = UDecimal('3.0', '0.1')
+        v = UDecimal('4.0', '0.2')
+        u.set_covariance(v, Decimal('0.015'))
+
+        arr = UDecimalArray.from_list([u, v])
+        swapped = UDecimalArray.from_list([v, u])
+        product = arr * swapped
+        self.assertEqual(product.uncertainties[0], (u * v).uncertainty)
+
+        items = (arr * 2).to_list()
+        total = items[0] + items[1]
+        self.assertEqual(total.uncertainty, (u * 2 + v * 2).uncertainty)
+
+        leaves = arr.to_list()
+        self.assertEqual(leaves[0].id, u.id)
+        self.assertEqual(leaves[0].get_covariance(leaves[1]), Decimal('0.015'))
+
+    def test_generated_leaves_are_shared(self):
+        """
+        Тестирование корреляции элементов, полученных из одного массива.
+        """
+        a = UDecimalArray([1.0, 2.0], [0.1, 0.2])
+        first, second = a.to_list()
+        restored = UDecimalArray.from_list([first, second], dtype=float)
+        np.testing.assert_allclose((a - restored).uncertainties, [0.0, 0.0])
+
+    def test_invalid_input(self):
+        """
+        Тестирование обработки некорректных входных данных.
+        """
+        with self.assertRaises(ValueError):
+            UDecimalArray([1.0], [-0.1])
+        with self.assertRaises(ValueError):
+            UDecimalArray([1.0, 2.0], [0.1]) + UDecimalArray([1.0], [0.1])
+        with self.assertRaises(ValueError):
+            UDecimalArray([-1.0], [0.1]).ln()
+
+
+class TestIndexingAndAggregation(unittest.TestCase):
+    def _assert_matches(self, result, expected):
+        """
+        Сравнивает величину с величиной, вычисленной поэлементно.
+        """
+        self.assertAlmostEqual(float(result.value), float(expected.value), places=9)
+        self.assertAlmostEqual(float(result.uncertainty), float(expected.uncertainty), places=12)
+
+    def test_indexing_shares_leaves(self):
+        """
+        Тестирование срезов, масок и массивов номеров: элементы остаются теми же переменными.
+        """
+        a = UDecimalArray([1.0, 2.0, 3.0, 4.0], [0.1, 0.2, 0.3, 0.4])
+        np.testing.assert_allclose(a[1:3].values, [2.0, 3.0])
+        np.testing.assert_allclose(a[a.values > 2].uncertainties, [0.3, 0.4])
+        np.testing.assert_allclose(a[[-1, 0]].values, [4.0, 1.0])
+        np.testing.assert_allclose((a[1:3] - a[[1, 2]]).uncertainties, [0.0, 0.0])
+        self.assertIs(a[1:3][0]._leaf, a[1]._leaf)
+        with self.assertRaises(IndexError):
+            a[[4]]
+        with self.assertRaises(TypeError):
+            a['x']
+
+    def test_concatenate(self):
+        """
+        Тестирование объединения массивов с общими листами.
+        """
+        a = UDecimalArray([1.0, 2.0, 3.0], [0.1, 0.2, 0.3])
+        b = UDecimalArray(['5.0'], ['0.5'])
+        joined = UDecimalArray.concatenate([a, a[[2]] * 2, b])
+        self.assertEqual(joined.dtype, object)
+        self.assertEqual(len(joined), 5)
+        expected = sum(joined.to_list()[1:], joined[0])
+        self._assert_matches(joined.sum(), expected)
+        self._assert_matches(joined.sum(), a[0] + a[1] + a[2] * 3 + b[0])
+
+    def test_sum_and_mean_match_elementwise(self):
+        """
+        Тестирование сумм и средних по группам: дисперсии и ковариации точные.
+        """
+        calibration = UDecimal('2.0', '0.05')
+        a = UDecimalArray([1.0, 2.0, 3.0, 4.0, 5.0], [0.1, 0.2, 0.3, 0.4, 0.5])
+        b = a * calibration + a[[1, 1, 0, 4, 2]]
+        groups = np.array([0, 1, 0, 1, 1])
+        items = b.to_list()
+        sums = b.sum(groups)
+        means = b.mean(groups)
+        for g in range(2):
+            members = [item for item, k in zip(items, groups) if k == g]
+            self._assert_matches(sums[g], sum(members[1:], members[0]))
+            self._assert_matches(means[g], sum(members[1:], members[0]) / len(members))
+        self._assert_matches(sums[0] - sums[1], (items[0] + items[2]) - (items[1] + items[3] + items[4]))
+        self._assert_matches(sums[0] - items[2], items[0])
+        c = b._astype(object)
+        self.assertLess((c.sum() - c.mean() * 5).uncertainty, Decimal('1e-40'))
+
+    def test_sum_before_elements_are_created(self):
+        """
+        Тестирование ковариаций суммы с элементами, созданными после суммирования.
+        """
+        a = UDecimalArray(['1', '2', '3'], ['0.1', '0.2', '0.3'])
+        total = a.sum()
+        first = a[0]
+        self._assert_matches(total - first, UDecimal('5', '0.36055512754639892931192212674704959462512965738452462127104530562271669482930104452046190820184907177'))
+        self.assertTrue(a._independent())
+        self.assertFalse(UDecimalArray.concatenate([a, a[[0]]])._independent())
+
+    def test_empty_groups(self):
+        """
+        Тестирование обработки пустых групп и некорректных номеров групп.
+        """
+        a = UDecimalArray([1.0, 2.0], [0.1, 0.2])
+        sums = a.sum([0, 0], size=2)
+        self.assertEqual(float(sums[1].value), 0.0)
+        with self.assertRaises(ValueError):
+            a.mean([0, 0], size=2)
+        with self.assertRaises(ValueError):
+            a.sum([0, -1])
+        with self.assertRaises(ValueError):
+            UDecimalArray([], []).mean()
+
+
+if __name__ == '__main__':
+    unittest.main()
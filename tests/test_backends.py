@@ -0,0 +1,173 @@
+# test_backends.py
+
+import math
+import unittest
+from decimal import Decimal
+
+from mpmath.ctx_mp import MPContext
+
+from udecimal import (
+    UDecimal, DecimalBackend, FixedBackend, MpmathBackend, get_backend, set_backend, using_backend,
+)
+from udecimal.backends import decimal_to_mpf, mpf_to_decimal
+
+
+class TestBackends(unittest.TestCase):
+    def test_float_backend(self):
+        """
+        Тестирование быстрого бэкенда на float.
+        """
+        with using_backend('float'):
+            a = UDecimal('2.0', '0.1')
+            b = UDecimal(3.0, 0.2)
+            c = a * b
+            self.assertIsInstance(c.value, float)
+            self.assertAlmostEqual(c.value, 6.0)
+            self.assertAlmostEqual(c.uncertainty, math.hypot(0.3, 0.4))
+            s = a.sin()
+            self.assertAlmostEqual(s.value, math.sin(2.0))
+            self.assertAlmostEqual(s.uncertainty, abs(math.cos(2.0)) * 0.1)
+            self.assertEqual((a - a).uncertainty, 0.0)
+
+    def test_backends_agree(self):
+        """
+        Тестирование согласованности результатов разных бэкендов.
+        """
+        results = []
+        for backend in ('float', DecimalBackend(prec=30), MpmathBackend(dps=50)):
+            with using_backend(backend):
+                x = UDecimal('1.5', '0.1')
+                p = UDecimal('1.2', '0.01')
+                y = (x ** p).exp() / x.log10() + x.tan()
+                results.append((float(y.value), float(y.uncertainty)))
+        for value, uncertainty in results[1:]:
+            self.assertAlmostEqual(value, results[0][0], places=9)
+            self.assertAlmostEqual(uncertainty, results[0][1], places=9)
+
+    def test_configurable_precision(self):
+        """
+        Тестирование точности бэкенда Decimal.
+        """
+        with using_backend(DecimalBackend(prec=20)):
+            third = UDecimal('1') / 3
+        self.assertEqual(len(third.value.as_tuple().digits), 20)
+        self.assertEqual(len((UDecimal('1') / 3).value.as_tuple().digits), 110)
+
+    def test_mixed_backends(self):
+        """
+        Тестирование операций над величинами, созданными в разных бэкендах.
+        """
+        a = UDecimal('2', '0.1')
+        with using_backend('float'):
+            c = a * UDecimal(3, 0.1)
+        self.assertIsInstance(c.value, float)
+        self.assertAlmostEqual(c.uncertainty, math.hypot(0.3, 0.2))
+
+    def test_direct_conversion(self):
+        """
+        Тестирование перевода между Decimal и mpf без строкового представления.
+        """
+        backend = DecimalBackend(prec=50)
+        ctx = MPContext()
+        ctx.dps = 50
+        for text in ('0', '1', '-2.5', '3.14159265358979323846264338327950288419716939937510',
+                     '1.2345E-40', '-6.02214076E+23', '0.1'):
+            value = Decimal(text)
+            converted = decimal_to_mpf(ctx, value)
+            self.assertEqual(converted, ctx.mpf(text))
+            self.assertEqual(mpf_to_decimal(backend.context, converted), backend.context.plus(value))
+        self.assertEqual(mpf_to_decimal(backend.context, ctx.mpf(1) / 3), backend.context.divide(1, 3))
+
+    def test_fused_kernels(self):
+        """
+        Тестирование совмещённых ядер значения и производной.
+        """
+        for backend in ('float', DecimalBackend(prec=40), MpmathBackend(dps=40)):
+            with using_backend(backend) as context:
+                b = context.backend
+                x = b.convert('0.7')
+                p = b.convert('1.3')
+                self.assertAlmostEqual(float(b.sin_d(x)[1]), float(b.cos(x)), places=12)
+                self.assertAlmostEqual(float(b.cos_d(x)[1]), -float(b.sin(x)), places=12)
+                self.assertAlmostEqual(float(b.tan_d(x)[0]), float(b.tan(x)), places=12)
+                self.assertAlmostEqual(float(b.log10_d(x)[0]), float(b.log10(x)), places=12)
+                y, dy_dx, dy_dp = b.pow_d(x, p)
+                self.assertAlmostEqual(float(dy_dx), 1.3 * 0.7 ** 0.3, places=12)
+                self.assertAlmostEqual(float(dy_dp), float(y) * math.log(0.7), places=12)
+
+    def test_fixed_backend(self):
+        """
+        Тестирование бэкенда с фиксированной точкой: точная арифметика и дисперсия без округления.
+        """
+        with using_backend(FixedBackend(scale=9)):
+            a = UDecimal('0.1', '0.000001')
+            b = UDecimal('0.2', '0.000002')
+            c = a * 3 + b - a
+            self.assertEqual(str(c.value), '0.400000000')
+            # Дисперсия 4e-12 + 4e-12 меньше единицы масштаба, но корень из неё точен
+            self.assertEqual(str(c.uncertainty), '0.000002828')
+            self.assertEqual(str((a - a).uncertainty), '0.000000000')
+            r = UDecimal('2', '0.01').sqrt()
+            self.assertEqual(str(r.value), '1.414213562')
+            self.assertEqual(str(r.uncertainty), '0.003535534')
+            x = UDecimal('0.7', '0.01')
+            self.assertEqual(x.ln().value.to_decimal(), Decimal('-0.356674944'))
+            self.assertEqual(str(x.sin().uncertainty), '0.007648422')
+            # Почти полная корреляция: дисперсия 1e-6 много больше ошибки округления
+            y, z = UDecimal('1000', '1'), UDecimal('1000', '1')
+            y.set_covariance(z, '0.9999995')
+            self.assertEqual(str((y - z).uncertainty), '0.001000000')
+            z.set_covariance(y, '1')
+            self.assertEqual(str((y - z).uncertainty), '0.000000000')
+
+    def test_fixed_small_uncertainty(self):
+        """
+        Тестирование сохранения неопределённостей в несколько единиц последнего разряда:
+        сумма неотрицательных диагональных слагаемых не считается взаимным уничтожением.
+        """
+        with using_backend(FixedBackend(scale=9)):
+            for k in range(1, 5):
+                x = UDecimal('1', f'0.00000000{k}')
+                self.assertEqual(str((x + 1).uncertainty), f'0.00000000{k}')
+                self.assertEqual(str((x * 2).uncertainty), f'0.00000000{2 * k}')
+        with using_backend(FixedBackend(scale=2)):
+            x = UDecimal('100', '0.03')
+            self.assertEqual(str((x + 1).uncertainty), '0.03')
+            self.assertEqual(str((x * 2).uncertainty), '0.06')
+
+    def test_fixed_interoperability(self):
+        """
+        Тестирование совместных вычислений с величинами на Decimal.
+        """
+        d = UDecimal('1.25', '0.1')
+        with using_backend('fixed'):
+            f = UDecimal('2.5', '0.2')
+            self.assertEqual(repr(f.value), "Fixed('2.500000000')")
+            self.assertEqual(float(f.value), 2.5)
+            g = f + d
+            self.assertEqual(str(g.value), '3.750000000')
+        h = d * f
+        self.assertIsInstance(h.value, Decimal)
+        self.assertEqual(h.value, Decimal('3.125'))
+        self.assertAlmostEqual(float(h.uncertainty), math.hypot(0.25, 0.25), places=12)
+        self.assertAlmostEqual(float((g - d - f).uncertainty), 0.0)
+        with using_backend(FixedBackend(scale=2)):
+            self.assertEqual(str(UDecimal('1.235', '0.004').value), '1.24')
+
+    def test_backend_selection(self):
+        """
+        Тестирование выбора и восстановления активного бэкенда.
+        """
+        previous = get_backend()
+        set_backend('float')
+        try:
+            self.assertEqual(get_backend().name, 'float')
+        finally:
+            set_backend(previous)
+        self.assertIs(get_backend(), previous)
+        with self.assertRaises(ValueError):
+            set_backend('unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
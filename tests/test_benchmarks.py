@@ -0,0 +1,39 @@
+# test_benchmarks.py
+
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.__main__ import main
+from benchmarks.common import compare, metric
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_compare(self):
+        """
+        Тестирование обнаружения регрессий относительно базовой линии.
+        """
+        baseline = {'speed': metric(100.0, 'ops/s', True), 'time': metric(1.0, 's', False)}
+        results = {'speed': metric(80.0, 'ops/s', True), 'time': metric(0.5, 's', False), 'new': metric(1.0, 's', False)}
+        rows = {name: (change, regression) for name, _, _, change, regression in compare(results, baseline, 0.1)}
+        self.assertEqual(set(rows), {'speed', 'time'})
+        self.assertTrue(rows['speed'][1])
+        self.assertAlmostEqual(rows['time'][0], 1.0)
+        self.assertFalse(rows['time'][1])
+
+    def test_cli_json_output(self):
+        """
+        Тестирование сохранения результатов в JSON и сравнения с ними же.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            self.assertEqual(main(['--suite', 'chains', '--quick', '--output', path]), 0)
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+            self.assertIn('chains.sum.100', report['results'])
+            self.assertEqual(main(['--suite', 'chains', '--quick', '--baseline', path, '--tolerance', '100']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
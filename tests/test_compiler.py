@@ -0,0 +1,114 @@
+# test_compiler.py
+
+import unittest
+
+from udecimal import UDecimal, UDecimalArray, compile, covariance_matrix, getcontext, localcontext, usum
+
+
+def _formula(x, y, z):
+    """
+    Формула со всеми видами операций, константами слева и справа и общими подвыражениями.
+    """
+    s = x * y
+    t = (s + z).ln() / (x ** 2 + 1)
+    return (s - t) * (z / y).sin() + 2 / (s + t).exp() - (x ** y).sqrt() + (z.cos() + 3).log10() * (y / 4).tan()
+
+
+# Внешняя величина, захваченная компилируемой функцией
+_CALIBRATION = UDecimal('1.02', '0.01')
+
+
+class TestCompile(unittest.TestCase):
+    def setUp(self):
+        self.x = UDecimal('1.5', '0.01')
+        self.y = UDecimal('2.5', '0.02')
+        self.z = UDecimal('0.7', '0.03')
+        self.x.set_covariance(self.z, '0.0001')
+
+    def assertMatches(self, compiled, eager, places):
+        self.assertAlmostEqual(compiled.value, eager.value, places=places)
+        self.assertAlmostEqual(compiled.uncertainty, eager.uncertainty, places=places)
+
+    def test_matches_eager(self):
+        """
+        Тестирование совпадения воспроизведения ленты с прямым вызовом во всех бэкендах.
+        """
+        compiled = compile(_formula)
+        for backend, places in (('decimal', 100), ('float', 12), ('fixed', 7)):
+            with localcontext(backend=backend):
+                for x, y, z in ((self.x, self.y, self.z), (self.x + 1, self.y * 2, self.z / 3)):
+                    self.assertMatches(compiled(x, y, z), _formula(x, y, z), places)
+        self.assertEqual(len(compiled._tapes), 3)
+        # Базовые переменные воспроизводятся сгенерированной функцией call, производные — общим путём
+        tape = compiled.tape(self.x, self.y, self.z)
+        self.assertIsNotNone(tape.call(getcontext().backend, self.x, self.y, self.z))
+        self.assertIsNone(tape.call(getcontext().backend, self.x * 1, self.y, self.z))
+
+    def test_multiple_outputs_and_externals(self):
+        """
+        Тестирование корреляций между результатами и величин, захваченных функцией.
+        """
+        def split(x, y):
+            return [x * _CALIBRATION + y, (x / y, x - y)]
+
+        compiled = compile(split)
+        result = compiled(self.x, self.y)
+        expected = split(self.x, self.y)
+        self.assertIsInstance(result, list)
+        self.assertIsInstance(result[1], tuple)
+        flat = [result[0], *result[1]]
+        reference = [expected[0], *expected[1]]
+        for a, b in zip(flat, reference):
+            self.assertMatches(a, b, 100)
+        self.assertTrue((covariance_matrix(flat) == covariance_matrix(reference)).all())
+        self.assertIn(_CALIBRATION.id, result[0].contributors)
+        # Тот же аргумент в двух позициях
+        self.assertMatches(compiled(self.x, self.x)[0], split(self.x, self.x)[0], 100)
+
+    def test_static_arguments(self):
+        """
+        Тестирование статических аргументов: своя лента для каждого значения.
+        """
+        def power_sum(x, n):
+            total = x
+            for _ in range(n):
+                total = total * x + 1
+            return total
+
+        compiled = compile(power_sum)
+        for n in (1, 3):
+            self.assertMatches(compiled(self.y, n), power_sum(self.y, n), 100)
+        self.assertEqual(len(compiled._tapes), 2)
+        with self.assertRaises(TypeError):
+            compiled(self.y, [1])
+
+    def test_arrays(self):
+        """
+        Тестирование пакетного воспроизведения над массивами UDecimalArray.
+        """
+        compiled = compile(_formula)
+        xs = UDecimalArray([1.5, 1.6, 1.7], [0.01, 0.02, 0.03])
+        ys = UDecimalArray([2.5, 2.4, 2.3], 0.02)
+        with localcontext(backend='float'):
+            result = compiled(xs, ys, self.z)
+            self.assertIsInstance(result, UDecimalArray)
+            for i in range(3):
+                expected = _formula(UDecimal(xs.values[i], xs.uncertainties[i]),
+                                    UDecimal(ys.values[i], ys.uncertainties[i]), self.z)
+                self.assertAlmostEqual(result.values[i], expected.value, places=12)
+                self.assertAlmostEqual(result.uncertainties[i], expected.uncertainty, places=12)
+
+    def test_errors(self):
+        """
+        Тестирование ошибок области определения и неподдерживаемых операций.
+        """
+        compiled = compile(lambda x, y: (x - y).ln())
+        self.assertMatches(compiled(self.y, self.x), (self.y - self.x).ln(), 100)
+        with self.assertRaises(ValueError):
+            compiled(self.x, self.y)
+        with self.assertRaises(TypeError):
+            compile(lambda x, y: usum([x, y]) * 2)(self.x, self.y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# test_context.py
+
+import asyncio
+import decimal
+import threading
+import unittest
+
+import mpmath
+
+import udecimal
+from udecimal import UDecimal, UDecimalArray, Context, getcontext, localcontext, setcontext
+
+
+class TestContext(unittest.TestCase):
+    def test_global_contexts_untouched(self):
+        """
+        Тестирование независимости вычислений от глобальных контекстов decimal и mpmath.
+        """
+        with decimal.localcontext() as ctx, mpmath.workdps(15):
+            ctx.prec = 28
+            third = UDecimal('1') / 3
+            ln = UDecimal('2', '0.1').ln()
+            array = UDecimalArray(['1'], ['0.1']) / 3
+            self.assertEqual(ctx.prec, 28)
+            self.assertEqual(mpmath.mp.dps, 15)
+        self.assertEqual(len(third.value.as_tuple().digits), 110)
+        self.assertEqual(len(array.values[0].as_tuple().digits), 110)
+        self.assertGreater(len(ln.value.as_tuple().digits), 100)
+
+    def test_nested_local_contexts(self):
+        """
+        Тестирование вложенных локальных контекстов.
+        """
+        default = getcontext()
+        with localcontext(prec=20) as outer:
+            self.assertIs(getcontext(), outer)
+            self.assertEqual(getcontext().prec, 20)
+            with localcontext(backend='float'):
+                self.assertIsInstance((UDecimal(1) / 3).value, float)
+            self.assertEqual(len((UDecimal('1') / 3).value.as_tuple().digits), 20)
+        self.assertIs(getcontext(), default)
+
+    def test_thread_local(self):
+        """
+        Тестирование изоляции контекста между потоками.
+        """
+        results = {}
+        barrier = threading.Barrier(2)
+
+        def worker(name, prec):
+            setcontext(Context(prec=prec))
+            barrier.wait()
+            results[name] = len((UDecimal('1') / 3).value.as_tuple().digits)
+
+        threads = [threading.Thread(target=worker, args=(name, prec)) for name, prec in (('low', 10), ('high', 60))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {'low': 10, 'high': 60})
+        self.assertEqual(getcontext().prec, 110)
+
+    def test_async_local(self):
+        """
+        Тестирование изоляции контекста между задачами asyncio.
+        """
+        async def compute(prec):
+            with localcontext(prec=prec):
+                await asyncio.sleep(0)
+                return len((UDecimal('1') / 3).value.as_tuple().digits)
+
+        async def main():
+            return await asyncio.gather(compute(12), compute(40))
+
+        self.assertEqual(asyncio.run(main()), [12, 40])
+
+    def test_invalid_settings(self):
+        """
+        Тестирование обработки некорректных параметров контекста.
+        """
+        with self.assertRaises(ValueError):
+            Context(backend='float', prec=30)
+        with self.assertRaises(TypeError):
+            setcontext('decimal')
+        self.assertIs(udecimal.DefaultContext.backend, udecimal.get_backend())
+
+    def test_backend_switch_keeps_settings(self):
+        """
+        Тестирование сохранения режимов и точности контекста при смене бэкенда.
+        """
+        with localcontext(prec=30, reactive=True):
+            with udecimal.using_backend('mpmath') as context:
+                self.assertEqual(context.backend.name, 'mpmath')
+                self.assertEqual(context.prec, 30)
+                self.assertTrue(context.reactive and context.lazy)
+            with localcontext():
+                udecimal.set_backend('float')
+                self.assertEqual(getcontext().backend.name, 'float')
+                self.assertTrue(getcontext().reactive)
+            self.assertEqual(getcontext().prec, 30)
+        with localcontext(lazy=True), udecimal.using_backend('fixed') as context:
+            self.assertTrue(context.lazy)
+            self.assertFalse(context.reactive)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# test_dataframe.py
+
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from udecimal import UDecimal, UDecimalArray
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@unittest.skipUnless(pd is not None, "требуется pandas")
+class TestUDecimalDtype(unittest.TestCase):
+    def setUp(self):
+        from udecimal.dataframe import UDecimalExtensionArray
+        self.a = UDecimalArray([1.0, 2.0, 3.0, 4.0], [0.1, 0.2, 0.3, 0.4])
+        self.series = pd.Series(UDecimalExtensionArray(self.a))
+
+    def test_dtype(self):
+        """
+        Тестирование разбора имени типа и типа хранения.
+        """
+        from udecimal.dataframe import UDecimalDtype
+        self.assertEqual(self.series.dtype, UDecimalDtype('float'))
+        self.assertEqual(pd.api.types.pandas_dtype('udecimal'), UDecimalDtype('decimal'))
+        self.assertEqual(str(pd.api.types.pandas_dtype('udecimal[float]')), 'udecimal[float]')
+        with self.assertRaises(TypeError):
+            UDecimalDtype.construct_from_string('udecimal[int]')
+
+    def test_construction_and_missing_values(self):
+        """
+        Тестирование создания столбца из величин, чисел и строк с пропусками.
+        """
+        x = UDecimal('1.5', '0.1')
+        array = pd.array([x, None, 2], dtype='udecimal')
+        self.assertEqual(array.isna().tolist(), [False, True, False])
+        self.assertIs(array[0]._leaf, x._leaf)
+        parsed = pd.array(['1.5 ± 0.1', '2+/-0.2', None], dtype='udecimal')
+        self.assertEqual(parsed[1].uncertainty, Decimal('0.2'))
+        self.assertTrue(pd.isna(parsed[2]))
+
+    def test_arithmetic_propagates_correlations(self):
+        """
+        Тестирование векторной арифметики столбцов с учётом корреляций.
+        """
+        df = pd.DataFrame({'x': self.series, 'y': self.series * 2 + 1})
+        np.testing.assert_allclose((df.y - 2 * df.x).array.quantities.uncertainties, np.zeros(4), atol=1e-12)
+        np.testing.assert_allclose((df.x * df.y).array.quantities.uncertainties,
+                                   (self.a * (self.a * 2 + 1)).uncertainties)
+        self.assertEqual((df.x > 2).tolist(), [False, False, True, True])
+
+    def test_reductions(self):
+        """
+        Тестирование sum, mean, min и max с пропусками.
+        """
+        series = self.series.copy()
+        series[1] = np.nan
+        total = series.sum()
+        self.assertAlmostEqual(float(total.value), 8.0)
+        self.assertAlmostEqual(float(total.uncertainty), np.sqrt(0.01 + 0.09 + 0.16))
+        self.assertAlmostEqual(float(series.mean().value), 8.0 / 3)
+        self.assertEqual(float(series.max().value), 4.0)
+        self.assertTrue(pd.isna(series.sum(skipna=False)))
+        self.assertAlmostEqual(float((total - series[0]).uncertainty), 0.5)
+
+    def test_groupby(self):
+        """
+        Тестирование сумм и средних по группам groupby.
+        """
+        df = pd.DataFrame({'k': ['a', 'b', 'a', 'b'], 'x': self.series})
+        sums = df.groupby('k')['x'].sum()
+        means = df.groupby('k')['x'].mean()
+        self.assertAlmostEqual(float(sums['a'].value), 4.0)
+        self.assertAlmostEqual(float(sums['b'].uncertainty), np.sqrt(0.04 + 0.16))
+        self.assertAlmostEqual(float(means['a'].uncertainty), np.sqrt(0.01 + 0.09) / 2)
+        self.assertAlmostEqual(float((sums['a'] - self.series[2]).uncertainty), 0.1)
+
+    def test_reshaping(self):
+        """
+        Тестирование выборки, сортировки и объединения столбцов.
+        """
+        series = self.series.iloc[[3, 1]]
+        joined = pd.concat([self.series, series], ignore_index=True)
+        self.assertEqual(joined.dtype, self.series.dtype)
+        total = joined.sum()
+        self.assertAlmostEqual(float(total.uncertainty), np.sqrt(0.01 + 0.16 + 0.09 + 0.64))
+        self.assertEqual(self.series.sort_values(ascending=False).index.tolist(), [3, 2, 1, 0])
+        self.assertEqual(len(self.series.unique()), 4)
+
+
+@unittest.skipUnless(pd is not None and pa is not None, "требуются pandas и pyarrow")
+class TestArrow(unittest.TestCase):
+    def test_arrow_roundtrip(self):
+        """
+        Тестирование преобразования в массив Arrow и обратно.
+        """
+        from udecimal.arrow import UDecimalType, from_arrow, to_arrow
+        a = UDecimalArray(['1.000000000000000000000000000001', 'NaN'], ['0.1', '0'])
+        array = to_arrow(a)
+        self.assertEqual(array.type, UDecimalType('decimal'))
+        self.assertEqual(array.null_count, 1)
+        restored = from_arrow(array)
+        self.assertEqual(restored.values[0], Decimal('1.000000000000000000000000000001'))
+        self.assertTrue(restored.values[1].is_nan())
+
+    def test_parquet_roundtrip(self):
+        """
+        Тестирование записи таблицы в Parquet и чтения без потери типа и точности.
+        """
+        df = pd.DataFrame({
+            'x': pd.array([UDecimal('1.5', '0.1'), None, UDecimal('2.25', '0.05')], dtype='udecimal'),
+            'y': pd.array(UDecimalArray([1.0, 2.0, 3.0], [0.1, 0.2, 0.3]), dtype='udecimal[float]'),
+        })
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.parquet')
+            df.to_parquet(path)
+            restored = pd.read_parquet(path)
+        self.assertEqual(restored.x.dtype, df.x.dtype)
+        self.assertEqual(restored.y.dtype, df.y.dtype)
+        self.assertEqual(restored.x[2].uncertainty, Decimal('0.05'))
+        self.assertTrue(pd.isna(restored.x[1]))
+        np.testing.assert_allclose(restored.y.array.quantities.uncertainties, [0.1, 0.2, 0.3])
+
+
+if __name__ == '__main__':
+    unittest.main()
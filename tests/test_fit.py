@@ -0,0 +1,174 @@
+# test_fit.py
+
+import unittest
+
+import numpy as np
+
+from udecimal import UDecimal, UDecimalArray, covariance_matrix, localcontext, set_correlation_matrix
+from udecimal import fit
+
+
+def _decay(x, amplitude, rate):
+    return amplitude * np.exp(-rate * x)
+
+
+class TestFit(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.x = np.linspace(0, 10, 25)
+        self.sigma = 0.1 + 0.02 * self.x
+        self.values = 1.5 + 0.7 * self.x + rng.normal(0, self.sigma)
+        self.y = [UDecimal(repr(float(v)), repr(float(s))) for v, s in zip(self.values, self.sigma)]
+
+    def assertGeneralized(self, result, design, covariance):
+        """
+        Результат совпадает с обобщённым МНК: p = (Aᵀ·C⁻¹·A)⁻¹·Aᵀ·C⁻¹·y.
+        """
+        weight = np.linalg.inv(covariance)
+        expected = np.linalg.inv(design.T @ weight @ design)
+        self.assertTrue(np.allclose(result.covariance, expected, rtol=1e-9, atol=0))
+        parameters = expected @ design.T @ weight @ self.values
+        residuals = self.values - design @ parameters
+        for p, value in zip(result, parameters):
+            self.assertAlmostEqual(float(p.value), value, places=10)
+        self.assertAlmostEqual(result.chi2, residuals @ weight @ residuals, places=9)
+
+    def test_linear(self):
+        """
+        Тестирование линейной подгонки и ковариаций параметров.
+        """
+        result = fit.linear(self.x, self.y)
+        design = np.vander(self.x, 2, increasing=True)
+        self.assertGeneralized(result, design, np.diag(self.sigma ** 2))
+        self.assertEqual(result.dof, 23)
+        intercept, slope = result
+        self.assertAlmostEqual(float(intercept.get_covariance(slope)), result.covariance[0, 1], places=15)
+        self.assertAlmostEqual(float(intercept.uncertainty), np.sqrt(result.covariance[0, 0]), places=15)
+        # Тот же результат для произвольного базиса и массива UDecimalArray
+        array = UDecimalArray(self.values, self.sigma)
+        other = fit.linear(self.x, array, [lambda x: 1.0, lambda x: x])
+        self.assertTrue(np.allclose(other.covariance, result.covariance, rtol=1e-12, atol=0))
+
+    def test_correlated_points(self):
+        """
+        Тестирование весовой матрицы с ковариациями из хранилища и общими листами.
+        """
+        set_correlation_matrix(self.y[:3], [[1, 0.5, 0], [0.5, 1, 0.2], [0, 0.2, 1]])
+        offset = UDecimal('0', '0.05')
+        points = [p + offset if i % 2 else p for i, p in enumerate(self.y)]
+        result = fit.linear(self.x, points, 2)
+        self.assertGeneralized(result, np.vander(self.x, 3, increasing=True),
+                               covariance_matrix(points).astype(np.float64))
+        # Параметры коррелированы с точками: ковариация с общим смещением — производная по нему
+        gradients = np.linalg.solve(covariance_matrix(points).astype(np.float64),
+                                    np.vander(self.x, 3, increasing=True)) @ result.covariance
+        shift = sum(gradients[i] for i in range(1, len(points), 2)) * 0.05 ** 2
+        for k, parameter in enumerate(result):
+            self.assertAlmostEqual(float(parameter.get_covariance(offset)), shift[k], places=12)
+        joint = covariance_matrix(result.parameters).astype(np.float64)
+        self.assertTrue(np.allclose(joint, result.covariance, rtol=1e-9, atol=1e-18))
+
+    def test_block_sparse_points(self):
+        """
+        Тестирование выбеливания по независимым группам коррелированных точек.
+        """
+        rng = np.random.default_rng(11)
+        self.x = np.linspace(0, 10, 300)
+        self.sigma = 0.1 + 0.02 * self.x
+        self.values = 1.5 + 0.7 * self.x + rng.normal(0, self.sigma)
+        points = [UDecimal(repr(float(v)), repr(float(s))) for v, s in zip(self.values, self.sigma)]
+        # Группа из 100 точек с общим смещением (больше блока прямой подстановки) и пара
+        # точек с ковариацией из хранилища; остальные точки независимы
+        offset = UDecimal('0', '0.05')
+        points[:100] = [p + offset for p in points[:100]]
+        points[200].set_covariance(points[250], points[200].uncertainty * points[250].uncertainty / 2)
+        data = fit._Data(points)
+        self.assertEqual(sorted(len(group) for group, factor in data.blocks), [2, 100])
+        # Общее смещение — слагаемое ранга 1, пара с ковариацией из хранилища — плотная группа
+        self.assertEqual(sorted(type(factor).__name__ for group, factor in data.blocks), ['_Cholesky', '_LowRank'])
+        result = fit.linear(self.x, points)
+        self.assertGeneralized(result, np.vander(self.x, 2, increasing=True),
+                               covariance_matrix(points).astype(np.float64))
+
+    def test_nonlinear(self):
+        """
+        Тестирование методов Левенберга — Марквардта и Гаусса — Ньютона с конечными
+        разностями и аналитическим якобианом.
+        """
+        rng = np.random.default_rng(5)
+        values = _decay(self.x, 5.0, 0.3) + rng.normal(0, 0.05, len(self.x))
+        with localcontext(backend='float'):
+            points = UDecimalArray(values, 0.05)
+            start = [UDecimal(1.0), 0.1]
+            lm = fit.nonlinear(_decay, self.x, points, start)
+            gn = fit.nonlinear(_decay, self.x, points, [4.0, 0.25], method='gauss-newton')
+            analytic = fit.nonlinear(_decay, self.x, points, start, jacobian=lambda x, a, k: np.column_stack(
+                [np.exp(-k * x), -a * x * np.exp(-k * x)]))
+            for result in (gn, analytic):
+                for p, q in zip(result, lm):
+                    self.assertAlmostEqual(p.value, q.value, places=7)
+                    self.assertAlmostEqual(p.uncertainty, q.uncertainty, places=7)
+            self.assertIsInstance(lm.parameters[0].value, float)
+        # Решение — минимум χ²: градиент χ² по параметрам равен нулю
+        jacobian = np.column_stack([np.exp(-lm.parameters[1].value * self.x),
+                                    -lm.parameters[0].value * self.x * np.exp(-lm.parameters[1].value * self.x)])
+        residuals = values - _decay(self.x, lm.parameters[0].value, lm.parameters[1].value)
+        self.assertTrue(np.allclose(jacobian.T @ residuals, 0, atol=1e-6))
+        # Линейная модель нелинейным методом совпадает с линейной подгонкой
+        line = fit.nonlinear(lambda x, a, b: a + b * x, self.x, self.y, [0, 0])
+        self.assertTrue(np.allclose(line.covariance, fit.linear(self.x, self.y).covariance, rtol=1e-6, atol=0))
+
+    def test_large(self):
+        """
+        Тестирование подгонки по 100 000 точек.
+        """
+        rng = np.random.default_rng(7)
+        x = np.linspace(0, 10, 100000)
+        points = UDecimalArray(_decay(x, 5.0, 0.3) + rng.normal(0, 0.05, len(x)), 0.05)
+        result = fit.nonlinear(_decay, x, points, [1.0, 0.1])
+        self.assertAlmostEqual(float(result.parameters[0].value), 5.0, delta=5 * float(result.parameters[0].uncertainty))
+        self.assertAlmostEqual(result.reduced_chi2, 1.0, delta=0.05)
+
+    def test_large_shared_systematic(self):
+        """
+        Тестирование подгонки по 100 000 точек с общей систематической погрешностью.
+        """
+        rng = np.random.default_rng(9)
+        x = np.linspace(0, 10, 100000)
+        values = 1.5 + 0.7 * x + rng.normal(0, 0.05, len(x))
+        systematic = UDecimal('0', '0.02')
+        points = UDecimalArray(values, 0.05) + systematic
+        self.assertEqual([len(group) for group, factor in fit._Data(points).blocks], [100000])
+        result = fit.linear(x, points)
+        # Общий сдвиг всех точек неотличим от свободного члена: его дисперсия прибавляется
+        # к дисперсии свободного члена, остальное совпадает с подгонкой независимых точек
+        independent = fit.linear(x, UDecimalArray(values, 0.05))
+        expected = independent.covariance.copy()
+        expected[0, 0] += 0.02 ** 2
+        self.assertTrue(np.allclose(result.covariance, expected, rtol=1e-9, atol=1e-15))
+        for p, q in zip(result, independent):
+            self.assertAlmostEqual(float(p.value), float(q.value), places=9)
+        self.assertAlmostEqual(result.chi2, independent.chi2, places=6)
+
+    def test_errors(self):
+        """
+        Тестирование ошибок входных данных.
+        """
+        with self.assertRaises(ValueError):
+            fit.linear(self.x[:3], self.y)
+        with self.assertRaises(ValueError):
+            fit.linear(self.x[:2], self.y[:2], 2)
+        with self.assertRaises(ValueError):
+            fit.linear([1, 2, 3], [UDecimal('1'), UDecimal('2'), UDecimal('3')])
+        with self.assertRaises(ValueError):
+            fit.linear([1, 1, 1], self.y[:3])
+        with self.assertRaises(TypeError):
+            fit.linear([1, 2], [1.0, 2.0])
+        with self.assertRaises(ValueError):
+            fit.nonlinear(_decay, self.x, self.y, [1, 0.1], method='newton')
+        with self.assertRaises(RuntimeError):
+            fit.nonlinear(_decay, self.x, self.y, [1, 0.1], max_iterations=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
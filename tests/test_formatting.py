@@ -0,0 +1,80 @@
+# test_formatting.py
+
+import io
+import os
+import tempfile
+import unittest
+
+from udecimal import UDecimal, UDecimalArray, localcontext
+from udecimal import formatting
+
+
+class TestFormatting(unittest.TestCase):
+    def test_format_spec(self):
+        """
+        Тестирование спецификаций формата: округление, краткая, научная и инженерная запись.
+        """
+        x = UDecimal('1234.56789', '0.01234')
+        self.assertEqual(f"{x}", str(x))
+        self.assertEqual(f"{x:.2u}", '1234.568 ± 0.012')
+        self.assertEqual(f"{x:u}", '1234.568 ± 0.012')
+        self.assertEqual(f"{x:.1u}", '1234.57 ± 0.01')
+        self.assertEqual(f"{x:.2uS}", '1234.568(12)')
+        self.assertEqual(f"{x:.2ue}", '(1.234568 ± 0.000012)e+03')
+        self.assertEqual(f"{x:.2uSe}", '1.234568(12)e+03')
+        self.assertEqual(f"{UDecimal('12345', '123'):.2uSn}", '12.34(12)e+03')
+        self.assertEqual(f"{UDecimal('-0.000012345', '0.0000000456'):.2un}", '(-12.345 ± 0.046)e-06')
+        self.assertEqual(f"{x:*^20.2uS}", '****1234.568(12)****')
+        self.assertEqual(f"{x:16.1uS}", '      1234.57(1)')
+        self.assertEqual(f"{x:.3f}", '1234.568 ± 0.012')
+
+    def test_rounding(self):
+        """
+        Тестирование округления, увеличивающего число цифр неопределённости, и точных значений.
+        """
+        self.assertEqual(f"{UDecimal('0.0999', '0.0999'):.2u}", '0.10 ± 0.10')
+        self.assertEqual(f"{UDecimal('12345', '999'):.2u}", '12300 ± 1000')
+        self.assertEqual(f"{UDecimal('0', '0.0123'):.2uS}", '0.000(12)')
+        self.assertEqual(f"{UDecimal('5'):.2u}", '5 ± 0')
+        # Значение с полной точностью бэкенда округляется до разряда неопределённости
+        self.assertEqual(f"{UDecimal('1') / 3 * UDecimal('1', '0.1'):.2u}", '0.333 ± 0.033')
+        with self.assertRaises(ValueError):
+            format(UDecimal('1', '0.1'), '.0u')
+        with self.assertRaises(ValueError):
+            format(UDecimal('1', '0.1'), '.2uen')
+
+    def test_backends(self):
+        """
+        Тестирование форматирования величин бэкендов 'float' и 'fixed'.
+        """
+        with localcontext(backend='float'):
+            self.assertEqual(f"{UDecimal(2.0, 0.1).exp():.2u}", '7.39 ± 0.74')
+        with localcontext(backend='fixed'):
+            self.assertEqual(f"{UDecimal('2.5', '0.013'):.1uS}", '2.50(1)')
+
+    def test_write(self):
+        """
+        Тестирование потоковой записи столбцов в CSV: массивы, списки, подписи и генераторы.
+        """
+        a = UDecimalArray([1.23456, 2.5], [0.0123, 0.25])
+        b = (UDecimal(v, '0.1') for v in ('1', '2'))
+        f = io.StringIO()
+        count = formatting.write(f, ['a', 'b'], a, b, header=['name', 'x', 'y'])
+        self.assertEqual(count, 2)
+        self.assertEqual(f.getvalue(), 'name,x,y\na,1.235 ± 0.012,1.00 ± 0.10\nb,2.50 ± 0.25,2.00 ± 0.10\n')
+        self.assertEqual(list(formatting.iterformat(a, '.2uS')), ['1.235(12)', '2.50(25)'])
+        f = io.StringIO()
+        formatting.write(f, a, spec='.3f', split=True)
+        self.assertEqual(f.getvalue(), '1.235,0.012\n2.500,0.250\n')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.csv')
+            items = [UDecimal(str(i), '0.5') for i in range(25000)]
+            self.assertEqual(formatting.write(path, items, split=True, delimiter=';'), 25000)
+            with open(path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), 25000)
+        self.assertEqual(lines[24999], '24999.00;0.50')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# test_graph.py
+
+from decimal import Decimal
+import unittest
+
+from udecimal import UDecimal, localcontext
+
+
+def _formula(x, y, z):
+    """
+    Формула с общими подвыражениями и всеми видами операций.
+    """
+    s = x * y
+    t = (s + z).ln() / (x ** 2 + 1)
+    return (s - t) * (z / y).sin() + 2 / (s + t).exp() - (x ** y).sqrt() + (z.cos() + 3).log10() * (y / 4).tan()
+
+
+class TestLazyGraph(unittest.TestCase):
+    def setUp(self):
+        self.x = UDecimal('1.5', '0.01')
+        self.y = UDecimal('2.5', '0.02')
+        self.z = UDecimal('0.7', '0.03')
+        self.x.set_covariance(self.z, '0.0001')
+
+    def test_matches_eager(self):
+        """
+        Тестирование совпадения ленивых и немедленных вычислений.
+        """
+        eager = _formula(self.x, self.y, self.z)
+        with localcontext(lazy=True):
+            lazy = _formula(self.x, self.y, self.z)
+        self.assertEqual(lazy.value, eager.value)
+        self.assertAlmostEqual(lazy.uncertainty, eager.uncertainty, places=100)
+
+    def test_deferred_evaluation(self):
+        """
+        Тестирование отложенного вычисления значений и неопределённостей.
+        """
+        with localcontext(lazy=True):
+            s = self.x * self.y
+            r = s + self.z
+        self.assertIsNone(s._value)
+        self.assertIsNone(r._value)
+        self.assertEqual(str(r), f"{r.value} ± {r.uncertainty}")
+        self.assertEqual(r.value, Decimal('4.45'))
+        # Промежуточные узлы получают значения, но не карты производных
+        self.assertEqual(s._value, Decimal('3.75'))
+        self.assertIsNone(s._derivatives)
+
+    def test_common_subexpressions(self):
+        """
+        Тестирование устранения общих подвыражений.
+        """
+        with localcontext(lazy=True):
+            a = self.x * self.y
+            b = self.y * self.x
+            c = self.x * self.y + 1
+            d = a + 1
+            e = self.x - self.y
+            f = self.y - self.x
+        self.assertIs(a, b)
+        self.assertIs(c, d)
+        self.assertIsNot(e, f)
+        self.assertEqual(e.value, -f.value)
+
+    def test_shared_node_adjoints(self):
+        """
+        Тестирование накопления производных по общему узлу в обратном проходе.
+        """
+        with localcontext(lazy=True):
+            s = self.x * self.y
+            r = s + s * self.x
+        eager = self.x * self.y + self.x * self.y * self.x
+        self.assertEqual(r.uncertainty, eager.uncertainty)
+
+    def test_mixed_modes(self):
+        """
+        Тестирование смешивания ленивых и немедленных величин.
+        """
+        eager = self.x * self.y
+        with localcontext(lazy=True):
+            lazy = eager + self.z
+        result = lazy * self.x
+        expected = (self.x * self.y + self.z) * self.x
+        self.assertEqual(result.value, expected.value)
+        self.assertEqual(result.uncertainty, expected.uncertainty)
+
+    def test_deferred_errors(self):
+        """
+        Тестирование ошибок области определения при вычислении ленивого узла.
+        """
+        with localcontext(lazy=True):
+            r = (self.x - 2).ln()
+        with self.assertRaises(ValueError):
+            r.value
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# test_import.py
+
+import os
+import subprocess
+import sys
+import unittest
+
+from benchmarks.bench_import import import_time
+
+# Бюджет холодного импорта в микросекундах (с запасом для медленных машин)
+IMPORT_BUDGET = 50000
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestImport(unittest.TestCase):
+    def test_import_time_budget(self):
+        """
+        Тестирование времени импорта пакета (python -X importtime).
+        """
+        self.assertLess(min(import_time() for _ in range(3)), IMPORT_BUDGET)
+
+    def test_heavy_modules_loaded_on_demand(self):
+        """
+        Тестирование отложенной загрузки mpmath и NumPy.
+        """
+        code = '\n'.join([
+            'import sys',
+            'from udecimal import UDecimal',
+            "x = UDecimal('1.5', '0.1')",
+            "(x * x + 1 / x).uncertainty",
+            "print('mpmath' in sys.modules, 'numpy' in sys.modules)",
+            'x.sin()',
+            "print('mpmath' in sys.modules)",
+            'import udecimal',
+            'udecimal.UDecimalArray',
+            "print('numpy' in sys.modules)",
+        ])
+        env = dict(os.environ, PYTHONPATH=_ROOT)
+        output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ['False', 'False', 'True', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
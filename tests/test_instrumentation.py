@@ -0,0 +1,69 @@
+# test_instrumentation.py
+
+import json
+import unittest
+
+import udecimal
+from udecimal import UDecimal, localcontext, stats
+from udecimal.backends import resolve_backend
+
+
+class TestStatistics(unittest.TestCase):
+    def tearDown(self):
+        stats().disable()
+        stats().reset()
+
+    def test_counters(self):
+        """
+        Тестирование подсчёта операций, времени и гистограмм.
+        """
+        x = UDecimal('2', '0.1')
+        y = UDecimal('3', '0.2')
+        x.set_covariance(y, '0.01')
+        stats().reset()
+        with stats():
+            z = (x * y + 1).ln() + 2 * x
+            z.uncertainty
+            UDecimal('1')
+        snapshot = stats().snapshot()
+        self.assertEqual(snapshot['operations'], {'mul': 2, 'add': 2, 'ln': 1})
+        self.assertEqual(snapshot['timings']['mpmath.ln_d']['calls'], 1)
+        self.assertEqual(snapshot['timings']['decimal.sqrt']['calls'], 1)
+        self.assertEqual(snapshot['contributors'], {'1': 1, '2-3': 4})
+        self.assertEqual(snapshot['covariance_lookups'], {'1': 1})
+        self.assertEqual(snapshot['id_map']['created'], 1)
+        self.assertEqual(json.loads(stats().to_json()), snapshot)
+
+    def test_disabled_has_no_overhead(self):
+        """
+        Тестирование восстановления исходных методов при выключении.
+        """
+        add = UDecimal.__add__
+        sqrt = resolve_backend('decimal').sqrt
+        stats().enable()
+        self.assertIsNot(UDecimal.__add__, add)
+        stats().disable()
+        self.assertIs(UDecimal.__add__, add)
+        self.assertEqual(resolve_backend('decimal').sqrt, sqrt)
+        self.assertNotIn('sqrt', vars(udecimal.backends._MpmathFunctions))
+        UDecimal('1') + 1
+        self.assertEqual(stats().snapshot()['operations'], {})
+
+    def test_reset_and_snapshot(self):
+        """
+        Тестирование сброса статистики и независимости снимков.
+        """
+        with stats():
+            UDecimal('1', '0.1') * 2
+            first = stats().snapshot()
+            stats().reset()
+            with localcontext(backend='mpmath', prec=30):
+                UDecimal('1', '0.1').exp().uncertainty
+        self.assertEqual(first['operations'], {'mul': 1})
+        second = stats().snapshot()
+        self.assertEqual(second['operations'], {'exp': 1})
+        self.assertIn('mpmath.sqrt', second['timings'])
+
+
+if __name__ == '__main__':
+    unittest.main()
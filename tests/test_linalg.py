@@ -0,0 +1,152 @@
+# test_linalg.py
+
+import unittest
+
+import numpy as np
+
+from udecimal import UDecimal, compile, covariance_matrix, localcontext, set_correlation_matrix
+from udecimal import linalg
+from udecimal.backends import as_decimal
+
+
+def _matrix(rows, uncertainty):
+    return [[UDecimal(value, uncertainty) for value in row] for row in rows]
+
+
+class TestLinalg(unittest.TestCase):
+    def setUp(self):
+        self.a = _matrix([['4.0', '1.0', '0.5'], ['1.0', '3.0', '0.2'], ['0.5', '0.2', '2.0']], '0.01')
+        self.b = [UDecimal('1.0', '0.02'), UDecimal('2.0', '0.02'), UDecimal('3.0', '0.02')]
+
+    def assertNear(self, actual, expected, places):
+        # Значения бэкенда 'fixed' — целые числа единиц, поэтому сравниваются как Decimal
+        self.assertAlmostEqual(as_decimal(actual), as_decimal(expected), places=places)
+
+    def assertCovariance(self, result, joint, places):
+        """
+        Совместная ковариация совпадает с ковариацией, вычисленной по производным элементов.
+        """
+        reference = covariance_matrix(list(np.ravel(result)))
+        self.assertEqual(joint.shape, reference.shape)
+        for expected, actual in zip(reference.ravel(), joint.ravel()):
+            self.assertAlmostEqual(actual, expected, places=places)
+
+    def test_matches_elementwise(self):
+        """
+        Тестирование совпадения с поэлементными вычислениями над UDecimal во всех бэкендах.
+        """
+        for backend, places in (('decimal', 100), ('float', 12), ('fixed', 7)):
+            with localcontext(backend=backend):
+                a, b = self.a, self.b
+                product = linalg.matmul(a, [[v] for v in b])
+                for i in range(3):
+                    expected = a[i][0] * b[0] + a[i][1] * b[1] + a[i][2] * b[2]
+                    self.assertNear(product[i, 0].value, expected.value, places=places)
+                    self.assertNear(product[i, 0].uncertainty, expected.uncertainty, places=places)
+                # Решение, подставленное в систему, даёт правую часть без неопределённости
+                x = linalg.solve(a, b)
+                self.assertEqual(x.shape, (3,))
+                for i in range(3):
+                    residual = a[i][0] * x[0] + a[i][1] * x[1] + a[i][2] * x[2] - b[i]
+                    self.assertNear(residual.value, 0, places=places)
+                    self.assertNear(residual.uncertainty, 0, places=places)
+                # A·A⁻¹ = I без неопределённости
+                identity = linalg.matmul(a, linalg.inv(a))
+                for i in range(3):
+                    for j in range(3):
+                        self.assertNear(identity[i, j].value, int(i == j), places=places)
+                        self.assertNear(identity[i, j].uncertainty, 0, places=places)
+                m = [[a[0][0], a[0][1]], [a[1][0], a[1][1]]]
+                expected = m[0][0] * m[1][1] - m[0][1] * m[1][0]
+                d = linalg.det(m)
+                self.assertNear(d.value, expected.value, places=places)
+                self.assertNear(d.uncertainty, expected.uncertainty, places=places)
+
+    def test_joint_covariance(self):
+        """
+        Тестирование совместной ковариации результатов, в том числе для коррелированных входов.
+        """
+        set_correlation_matrix(self.b, [[1, 0.3, 0], [0.3, 1, -0.5], [0, -0.5, 1]])
+        rhs = [[self.b[0], self.b[1] * 2], [self.b[1], 1], [self.b[2] + self.b[0], self.a[0][0]]]
+        for backend, places in (('decimal', 100), ('float', 15)):
+            with localcontext(backend=backend):
+                x, joint = linalg.solve(self.a, rhs, covariance=True)
+                self.assertEqual(x.shape, (3, 2))
+                self.assertCovariance(x, joint, places)
+                for i, item in enumerate(x.ravel()):
+                    # Квадрат Decimal округляется до точности глобального контекста decimal
+                    self.assertAlmostEqual(item.uncertainty ** 2, joint[i, i], places=min(places, 25))
+                self.assertCovariance(*linalg.inv(self.a, covariance=True), places)
+                self.assertCovariance(*linalg.matmul(self.a, self.a, covariance=True), places)
+                d, variance = linalg.det(self.a, covariance=True)
+                self.assertCovariance([d], variance, places)
+
+    def test_singular_det(self):
+        """
+        Тестирование определителя вырожденных матриц и его производных (алгебраических дополнений).
+        """
+        for backend, places in (('decimal', 100), ('float', 15), ('fixed', 8)):
+            with localcontext(backend=backend):
+                a, b, c = _matrix([['1', '2', '3'], ['2', '4', '6'], ['1', '0', '1']], '0.01')
+                d = linalg.det([a, b, c])
+                expected = (a[0] * (b[1] * c[2] - b[2] * c[1]) - a[1] * (b[0] * c[2] - b[2] * c[0])
+                            + a[2] * (b[0] * c[1] - b[1] * c[0]))
+                self.assertNear(d.value, 0, places=places)
+                self.assertNear(d.uncertainty, expected.uncertainty, places=places)
+                d, variance = linalg.det(_matrix([['1', '2'], ['2', '4']], '0.01'), covariance=True)
+                self.assertNear(d.uncertainty, '0.05', places=places)
+                self.assertCovariance([d], variance, places)
+                zero = linalg.det(_matrix([['0'] * 3] * 3, '0.1'))
+                self.assertNear(zero.value, 0, places=places)
+                self.assertNear(zero.uncertainty, 0, places=places)
+                self.assertNear(linalg.det([[UDecimal('0', '0.1')]]).uncertainty, '0.1', places=places)
+
+    def test_correlated_matmul(self):
+        """
+        Тестирование произведения матриц с общими элементами: неопределённость по производным.
+        """
+        with localcontext(backend='float'):
+            x = UDecimal(2.0, 0.1)
+            square = linalg.matmul([[x, 1.0], [0.0, x]], [[x, 0.0], [1.0, x]])
+            expected = x * x + 1
+            self.assertAlmostEqual(square[0, 0].uncertainty, expected.uncertainty, places=15)
+            self.assertAlmostEqual(square[1, 1].uncertainty, (x * x).uncertainty, places=15)
+            self.assertEqual(square[0, 1].contributors, {x.id})
+
+    def test_large_solve(self):
+        """
+        Тестирование решения большой системы в бэкенде 'float'.
+        """
+        rng = np.random.default_rng(1)
+        size = 100
+        values = rng.random((size, size)) + np.eye(size) * size
+        with localcontext(backend='float'):
+            a = [[UDecimal(float(v), 0.01) for v in row] for row in values]
+            b = [UDecimal(float(v), 0.01) for v in rng.random(size)]
+            x, joint = linalg.solve(a, b, covariance=True)
+            total = x[0] - x[1]
+        expected = np.linalg.solve(values, [v.value for v in b])
+        self.assertTrue(np.allclose([v.value for v in x], expected, rtol=1e-12))
+        self.assertAlmostEqual(total.uncertainty ** 2, joint[0, 0] + joint[1, 1] - 2 * joint[0, 1], places=18)
+
+    def test_errors(self):
+        """
+        Тестирование ошибок размеров, вырожденных матриц и трассировки.
+        """
+        with self.assertRaises(ValueError):
+            linalg.matmul(self.a, [[1, 2]])
+        with self.assertRaises(ValueError):
+            linalg.solve(self.a, [1, 2])
+        with self.assertRaises(ValueError):
+            linalg.det([self.b])
+        singular = _matrix([['1', '2'], ['2', '4']], '0.1')
+        for backend in ('decimal', 'float'):
+            with localcontext(backend=backend):
+                with self.assertRaises(np.linalg.LinAlgError):
+                    linalg.inv(singular)
+        with self.assertRaises(TypeError):
+            compile(lambda x, y: linalg.det([[x, y], [y, x]]))(self.b[0], self.b[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# test_montecarlo.py
+
+import re
+import unittest
+import warnings
+
+import numpy as np
+
+from udecimal import UDecimal, covariance_matrix, localcontext
+from udecimal.montecarlo import propagate
+
+
+def _linear(x, y):
+    return 2 * x - y
+
+
+def _pair(x, y):
+    return x * y, x / y
+
+
+def _clipped(x):
+    # Значения вне интервала (1.9, 2.1) не определены
+    return np.where(abs(x - 2) < 0.1, x, np.nan)
+
+
+def _methods(x):
+    return (x.ln() + x.sqrt()).exp()
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        with localcontext(backend='float'):
+            self.x = UDecimal(2.0, 0.1)
+            self.y = UDecimal(1.0, 0.05)
+            self.x.set_covariance(self.y, 0.003)
+
+    def test_linear_function(self):
+        """
+        Тестирование совпадения с линейным распространением для линейной функции.
+        """
+        result = propagate(_linear, [self.x, self.y], samples=200000, seed=0)
+        with localcontext(backend='float'):
+            expected = 2 * self.x - self.y
+        self.assertAlmostEqual(float(result.value), expected.value, delta=0.002)
+        self.assertAlmostEqual(float(result.uncertainty), expected.uncertainty, delta=0.002)
+
+    def test_output_covariances(self):
+        """
+        Тестирование регистрации ковариаций между результатами.
+        """
+        with localcontext(backend='float'):
+            product, ratio = propagate(_pair, [self.x, self.y], samples=200000, seed=1)
+            linear = covariance_matrix([self.x * self.y, self.x / self.y])
+            self.assertAlmostEqual(product.uncertainty ** 2, linear[0, 0], delta=0.001)
+            self.assertAlmostEqual(ratio.uncertainty ** 2, linear[1, 1], delta=0.001)
+            self.assertAlmostEqual(product.get_covariance(ratio), linear[0, 1], delta=0.001)
+
+    def test_reproducible_seed(self):
+        """
+        Тестирование воспроизводимости результата при фиксированном начальном значении.
+        """
+        first = propagate(_methods, [self.x], samples=20000, chunk_size=3000, seed=42)
+        second = propagate(_methods, [self.x], samples=20000, chunk_size=3000, seed=42)
+        third = propagate(_methods, [self.x], samples=20000, chunk_size=3000, seed=43)
+        self.assertEqual(first.value, second.value)
+        self.assertEqual(first.uncertainty, second.uncertainty)
+        self.assertNotEqual(first.value, third.value)
+
+    def test_process_pool(self):
+        """
+        Тестирование совпадения результатов при вычислении блоков в пуле процессов.
+        """
+        local = propagate(_pair, [self.x, self.y], samples=40000, chunk_size=10000, seed=7)
+        pooled = propagate(_pair, [self.x, self.y], samples=40000, chunk_size=10000, seed=7, workers=2)
+        for a, b in zip(local, pooled):
+            self.assertEqual(a.value, b.value)
+            self.assertEqual(a.uncertainty, b.uncertainty)
+
+    def test_nonfinite_samples(self):
+        """
+        Тестирование обработки неконечных значений функции.
+        """
+        with self.assertRaisesRegex(ValueError, r'на \d+ из 20000 выборок'):
+            propagate(_clipped, [self.x], samples=20000, seed=3)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', RuntimeWarning)
+            result = propagate(_clipped, [self.x], samples=20000, seed=3, nonfinite='drop')
+        self.assertEqual([w.category for w in caught], [RuntimeWarning])
+        dropped = int(re.search(r'на (\d+) из', str(caught[0].message)).group(1))
+        # Вне одного стандартного отклонения — около 32% выборок
+        self.assertAlmostEqual(dropped / 20000, 0.317, delta=0.02)
+        self.assertLess(result.uncertainty, self.x.uncertainty)
+        with self.assertRaises(ValueError):
+            propagate(_clipped, [self.x], nonfinite='ignore')
+
+    def test_invalid_arguments(self):
+        """
+        Тестирование проверки параметров.
+        """
+        with self.assertRaises(ValueError):
+            propagate(_linear, [self.x, self.y], samples=1)
+        with self.assertRaises(ValueError):
+            propagate(_linear, [self.x, self.y], chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
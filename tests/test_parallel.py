@@ -0,0 +1,90 @@
+# test_parallel.py
+
+import multiprocessing
+import unittest
+
+from udecimal import UDecimal, getcontext, localcontext, parallel
+
+
+def _model(x, y):
+    return x * y, x / y
+
+
+def _with_constant(x):
+    return [x + _CONSTANT, x]
+
+
+def _shift(x):
+    return x + _CONSTANT
+
+
+def _precision(x):
+    return getcontext().prec, x.sqrt()
+
+
+def _modes(x):
+    context = getcontext()
+    return [context.lazy, context.reactive], x * 2
+
+
+_CONSTANT = UDecimal('10', '1')
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        self.x = UDecimal('1.5', '0.1')
+        self.y = UDecimal('2.5', '0.2')
+        self.x.set_covariance(self.y, '0.01')
+        self.xs = [self.x + k for k in range(6)]
+        self.ys = [self.y * (k + 1) for k in range(6)]
+
+    def test_matches_sequential(self):
+        """
+        Тестирование совпадения результатов с вычислением в текущем процессе.
+        """
+        expected = parallel.map(_model, self.xs, self.ys, workers=1)
+        result = parallel.map(_model, self.xs, self.ys, workers=2, chunksize=2)
+        for (a, b), (c, d) in zip(result, expected):
+            self.assertEqual(a.value, c.value)
+            self.assertEqual(a.uncertainty, c.uncertainty)
+            self.assertEqual(b.uncertainty, d.uncertainty)
+
+    def test_correlations_preserved(self):
+        """
+        Тестирование корреляций между результатами разных задач и с исходными величинами.
+        """
+        result = parallel.map(_model, self.xs, self.ys, workers=2, chunksize=1)
+        expected = (self.xs[0] * self.ys[0]) - (self.xs[5] * self.ys[5])
+        self.assertEqual((result[0][0] - result[5][0]).uncertainty, expected.uncertainty)
+        self.assertEqual((result[2][1] - self.xs[2] / self.ys[2]).uncertainty, 0)
+        # Величина, созданная в рабочем процессе, общая для всех результатов этого процесса
+        shifted = parallel.map(_with_constant, [self.x, self.x], workers=2, chunksize=1)
+        self.assertEqual((shifted[0][0] - shifted[0][1]).uncertainty, 1)
+
+    def test_context_propagated(self):
+        """
+        Тестирование передачи точности контекста в рабочие процессы.
+        """
+        with localcontext(prec=40):
+            x = UDecimal('2', '0.1')
+            result = parallel.map(_precision, [x, x], workers=2, chunksize=1)
+        self.assertEqual(result[0][0], 40)
+        self.assertEqual(len(str(result[1][1].value).replace('.', '')), 40)
+        with localcontext(reactive=True):
+            x = UDecimal('2', '0.1')
+            result = parallel.map(_modes, [x, x], workers=2, chunksize=1)
+        self.assertEqual(result[0][0], [True, True])
+        self.assertEqual(result[1][1].uncertainty, 2 * x.uncertainty)
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "требуется запуск процессов через fork")
+    def test_inherited_constant(self):
+        """
+        Тестирование корреляций с константой модуля, унаследованной рабочими процессами при fork.
+        """
+        result = parallel.map(_shift, [self.x] * 4, workers=2, chunksize=1)
+        self.assertEqual((result[0] - _CONSTANT).uncertainty, self.x.uncertainty)
+        self.assertEqual((result[0] - result[3]).uncertainty, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# test_reactive.py
+
+import gc
+import math
+import unittest
+
+from udecimal import Context, UDecimal, UDecimalArray, localcontext
+from udecimal.reactive import default_graph
+
+
+def _formula(x, y, z):
+    """
+    Формула с общими подвыражениями и всеми видами операций.
+    """
+    s = x * y
+    t = (s + z).ln() / (x ** 2 + 1)
+    return (s - t) * (z / y).sin() + 2 / (s + t).exp() - (x ** y).sqrt() + (z.cos() + 3).log10() * (y / 4).tan()
+
+
+class TestReactiveUpdates(unittest.TestCase):
+    def setUp(self):
+        self.x = UDecimal('1.5', '0.01')
+        self.y = UDecimal('2.5', '0.02')
+        self.z = UDecimal('0.7', '0.03')
+        self.x.set_covariance(self.z, '0.0001')
+
+    def test_matches_rebuilt_formula(self):
+        """
+        Тестирование совпадения пересчитанной величины с формулой, построенной заново.
+        """
+        with localcontext(reactive=True):
+            result = _formula(self.x, self.y, self.z)
+        str(result)
+        self.x.update(value='1.7')
+        self.z.update(uncertainty='0.05')
+        expected = _formula(self.x, self.y, self.z)
+        self.assertEqual(result.value, expected.value)
+        self.assertAlmostEqual(result.uncertainty, expected.uncertainty, places=100)
+        self.y.update(value='2.25', uncertainty='0.01')
+        expected = _formula(self.x, self.y, self.z)
+        self.assertEqual(result.value, expected.value)
+        self.assertAlmostEqual(result.uncertainty, expected.uncertainty, places=100)
+
+    def test_only_affected_cone_is_reset(self):
+        """
+        Тестирование сброса только величин, зависящих от изменённой переменной.
+        """
+        with localcontext(backend='float', reactive=True):
+            inputs = [UDecimal(float(i + 1), 0.1) for i in range(100)]
+            outputs = [(inputs[i] * inputs[(i + 1) % 100]).ln() for i in range(100)]
+        for output in outputs:
+            output.uncertainty
+        inputs[10].update(value=20.0)
+        dirty = [k for k, output in enumerate(outputs) if output._value is None]
+        self.assertEqual(dirty, [9, 10])
+        self.assertAlmostEqual(outputs[10].value, math.log(20.0 * 12.0))
+        self.assertAlmostEqual(outputs[10].uncertainty, ((0.1 / 20) ** 2 + (0.1 / 12) ** 2) ** 0.5)
+        outputs[9].uncertainty
+        inputs[50].update(uncertainty=0.3)
+        reset = [k for k, output in enumerate(outputs) if output._uncertainty is None]
+        self.assertEqual(reset, [49, 50])
+        self.assertIsNotNone(outputs[49]._value)
+        self.assertAlmostEqual(outputs[50].uncertainty, ((0.3 / 51) ** 2 + (0.1 / 52) ** 2) ** 0.5)
+
+    def test_array_copies_and_errors(self):
+        """
+        Тестирование копий переменной из массива и недопустимых обновлений.
+        """
+        array = UDecimalArray(['1', '2'], ['0.1', '0.2'])
+        items = array.to_list()
+        copy = array.to_list()[0]  # Другой экземпляр с тем же листом
+        with localcontext(reactive=True):
+            total = items[0] + copy * 2
+        self.assertEqual(total.value, 3)
+        items[0].update(value='4')
+        self.assertEqual(total.value, 12)
+        with self.assertRaises(ValueError):
+            total.update(value=1)
+        with self.assertRaises(ValueError):
+            items[0].update(uncertainty='-1')
+
+    def test_snapshots_and_covariances(self):
+        """
+        Тестирование величин, построенных вне реактивного режима, и ковариаций после обновления.
+        """
+        with localcontext(backend='float', lazy=True):
+            z = UDecimal(1.0, 0.1)
+            root = (z * 2).sqrt()
+            root.value
+            z.update(value=8.0)
+            self.assertEqual((z * 2).sqrt().value, 4.0)
+            self.assertAlmostEqual(root.value, math.sqrt(2))
+        y = UDecimal('1', '0.2')
+        doubled = self.x * 2
+        self.x.update(value='3', uncertainty='1')
+        # doubled зависит от прежних значения и неопределённости x
+        self.assertEqual((doubled + y).value, 4)
+        self.assertAlmostEqual(float((doubled + y).uncertainty), (0.02 ** 2 + 0.2 ** 2) ** 0.5)
+        self.assertAlmostEqual(float((doubled - 2 * self.x).uncertainty), (0.02 ** 2 + 2 ** 2) ** 0.5)
+        self.assertEqual(self.x.get_covariance(self.z), 100 * UDecimal('0.0001').value)
+        x = UDecimal('1', '0.5')
+        x.set_covariance(y, '0.05')
+        x.update(uncertainty='0.1')
+        self.assertEqual(x.get_covariance(y), UDecimal('0.01').value)
+        self.assertEqual(x.covariances, {y.id: UDecimal('0.01').value})
+        x.update(uncertainty='0')
+        self.assertEqual(x.covariances, {})
+
+    def test_context_and_cleanup(self):
+        """
+        Тестирование параметров контекста и удаления рёбер удалённых величин.
+        """
+        context = Context(reactive=True)
+        self.assertTrue(context.lazy)
+        self.assertEqual(repr(context), "Context(backend=DecimalBackend(prec=110), reactive=True)")
+        self.assertFalse(context.copy(reactive=False).lazy)
+        with localcontext(lazy=True):
+            plain = self.x * self.y
+        with localcontext(reactive=True):
+            reactive = self.x * self.y
+        self.assertIsNot(plain, reactive)
+        before = len(default_graph)
+        del reactive
+        gc.collect()
+        self.assertEqual(len(default_graph), before - 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
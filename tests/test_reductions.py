@@ -0,0 +1,78 @@
+# test_reductions.py
+
+from decimal import Decimal
+import unittest
+
+from udecimal import UDecimal, covariance_matrix, localcontext, udot, umean, usum, uweighted_mean
+
+
+class TestReductions(unittest.TestCase):
+    def setUp(self):
+        self.x = UDecimal('1', '0.1')
+        self.y = UDecimal('2', '0.2')
+        self.x.set_covariance(self.y, '0.01')
+
+    def test_sum_matches_operators(self):
+        """
+        Тестирование совпадения usum с последовательным сложением.
+        """
+        result = usum([self.x, self.y, self.x, 3])
+        expected = self.x + self.y + self.x + 3
+        self.assertEqual(result.value, expected.value)
+        self.assertEqual(result.uncertainty, expected.uncertainty)
+        self.assertEqual(usum([], start=5).value, 5)
+
+    def test_mean(self):
+        """
+        Тестирование среднего арифметического и взвешенного среднего.
+        """
+        mean = umean(iter([self.x, self.y]))
+        expected = (self.x + self.y) / 2
+        self.assertEqual(mean.value, expected.value)
+        self.assertEqual(mean.uncertainty, expected.uncertainty)
+        a = UDecimal('10', '1')
+        b = UDecimal('13', '2')
+        weighted = uweighted_mean([a, b])
+        self.assertEqual(weighted.value, Decimal('10.6'))
+        self.assertAlmostEqual(weighted.uncertainty, 1 / Decimal('1.25').sqrt(), places=100)
+        with self.assertRaises(ValueError):
+            umean([])
+        with self.assertRaises(ValueError):
+            uweighted_mean([a, UDecimal('1')])
+
+    def test_dot(self):
+        """
+        Тестирование скалярного произведения.
+        """
+        result = udot([self.x, self.y, 2], [self.y, self.x, self.x])
+        expected = self.x * self.y + self.y * self.x + 2 * self.x
+        self.assertEqual(result.value, expected.value)
+        self.assertEqual(result.uncertainty, expected.uncertainty)
+        with self.assertRaises(ValueError):
+            udot([self.x], [self.x, self.y])
+
+    def test_generator_folding(self):
+        """
+        Тестирование ограниченной памяти: удалённые независимые листы объединяются в один.
+        """
+        with localcontext(backend='float'):
+            result = usum(UDecimal(1.0, 0.5) for _ in range(10000))
+            self.assertEqual(result.value, 10000.0)
+            self.assertAlmostEqual(result.uncertainty, 50.0, places=9)
+            # Остаётся объединённый лист и, возможно, последнее ещё доступное показание
+            self.assertLessEqual(len(result.contributors), 2)
+
+    def test_surviving_leaves_keep_correlations(self):
+        """
+        Тестирование сохранения корреляций с величинами, которые остаются доступными.
+        """
+        with localcontext(backend='float'):
+            readings = [UDecimal(float(i), 0.1) for i in range(5)]
+            total = usum(readings)
+            self.assertEqual(len(total.contributors), 5)
+            matrix = covariance_matrix([total, readings[0]])
+            self.assertAlmostEqual(matrix[0, 1], 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
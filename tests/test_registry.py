@@ -0,0 +1,212 @@
+# test_registry.py
+
+from decimal import Decimal
+import gc
+import unittest
+
+import numpy as np
+
+from udecimal import (
+    UDecimal,
+    CovarianceRegistry,
+    correlation_matrix,
+    covariance_matrix,
+    localcontext,
+    memory_report,
+    set_correlation_matrix,
+    set_covariance_matrix,
+)
+
+
+class TestCovarianceRegistry(unittest.TestCase):
+    def test_covariance_matrix_import(self):
+        """
+        Тестирование загрузки ковариационной матрицы целиком.
+        """
+        x, y, z = UDecimal('1'), UDecimal('2'), UDecimal('3')
+        matrix = [[Decimal('0.04'), Decimal('0.01'), 0], [Decimal('0.01'), Decimal('0.09'), 0], [0, 0, Decimal('0.16')]]
+        set_covariance_matrix([x, y, z], matrix)
+        self.assertEqual(x.uncertainty, Decimal('0.2'))
+        self.assertEqual(x.get_covariance(y), Decimal('0.01'))
+        self.assertEqual(y.get_covariance(x), Decimal('0.01'))
+        self.assertEqual(x.get_covariance(z), 0)
+        self.assertEqual((x + y).uncertainty, UDecimal('0.15').sqrt().value)
+
+    def test_covariance_matrix_dependents(self):
+        """
+        Тестирование влияния загруженной матрицы на ранее выведенные величины.
+        """
+        x, y = UDecimal('1', '0.1'), UDecimal('2', '0.1')
+        read, pending = x + y, x - y
+        self.assertEqual(read.uncertainty, UDecimal('0.02').sqrt().value)
+        set_covariance_matrix([x, y], [[Decimal('0.04'), 0], [0, Decimal('0.09')]])
+        self.assertEqual(read.uncertainty, UDecimal('0.02').sqrt().value)
+        self.assertEqual(pending.uncertainty, UDecimal('0.13').sqrt().value)
+
+    def test_correlation_matrix_import(self):
+        """
+        Тестирование загрузки корреляционной матрицы и её согласованности с попарным API.
+        """
+        with localcontext(backend='float'):
+            a = [UDecimal(i, 0.1 * (i + 1)) for i in range(4)]
+            b = [UDecimal(i, 0.1 * (i + 1)) for i in range(4)]
+            correlation = np.array([
+                [1.0, 0.5, 0.0, -0.3],
+                [0.5, 1.0, 0.2, 0.0],
+                [0.0, 0.2, 1.0, 0.1],
+                [-0.3, 0.0, 0.1, 1.0],
+            ])
+            set_correlation_matrix(a, correlation)
+            for i in range(4):
+                for j in range(i + 1, 4):
+                    if correlation[i, j]:
+                        b[i].set_covariance(b[j], correlation[i, j] * b[i].uncertainty * b[j].uncertainty)
+            total_a = a[0] * a[1] + a[2] - a[3]
+            total_b = b[0] * b[1] + b[2] - b[3]
+            self.assertAlmostEqual(total_a.uncertainty, total_b.uncertainty, places=12)
+
+    def test_export(self):
+        """
+        Тестирование экспорта совместной ковариационной матрицы результатов.
+        """
+        with localcontext(backend='float'):
+            x = [UDecimal(i + 1, 0.1) for i in range(3)]
+            covariance = np.array([[0.01, 0.002, 0.0], [0.002, 0.01, 0.003], [0.0, 0.003, 0.01]])
+            set_covariance_matrix(x, covariance)
+            np.testing.assert_allclose(covariance_matrix(x), covariance)
+            s = x[0] + x[1]
+            d = x[1] - x[2]
+            matrix = covariance_matrix([s, d])
+            jacobian = np.array([[1, 1, 0], [0, 1, -1]])
+            np.testing.assert_allclose(matrix, jacobian @ covariance @ jacobian.T)
+            self.assertAlmostEqual(matrix[0, 0], s.uncertainty ** 2)
+
+    def test_export_mixed_and_exact(self):
+        """
+        Тестирование ковариаций производных величин с общими листами, блоками и попарными
+        ковариациями в бэкендах 'float' и 'decimal'.
+        """
+        for backend in ('float', 'decimal'):
+            with self.subTest(backend=backend), localcontext(backend=backend):
+                x = [UDecimal(str(i + 1), '0.1') for i in range(5)]
+                set_correlation_matrix(x[:3], [[1, 0.5, 0], [0.5, 1, -0.2], [0, -0.2, 1]])
+                x[3].set_covariance(x[4], '0.004')
+                results = [x[0] * x[3], x[1] + x[4], x[2] - x[0], x[3] * x[4], UDecimal(7)]
+                c = np.zeros((5, 5))
+                c[:3, :3] = np.array([[1, 0.5, 0], [0.5, 1, -0.2], [0, -0.2, 1]]) * 0.01
+                c[3, 3] = c[4, 4] = 0.01
+                c[3, 4] = c[4, 3] = 0.004
+                jacobian = np.array([[4, 0, 0, 1, 0], [0, 1, 0, 0, 1], [-1, 0, 1, 0, 0],
+                                     [0, 0, 0, 5, 4], [0, 0, 0, 0, 0]], dtype=np.float64)
+                matrix = covariance_matrix(results)
+                np.testing.assert_allclose(matrix.astype(np.float64), jacobian @ c @ jacobian.T, atol=1e-15)
+                for a in range(4):
+                    self.assertAlmostEqual(float(matrix[a, a]), float(results[a].uncertainty) ** 2, places=14)
+                self.assertAlmostEqual(float(results[0].get_covariance(results[3])), float(matrix[0, 3]), places=14)
+                correlation = correlation_matrix(results).astype(np.float64)
+                sigma = np.sqrt(np.diag(jacobian @ c @ jacobian.T))[:4]
+                np.testing.assert_allclose(correlation[:4, :4], matrix[:4, :4].astype(np.float64) / np.outer(sigma, sigma))
+                self.assertEqual(correlation[4].tolist(), [0.0] * 5)
+
+    def test_export_many_results(self):
+        """
+        Тестирование ковариационной матрицы сотен результатов по тысячам листов.
+        """
+        with localcontext(backend='float'):
+            rng = np.random.default_rng(1)
+            x = [UDecimal(float(v), 0.1) for v in rng.uniform(1, 2, 2000)]
+            set_correlation_matrix(x[:50], np.full((50, 50), 0.3) + 0.7 * np.eye(50))
+            groups = [rng.choice(2000, 20, replace=False) for _ in range(300)]
+            results = [sum((x[i] * x[(i + 1) % 2000] for i in group), UDecimal(0)) for group in groups]
+            matrix = covariance_matrix(results)
+            np.testing.assert_allclose(np.diag(matrix), [r.uncertainty ** 2 for r in results], rtol=1e-12)
+            self.assertAlmostEqual(matrix[1, 2], results[1].get_covariance(results[2]), places=14)
+
+    def test_update_and_remove(self):
+        """
+        Тестирование изменения и удаления элементов загруженной матрицы.
+        """
+        x, y = UDecimal('1', '0.1'), UDecimal('2', '0.1')
+        set_correlation_matrix([x, y], [[1, '0.5'], ['0.5', 1]])
+        self.assertEqual(x.get_covariance(y), Decimal('0.005'))
+        x.set_covariance(y, '0.002')
+        self.assertEqual(x.get_covariance(y), Decimal('0.002'))
+        x.remove_covariance(y)
+        self.assertEqual(x.get_covariance(y), 0)
+        self.assertEqual(x.covariances, {})
+
+    def test_invalid_matrices(self):
+        """
+        Тестирование проверки входных матриц.
+        """
+        x, y = UDecimal('1', '0.1'), UDecimal('2', '0.1')
+        with self.assertRaises(ValueError):
+            set_covariance_matrix([x, y], [[1, 0.5], [0.4, 1]])
+        with self.assertRaises(ValueError):
+            set_covariance_matrix([x, y], [[1]])
+        with self.assertRaises(ValueError):
+            set_correlation_matrix([x, y], [[1, 2], [2, 1]])
+        with self.assertRaises(ValueError):
+            set_correlation_matrix([x + y, y], [[1, 0], [0, 1]])
+
+    def test_separate_registry(self):
+        """
+        Тестирование отдельного экземпляра хранилища.
+        """
+        registry = CovarianceRegistry()
+        x, y = UDecimal('1', '0.1'), UDecimal('2', '0.1')
+        registry.set_correlation_matrix([x, y], [[1, 1], [1, 1]])
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(x.get_covariance(y), 0)
+        registry.clear()
+        self.assertFalse(registry)
+
+    def test_pruning_dead_variables(self):
+        """
+        Тестирование автоматического удаления ковариаций удалённых переменных.
+        """
+        registry = CovarianceRegistry()
+        keep = UDecimal('1', '0.1')
+        others = [UDecimal('2', '0.1') for _ in range(100)]
+        for other in others:
+            registry.track(keep._leaf, other._leaf)
+            registry.set(keep._backend, keep.id, other.id, Decimal('0.001'))
+        derived = others[0] * 2
+        self.assertEqual(len(registry), 100)
+        del others, other
+        gc.collect()
+        # Лист others[0] жив, пока на него ссылается производная величина
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(registry.memory()['tracked_leaves'], 2)
+        del derived
+        gc.collect()
+        self.assertEqual(registry.prune(), 1)
+        self.assertFalse(registry)
+        self.assertEqual(registry.memory()['tracked_leaves'], 1)
+
+    def test_pruning_blocks_and_report(self):
+        """
+        Тестирование удаления блоков матриц и отчёта о памяти.
+        """
+        gc.collect()
+        before = memory_report()['covariances']
+        variables = [UDecimal(i, '0.1') for i in range(20)]
+        set_correlation_matrix(variables, np.full((20, 20), 0.5) + 0.5 * np.eye(20))
+        report = memory_report()
+        self.assertEqual(report['covariances']['blocks'], before['blocks'] + 1)
+        self.assertEqual(report['covariances']['block_entries'], before['block_entries'] + 190)
+        self.assertGreaterEqual(report['variables']['live'], 20)
+        self.assertGreater(report['bytes'], report['covariances']['bytes'])
+        del variables[5:]
+        gc.collect()
+        self.assertEqual(len(variables[0].covariances), 4)
+        del variables
+        gc.collect()
+        after = memory_report()['covariances']
+        self.assertEqual(after['blocks'], before['blocks'])
+        self.assertEqual(after['tracked_leaves'], before['tracked_leaves'])
+        self.assertLess(after['bytes'], report['covariances']['bytes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+# test_serialization.py
+
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from udecimal import UDecimal, UDecimalArray, localcontext, serialization
+
+
+def _scale(values):
+    return [value * 2 for value in values]
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.x = UDecimal('1.5', '0.1')
+        self.y = UDecimal('2.25', '0.2')
+        self.x.set_covariance(self.y, '0.005')
+
+    def assertSame(self, restored, original):
+        self.assertEqual(restored.value, original.value)
+        self.assertEqual(restored.uncertainty, original.uncertainty)
+
+    def check_round_trip(self, format):
+        values = [self.x, self.y, self.x * self.y, self.x - self.y]
+        restored = serialization.loads(serialization.dumps(values, format=format))
+        for a, b in zip(restored, values):
+            self.assertSame(a, b)
+        # Корреляции внутри набора сохраняются
+        self.assertSame(restored[2] - restored[0] * restored[1], values[2] - values[0] * values[1])
+        self.assertEqual(restored[0].get_covariance(restored[1]), Decimal('0.005'))
+
+    def test_binary_round_trip(self):
+        """
+        Тестирование двоичного формата.
+        """
+        self.check_round_trip('binary')
+        with self.assertRaises(ValueError):
+            serialization.loads(b'XXXX' + bytes(60))
+
+    def test_json_round_trip(self):
+        """
+        Тестирование формата JSON.
+        """
+        self.check_round_trip('json')
+
+    def test_backends(self):
+        """
+        Тестирование сохранения бэкенда и точности.
+        """
+        with localcontext(backend='mpmath', prec=40):
+            z = UDecimal('3', '0.3').sqrt()
+        restored = serialization.loads(serialization.dumps(z))
+        self.assertEqual(restored.backend, z.backend)
+        self.assertSame(restored, z)
+        with localcontext(backend='float'):
+            w = UDecimal(0.1, 0.01) * 3
+        restored = serialization.loads(serialization.dumps(w))
+        self.assertIsInstance(restored.value, float)
+        self.assertSame(restored, w)
+        with localcontext(backend='fixed', prec=0):
+            v = UDecimal(-7, 2) * 3
+        for data in (serialization.dumps(v), serialization.dumps(v, format='json')):
+            restored = serialization.loads(data)
+            self.assertIs(restored.backend, v.backend)
+            self.assertSame(restored, v)
+
+    def test_pickle(self):
+        """
+        Тестирование pickle: величины, сериализованные по отдельности, остаются связанными.
+        """
+        a, b = pickle.loads(pickle.dumps(self.x)), pickle.loads(pickle.dumps(self.x * 2))
+        self.assertEqual((b - 2 * a).uncertainty, 0)
+        array = UDecimalArray([1.0, 2.0], [0.1, 0.2])
+        restored = pickle.loads(pickle.dumps(array))
+        self.assertEqual(restored.dtype, np.float64)
+        np.testing.assert_array_equal(restored.values, array.values)
+        np.testing.assert_array_equal(restored.uncertainties, array.uncertainties)
+
+    def test_array_columns(self):
+        """
+        Тестирование записи массивов из буферов: общие листы, срезы, суммы и ковариации.
+        """
+        for dtype in (float, object):
+            base = UDecimalArray(['1', '2', '3', '4'], ['0.1', '0.2', '0.3', '0.4'], dtype=dtype)
+            shifted = base[1:] * 2 + base[:-1] - base[0]
+            totals = base.sum([0, 0, 1, 1], 2)
+            mixed = UDecimalArray.concatenate([shifted, totals, UDecimalArray.from_list([self.x, self.x * self.y], dtype)])
+            for array in (base, shifted, mixed):
+                expected = array.to_list()
+                with mock.patch.object(UDecimalArray, 'to_list', side_effect=AssertionError):
+                    data = [serialization.dumps(array, format=format) for format in ('binary', 'json')]
+                # Массив восстанавливается из столбцов, без создания величин UDecimal
+                with mock.patch.object(UDecimalArray, 'from_list', side_effect=AssertionError):
+                    for d in data:
+                        self.assertIs(serialization.loads(d).dtype, array.dtype)
+                for items in (serialization.loads(d).to_list() for d in data):
+                    for a, b in zip(items, expected):
+                        self.assertEqual(a.value, b.value)
+                        self.assertEqual(a.uncertainty, b.uncertainty)
+                        self.assertEqual((a - b).uncertainty, 0)
+                    self.assertEqual((items[-1] - items[-2]).uncertainty, (expected[-1] - expected[-2]).uncertainty)
+        # Срез большого массива создаёт только листы своих элементов
+        large = UDecimalArray(np.arange(1000.0), 0.5)
+        restored = serialization.loads(serialization.dumps(large[10:12]))
+        self.assertIsNone(large._leaf_block._leaves)
+        self.assertEqual((restored.to_list()[0] - large.to_list()[10]).uncertainty, 0)
+
+    def test_process_round_trip(self):
+        """
+        Тестирование передачи величин в другой процесс и обратно.
+        """
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            doubled = executor.submit(_scale, [self.x, self.y]).result()
+        self.assertSame(doubled[0], self.x * 2)
+        self.assertEqual((doubled[0] - 2 * self.x).uncertainty, 0)
+        self.assertSame(doubled[1] - doubled[0], self.y * 2 - self.x * 2)
+
+    def test_file_mmap(self):
+        """
+        Тестирование записи в файл и чтения с отображением в память.
+        """
+        values = [self.x, self.x / self.y]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'values.udec')
+            serialization.dump(values, path)
+            restored = serialization.load(path, mmap=True)
+            json_path = os.path.join(directory, 'values.json')
+            serialization.dump(values, json_path, format='json')
+            from_json = serialization.load(json_path)
+        for a, b in zip(restored, values):
+            self.assertSame(a, b)
+        for a, b in zip(from_json, values):
+            self.assertSame(a, b)
+        # Столбцы float64 массива остаются представлениями отображённого файла
+        base = UDecimalArray(np.linspace(1, 2, 1000), 0.01)
+        array = UDecimalArray.concatenate([base * 3 - base[0], base[:10] * 2])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'array.udec')
+            serialization.dump(array, path)
+            restored = serialization.load(path, mmap=True)
+            self.assertIsInstance(restored.values.base, np.memmap)
+            np.testing.assert_array_equal(restored.values, array.values)
+            np.testing.assert_allclose(restored.uncertainties, array.uncertainties, rtol=1e-15)
+            difference = restored - array
+            np.testing.assert_allclose(difference.uncertainties, 0, atol=1e-15)
+            del restored, difference
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# test_threads.py
+
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import unittest
+
+from udecimal import UDecimal, localcontext, usum
+from udecimal.backends import resolve_backend
+from udecimal.registry import default_registry
+from udecimal.udecimal import _ThreadIds
+
+THREADS = 8
+
+
+class TestThreads(unittest.TestCase):
+    def setUp(self):
+        # Частое переключение потоков увеличивает вероятность гонок
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def run_threads(self, func):
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            return [future.result() for future in [executor.submit(func, k) for k in range(THREADS)]]
+
+    def test_covariances_under_contention(self):
+        """
+        Тестирование одновременной установки, удаления и чтения ковариаций.
+        """
+        shared = UDecimal('1', '0.1')
+        alive = []  # Ковариации удалённых переменных очищаются, поэтому переменные сохраняются
+
+        def work(k):
+            results = []
+            for n in range(300):
+                x = UDecimal('2', '0.2')
+                y = UDecimal('3', '0.3')
+                x.set_covariance(y, '0.05')
+                shared.set_covariance(x, '0.001')
+                alive.append(x)
+                results.append(((x - y).uncertainty, (shared + x).uncertainty, x.get_covariance(y)))
+                if n % 2:
+                    x.remove_covariance(y)
+                    self.assertEqual(x.get_covariance(y), 0)
+                    shared.remove_covariance(x)
+            return results
+
+        expected = ((UDecimal('0.04') + UDecimal('0.09') - UDecimal('0.1')).sqrt().value,
+                    (UDecimal('0.01') + UDecimal('0.04') + UDecimal('0.002')).sqrt().value,
+                    UDecimal('0.05').value)
+        for results in self.run_threads(work):
+            for result in results:
+                self.assertEqual(result, expected)
+        self.assertEqual(len(shared.covariances), THREADS * 150)
+        for other in list(shared.covariances):
+            default_registry.remove(shared.id, other)
+
+    def test_shared_lazy_graph(self):
+        """
+        Тестирование одновременного вычисления общего ленивого графа.
+        """
+        def build():
+            x = UDecimal('1.5', '0.1')
+            y = UDecimal('0.5', '0.05')
+            with localcontext(lazy=True):
+                terms = [(x * y + k).sin() * x for k in range(50)]
+                return terms, usum(terms)
+
+        # Эталон — такой же граф над другими переменными, вычисленный в одном потоке
+        reference, reference_total = build()
+        expected = [(term.value, term.uncertainty) for term in reference]
+        terms, total = build()
+
+        def work(k):
+            return [(term.value, term.uncertainty) for term in terms[k % 2::2]], total.uncertainty
+
+        for _, uncertainty in self.run_threads(work):
+            self.assertEqual(uncertainty, reference_total.uncertainty)
+        self.assertEqual([(term.value, term.uncertainty) for term in terms], expected)
+
+    def test_unique_ids(self):
+        """
+        Тестирование уникальности идентификаторов, выдаваемых потокам блоками.
+        """
+        ids = _ThreadIds()
+        batches = self.run_threads(lambda k: [ids.next() for _ in range(5000)])
+        flat = [i for batch in batches for i in batch]
+        self.assertEqual(len(set(flat)), len(flat))
+        backends = self.run_threads(lambda k: resolve_backend('mpmath', 37 + THREADS))
+        self.assertTrue(all(backend is backends[0] for backend in backends))
+
+
+if __name__ == '__main__':
+    unittest.main()
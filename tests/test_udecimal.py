@@ -323,6 +323,66 @@ class TestUDecimal(unittest.TestCase):
             msg="Неопределённость d должна соответствовать ожидаемой при множественных ковариациях."
         )
     
+    def test_self_correlation_through_sensitivities(self):
+        """
+        Тестирование учёта корреляций, возникающих через общие базовые переменные.
+        """
+        x = UDecimal('3.0', '0.1')
+        y = UDecimal('4.0', '0.2')
+
+        # x - x не содержит неопределённости
+        self.assertEqual((x - x).uncertainty, Decimal('0'))
+
+        # (x + y) + x = 2x + y
+        z = (x + y) + x
+        expected = ((2 * Decimal('0.1')) ** 2 + Decimal('0.2') ** 2).sqrt()
+        self.assertAlmostEqual(float(z.uncertainty), float(expected), places=20)
+        self.assertEqual(z.contributors, {x.id, y.id})
+
+        # x * x / x имеет ту же неопределённость, что и x
+        w = x * x / x
+        self.assertAlmostEqual(float(w.uncertainty), 0.1, places=20)
+
+    def test_long_accumulation_chain(self):
+        """
+        Тестирование накопления суммы большого числа слагаемых.
+        """
+        terms = [UDecimal('1.0', '0.1') for _ in range(2000)]
+        total = UDecimal('0')
+        for term in terms:
+            total = total + term
+        self.assertEqual(total.value, Decimal('2000.0'))
+        self.assertAlmostEqual(float(total.uncertainty), float((2000 * Decimal('0.01')).sqrt()), places=10)
+
+    def test_covariance_requires_base_variables(self):
+        """
+        Тестирование запрета установки ковариации для производной величины.
+        """
+        a = UDecimal('1.0', '0.1')
+        b = UDecimal('2.0', '0.2')
+        with self.assertRaises(ValueError):
+            (a + b).set_covariance(a, Decimal('0.01'))
+
+    def test_compact_layout(self):
+        """
+        Тестирование компактного представления: __slots__ и целочисленные идентификаторы.
+        """
+        a = UDecimal('1.0', '0.1')
+        b = a * 2
+        self.assertFalse(hasattr(a, '__dict__'))
+        self.assertIsInstance(a.id, int)
+        self.assertGreater(b.id, a.id)
+        self.assertEqual(a.covariances, {})
+
+        # Запись в глобальной карте удаляется без финализатора __del__
+        import gc
+        a_id = a.id
+        self.assertIs(UDecimal.id_map[a_id], a)
+        del a
+        gc.collect()
+        self.assertNotIn(a_id, UDecimal.id_map)
+        self.assertAlmostEqual(float(b.uncertainty), 0.2, places=20)
+
     def test_weak_reference_cleanup(self):
         """
         Тестирование автоматического удаления ковариаций при уничтожении экземпляра.
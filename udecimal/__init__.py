@@ -1,5 +1,63 @@
 # udecimal/__init__.py
 
 from .udecimal import UDecimal
+from .backends import DecimalBackend, FixedBackend, FloatBackend, MpmathBackend
+from .context import (
+    Context,
+    DefaultContext,
+    get_backend,
+    getcontext,
+    localcontext,
+    set_backend,
+    setcontext,
+    using_backend,
+)
+from .compiler import CompiledFunction, compile
+from .instrumentation import Statistics, memory_report, stats
+from .reductions import udot, umean, usum, uweighted_mean
+from .registry import (
+    CovarianceRegistry,
+    correlation_matrix,
+    covariance_matrix,
+    set_correlation_matrix,
+    set_covariance_matrix,
+)
 
-__all__ = ['UDecimal']
+__all__ = [
+    'UDecimal',
+    'UDecimalArray',
+    'DecimalBackend',
+    'FixedBackend',
+    'FloatBackend',
+    'MpmathBackend',
+    'Context',
+    'DefaultContext',
+    'getcontext',
+    'setcontext',
+    'localcontext',
+    'get_backend',
+    'set_backend',
+    'using_backend',
+    'CovarianceRegistry',
+    'set_covariance_matrix',
+    'set_correlation_matrix',
+    'covariance_matrix',
+    'correlation_matrix',
+    'CompiledFunction',
+    'Statistics',
+    'stats',
+    'memory_report',
+    'usum',
+    'umean',
+    'uweighted_mean',
+    'udot',
+]
+# udecimal.compile не входит в __all__: from udecimal import * не должен скрывать встроенную compile
+
+
+def __getattr__(name):
+    # UDecimalArray и NumPy загружаются при первом обращении
+    if name == 'UDecimalArray':
+        from .array import UDecimalArray
+        return UDecimalArray
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,1261 @@
+# array.py
+
+from decimal import Decimal, localcontext as decimal_localcontext
+import functools
+import weakref
+
+import numpy as np
+
+from .backends import DecimalBackend, as_decimal, resolve_backend
+from .context import get_backend
+from .registry import default_registry
+from .udecimal import UDecimal, _Leaf, _next_id
+
+# Пустой лист для выравнивания столбцов чувствительностей при импорте из списка
+_ZERO_LEAF = _Leaf(None, Decimal('0'))
+
+
+def _decimal_backend():
+    """
+    Бэкенд высокоточного пути: активный бэкенд Decimal или бэкенд Decimal по умолчанию.
+    """
+    backend = get_backend()
+    if isinstance(backend, DecimalBackend):
+        return backend
+    return resolve_backend('decimal')
+
+
+def _object_kernel(name):
+    """
+    Поэлементное применение функции бэкенда Decimal к массиву Decimal (dtype=object).
+    """
+    func = getattr(_decimal_backend(), name)
+    return np.frompyfunc(func, 2 if name == 'pow' else 1, 1)
+
+
+def _precise(method):
+    """
+    Выполняет операцию над массивом Decimal с точностью бэкенда, не изменяя
+    глобальный контекст decimal.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        if self._values.dtype != object:
+            return method(self, *args)
+        with decimal_localcontext(_decimal_backend().context):
+            return method(self, *args)
+    return wrapper
+
+
+# Ядра для быстрого пути (float64)
+_FLOAT_KERNELS = {
+    'ln': np.log,
+    'exp': np.exp,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'pow': np.power,
+}
+
+
+def _to_object(values):
+    """
+    Преобразует последовательность в массив Decimal (dtype=object).
+    """
+    values = np.asarray(values, dtype=object).ravel()
+    return np.array([as_decimal(v) for v in values], dtype=object)
+
+
+def _to_float(values):
+    """
+    Преобразует последовательность в массив float64.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+        return values.astype(np.float64).ravel()
+    return np.asarray(values, dtype=object).ravel().astype(np.float64)
+
+
+def _infer_dtype(*sequences):
+    """
+    Определяет тип хранения: Decimal (object), если среди значений есть строки или Decimal.
+    """
+    for sequence in sequences:
+        if isinstance(sequence, np.ndarray):
+            if sequence.dtype == object and any(isinstance(v, (Decimal, str)) for v in sequence.ravel()):
+                return object
+            continue
+        if isinstance(sequence, (Decimal, str)):
+            return object
+        if isinstance(sequence, (list, tuple)) and any(isinstance(v, (Decimal, str)) for v in sequence):
+            return object
+    return np.float64
+
+
+def _convert(values, dtype):
+    return _to_object(values) if dtype is object else _to_float(values)
+
+
+def _scalar(value, dtype):
+    """
+    Приводит скалярное значение к типу элементов массива.
+    """
+    if dtype is object:
+        return as_decimal(value)
+    return float(value)
+
+
+class _SumLeaf(_Leaf):
+    """
+    Лист суммы по группам: удерживает свой блок, на который по слабой ссылке указывают
+    исходные блоки слагаемых.
+    """
+    __slots__ = ('block',)
+
+    def __init__(self, id, uncertainty, block):
+        super().__init__(id, uncertainty)
+        self.block = block
+
+
+class _LeafBlock:
+    """
+    Блок базовых переменных массива: i-й элемент массива зависит от i-го листа блока.
+
+    Блок размера 1 транслируется на все элементы массива. Листы создаются лениво: все
+    сразу при преобразовании массива в список UDecimal или по одному при обращении
+    к отдельным элементам (created). Блок, выбранный из другого блока (срез, перестановка,
+    объединение массивов), хранит исходный блок root и номера его листов index, поэтому
+    листы создаются только в исходном блоке и остаются общими.
+
+    Блок сумм по группам (см. UDecimalArray.sum) хранит исходные блоки слагаемых в sources,
+    а исходный блок — ссылки на блоки сумм с коэффициентами в links. Пока листы исходного
+    блока не созданы, ковариации сумм с ними не записываются в хранилище: это происходит
+    при создании листов.
+    """
+    __slots__ = ('uncertainties', '_leaves', 'root', 'index', 'links', 'sources', 'created', '__weakref__')
+
+    def __init__(self, uncertainties, leaves=None, root=None, index=None):
+        self.uncertainties = uncertainties
+        self._leaves = leaves
+        self.root = root
+        self.index = index
+        self.links = None  # [(слабая ссылка на блок сумм, листы, группы, коэффициенты)]
+        self.sources = None
+        self.created = None  # {номер: лист} листов, созданных по одному
+
+    @property
+    def materialized(self):
+        """
+        Созданы ли все листы исходного блока. Отдельно созданные листы не меняют правил
+        вычисления ковариаций, пока у них нет ковариаций в хранилище, кроме ковариаций
+        с суммами; иначе создаются все листы.
+        """
+        root = _root(self)
+        if root._leaves is None and root.created and _correlated(root):
+            root.leaves()
+        return root._leaves is not None
+
+    def leaves(self):
+        """
+        Возвращает список листов блока, создавая их при первом обращении.
+        """
+        if self._leaves is None:
+            if self.root is not None:
+                leaves = self.root.leaves()
+                self._leaves = [leaves[i] for i in self.index.tolist()]
+            else:
+                if self.sources:
+                    # Связи слагаемых с суммами действуют, пока жив хотя бы один лист суммы
+                    self._leaves = [_SumLeaf(_next_id(), u, self) for u in self.uncertainties.tolist()]
+                else:
+                    self._leaves = [_Leaf(_next_id(), u) for u in self.uncertainties.tolist()]
+                if self.created:
+                    for p, leaf in self.created.items():
+                        self._leaves[p] = leaf
+                    self.created = None
+                if self.links:
+                    _register_links(self)
+        return self._leaves
+
+    def leaf(self, index):
+        """
+        Лист элемента index; в исходном блоке без сумм создаётся только этот лист.
+        """
+        if len(self.uncertainties) == 1:
+            index = 0
+        if self._leaves is not None:
+            return self._leaves[index]
+        root = _root(self)
+        if root._leaves is not None or root.sources:
+            return self.leaves()[index]
+        return root._create(int(index if self.root is None else self.index[index]))
+
+    def _create(self, p):
+        if self.created is None:
+            self.created = {}
+        leaf = self.created.get(p)
+        if leaf is None:
+            leaf = self.created[p] = _Leaf(_next_id(), self.uncertainties[p:p + 1].tolist()[0])
+            if self.links:
+                _register_links(self, {p: leaf})
+        return leaf
+
+    def take(self, index):
+        """
+        Блок из листов с номерами index; блок размера 1 остаётся транслируемым.
+        """
+        if len(self.uncertainties) == 1:
+            return self
+        if self.root is None:
+            return _LeafBlock(self.uncertainties[index], root=self, index=index)
+        return _LeafBlock(self.uncertainties[index], root=self.root, index=self.index[index])
+
+    def summaries(self):
+        """
+        Живые блоки сумм, ковариации которых с листами блока ещё не записаны в хранилище.
+        """
+        if not self.links:
+            return []
+        self.links = [link for link in self.links if link[0]() is not None]
+        return [link[0]() for link in self.links]
+
+
+def _root(block):
+    return block if block.root is None else block.root
+
+
+def _positions(block, size):
+    """
+    Номера листов исходного блока для элементов массива.
+    """
+    if len(block.uncertainties) == 1:
+        return np.zeros(size, dtype=np.int64)
+    if block.index is None:
+        return np.arange(size)
+    return block.index
+
+
+def _linked(ba, bb):
+    """
+    Связаны ли блоки как слагаемые и суммы с ковариациями, ещё не записанными в хранилище.
+    """
+    ra = _root(ba)
+    rb = _root(bb)
+    return any(summary is rb for summary in ra.summaries()) or any(summary is ra for summary in rb.summaries())
+
+
+def _correlated(root):
+    """
+    Есть ли у отдельно созданных листов исходного блока ковариации в хранилище, кроме
+    ковариаций с суммами его листов.
+    """
+    if not default_registry:
+        return False
+    sums = {leaf.id for summary in root.summaries() for leaf in summary.leaves()}
+    backend = _decimal_backend()
+    for leaf in root.created.values():
+        if default_registry.involves(leaf.id) and not sums.issuperset(default_registry.row(backend, leaf.id)):
+            return True
+    return False
+
+
+def _register_links(root, created=None):
+    """
+    Записывает в хранилище ковариации созданных листов исходного блока с суммами:
+    cov(x_p, S_g) = a_gp · u_p².
+
+    :param created: {номер: лист} отдельно созданных листов или None — все листы блока,
+                    после чего связи больше не нужны.
+    """
+    leaves = root._leaves if created is None else created
+    entries = []
+    tracked = list(root._leaves) if created is None else list(created.values())
+    for link in root.links:
+        summary = link[0]()
+        if summary is None:
+            continue
+        _, positions, groups, coefficients = link
+        if created is not None:
+            keep = np.isin(positions, list(created))
+            if not keep.any():
+                continue
+            positions, groups, coefficients = positions[keep], groups[keep], coefficients[keep]
+        sums = summary.leaves()
+        tracked.extend(sums)
+        u = root.uncertainties[positions]
+        covariances = coefficients * u * u
+        for p, g, c in zip(positions.tolist(), groups.tolist(), covariances.tolist()):
+            if c:
+                entries.append((leaves[p].id, sums[g].id, c))
+    if created is None:
+        root.links = None
+    default_registry.track(*tracked)
+    default_registry.set_many(_decimal_backend(), entries)
+
+
+def _bincount(indices, weights, size, dtype):
+    """
+    Суммы весов по номерам indices (np.bincount, в том числе для Decimal).
+    """
+    if dtype is object:
+        result = np.full(size, Decimal('0'), dtype=object)
+        np.add.at(result, indices, weights)
+        return result
+    return np.bincount(indices, weights=weights, minlength=size)
+
+
+def _aggregate(blocks, groups, size, dtype):
+    """
+    Коэффициенты сумм по группам при листах исходного блока: Σ c по одинаковым (группа, лист).
+
+    :param blocks: Блоки с общим исходным блоком и их коэффициенты.
+    :return: Номера листов, группы и ненулевые коэффициенты.
+    """
+    n = len(groups)
+    if len(blocks) == 1 and blocks[0][0].index is None:
+        # Сам исходный блок: пары (группа, лист) различны
+        positions, coefficients = np.arange(n), blocks[0][1]
+    else:
+        width = len(_root(blocks[0][0]).uncertainties)
+        keys = np.concatenate([groups * width + _positions(block, n) for block, _ in blocks])
+        keys, inverse = np.unique(keys, return_inverse=True)
+        coefficients = _bincount(inverse.ravel(), np.concatenate([c for _, c in blocks]), len(keys), dtype)
+        positions, groups = keys % width, keys // width
+    nonzero = coefficients != 0
+    return positions[nonzero], groups[nonzero], coefficients[nonzero]
+
+
+def _join(left, right):
+    """
+    Все пары номеров (i, j), для которых left[i] == right[j].
+    """
+    order = np.argsort(right, kind='stable')
+    ordered = right[order]
+    start = np.searchsorted(ordered, left, 'left')
+    counts = np.searchsorted(ordered, left, 'right') - start
+    i = np.repeat(np.arange(len(left)), counts)
+    offsets = np.arange(len(i)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return i, order[np.repeat(start, counts) + offsets]
+
+
+def _pair_sums(g, h, terms, width, dtype):
+    """
+    Суммы terms по парам (g, h): список (g, h, сумма).
+    """
+    keys, inverse = np.unique(g * width + h, return_inverse=True)
+    totals = _bincount(inverse.ravel(), terms, len(keys), dtype)
+    return [(key // width, key % width, c) for key, c in zip(keys.tolist(), totals.tolist())]
+
+
+def _shared_covariances(root, positions, groups, coefficients, size, dtype):
+    """
+    Ковариации между суммами разных групп через общие листы: Σ a_gp · a_hp · u_p², g < h.
+
+    :return: {(g, h): ковариация}.
+    """
+    i, j = _join(positions, positions)
+    keep = groups[i] < groups[j]
+    if not keep.any():
+        return {}
+    i, j = i[keep], j[keep]
+    u = root.uncertainties[positions[i]]
+    terms = coefficients[i] * coefficients[j] * u * u
+    return {(g, h): c for g, h, c in _pair_sums(groups[i], groups[j], terms, size, dtype)}
+
+
+def _sibling_covariances(root, positions, groups, coefficients, dtype):
+    """
+    Ковариации новой суммы с другими суммами тех же листов: Σ a_gp · b_hp · u_p².
+
+    :return: Список (группа, блок другой суммы, её группа, ковариация).
+    """
+    result = []
+    for summary in root.summaries():
+        link = next(link for link in root.links if link[0]() is summary)
+        _, other_positions, other_groups, other_coefficients = link
+        i, j = _join(positions, other_positions)
+        if not len(i):
+            continue
+        u = root.uncertainties[positions[i]]
+        terms = coefficients[i] * other_coefficients[j] * u * u
+        width = len(summary.uncertainties)
+        result.extend((g, summary, h, c) for g, h, c in _pair_sums(groups[i], other_groups[j], terms, width, dtype))
+    return result
+
+
+def _exposures(blocks, groups, size, dtype, variance):
+    """
+    Суммы по листам, которые уже созданы: ковариации сумм со всеми коррелированными листами,
+    включая ковариации из хранилища.
+
+    :param blocks: Блоки с созданными листами и их коэффициенты.
+    :param variance: Массив дисперсий сумм, к которому прибавляется вклад листов.
+    :return: Листы слагаемых, ковариации (группа, id листа, c) и ковариации сумм {(g, h): c}.
+    """
+    zero = _scalar(0, dtype)
+    groups = groups.tolist()
+    weights = {}  # {id листа: (лист, {группа: коэффициент})}
+    for block, c in blocks:
+        leaves = block.leaves()
+        for k in np.flatnonzero(c != 0).tolist():
+            leaf = leaves[k]
+            if leaf is _ZERO_LEAF:
+                continue
+            entry = weights.get(leaf.id)
+            if entry is None:
+                entry = weights[leaf.id] = (leaf, {})
+            g = groups[k]
+            entry[1][g] = entry[1].get(g, zero) + c[k]
+    backend = _decimal_backend()
+    exposure = {}  # {id листа: {группа: cov(S_g, лист)}}
+    for i, (leaf, coefficients) in weights.items():
+        neighbours = [(i, _scalar(leaf.uncertainty, dtype) ** 2)]
+        if default_registry.involves(i):
+            neighbours.extend((j, _scalar(c, dtype)) for j, c in default_registry.row(backend, i).items())
+        for j, c in neighbours:
+            target = exposure.setdefault(j, {})
+            for g, a in coefficients.items():
+                target[g] = target.get(g, zero) + a * c
+    pairs = {}
+    for i, (_, coefficients) in weights.items():
+        target = exposure[i]
+        for h, b in coefficients.items():
+            variance[h] += b * target[h]
+            for g, e in target.items():
+                if g < h:
+                    pairs[(g, h)] = pairs.get((g, h), zero) + b * e
+    covariances = [(g, j, c) for j, target in exposure.items() for g, c in target.items() if c]
+    return [leaf for leaf, _ in weights.values()], covariances, pairs
+
+
+def _summarize(sources, groups, size, dtype):
+    """
+    Создаёт блок сумм по группам Σ a_gp · x_p по листам исходных блоков.
+
+    Дисперсии сумм точные. Ковариации сумм между группами, с другими суммами тех же листов
+    и с листами, уже созданными или связанными ковариациями в хранилище, записываются в
+    хранилище; ковариации с ещё не созданными листами — при их создании.
+
+    :param sources: {исходный блок: [(блок, коэффициенты)]}.
+    :return: Экземпляр _LeafBlock размера size.
+    """
+    variance = np.full(size, _scalar(0, dtype), dtype=dtype)
+    links = []
+    siblings = []
+    shared = {}
+    created = {}
+    for root, blocks in sources.items():
+        for source in root.sources or ():
+            # Сумма сумм: ковариации первых сумм с их слагаемыми записываются в хранилище
+            source.leaves()
+        if root.materialized:
+            created[root] = blocks
+            continue
+        positions, g, a = _aggregate(blocks, groups, size, dtype)
+        u = root.uncertainties[positions]
+        variance += _bincount(g, (a * u) ** 2, size, dtype)
+        if len(positions) and np.bincount(positions).max() > 1:
+            # Лист входит в несколько групп: суммы ковариируют через него
+            for key, c in _shared_covariances(root, positions, g, a, size, dtype).items():
+                shared[key] = shared[key] + c if key in shared else c
+        if root.links:
+            siblings.extend(_sibling_covariances(root, positions, g, a, dtype))
+        links.append((root, positions, g, a))
+    members, covariances, pairs = [], [], {}
+    if created:
+        members, covariances, pairs = _exposures(
+            [item for blocks in created.values() for item in blocks], groups, size, dtype, variance)
+    for key, c in shared.items():
+        pairs[key] = pairs[key] + c if key in pairs else c
+    zero = _scalar(0, dtype)
+    variance = np.where(variance < zero, zero, variance)
+    if dtype is object:
+        uncertainties = np.array([v.sqrt() for v in variance], dtype=object)
+    else:
+        uncertainties = np.sqrt(variance)
+    summary = _LeafBlock(uncertainties)
+    summary.sources = [root for root, _, _, _ in links]
+    for root, positions, g, a in links:
+        if root.links is None:
+            root.links = []
+        root.links.append((weakref.ref(summary), positions, g, a))
+        if root.created:
+            # Листы, уже созданные по одному, получают ковариации с суммами сразу
+            _register_links(root, root.created)
+    if covariances or pairs or siblings:
+        sums = summary.leaves()
+        entries = [(sums[g].id, j, c) for g, j, c in covariances]
+        entries.extend((sums[g].id, sums[h].id, c) for (g, h), c in pairs.items() if c)
+        entries.extend((sums[g].id, other.leaf(h).id, c) for g, other, h, c in siblings if c)
+        default_registry.track(*sums, *members, *(other.leaf(h) for _, other, h, _ in siblings))
+        default_registry.set_many(_decimal_backend(), entries)
+    return summary
+
+
+def _combine_terms(ta, fa, tb, fb):
+    """
+    Вычисляет линейную комбинацию fa * ta + fb * tb двух наборов чувствительностей.
+    """
+    result = {block: c * fa for block, c in ta.items()}
+    for block, c in tb.items():
+        if block in result:
+            result[block] = result[block] + c * fb
+        else:
+            result[block] = c * fb
+    return result
+
+
+def _scale_terms(terms, factor):
+    return {block: c * factor for block, c in terms.items()}
+
+
+def _block_covariance(ba, bb, size, dtype):
+    """
+    Поэлементная ковариация листов двух блоков или None, если она всюду равна нулю.
+    """
+    backend = _decimal_backend()
+    covariances = []
+    nonzero = False
+    for i in range(size):
+        a = ba.leaf(i)
+        b = bb.leaf(i)
+        if a is b:
+            c = a.uncertainty ** 2
+        elif default_registry and a.id is not None and b.id is not None:
+            c = default_registry.get(backend, a.id, b.id, Decimal('0'))
+        else:
+            c = Decimal('0')
+        nonzero = nonzero or c != 0
+        covariances.append(c)
+    if not nonzero:
+        return None
+    return _convert(covariances, dtype)
+
+
+def _shared_covariance(ba, bb, size, dtype):
+    """
+    Поэлементная ковариация блоков с общим исходным блоком, листы которого ещё не созданы,
+    или None, если у блоков нет общих листов.
+    """
+    root = _root(ba)
+    if root is not _root(bb):
+        return None
+    pa = _positions(ba, size)
+    pb = _positions(bb, size)
+    shared = pa == pb
+    if not shared.any():
+        return None
+    u = root.uncertainties[pa]
+    return np.where(shared, u * u, _scalar(0, dtype))
+
+
+class UDecimalArray:
+    """
+    Одномерный массив величин с неопределённостями, хранящий значения и
+    чувствительности в непрерывных буферах NumPy.
+
+    Поддерживает быстрый путь на float64 и высокоточный путь на Decimal (dtype=object).
+    Правила распространения неопределённости совпадают с правилами UDecimal.
+    """
+    # Запрещаем NumPy обрабатывать операции с массивом поэлементно
+    __array_ufunc__ = None
+
+    def __init__(self, values, uncertainties=0, dtype=None):
+        """
+        Инициализация массива независимых базовых переменных.
+
+        :param values: Последовательность значений.
+        :param uncertainties: Последовательность неопределённостей или одно общее значение.
+        :param dtype: float (быстрый путь) или object (Decimal); по умолчанию определяется по данным.
+        """
+        if dtype is None:
+            dtype = _infer_dtype(values, uncertainties)
+        elif dtype is not object:
+            dtype = np.float64
+        values = _convert(values, dtype)
+        if np.ndim(uncertainties) == 0:
+            uncertainties = [uncertainties] * len(values)
+        uncertainties = _convert(uncertainties, dtype)
+        if len(uncertainties) != len(values):
+            raise ValueError("Длины массивов значений и неопределённостей не совпадают.")
+        if (uncertainties < 0).any():
+            raise ValueError("Неопределённость не может быть отрицательной.")
+        block = _LeafBlock(uncertainties)
+        self._values = values
+        self._terms = {block: self._ones(len(values), dtype)}
+        self._uncertainties = uncertainties
+        self._leaf_block = block
+
+    @staticmethod
+    def _ones(size, dtype):
+        if dtype is object:
+            return np.full(size, Decimal('1'), dtype=object)
+        return np.ones(size)
+
+    @classmethod
+    def _derived(cls, values, terms):
+        """
+        Создаёт производный массив по значениям и чувствительностям.
+        """
+        result = cls.__new__(cls)
+        result._values = values
+        result._terms = terms
+        result._uncertainties = None  # Вычисляется лениво
+        result._leaf_block = None
+        return result
+
+    @classmethod
+    def from_list(cls, items, dtype=object):
+        """
+        Создаёт массив из последовательности UDecimal с сохранением ковариаций.
+
+        :param items: Последовательность экземпляров UDecimal.
+        :param dtype: object (Decimal, по умолчанию) или float.
+        :return: Новый экземпляр UDecimalArray.
+        """
+        items = list(items)
+        if dtype is not object:
+            dtype = np.float64
+        values = _convert([item.value for item in items], dtype)
+        size = len(items)
+
+        if all(item._leaf is not None for item in items):
+            leaves = [item._leaf for item in items]
+            block = _LeafBlock(_convert([leaf.uncertainty for leaf in leaves], dtype), leaves)
+            result = cls._derived(values, {block: cls._ones(size, dtype)})
+            result._leaf_block = block
+            return result
+
+        # Раскладываем разреженные карты производных по столбцам одинаковой длины
+        width = max(len(item._sensitivities()) for item in items)
+        columns = [([_ZERO_LEAF] * size, [Decimal('0')] * size) for _ in range(width)]
+        for i, item in enumerate(items):
+            for t, (leaf, d) in enumerate(item._sensitivities().items()):
+                columns[t][0][i] = leaf
+                columns[t][1][i] = d
+        terms = {}
+        for leaves, coefficients in columns:
+            block = _LeafBlock(_convert([leaf.uncertainty for leaf in leaves], dtype), leaves)
+            terms[block] = _convert(coefficients, dtype)
+        return cls._derived(values, terms)
+
+    def to_list(self):
+        """
+        Преобразует массив в список UDecimal с сохранением ковариаций.
+
+        :return: Список экземпляров UDecimal.
+        """
+        for block in self._terms:
+            if len(self) * 2 >= len(_root(block).uncertainties):
+                # Большую часть листов выгоднее создать сразу, чем по одному
+                block.leaves()
+        return [self[i] for i in range(len(self))]
+
+    def _columns(self):
+        """
+        Чувствительности элементов по столбцам без создания величин UDecimal (для сериализации).
+
+        Листы исходного блока нумеруются один раз, а номера листов и производные каждого блока
+        выбираются векторно; повторы листа в строке суммируются, нулевые производные опускаются.
+
+        :return: Список листов, номера листов базовых переменных элементов (-1 для производных)
+                 и разреженная матрица производных в формате CSR: границы строк, номера листов
+                 и производные в типе элементов массива.
+        """
+        size = len(self)
+        dtype = self._kind
+        index = {}  # {лист: номер}
+        numbering = {}  # {исходный блок: номера его листов}
+        rows, columns, coefficients = [], [], []
+        for block, c in self._terms.items():
+            c = np.broadcast_to(c, (size,))
+            nonzero = np.flatnonzero(c != 0)
+            if not len(nonzero):
+                continue
+            root = _root(block)
+            if root._leaves is None and (size * 2 >= len(root.uncertainties) or root.sources):
+                # Как в to_list: большую часть листов выгоднее создать сразу
+                root.leaves()
+            if root._leaves is not None:
+                numbers = numbering.get(root)
+                if numbers is None:
+                    numbers = numbering[root] = np.array(
+                        [-1 if leaf is _ZERO_LEAF else index.setdefault(leaf, len(index)) for leaf in root._leaves],
+                        dtype=np.int64)
+                if len(block.uncertainties) == 1:
+                    positions = np.full(len(nonzero), 0 if block.root is None else block.index[0])
+                else:
+                    positions = _positions(block, size)[nonzero]
+                found = numbers[positions]
+            else:
+                found = np.array([index.setdefault(block.leaf(i), len(index)) for i in nonzero.tolist()],
+                                 dtype=np.int64)
+            keep = found >= 0
+            rows.append(nonzero[keep])
+            columns.append(found[keep])
+            coefficients.append(c[nonzero][keep])
+        if rows:
+            rows = np.concatenate(rows)
+            columns = np.concatenate(columns)
+            coefficients = np.concatenate(coefficients)
+        else:
+            rows = columns = np.zeros(0, dtype=np.int64)
+            coefficients = np.zeros(0, dtype=dtype)
+        keys = rows * max(len(index), 1) + columns
+        unique, inverse = np.unique(keys, return_inverse=True)
+        if len(unique) < len(keys):
+            # Один лист входит в элемент через несколько блоков
+            coefficients = _bincount(inverse.ravel(), coefficients, len(unique), dtype)
+            rows, columns = unique // len(index), unique % len(index)
+        else:
+            order = np.argsort(rows, kind='stable')
+            rows, columns, coefficients = rows[order], columns[order], coefficients[order]
+        pointers = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=pointers[1:])
+        bases = np.full(size, -1, dtype=np.int64)
+        if self._leaf_block is not None:
+            bases[rows] = columns
+        return list(index), bases, pointers, columns, coefficients
+
+    @classmethod
+    def _from_columns(cls, values, leaves, bases, pointers, sens_leaf, sens_value):
+        """
+        Создаёт массив по столбцам в формате _columns без создания величин UDecimal (для десериализации).
+
+        Значения и производные используются без копирования, если это позволяет их тип
+        (например, представления файла, отображённого в память). Как и в from_list, массив
+        базовых переменных состоит из одного блока листов, а производные раскладываются
+        по столбцам одинаковой длины; если у всех элементов одинаковое число производных,
+        столбцы — представления массива производных.
+
+        :param values: Массив значений (float64 или Decimal в dtype=object).
+        :param leaves: Список листов.
+        :param bases: Номера листов базовых переменных элементов (-1 для производных).
+        :param pointers: Границы строк разреженной матрицы производных (CSR).
+        :param sens_leaf: Номера листов производных.
+        :param sens_value: Производные в типе значений.
+        :return: Новый экземпляр UDecimalArray.
+        """
+        dtype = object if values.dtype == object else np.float64
+        size = len(values)
+        # Последний номер — пустой лист для выравнивания столбцов
+        table = np.empty(len(leaves) + 1, dtype=object)
+        table[:-1] = leaves
+        table[-1] = _ZERO_LEAF
+        uncertainties = _convert([leaf.uncertainty for leaf in table.tolist()], dtype)
+
+        if (bases >= 0).all():
+            block = _LeafBlock(uncertainties[bases], table[bases].tolist())
+            result = cls._derived(values, {block: cls._ones(size, dtype)})
+            result._leaf_block = block
+            return result
+
+        counts = np.diff(pointers)
+        width = int(counts.max(initial=0))
+        if (counts == width).all():
+            numbers = np.reshape(sens_leaf, (size, width)).T
+            coefficients = np.reshape(sens_value, (size, width)).T
+        else:
+            rows = np.repeat(np.arange(size), counts)
+            slots = np.arange(len(sens_leaf)) - np.repeat(pointers[:-1], counts)
+            numbers = np.full((width, size), len(leaves), dtype=np.int64)
+            numbers[slots, rows] = sens_leaf
+            coefficients = np.full((width, size), _scalar(0, dtype), dtype=dtype)
+            coefficients[slots, rows] = sens_value
+        terms = {}
+        for column, c in zip(numbers, coefficients):
+            terms[_LeafBlock(uncertainties[column], table[column].tolist())] = c
+        return cls._derived(values, terms)
+
+    @classmethod
+    def concatenate(cls, arrays):
+        """
+        Объединяет массивы в один с сохранением листов и ковариаций.
+
+        :param arrays: Непустая последовательность экземпляров UDecimalArray.
+        :return: Новый экземпляр UDecimalArray.
+        """
+        arrays = list(arrays)
+        if not arrays:
+            raise ValueError("Нет массивов для объединения.")
+        dtype = object if any(array._kind is object for array in arrays) else np.float64
+        arrays = [array if array._kind is dtype else array._astype(dtype) for array in arrays]
+        size = sum(len(array) for array in arrays)
+        # {исходный блок: [[номера листов, коэффициенты, номера массивов]]}: блоки одного
+        # исходного блока из разных массивов объединяются в один блок
+        merged = {}
+        offset = 0
+        with decimal_localcontext(_decimal_backend().context if dtype is object else None):
+            for part, array in enumerate(arrays):
+                n = len(array)
+                for block, c in array._terms.items():
+                    broadcast = len(block.uncertainties) == 1
+                    slots = merged.setdefault(block if broadcast else _root(block), [])
+                    slot = slots[0] if broadcast and slots else next((s for s in slots if part not in s[2]), None)
+                    if slot is None:
+                        slot = [None if broadcast else np.zeros(size, dtype=np.int64),
+                                np.full(size, _scalar(0, dtype), dtype=dtype), set()]
+                        slots.append(slot)
+                    if not broadcast:
+                        slot[0][offset:offset + n] = _positions(block, n)
+                    slot[1][offset:offset + n] += c
+                    slot[2].add(part)
+                offset += n
+        terms = {}
+        for root, slots in merged.items():
+            for index, c, _ in slots:
+                if index is None or (len(root.uncertainties) == size and (index == np.arange(size)).all()):
+                    block = root
+                else:
+                    # Элементы других массивов ссылаются на лист 0 с нулевым коэффициентом
+                    block = _LeafBlock(root.uncertainties[index], root=root, index=index)
+                terms[block] = c
+        result = cls._derived(np.concatenate([array._values for array in arrays]), terms)
+        if all(array._uncertainties is not None for array in arrays):
+            result._uncertainties = np.concatenate([array._uncertainties for array in arrays])
+        if len(terms) == 1 and all(array._leaf_block is not None for array in arrays):
+            result._leaf_block = next(iter(terms))
+        return result
+
+    def _take(self, indices):
+        """
+        Массив из элементов с номерами indices; листы остаются общими с исходным массивом.
+        """
+        terms = {}
+        for block, c in self._terms.items():
+            terms[block.take(indices)] = c if len(c) == 1 else c[indices]
+        result = UDecimalArray._derived(self._values[indices], terms)
+        if self._uncertainties is not None:
+            # Неопределённость элемента зависит только от его чувствительностей
+            result._uncertainties = self._uncertainties[indices]
+        if self._leaf_block is not None:
+            result._leaf_block = next(iter(terms))
+        return result
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._take(np.arange(len(self))[index])
+        if not isinstance(index, (int, np.integer)):
+            index = np.asarray(index)
+            if index.dtype == bool:
+                if index.shape != (len(self),):
+                    raise IndexError("Длина маски не совпадает с длиной массива.")
+                return self._take(np.flatnonzero(index))
+            if index.ndim != 1 or (index.size and index.dtype.kind not in 'iu'):
+                raise TypeError("Индекс массива должен быть целым числом, срезом, маской или массивом номеров.")
+            index = index.astype(np.int64)
+            if ((index < -len(self)) | (index >= len(self))).any():
+                raise IndexError("Индекс вне диапазона массива.")
+            return self._take(np.where(index < 0, index + len(self), index))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс вне диапазона массива.")
+        backend = get_backend()
+        value = backend.convert(self._values[index])
+        if self._leaf_block is not None:
+            return UDecimal._from_leaf(value, self._leaf_block.leaf(index), backend)
+        derivatives = {}
+        for block, c in self._terms.items():
+            d = backend.convert(c[index] if len(c) != 1 else c[0])
+            leaf = block.leaf(index)
+            if d == 0 or leaf is _ZERO_LEAF:
+                continue
+            derivatives[leaf] = backend.add(derivatives[leaf], d) if leaf in derivatives else d
+        return UDecimal._derived(value, derivatives, backend)
+
+    @_precise
+    def _where(self, mask, other):
+        """
+        Массив, элементы которого на позициях mask взяты из other (величины UDecimal, числа
+        или массива той же длины), а остальные — из исходного массива.
+        """
+        dtype = self._kind
+        size = len(self)
+        mask = np.asarray(mask, dtype=bool)
+        values, terms = self._coerce(other)
+        zero = _scalar(0, dtype)
+        result = {}
+        for source, keep in ((self._terms, ~mask), (terms or {}, mask)):
+            for block, c in source.items():
+                c = np.where(keep, np.broadcast_to(c, (size,)), zero)
+                if block in result:
+                    result[block] = result[block] + c
+                elif keep.any():
+                    result[block] = c
+        return UDecimalArray._derived(np.where(mask, values, self._values).astype(self._values.dtype), result)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    @property
+    def dtype(self):
+        return self._values.dtype
+
+    @property
+    def values(self):
+        """
+        Массив значений.
+        """
+        return self._values
+
+    @property
+    def uncertainties(self):
+        """
+        Массив стандартных неопределённостей элементов.
+        """
+        if self._uncertainties is None:
+            self._uncertainties = self._compute_uncertainties()
+        return self._uncertainties
+
+    @_precise
+    def _compute_uncertainties(self):
+        dtype = self._kind
+        size = len(self)
+        items = list(self._terms.items())
+        variance = 0
+        magnitude = 0
+        for block, c in items:
+            term = (c * block.uncertainties) ** 2
+            variance = variance + term
+            magnitude = magnitude + term
+        for i, (ba, ca) in enumerate(items):
+            for bb, cb in items[i + 1:]:
+                if not (ba.materialized and bb.materialized) and _linked(ba, bb):
+                    # Ковариации суммы со слагаемыми записываются в хранилище при создании листов
+                    ba.leaves()
+                    bb.leaves()
+                if ba.materialized and bb.materialized:
+                    covariance = _block_covariance(ba, bb, size, dtype)
+                else:
+                    covariance = _shared_covariance(ba, bb, size, dtype)
+                if covariance is not None:
+                    term = 2 * ca * cb * covariance
+                    variance = variance + term
+                    magnitude = magnitude + abs(term)
+        variance = np.broadcast_to(variance, (size,))
+        magnitude = np.broadcast_to(magnitude, (size,))
+        if dtype is object:
+            tolerance = magnitude * _decimal_backend().eps
+        else:
+            tolerance = magnitude * 1e-12
+        # При полной корреляции слагаемые взаимно уничтожаются с точностью до округления
+        cancelled = abs(variance) <= tolerance
+        if (~cancelled & (variance < 0)).any():
+            raise ValueError("Ковариационная матрица не является положительно полуопределённой.")
+        zero = Decimal('0') if dtype is object else 0.0
+        variance = np.where(cancelled, zero, variance)
+        if dtype is object:
+            return np.array([v.sqrt() for v in variance], dtype=object)
+        return np.sqrt(variance)
+
+    @property
+    def _kind(self):
+        return object if self._values.dtype == object else np.float64
+
+    def _coerce(self, other):
+        """
+        Приводит операнд к виду (значения, чувствительности, тип хранения).
+        Для чисел и массивов чисел чувствительности равны None.
+        """
+        dtype = self._kind
+        if isinstance(other, UDecimalArray):
+            if len(other) != len(self):
+                raise ValueError("Длины массивов не совпадают.")
+            if other._kind is not dtype:
+                other = other._astype(dtype)
+            return other._values, other._terms
+        if isinstance(other, UDecimal):
+            value = _scalar(other.value, dtype)
+            terms = {}
+            for leaf, d in other._sensitivities().items():
+                block = _LeafBlock(_convert([leaf.uncertainty], dtype), [leaf])
+                terms[block] = _convert([d], dtype)
+            return value, terms
+        if np.ndim(other) == 1:
+            values = _convert(other, dtype)
+            if len(values) != len(self):
+                raise ValueError("Длины массивов не совпадают.")
+            return values, None
+        return _scalar(other, dtype), None
+
+    def _astype(self, dtype):
+        """
+        Возвращает копию массива с другим типом хранения, сохраняя листы.
+        """
+        terms = {}
+        for block, c in self._terms.items():
+            converted = _LeafBlock(_convert(block.uncertainties, dtype), block.leaves())
+            terms[converted] = _convert(c, dtype)
+        return UDecimalArray._derived(_convert(self._values, dtype), terms)
+
+    def _binary(self, other, func):
+        """
+        Выполняет бинарную операцию, приводя типы хранения операндов.
+        """
+        if isinstance(other, UDecimalArray) and other._kind is object and self._kind is not object:
+            # Высокоточный путь имеет приоритет над быстрым
+            converted = self._astype(object)
+            return func(converted, *converted._coerce(other))
+        return func(self, *self._coerce(other))
+
+    # Арифметические операции
+    @_precise
+    def __add__(self, other):
+        def add(x, value, terms):
+            if terms is None:
+                return UDecimalArray._derived(x._values + value, x._terms)
+            return UDecimalArray._derived(x._values + value, _combine_terms(x._terms, 1, terms, 1))
+        return self._binary(other, add)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    @_precise
+    def __sub__(self, other):
+        def sub(x, value, terms):
+            if terms is None:
+                return UDecimalArray._derived(x._values - value, x._terms)
+            return UDecimalArray._derived(x._values - value, _combine_terms(x._terms, 1, terms, -1))
+        return self._binary(other, sub)
+
+    @_precise
+    def __rsub__(self, other):
+        def rsub(x, value, terms):
+            if terms is None:
+                return UDecimalArray._derived(value - x._values, _scale_terms(x._terms, -1))
+            return UDecimalArray._derived(value - x._values, _combine_terms(terms, 1, x._terms, -1))
+        return self._binary(other, rsub)
+
+    @_precise
+    def __mul__(self, other):
+        def mul(x, value, terms):
+            if terms is None:
+                return UDecimalArray._derived(x._values * value, _scale_terms(x._terms, value))
+            # d(x * y) = y * dx + x * dy
+            return UDecimalArray._derived(x._values * value, _combine_terms(x._terms, value, terms, x._values))
+        return self._binary(other, mul)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    @_precise
+    def __truediv__(self, other):
+        def div(x, value, terms):
+            result = x._values / value
+            if terms is None:
+                return UDecimalArray._derived(result, _scale_terms(x._terms, 1 / value))
+            # d(x / y) = dx / y - x / y^2 * dy
+            return UDecimalArray._derived(result, _combine_terms(x._terms, 1 / value, terms, -result / value))
+        return self._binary(other, div)
+
+    @_precise
+    def __rtruediv__(self, other):
+        def rdiv(x, value, terms):
+            result = value / x._values
+            if terms is None:
+                # d(c / x) = -c / x^2 * dx
+                return UDecimalArray._derived(result, _scale_terms(x._terms, -result / x._values))
+            return UDecimalArray._derived(result, _combine_terms(terms, 1 / x._values, x._terms, -result / x._values))
+        return self._binary(other, rdiv)
+
+    @_precise
+    def __pow__(self, power):
+        def pow_(x, value, terms):
+            if (x._values <= 0).any():
+                raise ValueError("Основание степени должно быть положительным числом для учёта неопределённости.")
+            result = x._kernel('pow')(x._values, value)
+            # dy/dx = p * y / x
+            dy_dx = value * result / x._values
+            if terms is None:
+                return UDecimalArray._derived(result, _scale_terms(x._terms, dy_dx))
+            # dy/dp = y * ln(x)
+            dy_dp = result * x._kernel('ln')(x._values)
+            return UDecimalArray._derived(result, _combine_terms(x._terms, dy_dx, terms, dy_dp))
+        return self._binary(power, pow_)
+
+    def sqrt(self):
+        """
+        Вычисляет поэлементный квадратный корень.
+        """
+        return self.__pow__(Decimal('0.5') if self._kind is object else 0.5)
+
+    # Математические функции
+    def _kernel(self, name):
+        if self._kind is object:
+            return _object_kernel(name)
+        return _FLOAT_KERNELS[name]
+
+    def _apply(self, value, dy_dx):
+        values = np.asarray(value, dtype=self._values.dtype)
+        return UDecimalArray._derived(values, _scale_terms(self._terms, np.asarray(dy_dx, dtype=self._values.dtype)))
+
+    @_precise
+    def ln(self):
+        """
+        Вычисляет поэлементный натуральный логарифм.
+        """
+        if (self._values <= 0).any():
+            raise ValueError("Логарифм определён только для положительных чисел.")
+        return self._apply(self._kernel('ln')(self._values), 1 / self._values)
+
+    @_precise
+    def log10(self):
+        """
+        Вычисляет поэлементный десятичный логарифм.
+        """
+        if (self._values <= 0).any():
+            raise ValueError("Логарифм определён только для положительных чисел.")
+        ln10 = self._kernel('ln')(np.array([_scalar(10, self._kind)], dtype=self._values.dtype))[0]
+        return self._apply(self._kernel('ln')(self._values) / ln10, 1 / (self._values * ln10))
+
+    @_precise
+    def exp(self):
+        """
+        Вычисляет поэлементную экспоненту.
+        """
+        y = self._kernel('exp')(self._values)
+        return self._apply(y, y)
+
+    @_precise
+    def sin(self):
+        """
+        Вычисляет поэлементный синус (в радианах).
+        """
+        return self._apply(self._kernel('sin')(self._values), self._kernel('cos')(self._values))
+
+    @_precise
+    def cos(self):
+        """
+        Вычисляет поэлементный косинус (в радианах).
+        """
+        return self._apply(self._kernel('cos')(self._values), -self._kernel('sin')(self._values))
+
+    @_precise
+    def tan(self):
+        """
+        Вычисляет поэлементный тангенс (в радианах).
+        """
+        cos_values = self._kernel('cos')(self._values)
+        if (cos_values == 0).any():
+            raise ValueError("Тангенс не определён для данного значения.")
+        return self._apply(self._kernel('tan')(self._values), 1 / cos_values ** 2)
+
+    # Агрегирование
+    def _groups(self, groups, size):
+        groups = np.asarray(groups)
+        if groups.shape != (len(self),) or (groups.size and groups.dtype.kind not in 'iu'):
+            raise ValueError("Номера групп должны быть целыми числами, по одному на элемент.")
+        groups = groups.astype(np.int64)
+        if groups.size and groups.min() < 0:
+            raise ValueError("Номера групп должны быть неотрицательными.")
+        if size is None:
+            size = int(groups.max()) + 1 if groups.size else 0
+        elif groups.size and groups.max() >= size:
+            raise ValueError("Номер группы превышает число групп.")
+        return groups, size
+
+    @_precise
+    def _group_sums(self, groups, size):
+        """
+        Суммы элементов по группам.
+
+        Транслируемые листы (общие для всех элементов, например, калибровочный множитель)
+        остаются листами результата. Поэлементные листы заменяются в каждой группе новой
+        базовой переменной — суммой S_g = Σ a_gp · x_p — с точной дисперсией; её ковариации
+        со слагаемыми, с другими суммами и между группами сохраняются в хранилище.
+        """
+        dtype = self._kind
+        n = len(self)
+        terms = {}
+        sources = {}  # {исходный блок: [(блок, коэффициенты)]}
+        for block, c in self._terms.items():
+            c = np.broadcast_to(c, (n,))
+            if len(block.uncertainties) == 1:
+                terms[block] = _bincount(groups, c, size, dtype)
+            else:
+                sources.setdefault(_root(block), []).append((block, c))
+        if sources:
+            terms[_summarize(sources, groups, size, dtype)] = self._ones(size, dtype)
+        return UDecimalArray._derived(_bincount(groups, self._values, size, dtype), terms)
+
+    def sum(self, groups=None, size=None):
+        """
+        Сумма элементов массива или суммы по группам, вычисляемые векторно.
+
+        Результат коррелирован со слагаемыми и другими величинами так же, как сумма,
+        вычисленная поэлементно.
+
+        :param groups: Номера групп элементов (целые числа от 0) или None.
+        :param size: Число групп (по умолчанию — наибольший номер плюс один).
+        :return: Экземпляр UDecimal или, если заданы группы, UDecimalArray сумм по группам.
+        """
+        if groups is None:
+            return self._group_sums(np.zeros(len(self), dtype=np.int64), 1)[0]
+        return self._group_sums(*self._groups(groups, size))
+
+    def mean(self, groups=None, size=None):
+        """
+        Среднее арифметическое элементов массива или средние по группам.
+
+        :param groups: Номера групп элементов (целые числа от 0) или None.
+        :param size: Число групп (по умолчанию — наибольший номер плюс один).
+        :return: Экземпляр UDecimal или, если заданы группы, UDecimalArray средних по группам.
+        """
+        if groups is None:
+            if not len(self):
+                raise ValueError("Среднее не определено для пустого массива.")
+            return self.sum() / len(self)
+        groups, size = self._groups(groups, size)
+        counts = np.bincount(groups, minlength=size)
+        if not counts.all():
+            raise ValueError("Среднее не определено для пустой группы.")
+        return self._group_sums(groups, size) / counts
+
+    def _independent(self):
+        """
+        Независимы ли элементы массива: нет общих листов и ковариаций в хранилище.
+        """
+        size = len(self)
+        positions = {}
+        ids = []
+        for block, c in self._terms.items():
+            nonzero = np.flatnonzero(np.broadcast_to(c, (size,)) != 0)
+            if not len(nonzero):
+                continue
+            if len(block.uncertainties) == 1:
+                if len(nonzero) > 1:
+                    return False
+                # Транслируемый блок влияет на один элемент через свой единственный лист
+                nonzero = np.zeros(1, dtype=np.int64)
+                index = nonzero if block.root is None else block.index
+            else:
+                index = _positions(block, size)
+            if block.materialized:
+                leaves = block.leaves()
+                ids.extend(leaves[k].id for k in nonzero.tolist() if leaves[k] is not _ZERO_LEAF)
+            else:
+                positions.setdefault(_root(block), []).append(index[nonzero])
+        if any(summary in positions for root in positions for summary in root.summaries()):
+            return False
+        for chunks in positions.values():
+            chunk = np.concatenate(chunks)
+            if len(chunk) and np.bincount(chunk).max() > 1:
+                return False
+        if len(set(ids)) != len(ids):
+            return False
+        return not (ids and default_registry and default_registry.entries(_decimal_backend(), set(ids)))
+
+    # Строковое представление
+    def __str__(self):
+        return "[" + ", ".join(f"{v} ± {u}" for v, u in zip(self._values, self.uncertainties)) + "]"
+
+    def __repr__(self):
+        return f"UDecimalArray(values={self._values!r}, uncertainties={self.uncertainties!r})"
+
+    # Сериализация
+    def __reduce__(self):
+        from .serialization import _restore, dumps
+        return _restore, (dumps(self),)
@@ -0,0 +1,127 @@
+# arrow.py
+
+# Тип расширения Apache Arrow для столбцов величин: хранилище — структура
+# <value, uncertainty> из float64 (тип хранения 'float') или строк (тип хранения 'decimal',
+# без потери точности Decimal). Тип регистрируется в pyarrow при импорте модуля, поэтому
+# столбцы восстанавливаются при чтении Parquet и Feather; в pandas они преобразуются
+# в тип UDecimalDtype. Сохраняются значения и стандартные неопределённости: ковариации
+# между строками в Arrow не записываются (для них используйте udecimal.serialization).
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    raise ImportError("Для udecimal.arrow требуется pyarrow: pip install udecimal[arrow]") from None
+
+from .array import UDecimalArray, _convert
+
+_STORAGES = ('decimal', 'float')
+_EXTENSION_NAME = 'udecimal'
+
+
+class UDecimalType(pa.ExtensionType):
+    """
+    Тип расширения Arrow для величин UDecimal.
+
+    :ivar storage: 'decimal' (строковое хранилище) или 'float' (float64).
+    """
+
+    def __init__(self, storage='decimal'):
+        if storage not in _STORAGES:
+            raise ValueError(f"Неизвестный тип хранения: {storage!r}; допустимы 'decimal' и 'float'.")
+        self.storage = storage
+        field = pa.float64() if storage == 'float' else pa.string()
+        super().__init__(pa.struct([('value', field), ('uncertainty', field)]), _EXTENSION_NAME)
+
+    def __arrow_ext_serialize__(self):
+        return self.storage.encode()
+
+    @classmethod
+    def __arrow_ext_deserialize__(cls, storage_type, serialized):
+        return cls(serialized.decode())
+
+    def __reduce__(self):
+        return UDecimalType, (self.storage,)
+
+    def to_pandas_dtype(self):
+        from .dataframe import UDecimalDtype
+        return UDecimalDtype(self.storage)
+
+
+def to_arrow(array):
+    """
+    Преобразует массив величин в массив Arrow типа UDecimalType.
+
+    Пропущенные значения (NaN) записываются как null.
+
+    :param array: Экземпляр UDecimalArray.
+    :return: pyarrow.ExtensionArray.
+    """
+    values = array.values
+    uncertainties = array.uncertainties
+    missing = values != values
+    if array._kind is object:
+        storage = 'decimal'
+        values = pa.array([str(v) for v in values], pa.string(), mask=missing)
+        uncertainties = pa.array([str(u) for u in uncertainties], pa.string(), mask=missing)
+    else:
+        storage = 'float'
+        values = pa.array(values, pa.float64(), mask=missing)
+        uncertainties = pa.array(uncertainties, pa.float64(), mask=missing)
+    struct = pa.StructArray.from_arrays([values, uncertainties], names=['value', 'uncertainty'],
+                                        mask=pa.array(missing, pa.bool_()) if missing.any() else None)
+    return pa.ExtensionArray.from_storage(UDecimalType(storage), struct)
+
+
+def _field(storage, name, default):
+    """
+    Поле структуры как массив NumPy; null заменяются значением default.
+    """
+    field = storage.field(name)
+    if storage.null_count:
+        # Поле не наследует null всей структуры
+        field = pc.if_else(storage.is_null(), pa.scalar(None, field.type), field)
+    if pa.types.is_floating(field.type):
+        return field.fill_null(default).to_numpy(zero_copy_only=False).astype(np.float64)
+    return np.array([default if v is None else v for v in field.to_pylist()], dtype=object)
+
+
+def from_arrow(array):
+    """
+    Преобразует массив Arrow (тип UDecimalType или структура <value, uncertainty>) в массив
+    независимых величин.
+
+    :param array: pyarrow.Array или pyarrow.ChunkedArray.
+    :return: Экземпляр UDecimalArray (null становятся NaN с нулевой неопределённостью).
+    """
+    if isinstance(array, pa.ChunkedArray):
+        chunks = [from_arrow(chunk) for chunk in array.chunks]
+        if not chunks:
+            dtype = np.float64 if _storage_kind(array.type) == 'float' else object
+            return UDecimalArray(_convert([], dtype), 0, dtype=dtype)
+        return UDecimalArray.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+    kind = _storage_kind(array.type)
+    storage = array.storage if isinstance(array, pa.ExtensionArray) else array
+    dtype = np.float64 if kind == 'float' else object
+    values = _field(storage, 'value', float('nan') if kind == 'float' else 'NaN')
+    uncertainties = _field(storage, 'uncertainty', 0.0 if kind == 'float' else '0')
+    return UDecimalArray(values, uncertainties, dtype=dtype)
+
+
+def _storage_kind(type_):
+    if isinstance(type_, UDecimalType):
+        return type_.storage
+    if isinstance(type_, pa.ExtensionType):
+        type_ = type_.storage_type
+    if not pa.types.is_struct(type_) or {type_.field(i).name for i in range(type_.num_fields)} != {'value', 'uncertainty'}:
+        raise TypeError(f"Ожидается массив Arrow типа udecimal или структура <value, uncertainty>, получен {type_}.")
+    return 'float' if pa.types.is_floating(type_.field('value').type) else 'decimal'
+
+
+try:
+    pa.register_extension_type(UDecimalType())
+except pa.ArrowKeyError:
+    # Тип уже зарегистрирован (повторная загрузка модуля)
+    pass
@@ -0,0 +1,605 @@
+# backends.py
+
+from decimal import Decimal, Context as DecimalContext
+import math
+import operator
+import threading
+from weakref import WeakSet
+
+# mpmath загружается при первом обращении к трансцендентным функциям (см. _import_mpmath),
+# поэтому import udecimal и арифметика на Decimal и float не импортируют его
+MPContext = from_int = mpf_div = round_nearest = None
+_MPMATH_LOCK = threading.Lock()
+
+
+def _import_mpmath():
+    global MPContext, from_int, mpf_div, round_nearest
+    with _MPMATH_LOCK:
+        if MPContext is None:
+            from mpmath.libmp import from_int, mpf_div, round_nearest
+            from mpmath.ctx_mp import MPContext as context
+            MPContext = context  # Присваивается последним: признак загрузки
+
+# Кэш степеней 5 для точного перевода двоичной мантиссы в десятичную
+_POWERS_OF_FIVE = {}
+
+# Созданные экземпляры бэкендов с собственными функциями sqrt (для инструментирования)
+_INSTANCES = WeakSet()
+
+
+def decimal_to_mpf(ctx, x):
+    """
+    Переводит Decimal в число mpmath через целочисленные числитель и знаменатель,
+    без промежуточного строкового представления. Результат округляется один раз
+    до точности контекста mpmath.
+
+    :param ctx: Контекст mpmath.
+    :param x: Конечное значение Decimal.
+    :return: Число типа ctx.mpf.
+    """
+    if MPContext is None:
+        _import_mpmath()
+    numerator, denominator = x.as_integer_ratio()
+    if denominator == 1:
+        return ctx.make_mpf(from_int(numerator, ctx.prec, round_nearest))
+    return ctx.make_mpf(mpf_div(from_int(numerator), from_int(denominator), ctx.prec, round_nearest))
+
+
+def mpf_to_decimal(context, x):
+    """
+    Переводит число mpmath в Decimal по мантиссе и двоичному порядку:
+    man * 2^exp = man * 5^(-exp) * 10^exp. Результат округляется один раз
+    до точности контекста decimal.
+
+    :param context: Контекст decimal, задающий точность результата.
+    :param x: Число mpmath.
+    :return: Значение типа Decimal.
+    """
+    sign, man, exp, _ = x._mpf_
+    if not man:
+        # Ноль и специальные значения (inf, nan)
+        return context.create_decimal(str(x)) if exp else Decimal(0)
+    if exp >= 0:
+        result = context.plus(Decimal(man << exp))
+    else:
+        factor = _POWERS_OF_FIVE.get(-exp)
+        if factor is None:
+            factor = _POWERS_OF_FIVE[-exp] = 5 ** -exp
+        result = context.scaleb(Decimal(man * factor), exp)
+    return result.copy_negate() if sign else result
+
+
+def as_decimal(x):
+    """
+    Преобразует число любого поддерживаемого типа в Decimal без потери точности.
+
+    :param x: Число (Decimal, int, float, str или mpf).
+    :return: Значение типа Decimal.
+    """
+    if isinstance(x, Decimal):
+        return x
+    if isinstance(x, _Fixed):
+        return x.to_decimal()
+    if hasattr(x, '_mpf_'):
+        return Decimal(str(x))
+    return Decimal(x)
+
+
+class Backend:
+    """
+    Базовый класс числового бэкенда UDecimal.
+
+    Бэкенд определяет тип хранения значений, арифметику, квадратный корень и
+    трансцендентные функции. Все операции UDecimal выполняются через активный бэкенд.
+    """
+    name = None
+    raw_type = None
+    digits = None  # Число значащих десятичных цифр
+
+    # Арифметика над «сырыми» числами бэкенда
+    add = staticmethod(operator.add)
+    sub = staticmethod(operator.sub)
+    mul = staticmethod(operator.mul)
+    div = staticmethod(operator.truediv)
+    neg = staticmethod(operator.neg)
+    abs = staticmethod(abs)
+
+    # Умножение слагаемых дисперсии и квадратный корень из их суммы (см. udecimal._variance);
+    # None означает mul и sqrt. Бэкенд с фиксированной точкой накапливает дисперсию
+    # в удвоенном масштабе, чтобы округлять её только при извлечении корня
+    variance_mul = None
+    variance_sqrt = None
+    # Оценка абсолютной ошибки слагаемого дисперсии variance_mul(mul(a, b), other), вызванной
+    # округлением произведения mul(a, b); None означает относительный порог eps от суммы
+    # модулей слагаемых
+    variance_error = None
+
+    def convert(self, x):
+        """
+        Преобразует число в тип хранения бэкенда.
+        """
+        raise NotImplementedError
+
+    def to_decimal(self, x):
+        """
+        Преобразует число бэкенда в Decimal.
+        """
+        return as_decimal(x)
+
+    # Совмещённые ядра: значение функции и её производная за один вызов
+    def ln_d(self, x):
+        return self.ln(x), self.div(self.one, x)
+
+    def exp_d(self, x):
+        y = self.exp(x)
+        return y, y
+
+    def log10_d(self, x):
+        return self.log10(x), self.div(self.one, self.mul(x, self.ln(self.convert(10))))
+
+    def sin_d(self, x):
+        return self.sin(x), self.cos(x)
+
+    def cos_d(self, x):
+        return self.cos(x), self.neg(self.sin(x))
+
+    def tan_d(self, x):
+        cos_x = self.cos(x)
+        if cos_x == 0:
+            raise ValueError("Тангенс не определён для данного значения.")
+        return self.tan(x), self.div(self.one, self.mul(cos_x, cos_x))
+
+    def pow_d(self, x, p, exponent_derivative=True):
+        """
+        Вычисляет y = x^p и частные производные dy/dx = p * y / x и dy/dp = y * ln(x).
+
+        :param exponent_derivative: Вычислять ли dy/dp (нужно только для показателя с неопределённостью).
+        """
+        y = self.pow(x, p)
+        dy_dx = self.div(self.mul(p, y), x)
+        if not exponent_derivative:
+            return y, dy_dx, None
+        return y, dy_dx, self.mul(y, self.ln(x))
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class FloatBackend(Backend):
+    """
+    Быстрый бэкенд на встроенных float и модуле math (около 15 значащих цифр).
+    """
+    name = 'float'
+    raw_type = float
+    digits = 15
+    zero = 0.0
+    one = 1.0
+    eps = 1e-12  # Относительный порог ошибки округления
+
+    def convert(self, x):
+        if type(x) is float:
+            return x
+        return float(x)
+
+    sqrt = staticmethod(math.sqrt)
+    ln = staticmethod(math.log)
+    log10 = staticmethod(math.log10)
+    exp = staticmethod(math.exp)
+    sin = staticmethod(math.sin)
+    cos = staticmethod(math.cos)
+    tan = staticmethod(math.tan)
+    pow = staticmethod(math.pow)
+
+
+class _MpmathAttribute:
+    """
+    Атрибут контекста mpmath, создаваемый при первом обращении.
+
+    Дескриптор без __set__: после инициализации значение хранится в словаре экземпляра
+    и читается без обращения к дескриптору (в отличие от __getattr__, который замедлил бы
+    поиск всех атрибутов бэкенда).
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        instance._init_mpmath(instance.digits)
+        return instance.__dict__[self.name]
+
+
+class _MpmathFunctions:
+    """
+    Трансцендентные функции, вычисляемые через собственный контекст mpmath.
+
+    Совмещённые ядра переводят аргумент в mpf один раз и возвращают значение вместе
+    с производной: sin и cos — через один вызов cos_sin, tan — через тот же cos,
+    log10 — через ln(10), вычисленный при создании контекста.
+    """
+
+    # Контекст mpmath и ln(10) создаются при первом вызове трансцендентной функции
+    _mp = _MpmathAttribute()
+    _ln10 = _MpmathAttribute()
+
+    def _to_mpf(self, x):
+        raise NotImplementedError
+
+    def _from_mpf(self, x):
+        raise NotImplementedError
+
+    def _init_mpmath(self, dps):
+        """
+        Создаёт собственный контекст mpmath с заданной точностью.
+        """
+        if MPContext is None:
+            _import_mpmath()
+        mp = MPContext()
+        mp.dps = dps
+        self._ln10 = mp.ln(10)
+        self._mp = mp  # Присваивается последним: другие потоки видят готовый контекст
+
+    def ln(self, x):
+        return self._from_mpf(self._mp.ln(self._to_mpf(x)))
+
+    def log10(self, x):
+        return self._from_mpf(self._mp.ln(self._to_mpf(x)) / self._ln10)
+
+    def exp(self, x):
+        return self._from_mpf(self._mp.exp(self._to_mpf(x)))
+
+    def sin(self, x):
+        return self._from_mpf(self._mp.sin(self._to_mpf(x)))
+
+    def cos(self, x):
+        return self._from_mpf(self._mp.cos(self._to_mpf(x)))
+
+    def tan(self, x):
+        return self._from_mpf(self._mp.tan(self._to_mpf(x)))
+
+    def pow(self, x, p):
+        return self._from_mpf(self._mp.power(self._to_mpf(x), self._to_mpf(p)))
+
+    def ln_d(self, x):
+        m = self._to_mpf(x)
+        return self._from_mpf(self._mp.ln(m)), self._from_mpf(1 / m)
+
+    def exp_d(self, x):
+        y = self._from_mpf(self._mp.exp(self._to_mpf(x)))
+        return y, y
+
+    def log10_d(self, x):
+        m = self._to_mpf(x)
+        return self._from_mpf(self._mp.ln(m) / self._ln10), self._from_mpf(1 / (m * self._ln10))
+
+    def sin_d(self, x):
+        cos_x, sin_x = self._mp.cos_sin(self._to_mpf(x))
+        return self._from_mpf(sin_x), self._from_mpf(cos_x)
+
+    def cos_d(self, x):
+        cos_x, sin_x = self._mp.cos_sin(self._to_mpf(x))
+        return self._from_mpf(cos_x), self._from_mpf(-sin_x)
+
+    def tan_d(self, x):
+        cos_x, sin_x = self._mp.cos_sin(self._to_mpf(x))
+        if cos_x == 0:
+            raise ValueError("Тангенс не определён для данного значения.")
+        return self._from_mpf(sin_x / cos_x), self._from_mpf(1 / (cos_x * cos_x))
+
+    def pow_d(self, x, p, exponent_derivative=True):
+        mx = self._to_mpf(x)
+        mp_ = self._to_mpf(p)
+        y = self._mp.power(mx, mp_)
+        dy_dx = self._from_mpf(mp_ * y / mx)
+        if not exponent_derivative:
+            return self._from_mpf(y), dy_dx, None
+        return self._from_mpf(y), dy_dx, self._from_mpf(y * self._mp.ln(mx))
+
+
+class DecimalBackend(_MpmathFunctions, Backend):
+    """
+    Бэкенд на Decimal с настраиваемой точностью; трансцендентные функции
+    вычисляются через mpmath с той же точностью.
+    """
+    name = 'decimal'
+    raw_type = Decimal
+    zero = Decimal('0')
+    one = Decimal('1')
+
+    def __init__(self, prec=110):
+        """
+        :param prec: Число значащих десятичных цифр.
+        """
+        self.prec = self.digits = prec
+        self.context = DecimalContext(prec=prec)
+        self.eps = Decimal(1).scaleb(3 - prec)
+        self.add = self.context.add
+        self.sub = self.context.subtract
+        self.mul = self.context.multiply
+        self.div = self.context.divide
+        self.neg = self.context.minus
+        self.abs = self.context.abs
+        self.sqrt = self.context.sqrt
+        _INSTANCES.add(self)
+
+    def convert(self, x):
+        if type(x) is Decimal:
+            return x
+        if hasattr(x, '_mpf_'):
+            return mpf_to_decimal(self.context, x)
+        return as_decimal(x)
+
+    def _to_mpf(self, x):
+        return decimal_to_mpf(self._mp, x)
+
+    def _from_mpf(self, x):
+        return mpf_to_decimal(self.context, x)
+
+    def __repr__(self):
+        return f"DecimalBackend(prec={self.prec})"
+
+
+class MpmathBackend(_MpmathFunctions, Backend):
+    """
+    Бэкенд на числах mpmath произвольной точности.
+    """
+    name = 'mpmath'
+
+    def __init__(self, dps=110):
+        """
+        :param dps: Число значащих десятичных цифр.
+        """
+        self.dps = self.digits = dps
+        self._init_mpmath(dps)
+        self.raw_type = self._mp.mpf
+        self.zero = self._mp.mpf(0)
+        self.one = self._mp.mpf(1)
+        self.eps = self._mp.mpf(10) ** (3 - dps)
+        self.sqrt = self._mp.sqrt
+        _INSTANCES.add(self)
+
+    def convert(self, x):
+        if type(x) is self.raw_type:
+            return x
+        if isinstance(x, (Decimal, _Fixed)):
+            return decimal_to_mpf(self._mp, x)
+        return self._mp.mpf(x)
+
+    def _to_mpf(self, x):
+        return x
+
+    def _from_mpf(self, x):
+        return x
+
+    def __repr__(self):
+        return f"MpmathBackend(dps={self.dps})"
+
+
+def _round_div(n, d):
+    """
+    Частное n / d (d > 0), округлённое до ближайшего целого; половина — к чётному,
+    как в контексте Decimal по умолчанию.
+    """
+    q, r = divmod(n, d)
+    r += r
+    if r > d or (r == d and q & 1):
+        q += 1
+    return q
+
+
+class _Fixed(int):
+    """
+    Число с фиксированной точкой: целое число единиц 10^-scale.
+
+    Подклассы с конкретным масштабом создаются функцией _fixed_type. Арифметика int
+    над такими числами возвращает обычные int, поэтому вычисления выполняются через
+    методы FixedBackend, которые восстанавливают тип.
+    """
+    __slots__ = ()
+    scale = 0
+
+    def to_decimal(self):
+        """
+        Точное значение в виде Decimal (без округления контекстом).
+        """
+        sign, digits, _ = Decimal(int(self)).as_tuple()
+        return Decimal((sign, digits, -self.scale))
+
+    def as_integer_ratio(self):
+        denominator = 10 ** self.scale
+        divisor = math.gcd(int(self), denominator)
+        return int(self) // divisor, denominator // divisor
+
+    def __float__(self):
+        return int(self) / 10 ** self.scale
+
+    def __str__(self):
+        # Всегда в позиционной записи: малые неопределённости не переходят в экспоненциальную
+        return format(self.to_decimal(), 'f')
+
+    def __repr__(self):
+        return f"Fixed('{self}')"
+
+    def __format__(self, format_spec):
+        return format(self.to_decimal(), format_spec or 'f')
+
+
+# Типы чисел с фиксированной точкой по масштабу
+_FIXED_TYPES = {}
+
+
+def _fixed_type(scale):
+    cls = _FIXED_TYPES.get(scale)
+    if cls is None:
+        cls = _FIXED_TYPES.setdefault(scale, type('Fixed', (_Fixed,), {'__slots__': (), 'scale': scale}))
+    return cls
+
+
+class FixedBackend(_MpmathFunctions, Backend):
+    """
+    Бэкенд на целых числах с общим десятичным масштабом: значение x хранится как
+    round(x · 10^scale).
+
+    Сложение, вычитание и умножение на целое выполняются точно в целых числах,
+    умножение и деление округляются до масштаба. Дисперсия накапливается в удвоенном
+    масштабе без округления, а неопределённость извлекается из неё через math.isqrt.
+    Трансцендентные функции вычисляются через mpmath и округляются до масштаба.
+    """
+    name = 'fixed'
+
+    # Запас значащих цифр mpmath сверх масштаба: абсолютная точность 10^-scale
+    # требует также цифр целой части результата
+    _GUARD_DIGITS = 30
+
+    def __init__(self, scale=9):
+        """
+        :param scale: Число десятичных знаков после точки.
+        """
+        if scale < 0:
+            raise ValueError("Масштаб не может быть отрицательным.")
+        self.scale = self.digits = scale
+        self.raw_type = _fixed_type(scale)
+        self._unit = 10 ** scale
+        self.zero = self.raw_type(0)
+        self.one = self.raw_type(self._unit)
+        self._init_arithmetic()
+
+    def convert(self, x):
+        raw_type = self.raw_type
+        if type(x) is raw_type:
+            return x
+        if type(x) is int:
+            return raw_type(x * self._unit)
+        if isinstance(x, str):
+            x = Decimal(x)
+        elif hasattr(x, '_mpf_'):
+            x = as_decimal(x)
+        numerator, denominator = x.as_integer_ratio()
+        return raw_type(_round_div(numerator * self._unit, denominator))
+
+    def _init_arithmetic(self):
+        """
+        Создаёт операции, замыкающие тип и масштаб: на фоне целочисленной арифметики
+        поиск атрибутов экземпляра заметно замедлил бы каждую операцию.
+        """
+        raw_type = self.raw_type
+        unit = self._unit
+
+        def mul(a, b):
+            # Округление a · b / unit до ближайшего, половина — к чётному (как _round_div)
+            q, r = divmod(a * b, unit)
+            r += r
+            if r > unit or (r == unit and q & 1):
+                q += 1
+            return raw_type(q)
+
+        def div(a, b):
+            if b < 0:
+                a, b = -a, -b
+            return raw_type(_round_div(a * unit, b))
+
+        self.add = lambda a, b: raw_type(a + b)
+        self.sub = lambda a, b: raw_type(a - b)
+        self.mul = mul
+        self.div = div
+        self.neg = lambda a: raw_type(-a)
+        self.abs = lambda a: raw_type(abs(a))
+
+    def sqrt(self, x):
+        if x < 0:
+            raise ValueError("Квадратный корень из отрицательного числа не определён.")
+        # sqrt(x · 10^-s) · 10^s = sqrt(x · 10^s); округление до ближайшего по isqrt(4 · x · 10^s)
+        return self.raw_type((math.isqrt(4 * x * self._unit) + 1) >> 1)
+
+    def variance_mul(self, a, b):
+        # Произведение в масштабе 10^-2s без округления
+        return self.raw_type(a * b)
+
+    def variance_error(self, a, b, factor, other=None):
+        # Остаток округления factor = mul(a, b) (в удвоенном масштабе, не больше unit / 2)
+        # задаёт ошибку множителя e = residual / unit. Ошибка слагаемого factor · other —
+        # |e| · |other|, а квадрата factor² (other не задан) — |e| · (2 |factor| + 1);
+        # при точном произведении ошибки нет
+        residual = abs(a * b - factor * self._unit)
+        if not residual:
+            return self.zero
+        scale = abs(other) if other is not None else 2 * abs(factor) + 1
+        return self.raw_type(-(-residual * scale // self._unit))
+
+    def variance_sqrt(self, variance):
+        if variance < 0:
+            raise ValueError("Квадратный корень из отрицательного числа не определён.")
+        return self.raw_type((math.isqrt(4 * variance) + 1) >> 1)
+
+    def pow_d(self, x, p, exponent_derivative=True):
+        # Квадратный корень и небольшие натуральные степени вычисляются в целых числах
+        if not exponent_derivative and 0 < p <= 16 * self._unit:
+            n, remainder = divmod(p, self._unit)
+            if remainder == 0:
+                y = self.raw_type(_round_div(x ** n, self._unit ** (n - 1)))
+                return y, self.div(self.mul(p, y), x), None
+            if p == self._unit >> 1:
+                y = self.sqrt(x)
+                return y, self.div(self.mul(p, y), x), None
+        return super().pow_d(x, p, exponent_derivative)
+
+    def _init_mpmath(self, dps):
+        super()._init_mpmath(dps + self._GUARD_DIGITS)
+
+    def _to_mpf(self, x):
+        return decimal_to_mpf(self._mp, x)
+
+    def _from_mpf(self, x):
+        return self.raw_type(int(self._mp.nint(x * self._unit)))
+
+    def to_decimal(self, x):
+        return self.convert(x).to_decimal()
+
+    def __repr__(self):
+        return f"FixedBackend(scale={self.scale})"
+
+
+# Экземпляры бэкендов, доступные по имени; бэкенд 'mpmath' создаётся при первом обращении
+_NAMED = {
+    'float': FloatBackend(),
+    'decimal': DecimalBackend(),
+    'fixed': FixedBackend(),
+}
+
+# Бэкенды с нестандартной точностью, созданные по имени
+_BY_PRECISION = {}
+
+
+def resolve_backend(backend, prec=None):
+    """
+    Возвращает экземпляр бэкенда по имени или сам экземпляр.
+
+    :param backend: Имя ('float', 'decimal', 'mpmath', 'fixed') или экземпляр Backend.
+    :param prec: Число значащих цифр для бэкендов 'decimal' и 'mpmath'
+                 или число знаков после точки для бэкенда 'fixed'.
+    """
+    if isinstance(backend, Backend):
+        if prec is not None and prec != backend.digits:
+            raise ValueError("Точность задаётся при создании экземпляра бэкенда.")
+        return backend
+    if prec is not None:
+        if backend == 'float':
+            raise ValueError("Точность бэкенда 'float' фиксирована.")
+        key = (backend, prec)
+        if key not in _BY_PRECISION:
+            # setdefault атомарен: при одновременном создании все потоки получат один экземпляр
+            if backend == 'decimal':
+                _BY_PRECISION.setdefault(key, DecimalBackend(prec))
+            elif backend == 'mpmath':
+                _BY_PRECISION.setdefault(key, MpmathBackend(prec))
+            elif backend == 'fixed':
+                _BY_PRECISION.setdefault(key, FixedBackend(prec))
+        if key in _BY_PRECISION:
+            return _BY_PRECISION[key]
+    try:
+        return _NAMED[backend]
+    except KeyError:
+        if backend == 'mpmath':
+            return _NAMED.setdefault('mpmath', MpmathBackend())
+        raise ValueError(f"Неизвестный бэкенд: {backend!r}.") from None
@@ -0,0 +1,179 @@
+# blocks.py
+
+# Блоки ковариаций, загружаемые матрицами целиком. Модуль использует NumPy и
+# загружается при первой загрузке матрицы, поэтому import udecimal не импортирует NumPy.
+
+from decimal import Decimal
+import sys
+import weakref
+
+import numpy as np
+
+from .backends import as_decimal
+
+
+def _as_matrix(matrix, size):
+    """
+    Приводит квадратную матрицу (массив NumPy или вложенные списки) к массиву NumPy.
+    Матрицы из Decimal и строк хранятся как dtype=object, остальные — как float64.
+    """
+    if isinstance(matrix, np.ndarray) and matrix.dtype != object:
+        result = np.asarray(matrix, dtype=np.float64)
+    else:
+        result = np.asarray(matrix, dtype=object)
+        if any(isinstance(v, (Decimal, str)) for v in result.ravel()):
+            result = np.vectorize(as_decimal, otypes=[object])(result) if result.size else result
+        else:
+            result = result.astype(np.float64)
+    if result.shape != (size, size):
+        raise ValueError("Размер матрицы не совпадает с числом переменных.")
+    return result
+
+
+def _check_symmetric(matrix):
+    if matrix.dtype == object:
+        symmetric = bool((matrix == matrix.T).all())
+    else:
+        symmetric = np.allclose(matrix, matrix.T, rtol=1e-12, atol=0)
+    if not symmetric:
+        raise ValueError("Матрица должна быть симметричной.")
+
+
+class _Block:
+    """
+    Блок ковариаций, загруженный одной матрицей: строго верхний треугольник в формате CSR.
+
+    Для блоков корреляций хранятся коэффициенты корреляции, а ковариация вычисляется
+    при обращении как rho_ij * u_i * u_j по текущим неопределённостям листов.
+    Листы хранятся по слабым ссылкам, чтобы блок не продлевал их жизнь.
+    """
+    __slots__ = ('ids', 'leaves', 'indptr', 'indices', 'data', 'correlation')
+
+    def __init__(self, leaves, matrix, correlation=False):
+        size = len(leaves)
+        self.ids = [leaf.id for leaf in leaves]
+        self.leaves = [weakref.ref(leaf) for leaf in leaves]
+        self.correlation = correlation
+        rows, cols = np.nonzero(np.triu(matrix != 0, 1))
+        self.indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=self.indptr[1:])
+        self.indices = cols.astype(np.int32)
+        self.data = matrix[rows, cols]
+
+    def _position(self, a, b):
+        """
+        Позиция элемента (a, b), a < b, в массиве data или None.
+        """
+        start, stop = self.indptr[a], self.indptr[a + 1]
+        k = start + np.searchsorted(self.indices[start:stop], b)
+        if k < stop and self.indices[k] == b:
+            return k
+        return None
+
+    def _value(self, backend, a, b, k):
+        value = self.data[k]
+        value = backend.convert(value if type(value) is Decimal else float(value))
+        if self.correlation:
+            # Ковариация rho_ij * u_i * u_j по текущим неопределённостям листов
+            convert = backend.convert
+            mul = backend.mul
+            value = mul(mul(value, convert(self.leaves[a]().uncertainty)), convert(self.leaves[b]().uncertainty))
+        return value
+
+    def get(self, backend, a, b):
+        if a > b:
+            a, b = b, a
+        k = self._position(a, b)
+        return None if k is None else self._value(backend, a, b, k)
+
+    def set(self, backend, a, b, value):
+        """
+        Изменяет существующий элемент блока; возвращает False, если элемента нет.
+        """
+        if a > b:
+            a, b = b, a
+        k = self._position(a, b)
+        if k is None:
+            return False
+        value = backend.convert(value)
+        if self.correlation:
+            scale = backend.mul(backend.convert(self.leaves[a]().uncertainty),
+                                backend.convert(self.leaves[b]().uncertainty))
+            value = backend.div(value, scale) if scale else backend.zero
+        self.data[k] = backend.to_decimal(value) if self.data.dtype == object else float(value)
+        return True
+
+    def clear(self, a, b):
+        """
+        Обнуляет элемент блока, если он хранится.
+        """
+        if a > b:
+            a, b = b, a
+        k = self._position(a, b)
+        if k is not None:
+            self.data[k] = 0
+
+    def entries(self, backend, locals_):
+        """
+        Возвращает ненулевые элементы (id_i, id_j, c) для пар из заданных локальных индексов.
+        """
+        selected = np.zeros(len(self.ids), dtype=bool)
+        selected[locals_] = True
+        result = []
+        ids = self.ids
+        for a in locals_:
+            start, stop = self.indptr[a], self.indptr[a + 1]
+            if start == stop:
+                continue
+            cols = self.indices[start:stop]
+            for h in np.flatnonzero(selected[cols]):
+                b = int(cols[h])
+                value = self._value(backend, a, b, start + h)
+                if value != 0:
+                    result.append((ids[a], ids[b], value))
+        return result
+
+    def dense(self, locals_):
+        """
+        Возвращает ковариации между листами с заданными локальными индексами
+        плотной симметричной матрицей float64 с нулевой диагональю.
+        """
+        size = len(self.ids)
+        position = np.full(size, -1, dtype=np.int64)
+        position[locals_] = np.arange(len(locals_))
+        rows = np.repeat(np.arange(size), np.diff(self.indptr))
+        keep = (position[rows] >= 0) & (position[self.indices] >= 0)
+        a, b = position[rows[keep]], position[self.indices[keep]]
+        values = self.data[keep].astype(np.float64)
+        if self.correlation:
+            u = np.array([float(self.leaves[k]().uncertainty) for k in locals_], dtype=np.float64)
+            values *= u[a] * u[b]
+        result = np.zeros((len(locals_), len(locals_)))
+        result[a, b] = values
+        result[b, a] = values
+        return result
+
+    def row(self, backend, a):
+        """
+        Возвращает все ненулевые ковариации локального индекса a: {id: c}.
+        """
+        result = {}
+        for b in range(len(self.ids)):
+            if b != a and self.leaves[b]() is not None:
+                value = self.get(backend, a, b)
+                if value is not None and value != 0:
+                    result[self.ids[b]] = value
+        return result
+
+    def nbytes(self):
+        """
+        Оценка объёма памяти блока в байтах.
+        """
+        size = self.indptr.nbytes + self.indices.nbytes + self.data.nbytes
+        if self.data.dtype == object:
+            size += sum(sys.getsizeof(value) for value in self.data)
+        return size + sys.getsizeof(self.ids) + sys.getsizeof(self.leaves) + len(self.leaves) * _REF_SIZE
+
+
+# Размер слабой ссылки в байтах (для оценки памяти)
+_REF_SIZE = sys.getsizeof(weakref.ref(_Block))
@@ -0,0 +1,515 @@
+# compiler.py
+
+"""
+Компиляция формул неопределённости трассировкой (udecimal.compile).
+
+При первом вызове функция вычисляется в ленивом режиме над величинами-заполнителями,
+и полученный граф выражения записывается в плоскую ленту примитивных операций. По ленте
+генерируется функция Python без циклов: прямой проход вычисляет значения и частные
+производные, обратный проход — производные каждого результата по аргументам. Повторные
+вызовы воспроизводят ленту над новыми значениями без промежуточных экземпляров UDecimal
+и их карт производных; карта производных результата получается умножением градиентов
+на карты производных аргументов. Над массивами UDecimalArray лента воспроизводится
+векторными операциями массивов.
+
+Если аргументы и внешние величины — базовые переменные бэкенда с различными листами,
+вызов выполняется одной сгенерированной функцией (_Tape.call): значения и листы читаются
+из аргументов, а карты производных результатов собираются литералами словарей. Остальные
+аргументы обрабатываются общим путём с картами производных.
+
+Ускорение скалярного вызова ограничено стоимостью самой арифметики бэкенда: для формулы
+из бенчмарка compile (пять операций) воспроизведение быстрее прямого вызова примерно в 4–6
+раз на бэкендах 'float' и 'decimal' и в 3 раза на 'fixed' (метрики
+compile.*.speedup). Ускорение на порядок и более достигается пакетным воспроизведением
+над массивами UDecimalArray.
+
+Лента повторяет путь вычисления при трассировке: ветвления по значениям величин внутри
+функции фиксируются при первом вызове. Аргументы, не являющиеся UDecimal или
+UDecimalArray, считаются статическими: для каждого их набора строится своя лента.
+"""
+
+import builtins
+import functools
+import operator
+import sys
+
+from .context import getcontext, localcontext
+from .graph import _LOG_DOMAIN, _POW_DOMAIN, KERNELS
+from .layout import extract, insert
+from .udecimal import UDecimal, _Leaf
+
+# Признаки трассируемых аргументов в ключе ленты
+_SCALAR, _ARRAY = 'UDecimal', 'UDecimalArray'
+
+# Операторы, которыми заменяются вызовы методов бэкенда на float
+_OPERATORS = {
+    'add': '({} + {})',
+    'sub': '({} - {})',
+    'mul': '({} * {})',
+    'div': '({} / {})',
+    'neg': '(-{})',
+}
+
+# Функции со значением и производной: имя операции -> совмещённое ядро бэкенда
+_FUSED = {
+    'ln': 'ln_d',
+    'log10': 'log10_d',
+    'exp': 'exp_d',
+    'sin': 'sin_d',
+    'cos': 'cos_d',
+    'tan': 'tan_d',
+}
+
+# Операции ленты над массивами UDecimalArray
+_ARRAY_OPERATIONS = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'div': operator.truediv,
+    'pow': operator.pow,
+    'pow_constant': operator.pow,
+    'ln': operator.methodcaller('ln'),
+    'log10': operator.methodcaller('log10'),
+    'exp': operator.methodcaller('exp'),
+    'sin': operator.methodcaller('sin'),
+    'cos': operator.methodcaller('cos'),
+    'tan': operator.methodcaller('tan'),
+}
+
+
+# Отражённые операции массива для скалярного левого операнда
+_REFLECTED = {
+    'add': '__radd__',
+    'sub': '__rsub__',
+    'mul': '__rmul__',
+    'div': '__rtruediv__',
+}
+
+
+def _is_array(obj):
+    # Модуль массивов (и NumPy) не импортируется: без него экземпляров UDecimalArray нет
+    array = sys.modules.get(__package__ + '.array')
+    return array is not None and isinstance(obj, array.UDecimalArray)
+
+
+class _Tape:
+    """
+    Лента примитивных операций трассированной функции.
+
+    Слоты ленты нумеруются подряд: трассируемые аргументы, внешние величины (захваченные
+    функцией UDecimal, не зависящие от аргументов), затем результаты операций.
+
+    :ivar n_inputs: Число трассируемых аргументов.
+    :ivar externals: Внешние величины.
+    :ivar operations: Операции [(имя, операнды)] в порядке вычисления; операнд — номер
+                      слота или кортеж из одной константы бэкенда.
+    :ivar outputs: Номера слотов результатов.
+    :ivar layout: Структура результата с местами Slot.
+    :ivar gradients: Для каждого результата — номера слотов аргументов и внешних величин,
+                     по которым сгенерированная функция возвращает производные.
+    :ivar replay: Сгенерированная функция replay(backend, *значения) -> (значения, градиенты).
+    :ivar call: Сгенерированная функция call(backend, *аргументы) -> результаты UDecimal для
+                аргументов и внешних величин — базовых переменных бэкенда с различными листами
+                (иначе None): значения и листы читаются, а карты производных собираются
+                без циклов по аргументам.
+    :ivar source: Исходный код функций replay и call (для отладки).
+    """
+
+    def __init__(self, n_inputs, externals, operations, outputs, layout):
+        self.n_inputs = n_inputs
+        self.externals = externals
+        self.operations = operations
+        self.outputs = outputs
+        self.layout = layout
+        self.gradients = None
+        self.replay = None
+        self.call = None
+        self.source = None
+
+
+def _trace(func, args, backend):
+    """
+    Вычисляет функцию в ленивом режиме над заполнителями и записывает граф в ленту.
+
+    :param func: Трассируемая функция.
+    :param args: Аргументы первого вызова; значения величин используются как значения заполнителей.
+    :param backend: Бэкенд, для которого строится лента.
+    :return: Экземпляр _Tape (без сгенерированной функции).
+    """
+    inputs = []
+    traced = []
+    with localcontext(backend=backend, lazy=True, reactive=False):
+        for arg in args:
+            if isinstance(arg, UDecimal) or _is_array(arg):
+                # Значение первого элемента массива читается без создания листов его блока
+                sample = arg.value if isinstance(arg, UDecimal) else arg.values[0] if len(arg) else 1
+                placeholder = UDecimal(sample)
+                inputs.append(placeholder)
+                traced.append(placeholder)
+            else:
+                traced.append(arg)
+        outputs = []
+        layout = extract(func(*traced), outputs)
+
+    # Обход графа от результатов в порядке от операндов к результату; ссылка на слот
+    # до нумерации — пара (раздел, номер): 'i' — аргумент, 'e' — внешняя величина, 'o' — операция
+    placeholder_leaves = {placeholder._leaf for placeholder in inputs}
+    refs = {id(placeholder): ('i', k) for k, placeholder in enumerate(inputs)}
+    externals = []
+    operations = []
+    visiting = set()
+    stack = [(item, False) for item in reversed(outputs)]
+    while stack:
+        item, expanded = stack.pop()
+        key = id(item)
+        node = item._node
+        if expanded:
+            operands = tuple(refs[id(arg)] if variable else (arg,) for arg, variable in zip(node.args, node.mask))
+            refs[key] = ('o', len(operations))
+            operations.append((node.kind, operands))
+            continue
+        if key in refs or key in visiting:
+            continue
+        if node is None:
+            if not placeholder_leaves.isdisjoint(item._sensitivities()):
+                raise TypeError("Функция использует операции, которые не поддерживают трассировку "
+                                "(вычисленные производные или однопроходные агрегаты аргументов).")
+            refs[key] = ('e', len(externals))
+            externals.append(item)
+            continue
+        if node.kind not in KERNELS:
+            raise TypeError("Функция использует операции, которые не поддерживают трассировку "
+                            "(матричные операции udecimal.linalg).")
+        visiting.add(key)
+        stack.append((item, True))
+        for arg, variable in zip(node.args, node.mask):
+            if variable and id(arg) not in refs:
+                stack.append((arg, False))
+
+    offsets = {'i': 0, 'e': len(inputs), 'o': len(inputs) + len(externals)}
+
+    def slot(ref):
+        return offsets[ref[0]] + ref[1]
+
+    operations = [(kind, tuple(slot(a) if len(a) == 2 else a for a in operands)) for kind, operands in operations]
+    return _Tape(len(inputs), externals, operations, [slot(refs[id(item)]) for item in outputs], layout)
+
+
+class _Generator:
+    """
+    Генератор исходного кода функции воспроизведения ленты.
+    """
+
+    def __init__(self, backend, tape):
+        self.backend = backend
+        self.tape = tape
+        self.inline = backend.raw_type is float  # Методы бэкенда float совпадают с операторами
+        self.lines = []
+        self.methods = set()
+        self.constants = {}  # {имя: константа}
+
+    def call(self, name, *args):
+        if all(arg == 'one' or arg in self.constants for arg in args):
+            # Операция над константами (например, -1 в обратном проходе вычитания) вычисляется сразу
+            values = [self.backend.one if arg == 'one' else self.constants[arg] for arg in args]
+            return self.constant(getattr(self.backend, name)(*values))
+        if self.inline and name in _OPERATORS:
+            return _OPERATORS[name].format(*args)
+        self.methods.add(name)
+        return f"{name}({', '.join(args)})"
+
+    def times(self, a, partial):
+        if a == 'one':
+            return partial
+        if partial == 'one':
+            return a
+        return self.call('mul', a, partial)
+
+    def constant(self, value):
+        name = f'c{len(self.constants)}'
+        self.constants[name] = value
+        return name
+
+    def operand(self, operand):
+        if type(operand) is int:
+            return f'x{operand}'
+        return self.constant(operand[0])
+
+    def accumulate(self, terms, name):
+        """
+        Складывает вклады в сопряжённое значение; составное выражение сохраняется в переменной.
+        """
+        expression = terms[0]
+        for term in terms[1:]:
+            expression = self.call('add', expression, term)
+        if expression.isidentifier():
+            return expression
+        self.lines.append(f'    {name} = {expression}')
+        return name
+
+    def forward(self, s, kind, operands):
+        """
+        Код прямого прохода операции слота s; возвращает имена частных производных по операндам.
+        """
+        args = [self.operand(operand) for operand in operands]
+        x = f'x{s}'
+        emit = self.lines.append
+        if kind in ('add', 'sub', 'mul', 'div'):
+            emit(f'    {x} = {self.call(kind, *args)}')
+            return None
+        a = args[0]
+        if kind in ('pow', 'pow_constant', 'ln', 'log10'):
+            message = '_POW_DOMAIN' if kind.startswith('pow') else '_LOG_DOMAIN'
+            emit(f'    if {a} <= 0:')
+            emit(f'        raise ValueError({message})')
+        if kind == 'pow_constant':
+            backend = self.backend
+            p = operands[1][0]
+            # Квадрат и квадратный корень не требуют вызова функции степени
+            if p == backend.convert(2):
+                emit(f'    {x} = {self.call("mul", a, a)}')
+                emit(f'    d{s} = {self.call("add", a, a)}')
+            elif p == backend.convert('0.5'):
+                emit(f'    {x} = {self.call("sqrt", a)}')
+                emit(f'    d{s} = {self.call("div", args[1], x)}')
+            else:
+                emit(f'    {x}, d{s}, _ = {self.call("pow_d", a, args[1], "False")}')
+            return (f'd{s}', None)
+        if kind == 'pow':
+            emit(f'    {x}, d{s}, e{s} = {self.call("pow_d", a, args[1])}')
+            return (f'd{s}', f'e{s}')
+        emit(f'    {x}, d{s} = {self.call(_FUSED[kind], a)}')
+        return (f'd{s}',)
+
+    def backward(self, o, output, partials):
+        """
+        Код обратного прохода для результата номер o; возвращает номера слотов
+        аргументов и имена переменных с производными по ним.
+        """
+        tape = self.tape
+        base = tape.n_inputs + len(tape.externals)
+        adjoints = {output: ['one']}
+        for s in range(output, base - 1, -1):
+            terms = adjoints.pop(s, None)
+            if terms is None:
+                continue
+            a = self.accumulate(terms, f'g{o}_{s}')
+            kind, operands = tape.operations[s - base]
+            x, y = (operands + (None,))[:2]
+            if kind == 'add':
+                contributions = (a, a)
+            elif kind == 'sub':
+                contributions = (a, self.call('neg', a))
+            elif kind == 'mul':
+                contributions = (self.times(a, self.operand(y)), self.times(a, self.operand(x)))
+            elif kind == 'div':
+                divisor = self.operand(y)
+                contributions = (self.call('div', a, divisor),
+                                 self.call('neg', self.call('div', self.times(a, f'x{s}'), divisor)))
+            else:
+                contributions = tuple(None if p is None else self.times(a, p) for p in partials[s])
+            for operand, contribution in zip(operands, contributions):
+                if type(operand) is int and contribution is not None:
+                    adjoints.setdefault(operand, []).append(contribution)
+        used = sorted(adjoints)
+        return used, [self.accumulate(adjoints[k], f'g{o}_{k}') for k in used]
+
+    def generate(self):
+        """
+        Компилирует функции replay и call и записывает их в ленту вместе с составом градиентов.
+        """
+        tape = self.tape
+        base = tape.n_inputs + len(tape.externals)
+        partials = {}
+        for s, (kind, operands) in enumerate(tape.operations, base):
+            partials[s] = self.forward(s, kind, operands)
+        gradients = []
+        returned = []
+        maps = []
+        for o, output in enumerate(tape.outputs):
+            used, names = self.backward(o, output, partials)
+            gradients.append(used)
+            returned.append(f"({''.join(name + ', ' for name in names)})")
+            maps.append(f"derived(x{output}, {{{', '.join(f'l{k}: {name}' for k, name in zip(used, names))}}}, backend)")
+        body = self.lines
+        values = ''.join(f'x{output}, ' for output in tape.outputs)
+        inputs = [f'x{k}' for k in range(base)]
+        prologue = ['    one = backend.one'] + [f'    {name} = backend.{name}' for name in sorted(self.methods)]
+        replay = [f"def replay(backend, {', '.join(inputs)}):"] + prologue + body
+        replay.append(f"    return ({values}), ({''.join(r + ', ' for r in returned)})")
+        # call: аргументы и внешние величины — базовые переменные бэкенда с различными листами;
+        # карты производных результатов собираются литералами словарей {лист: градиент}
+        arguments = [f'a{k}' for k in range(tape.n_inputs)]
+        call = [f"def call(backend, {''.join(a + ', ' for a in arguments)}):"]
+        call += [f'    a{k} = E{k}' for k in range(tape.n_inputs, base)]
+        call += [f'    l{k} = a{k}._leaf' for k in range(base)]
+        checks = [f'l{k} is None or a{k}._backend is not backend' for k in range(base)]
+        if base > 1:
+            checks.append(f"len({{{', '.join(f'l{k}' for k in range(base))}}}) != {base}")
+        if checks:
+            call.append(f"    if {' or '.join(checks)}:")
+            call.append('        return None')
+        call += [f'    x{k} = a{k}._value' for k in range(base)]
+        call += prologue + body
+        call.append(f"    return ({''.join(m + ', ' for m in maps)})")
+        source = '\n'.join(replay) + '\n\n\n' + '\n'.join(call) + '\n'
+        namespace = dict(self.constants, _LOG_DOMAIN=_LOG_DOMAIN, _POW_DOMAIN=_POW_DOMAIN, derived=UDecimal._derived)
+        namespace.update((f'E{k}', external) for k, external in enumerate(tape.externals, tape.n_inputs))
+        exec(builtins.compile(source, '<udecimal.compile>', 'exec'), namespace)
+        tape.gradients = gradients
+        tape.replay = namespace['replay']
+        tape.call = namespace['call']
+        tape.source = source
+
+
+def _source(arg, backend):
+    """
+    Значение аргумента в типе бэкенда и его лист (для базовой переменной) или карта производных.
+    """
+    if arg._leaf is not None:
+        value = arg._value
+        if arg._backend.raw_type is not backend.raw_type:
+            value = backend.convert(value)
+        return value, arg._leaf
+    return arg._operand(backend)
+
+
+class CompiledFunction:
+    """
+    Функция над величинами UDecimal, вычисляемая воспроизведением трассированной ленты.
+
+    Ленты строятся при первом вызове для каждого сочетания бэкенда активного контекста,
+    видов аргументов (UDecimal, UDecimalArray) и значений статических аргументов.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self._tapes = {}
+        self._scalar = {}  # {(бэкенд, типы аргументов): лента} для вызовов только с UDecimal
+        functools.update_wrapper(self, func)
+
+    def _lookup(self, backend, args):
+        """
+        Возвращает ленту, трассируемые аргументы и признак вызова с массивами.
+        """
+        key = [backend]
+        traced = []
+        arrays = False
+        for arg in args:
+            if isinstance(arg, UDecimal):
+                key.append(_SCALAR)
+                traced.append(arg)
+            elif _is_array(arg):
+                key.append(_ARRAY)
+                traced.append(arg)
+                arrays = True
+            else:
+                key.append(arg)
+        key = tuple(key)
+        try:
+            tape = self._tapes.get(key)
+        except TypeError:
+            raise TypeError("Аргументы, кроме UDecimal и UDecimalArray, должны быть хешируемыми.") from None
+        if tape is None:
+            tape = _trace(self.func, args, backend)
+            _Generator(backend, tape).generate()
+            tape = self._tapes.setdefault(key, tape)
+        return tape, traced, arrays
+
+    def tape(self, *args):
+        """
+        Возвращает ленту для данных аргументов, трассируя функцию при необходимости.
+        """
+        return self._lookup(getcontext().backend, args)[0]
+
+    def __call__(self, *args):
+        backend = getcontext().backend
+        # Вызов только с аргументами UDecimal находит ленту по типам аргументов
+        key = (backend, *map(type, args))
+        tape = self._scalar.get(key)
+        if tape is None:
+            tape, traced, arrays = self._lookup(backend, args)
+            if arrays:
+                return self._replay_arrays(tape, traced)
+            if len(traced) == len(args) and all(kind is UDecimal for kind in key[1:]):
+                self._scalar[key] = tape
+        else:
+            traced = args
+        results = tape.call(backend, *traced)
+        if results is None:
+            results = self._replay_general(backend, tape, traced)
+        return insert(tape.layout, results)
+
+    @staticmethod
+    def _replay_general(backend, tape, traced):
+        """
+        Воспроизводит ленту для произвольных аргументов: производных величин, величин другого
+        бэкенда или повторяющихся базовых переменных.
+        """
+        raw_type = backend.raw_type
+        values = []
+        sources = []
+        for arg in (*traced, *tape.externals):
+            leaf = arg._leaf
+            if leaf is not None and arg._backend.raw_type is raw_type:
+                # Базовая переменная: значение известно, карта производных — {лист: 1}
+                values.append(arg._value)
+                sources.append(leaf)
+            else:
+                value, source = _source(arg, backend)
+                values.append(value)
+                sources.append(source)
+        output_values, gradients = tape.replay(backend, *values)
+        mul = backend.mul
+        add = backend.add
+        results = []
+        for value, used, gradient in zip(output_values, tape.gradients, gradients):
+            derivatives = {}
+            for k, g in zip(used, gradient):
+                source = sources[k]
+                if isinstance(source, _Leaf):
+                    derivatives[source] = add(derivatives[source], g) if source in derivatives else g
+                    continue
+                for leaf, d in source.items():
+                    term = mul(g, d)
+                    derivatives[leaf] = add(derivatives[leaf], term) if leaf in derivatives else term
+            results.append(UDecimal._derived(value, derivatives, backend))
+        return results
+
+    @staticmethod
+    def _replay_arrays(tape, traced):
+        """
+        Воспроизводит ленту векторными операциями над массивами UDecimalArray.
+        """
+        slots = traced + tape.externals
+        for kind, operands in tape.operations:
+            args = [slots[a] if type(a) is int else a[0] for a in operands]
+            if len(args) == 2 and not _is_array(args[0]) and _is_array(args[1]):
+                # Операции UDecimal не принимают массивы: скаляр слева обрабатывает массив
+                x, y = args
+                if kind == 'pow':
+                    x = type(y).from_list([x] * len(y), dtype=object if y.dtype == object else float)
+                    slots.append(x ** y)
+                else:
+                    slots.append(getattr(y, _REFLECTED[kind])(x))
+                continue
+            slots.append(_ARRAY_OPERATIONS[kind](*args))
+        return insert(tape.layout, [slots[s] for s in tape.outputs])
+
+    def __repr__(self):
+        return f"udecimal.compile({self.func!r})"
+
+
+def compile(func):
+    """
+    Компилирует функцию над величинами UDecimal в воспроизводимую ленту операций.
+
+    Функция должна использовать арифметику UDecimal (+, -, *, /, **, sqrt) и методы ln,
+    log10, exp, sin, cos, tan. Ветвления по значениям величин фиксируются при трассировке.
+    Результат функции — UDecimal или (вложенные) списки и кортежи величин.
+
+    :param func: Функция; аргументы UDecimal и UDecimalArray трассируются, остальные статичны.
+    :return: Экземпляр CompiledFunction с той же сигнатурой вызова. При вызове с массивами
+             UDecimalArray лента воспроизводится поэлементно векторными операциями.
+    """
+    return CompiledFunction(func)
@@ -0,0 +1,157 @@
+# context.py
+
+from contextvars import ContextVar
+
+from .backends import resolve_backend
+
+
+class Context:
+    """
+    Контекст вычислений UDecimal: числовой бэкенд, его точность и режим вычислений.
+
+    Активный контекст хранится в переменной контекста (contextvars), поэтому он
+    локален для потока и для задачи asyncio. Глобальные контексты decimal и mpmath
+    не изменяются. Контекст можно использовать как менеджер контекста:
+
+        with Context(prec=30):
+            ...
+    """
+
+    def __init__(self, backend='decimal', prec=None, lazy=False, reactive=False):
+        """
+        :param backend: Имя бэкенда ('float', 'decimal', 'mpmath', 'fixed') или экземпляр Backend.
+        :param prec: Число значащих десятичных цифр (для 'decimal' и 'mpmath')
+                     или число знаков после точки (для 'fixed').
+        :param lazy: Ленивый режим: операции строят граф выражения, а значения и
+                     неопределённости вычисляются при первом обращении.
+        :param reactive: Реактивный режим (включает ленивый): граф выражения сохраняется
+                         после вычисления, а изменение базовой переменной методом
+                         UDecimal.update помечает зависимые величины для пересчёта.
+        """
+        self.backend = resolve_backend(backend, prec)
+        self.reactive = bool(reactive)
+        self.lazy = bool(lazy) or self.reactive
+
+    @property
+    def prec(self):
+        """
+        Число значащих десятичных цифр активного бэкенда.
+        """
+        return self.backend.digits
+
+    def copy(self, backend=None, prec=None, lazy=None, reactive=None):
+        """
+        Создаёт копию контекста с изменёнными параметрами.
+
+        :param backend: Новый бэкенд (по умолчанию — бэкенд текущего контекста).
+        :param prec: Новая точность.
+        :param lazy: Новый режим вычислений (по умолчанию — режим текущего контекста).
+        :param reactive: Новый реактивный режим (по умолчанию — режим текущего контекста).
+        """
+        if backend is None:
+            backend = self.backend if prec is None else self.backend.name
+        if reactive is None:
+            reactive = self.reactive
+        if lazy is None:
+            lazy = self.lazy and (reactive or not self.reactive)
+        return Context(backend, prec, lazy, reactive)
+
+    def __enter__(self):
+        _tokens.set(_tokens.get() + (_current.set(self),))
+        return self
+
+    def __exit__(self, *exc_info):
+        tokens = _tokens.get()
+        _tokens.set(tokens[:-1])
+        _current.reset(tokens[-1])
+
+    def __repr__(self):
+        if self.reactive:
+            return f"Context(backend={self.backend!r}, reactive=True)"
+        if self.lazy:
+            return f"Context(backend={self.backend!r}, lazy=True)"
+        return f"Context(backend={self.backend!r})"
+
+
+DefaultContext = Context()
+
+_current = ContextVar('udecimal_context', default=DefaultContext)
+# Стек токенов для восстановления контекста при выходе из блока with
+_tokens = ContextVar('udecimal_context_tokens', default=())
+
+
+def getcontext():
+    """
+    Возвращает активный контекст вычислений.
+    """
+    return _current.get()
+
+
+def setcontext(context):
+    """
+    Устанавливает активный контекст вычислений для текущего потока или задачи.
+
+    :param context: Экземпляр Context.
+    """
+    if not isinstance(context, Context):
+        raise TypeError("Контекст должен быть экземпляром udecimal.Context.")
+    _current.set(context)
+
+
+def localcontext(context=None, backend=None, prec=None, lazy=None, reactive=None):
+    """
+    Возвращает контекст для использования в блоке with.
+
+    :param context: Исходный контекст (по умолчанию — активный).
+    :param backend: Бэкенд внутри блока.
+    :param prec: Точность внутри блока.
+    :param lazy: Режим ленивых вычислений внутри блока.
+    :param reactive: Реактивный режим внутри блока.
+    """
+    if context is None:
+        context = getcontext()
+    return context.copy(backend, prec, lazy, reactive)
+
+
+# Бэкенды, у которых точность означает число значащих десятичных цифр
+_SIGNIFICANT = ('decimal', 'mpmath')
+
+
+def _with_backend(context, backend):
+    """
+    Копия контекста, в которой заменён только бэкенд.
+    """
+    prec = None
+    if backend in _SIGNIFICANT and context.backend.name in _SIGNIFICANT:
+        prec = context.backend.digits
+    return context.copy(backend, prec)
+
+
+def get_backend():
+    """
+    Возвращает бэкенд активного контекста.
+    """
+    return _current.get().backend
+
+
+def set_backend(backend):
+    """
+    Устанавливает бэкенд активного контекста для текущего потока или задачи.
+
+    Остальные параметры активного контекста (режимы lazy и reactive, точность при
+    переходе между бэкендами 'decimal' и 'mpmath') сохраняются.
+
+    :param backend: Имя ('float', 'decimal', 'mpmath', 'fixed') или экземпляр Backend.
+    """
+    setcontext(_with_backend(getcontext(), backend))
+
+
+def using_backend(backend):
+    """
+    Временно устанавливает бэкенд для блока вычислений.
+
+    Как и set_backend, заменяет в копии активного контекста только бэкенд.
+
+    :param backend: Имя ('float', 'decimal', 'mpmath', 'fixed') или экземпляр Backend.
+    """
+    return _with_backend(getcontext(), backend)
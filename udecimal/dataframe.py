@@ -0,0 +1,451 @@
+# dataframe.py
+
+# Тип данных pandas для столбцов величин с неопределённостями. Столбец хранит массив
+# UDecimalArray (значения и чувствительности в буферах NumPy), поэтому арифметика,
+# суммы и средние, в том числе по группам groupby, вычисляются векторно, а величины
+# UDecimal создаются только при обращении к отдельным элементам. Пропущенные значения
+# хранятся как NaN с нулевой неопределённостью.
+
+import operator
+import re
+
+import numpy as np
+
+try:
+    from pandas.api.extensions import (ExtensionArray, ExtensionDtype, ExtensionScalarOpsMixin,
+                                       register_extension_dtype)
+    from pandas import factorize
+    from pandas.api.indexers import check_array_indexer
+    from pandas.api.types import is_list_like
+except ImportError:
+    raise ImportError("Для udecimal.dataframe требуется pandas: pip install udecimal[pandas]") from None
+
+from .array import UDecimalArray, _convert
+from .context import get_backend
+from .udecimal import UDecimal
+
+_STORAGES = ('decimal', 'float')
+_NAME = re.compile(r'udecimal(?:\[(?P<storage>\w+)\])?\Z')
+
+
+@register_extension_dtype
+class UDecimalDtype(ExtensionDtype):
+    """
+    Тип данных pandas для величин UDecimal.
+
+    :ivar storage: 'decimal' (значения Decimal с точностью бэкенда) или 'float' (float64).
+    """
+    type = UDecimal
+    kind = 'O'
+    na_value = np.nan
+    _metadata = ('storage',)
+
+    def __init__(self, storage='decimal'):
+        if storage not in _STORAGES:
+            raise ValueError(f"Неизвестный тип хранения: {storage!r}; допустимы 'decimal' и 'float'.")
+        self.storage = storage
+
+    @property
+    def name(self):
+        return f"udecimal[{self.storage}]"
+
+    @property
+    def _is_numeric(self):
+        return True
+
+    @property
+    def _kind(self):
+        return object if self.storage == 'decimal' else np.float64
+
+    @classmethod
+    def construct_from_string(cls, string):
+        if not isinstance(string, str):
+            raise TypeError(f"'construct_from_string' expects a string, got {type(string)}")
+        match = _NAME.match(string)
+        if match is None or (match['storage'] is not None and match['storage'] not in _STORAGES):
+            raise TypeError(f"Cannot construct a '{cls.__name__}' from '{string}'")
+        return cls(match['storage'] or 'decimal')
+
+    @classmethod
+    def construct_array_type(cls):
+        return UDecimalExtensionArray
+
+    def __repr__(self):
+        return self.name
+
+    def __from_arrow__(self, array):
+        from .arrow import from_arrow
+        return UDecimalExtensionArray._from_data(from_arrow(array), self)
+
+
+def _default_dtype():
+    """
+    Тип данных по активному бэкенду: 'float' для бэкенда на float, иначе 'decimal'.
+    """
+    return UDecimalDtype('float' if get_backend().name == 'float' else 'decimal')
+
+
+def _resolve_dtype(dtype):
+    if dtype is None:
+        return _default_dtype()
+    if isinstance(dtype, str):
+        return UDecimalDtype.construct_from_string(dtype)
+    if not isinstance(dtype, UDecimalDtype):
+        raise TypeError(f"Недопустимый тип данных: {dtype!r}.")
+    return dtype
+
+
+def _isna(value):
+    """
+    Является ли скаляр пропущенным значением (None, NaN, pd.NA, NaT).
+    """
+    if value is None:
+        return True
+    if isinstance(value, UDecimal):
+        return False
+    try:
+        return bool(value != value)
+    except TypeError:
+        # pd.NA не приводится к bool
+        return True
+
+
+def _missing(size, kind):
+    return UDecimalArray(_convert([float('nan')] * size, kind), 0, dtype=kind)
+
+
+class UDecimalExtensionArray(ExtensionArray, ExtensionScalarOpsMixin):
+    """
+    Массив расширения pandas поверх UDecimalArray.
+
+    Элементы массива — величины UDecimal; пропущенные значения — NaN.
+    """
+    __array_priority__ = 1000
+
+    def __init__(self, values, copy=False):
+        """
+        :param values: Экземпляр UDecimalArray (массив неизменяем, поэтому copy не используется).
+        """
+        if not isinstance(values, UDecimalArray):
+            raise TypeError("Ожидается экземпляр UDecimalArray; используйте pd.array(..., dtype='udecimal').")
+        self._data = values
+
+    @classmethod
+    def _from_data(cls, data, dtype):
+        """
+        Массив с заданным типом хранения.
+        """
+        if data._kind is not dtype._kind:
+            data = data._astype(dtype._kind)
+        return cls(data)
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        dtype = _resolve_dtype(dtype)
+        if isinstance(scalars, cls):
+            return cls._from_data(scalars._data, dtype)
+        if isinstance(scalars, UDecimalArray):
+            return cls._from_data(scalars, dtype)
+        kind = dtype._kind
+        scalars = list(scalars)
+        if any(isinstance(item, str) for item in scalars):
+            return cls._from_sequence_of_strings(scalars, dtype=dtype)
+        if not any(isinstance(item, UDecimal) for item in scalars):
+            values = [float('nan') if _isna(item) else item for item in scalars]
+            return cls(UDecimalArray(_convert(values, kind), 0, dtype=kind))
+        items = [item if isinstance(item, UDecimal) else UDecimal(float('nan') if _isna(item) else item)
+                 for item in scalars]
+        return cls(UDecimalArray.from_list(items, dtype=kind))
+
+    @classmethod
+    def _from_scalars(cls, scalars, *, dtype):
+        # Результаты поэлементных функций (например, Series.combine) остаются величинами,
+        # только если все они величины
+        if not all(isinstance(item, UDecimal) or _isna(item) for item in scalars):
+            raise TypeError("Элементы должны быть величинами UDecimal.")
+        return cls._from_sequence(scalars, dtype=dtype)
+
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, *, dtype, copy=False):
+        """
+        Разбирает строки вида '1.23 ± 0.04' или '1.23+/-0.04' (например, при чтении CSV).
+        """
+        dtype = _resolve_dtype(dtype)
+        values = []
+        uncertainties = []
+        for text in strings:
+            parts = ['NaN'] if _isna(text) or not str(text).strip() else str(text).replace('+/-', '±').split('±')
+            if len(parts) > 2:
+                raise ValueError(f"Не удалось разобрать величину: {text!r}.")
+            values.append(parts[0].strip())
+            uncertainties.append(parts[1].strip() if len(parts) == 2 else '0')
+        kind = dtype._kind
+        return cls(UDecimalArray(_convert(values, kind), _convert(uncertainties, kind), dtype=kind))
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        kind = original.dtype._kind
+        pairs = [(float('nan'), 0) if item is None else item for item in values]
+        return cls(UDecimalArray(_convert([v for v, _ in pairs], kind), _convert([u for _, u in pairs], kind),
+                                 dtype=kind))
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        return cls(UDecimalArray.concatenate([array._data for array in to_concat]))
+
+    # Основной интерфейс
+    @property
+    def dtype(self):
+        return UDecimalDtype('decimal' if self._data._kind is object else 'float')
+
+    @property
+    def quantities(self):
+        """
+        Массив UDecimalArray столбца (например, для udecimal.serialization или formatting.write).
+        """
+        return self._data
+
+    @property
+    def nbytes(self):
+        return self._data.values.nbytes + sum(c.nbytes for c in self._data._terms.values())
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            value = self._data.values[key]
+            if value != value:
+                return self.dtype.na_value
+            return self._data[key]
+        if isinstance(key, tuple):
+            key = tuple(k for k in key if k is not Ellipsis)
+            key = key[0] if len(key) == 1 else slice(None) if not key else key
+        elif key is Ellipsis:
+            key = slice(None)
+        if not isinstance(key, slice):
+            key = check_array_indexer(self, key)
+        return type(self)(self._data[key])
+
+    def __setitem__(self, key, value):
+        key = check_array_indexer(self, key)
+        size = len(self)
+        positions = np.arange(size)[key]
+        mask = np.zeros(size, dtype=bool)
+        mask[positions] = True
+        if not mask.any():
+            return
+        if isinstance(value, UDecimalExtensionArray):
+            value = value._data
+        elif is_list_like(value) and not isinstance(value, UDecimalArray):
+            value = self._from_sequence(value, dtype=self.dtype)._data
+        elif _isna(value):
+            value = float('nan')
+        if isinstance(value, UDecimalArray):
+            positions = np.atleast_1d(positions)
+            if len(value) != len(positions):
+                raise ValueError("Длина присваиваемых значений не совпадает с числом позиций.")
+            # Переставляем присваиваемые значения на их позиции в массиве
+            index = np.zeros(size, dtype=np.int64)
+            index[positions] = np.arange(len(positions))
+            value = value[index] if len(value) else value
+        self._data = self._data._where(mask, value)
+
+    def isna(self):
+        values = self._data.values
+        return np.asarray(values != values, dtype=bool)
+
+    def take(self, indices, *, allow_fill=False, fill_value=None):
+        indices = np.asarray(indices, dtype=np.int64)
+        if not allow_fill:
+            return type(self)(self._data[indices])
+        if (indices < -1).any():
+            raise ValueError("При allow_fill=True допустим только отрицательный индекс -1.")
+        missing = indices == -1
+        if not len(self):
+            if not missing.all():
+                raise IndexError("Выборка из пустого массива.")
+            return type(self)(_missing(len(indices), self._data._kind))
+        data = self._data[np.where(missing, 0, indices)]
+        if missing.any():
+            data = data._where(missing, float('nan') if fill_value is None or _isna(fill_value) else fill_value)
+        return type(self)(data)
+
+    def copy(self):
+        return type(self)(self._data)
+
+    def astype(self, dtype, copy=True):
+        if isinstance(dtype, (str, UDecimalDtype)):
+            try:
+                dtype = _resolve_dtype(dtype)
+            except TypeError:
+                pass
+            else:
+                if dtype == self.dtype and not copy:
+                    return self
+                return self._from_data(self._data, dtype)
+        return super().astype(dtype, copy=copy)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("Массив величин нельзя преобразовать в массив NumPy без копирования.")
+        if dtype is not None and np.dtype(dtype) != object:
+            # Приведение к числовому типу отбрасывает неопределённости
+            return np.asarray(self._data.values, dtype=dtype)
+        result = np.full(len(self), np.nan, dtype=object)
+        present = ~self.isna()
+        if present.any():
+            result[present] = self._data[present].to_list()
+        return result
+
+    def _values_for_factorize(self):
+        # Ключ элемента — пара (значение, неопределённость)
+        keys = np.empty(len(self), dtype=object)
+        keys[:] = list(zip(self._data.values.tolist(), self._data.uncertainties.tolist()))
+        keys[self.isna()] = None
+        return keys, None
+
+    def unique(self):
+        # Первые вхождения различных элементов: величины остаются теми же переменными
+        codes = factorize(self._values_for_factorize()[0])[0]
+        return self[np.sort(np.unique(codes, return_index=True)[1])]
+
+    def _values_for_argsort(self):
+        return self._data.values
+
+    def _formatter(self, boxed=False):
+        if boxed:
+            return lambda x: format(x, '.2u') if isinstance(x, UDecimal) else str(x)
+        return repr
+
+    def __arrow_array__(self, type=None):
+        from .arrow import to_arrow
+        return to_arrow(self._data)
+
+    # Операции
+    @classmethod
+    def _create_arithmetic_method(cls, op):
+        def method(self, other):
+            if isinstance(other, ExtensionArray) and not isinstance(other, cls) or \
+                    getattr(other, '_typ', None) in ('series', 'index', 'dataframe'):
+                return NotImplemented
+            data, missing = self._data, self.isna()
+            if isinstance(other, cls):
+                other_missing = other.isna()
+                other = other._data
+                if other_missing.any():
+                    other = other._where(other_missing, 1)
+                    missing = missing | other_missing
+            if missing.any():
+                # Пропущенные значения заменяются единицей, чтобы не вызывать ошибок области определения
+                data = data._where(missing, 1)
+            try:
+                result = op(data, _operand(other))
+            except TypeError:
+                return NotImplemented
+            if missing.any():
+                result = result._where(missing, float('nan'))
+            return cls(result)
+        return method
+
+    @classmethod
+    def _create_comparison_method(cls, op):
+        def method(self, other):
+            if getattr(other, '_typ', None) in ('series', 'index', 'dataframe'):
+                return NotImplemented
+            if isinstance(other, cls):
+                other = other._data.values
+            elif isinstance(other, UDecimal):
+                other = other.value
+            elif is_list_like(other):
+                other = np.array([item.value if isinstance(item, UDecimal) else item for item in other], dtype=object)
+                other = _convert(other, self._data._kind)
+            values = self._data.values
+            missing = values != values
+            if is_list_like(other):
+                missing = missing | np.asarray(other != other, dtype=bool)
+                other = np.where(missing, 0, other)
+            elif other != other:
+                missing = np.ones(len(self), dtype=bool)
+                other = 0
+            # Упорядочивающие сравнения с NaN Decimal вызывают исключение: пропуски заменяются нулём
+            result = np.asarray(op(np.where(missing, 0, values), other), dtype=bool)
+            result[missing] = op is operator.ne
+            return result
+        return method
+
+    # Агрегирование
+    def _present(self, skipna):
+        """
+        Массив без пропущенных значений или None, если пропуски есть и skipna=False.
+        """
+        missing = self.isna()
+        if not missing.any():
+            return self._data
+        return self._data[~missing] if skipna else None
+
+    def _reduce(self, name, *, skipna=True, keepdims=False, **kwargs):
+        if name not in ('sum', 'mean', 'min', 'max'):
+            raise TypeError(f"Тип {self.dtype} не поддерживает операцию '{name}'.")
+        data = self._present(skipna)
+        if data is None or len(data) < kwargs.get('min_count', 0) or (name != 'sum' and not len(data)):
+            result = self.dtype.na_value
+        elif name == 'sum':
+            result = data.sum()
+        elif name == 'mean':
+            result = data.mean()
+        else:
+            values = data.values
+            result = data[int(np.argmin(values) if name == 'min' else np.argmax(values))]
+        if keepdims:
+            return type(self)._from_sequence([result], dtype=self.dtype)
+        return result
+
+    def _groupby_op(self, *, how, has_dropped_na, min_count, ngroups, ids, **kwargs):
+        if how not in ('sum', 'mean'):
+            return super()._groupby_op(how=how, has_dropped_na=has_dropped_na, min_count=min_count,
+                                       ngroups=ngroups, ids=ids, **kwargs)
+        ids = np.asarray(ids, dtype=np.int64)
+        keep = ids >= 0
+        missing = self.isna()
+        if kwargs.get('skipna', True):
+            keep &= ~missing
+        groups = ids[keep]
+        data = self._data[keep]
+        counts = np.bincount(groups, minlength=ngroups)
+        if how == 'sum':
+            result = data.sum(groups, ngroups)
+            empty = counts < max(min_count, 1) if min_count else np.zeros(ngroups, dtype=bool)
+        else:
+            result = data.sum(groups, ngroups) / np.maximum(counts, 1)
+            empty = counts == 0
+        if not kwargs.get('skipna', True):
+            # Группы с пропущенными значениями
+            empty = empty | (np.bincount(ids[(ids >= 0) & missing], minlength=ngroups) > 0)
+        if empty.any():
+            result = result._where(empty, float('nan'))
+        return type(self)(result)
+
+
+def _operand(other):
+    """
+    Приводит операнд арифметики к виду, принимаемому UDecimalArray.
+    """
+    if isinstance(other, UDecimalExtensionArray):
+        return other._data
+    if isinstance(other, (UDecimal, UDecimalArray)) or not is_list_like(other):
+        return other
+    items = list(other)
+    if any(isinstance(item, UDecimal) for item in items):
+        return UDecimalArray.from_list([item if isinstance(item, UDecimal) else UDecimal(item) for item in items])
+    return np.asarray(items)
+
+
+UDecimalExtensionArray._add_arithmetic_ops()
+UDecimalExtensionArray._add_comparison_ops()
+
+try:
+    # Регистрирует тип расширения Arrow, чтобы столбцы восстанавливались при чтении Parquet
+    from . import arrow as _arrow  # noqa: F401
+except ImportError:
+    pass
@@ -0,0 +1,499 @@
+# fit.py
+
+# Взвешенный метод наименьших квадратов для точек с неопределённостями: линейная
+# подгонка и нелинейная (Гаусс — Ньютон, Левенберг — Марквардт). Весовая матрица —
+# обратная ковариационная матрица точек с учётом ковариаций из хранилища; вычисления
+# выполняются векторно в float64 над «выбеленными» невязками W·(y - f), где Wᵀ·W = C⁻¹
+# (выбеливаются только группы коррелированных точек, см. _Data).
+# Подогнанные параметры — величины активного бэкенда, линейные по точкам: их производные
+# по базовым переменным точек вычисляются лениво, поэтому корреляции с данными сохраняются.
+
+import numpy as np
+
+from .array import UDecimalArray
+from .context import get_backend
+from .graph import _Node
+from .linalg import _independent
+from .registry import default_registry
+from .udecimal import UDecimal
+
+try:
+    # Необязательная зависимость: без SciPy треугольные системы решаются блочной подстановкой
+    from scipy.linalg import solve_triangular
+except ImportError:
+    solve_triangular = None
+
+# Размер диагонального блока прямой подстановки без SciPy
+_SOLVE_BLOCK = 64
+
+
+class FitResult:
+    """
+    Результат подгонки.
+
+    :ivar parameters: Подогнанные параметры (величины UDecimal, коррелированные между собой
+                      и с точками через производные по их базовым переменным).
+    :ivar covariance: Ковариационная матрица параметров (массив float64).
+    :ivar chi2: Значение χ² в найденном минимуме.
+    :ivar dof: Число степеней свободы (число точек минус число параметров).
+    :ivar iterations: Число итераций нелинейной подгонки (0 для линейной).
+    """
+
+    def __init__(self, parameters, covariance, chi2, dof, iterations):
+        self.parameters = parameters
+        self.covariance = covariance
+        self.chi2 = chi2
+        self.dof = dof
+        self.iterations = iterations
+
+    @property
+    def reduced_chi2(self):
+        """
+        χ² на одну степень свободы.
+        """
+        return self.chi2 / self.dof if self.dof else float('nan')
+
+    def __iter__(self):
+        return iter(self.parameters)
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def __repr__(self):
+        parameters = ', '.join(str(p) for p in self.parameters)
+        return f"FitResult([{parameters}], chi2={self.chi2:.6g}, dof={self.dof})"
+
+
+def _abscissae(x):
+    """
+    Значения аргумента в float64; неопределённости величин UDecimal не учитываются.
+    """
+    if isinstance(x, UDecimalArray):
+        return np.asarray(x.values, dtype=np.float64)
+    if isinstance(x, np.ndarray) and x.dtype != object:
+        return x.astype(np.float64)
+    return np.array([float(v.value) if isinstance(v, UDecimal) else float(v) for v in x])
+
+
+def _solve_lower(factor, v, transpose=False):
+    """
+    Решает L·z = v (или Lᵀ·z = v при transpose) для нижнетреугольной матрицы L
+    (v — вектор или матрица столбцов).
+    """
+    if solve_triangular is not None:
+        return solve_triangular(factor, v, lower=True, trans='T' if transpose else 'N', check_finite=False)
+    # Блочная подстановка: O(n²) на столбец, плотно решаются только диагональные блоки
+    z = np.array(v, dtype=np.float64)
+    n = len(factor)
+    starts = range(0, n, _SOLVE_BLOCK)
+    for start in (reversed(starts) if transpose else starts):
+        stop = min(start + _SOLVE_BLOCK, n)
+        if transpose:
+            if stop < n:
+                z[start:stop] -= factor[stop:, start:stop].T @ z[stop:]
+            z[start:stop] = np.linalg.solve(factor[start:stop, start:stop].T, z[start:stop])
+        else:
+            if start:
+                z[start:stop] -= factor[start:stop, :start] @ z[:start]
+            z[start:stop] = np.linalg.solve(factor[start:stop, start:stop], z[start:stop])
+    return z
+
+
+def _column(x, v):
+    """
+    Вектор x, согласованный по форме с вектором или матрицей столбцов v.
+    """
+    return x if v.ndim == 1 else x[:, None]
+
+
+class _Cholesky:
+    """
+    Выбеливание группы точек по множителю Холецкого её ковариационной матрицы C = L·Lᵀ:
+    W = L⁻¹.
+    """
+    __slots__ = ('factor',)
+
+    def __init__(self, covariance):
+        try:
+            self.factor = np.linalg.cholesky(covariance)
+        except np.linalg.LinAlgError:
+            raise ValueError("Ковариационная матрица точек должна быть положительно определённой.") from None
+
+    def __len__(self):
+        return len(self.factor)
+
+    def whiten(self, v):
+        return _solve_lower(self.factor, v)
+
+    def whiten_transpose(self, v):
+        return _solve_lower(self.factor, v, transpose=True)
+
+
+class _LowRank:
+    """
+    Выбеливание группы точек с ковариационной матрицей «диагональ плюс малый ранг»
+    C = D + U·S·Uᵀ, где D — вклад листов, входящих только в одну точку, U — производные
+    точек по r общим листам, S — ковариационная матрица общих листов.
+
+    C = D^½·(I + Q·Qᵀ)·D^½ при Q = D^-½·U·R, S = R·Rᵀ. По тонкому сингулярному разложению
+    Q = B·diag(σ)·Vᵀ выбеливание W = (I + Q·Qᵀ)^-½·D^-½ = (I + B·diag(1/√(1 + σ²) - 1)·Bᵀ)·D^-½
+    требует O(n·r) памяти и O(n·r²) операций вместо O(n²) и O(n³) для плотного разложения.
+    """
+    __slots__ = ('scale', 'basis', 'shrink')
+
+    def __init__(self, diagonal, loadings, covariance):
+        self.scale = np.sqrt(diagonal)
+        # S может быть вырожденной (полностью коррелированные листы), поэтому R — по собственному разложению
+        eigenvalues, vectors = np.linalg.eigh(covariance)
+        q = (loadings / self.scale[:, None]) @ (vectors * np.sqrt(np.maximum(eigenvalues, 0.0)))
+        self.basis, singular, _ = np.linalg.svd(q, full_matrices=False)
+        self.shrink = 1 / np.sqrt(1 + singular ** 2) - 1
+
+    def __len__(self):
+        return len(self.scale)
+
+    def _project(self, v):
+        return v + self.basis @ (_column(self.shrink, v) * (self.basis.T @ v))
+
+    def whiten(self, v):
+        return self._project(v / _column(self.scale, v))
+
+    def whiten_transpose(self, v):
+        return self._project(v) / _column(self.scale, v)
+
+
+class _Points:
+    """
+    Точки подгонки как последовательность величин UDecimal; массив UDecimalArray
+    преобразуется в список только при первом обращении (см. _Parameter).
+    """
+    __slots__ = ('source', '_items')
+
+    def __init__(self, source, items=None):
+        self.source = source
+        self._items = items
+
+    def items(self):
+        if self._items is None:
+            self._items = tuple(self.source.to_list())
+        return self._items
+
+
+class _Parameter(_Node):
+    """
+    Узел ленивого графа для подогнанного параметра: линейная комбинация точек
+    dp = Σ_i (∂p/∂y_i)·dy_i с производными из решения нормальных уравнений.
+
+    Производные по листам точек вычисляются обратным проходом только при обращении к ним
+    (ковариации, вычисления с параметром), поэтому подгонка массива UDecimalArray не создаёт
+    величин UDecimal для его элементов.
+    """
+    __slots__ = ('points', 'row', 'convert')
+
+    def __init__(self, points, row, convert):
+        self.kind = 'fit'
+        self.points = points
+        self.row = row
+        self.convert = convert
+
+    @property
+    def args(self):
+        return self.points.items()
+
+    @property
+    def mask(self):
+        return (True,) * len(self.row)
+
+    @property
+    def partials(self):
+        convert = self.convert
+        return [convert(d) for d in self.row.tolist()]
+
+
+def _union_find(size, first, second):
+    """
+    Компоненты связности графа из size вершин с рёбрами (first[k], second[k]) (система
+    непересекающихся множеств).
+
+    :return: Массив номеров представителей компонент вершин.
+    """
+    parent = list(range(size))
+
+    def find(i):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    for i, j in zip(first, second):
+        i, j = find(i), find(j)
+        if i != j:
+            parent[i] = j
+    return np.array([find(i) for i in range(size)], dtype=np.int64)
+
+
+def _sensitivity_columns(items):
+    """
+    Разреженная матрица производных точек по листам в формате CSR (как UDecimalArray._columns).
+    """
+    index = {}  # {лист: номер}
+    counts, sens_leaf, sens_value = [], [], []
+    for item in items:
+        derivatives = item._sensitivities()
+        for leaf, d in derivatives.items():
+            sens_leaf.append(index.setdefault(leaf, len(index)))
+            sens_value.append(float(d))
+        counts.append(len(derivatives))
+    pointers = np.zeros(len(items) + 1, dtype=np.int64)
+    np.cumsum(counts, out=pointers[1:])
+    return list(index), pointers, np.array(sens_leaf, dtype=np.int64), np.array(sens_value, dtype=np.float64)
+
+
+def _bucket(keys, size):
+    """
+    Номера элементов, упорядоченные по ключам, и границы отрезков каждого ключа.
+    """
+    order = np.argsort(keys, kind='stable')
+    return order, np.searchsorted(keys[order], np.arange(size + 1))
+
+
+class _Data:
+    """
+    Значения точек и преобразование «выбеливания» W по их ковариационной матрице C (Wᵀ·W = C⁻¹).
+
+    Для независимых точек выбеливание — деление на неопределённости. Коррелированные точки
+    разбиваются на независимые группы, связанные общими листами или ковариациями листов
+    из хранилища. Ковариационная матрица группы собирается по разреженным производным точек:
+    листы, входящие только в одну точку, дают диагональ D, а общие листы — слагаемое малого
+    ранга U·S·Uᵀ. Если D положительна и общих листов меньше, чем точек, группа выбеливается
+    без плотной матрицы (_LowRank), иначе — по разложению Холецкого (_Cholesky).
+    """
+    __slots__ = ('values', 'sigma', 'blocks', 'points')
+
+    def __init__(self, y):
+        self.blocks = []  # [(индексы точек группы, выбеливание группы)]
+        if isinstance(y, UDecimalArray):
+            self.points = _Points(y)
+            self.values = np.asarray(y.values, dtype=np.float64)
+            self.sigma = np.asarray(y.uncertainties, dtype=np.float64)
+            if not y._independent():
+                leaves, _, pointers, sens_leaf, sens_value = y._columns()
+                self._correlate(leaves, pointers, sens_leaf, np.asarray(sens_value, dtype=np.float64))
+        else:
+            items = tuple(y)
+            if not all(isinstance(item, UDecimal) for item in items):
+                raise TypeError("Точки должны быть величинами UDecimal или массивом UDecimalArray.")
+            self.points = _Points(y, items)
+            self.values = np.array([float(item.value) for item in items])
+            self.sigma = np.array([float(item.uncertainty) for item in items])
+            if not _independent(items, (True,) * len(items), get_backend()):
+                self._correlate(*_sensitivity_columns(items))
+        if not (self.sigma > 0).all():
+            raise ValueError("Неопределённости точек должны быть положительными.")
+
+    def _correlate(self, leaves, pointers, sens_leaf, sens_value):
+        """
+        Находит группы коррелированных точек по производным точек по листам (CSR) и
+        строит выбеливание каждой группы.
+        """
+        n, m = len(self.values), len(leaves)
+        rows = np.repeat(np.arange(n), np.diff(pointers))
+        u = np.array([float(leaf.uncertainty) for leaf in leaves])
+        first, second, values = [], [], []
+        if default_registry:
+            index = {leaf.id: k for k, leaf in enumerate(leaves)}
+            for i, j, c in default_registry.entries(get_backend(), index):
+                first.append(index[i])
+                second.append(index[j])
+                values.append(float(c))
+        first, second = np.array(first, dtype=np.int64), np.array(second, dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        # Общие листы: входят в несколько точек или связаны ковариациями из хранилища
+        shared = np.bincount(sens_leaf, minlength=m) > 1
+        shared[first] = shared[second] = True
+        # Компоненты связности графа: вершины — точки (0..n-1) и общие листы (n + номер листа)
+        links = shared[sens_leaf]
+        roots = _union_find(n + m, np.concatenate((rows[links], n + first)).tolist(),
+                            np.concatenate((n + sens_leaf[links], n + second)).tolist())
+        labels, components = np.unique(roots[:n], return_inverse=True)
+        sizes = np.bincount(components, minlength=len(labels))
+        point_order, point_bounds = _bucket(components, len(labels))
+        nonzero_order, nonzero_bounds = _bucket(components[rows], len(labels))
+        entry_order, entry_bounds = _bucket(np.searchsorted(labels, roots[n + first]), len(labels))
+        for g in np.flatnonzero(sizes > 1).tolist():
+            group = np.sort(point_order[point_bounds[g]:point_bounds[g + 1]])
+            nz = nonzero_order[nonzero_bounds[g]:nonzero_bounds[g + 1]]
+            local = np.searchsorted(group, rows[nz])
+            leaf, d = sens_leaf[nz], sens_value[nz]
+            common = shared[leaf]
+            diagonal = np.bincount(local[~common], weights=(d[~common] * u[leaf[~common]]) ** 2,
+                                   minlength=len(group))
+            members = np.unique(leaf[common])
+            loadings = np.zeros((len(group), len(members)))
+            loadings[local[common], np.searchsorted(members, leaf[common])] = d[common]
+            covariance = np.diag(u[members] ** 2)
+            e = entry_order[entry_bounds[g]:entry_bounds[g + 1]]
+            a, b = np.searchsorted(members, first[e]), np.searchsorted(members, second[e])
+            covariance[a, b] = covariance[b, a] = values[e]
+            if (diagonal > 0).all() and len(members) < len(group):
+                whitening = _LowRank(diagonal, loadings, covariance)
+            else:
+                whitening = _Cholesky(np.diag(diagonal) + loadings @ covariance @ loadings.T)
+            self.sigma[group] = 1.0  # Строки группы заменяются выбеливанием группы
+            self.blocks.append((group, whitening))
+
+    def __len__(self):
+        return len(self.values)
+
+    def whiten(self, v):
+        """
+        Выбеливает вектор невязок или столбцы матрицы якобиана: W·v.
+        """
+        result = v / _column(self.sigma, v)
+        for group, whitening in self.blocks:
+            result[group] = whitening.whiten(v[group])
+        return result
+
+    def whiten_transpose(self, v):
+        """
+        Применяет транспонированное выбеливание Wᵀ·v.
+        """
+        result = v / _column(self.sigma, v)
+        for group, whitening in self.blocks:
+            result[group] = whitening.whiten_transpose(v[group])
+        return result
+
+
+def _result(data, p, jacobian, residuals, iterations):
+    """
+    Создаёт параметры по решению и выбеленному якобиану J: ковариация (Jᵀ·J)⁻¹.
+
+    Производные параметров по точкам ∂p/∂y = (Jᵀ·J)⁻¹·Jᵀ·W (линеаризация решения нормальных
+    уравнений), поэтому параметры коррелированы с точками и их базовыми переменными, а их
+    совместная ковариация, вычисленная по производным, равна (Jᵀ·J)⁻¹.
+    """
+    dof = len(residuals) - len(p)
+    try:
+        covariance = np.linalg.inv(jacobian.T @ jacobian)
+    except np.linalg.LinAlgError:
+        raise ValueError("Параметры не определяются данными: матрица Jᵀ·J вырождена.") from None
+    covariance = (covariance + covariance.T) / 2
+    gradients = data.whiten_transpose(jacobian) @ covariance
+    backend = get_backend()
+    convert = backend.convert
+    parameters = []
+    for k, v in enumerate(p):
+        parameter = UDecimal._derived(convert(repr(float(v))), None, backend)
+        parameter._node = _Parameter(data.points, gradients[:, k], convert)
+        parameter._uncertainty = convert(repr(float(np.sqrt(max(covariance[k, k], 0.0)))))
+        parameters.append(parameter)
+    return FitResult(parameters, covariance, float(residuals @ residuals), dof, iterations)
+
+
+def _check_size(data, width):
+    if len(data) < width:
+        raise ValueError("Число точек меньше числа параметров.")
+
+
+def linear(x, y, basis=1):
+    """
+    Линейная подгонка y ≈ Σ_k p_k · g_k(x) взвешенным методом наименьших квадратов.
+
+    :param x: Значения аргумента (последовательность, массив NumPy или UDecimalArray);
+              неопределённости аргумента не учитываются.
+    :param y: Точки: последовательность величин UDecimal или UDecimalArray.
+    :param basis: Степень многочлена (параметры — коэффициенты при 1, x, …, x^степень)
+                  или последовательность функций g_k, вычисляемых над массивом x.
+    :return: FitResult.
+    """
+    x = _abscissae(x)
+    data = _Data(y)
+    if len(x) != len(data):
+        raise ValueError("Длины аргумента и точек не совпадают.")
+    if isinstance(basis, int):
+        design = np.vander(x, basis + 1, increasing=True)
+    else:
+        design = np.column_stack([np.broadcast_to(np.asarray(g(x), dtype=np.float64), x.shape) for g in basis])
+    _check_size(data, design.shape[1])
+    jacobian = data.whiten(design)
+    p = np.linalg.lstsq(jacobian, data.whiten(data.values), rcond=None)[0]
+    residuals = data.whiten(data.values - design @ p)
+    return _result(data, p, jacobian, residuals, 0)
+
+
+def _differences(model, x, p, f):
+    """
+    Якобиан модели по параметрам односторонними конечными разностями.
+    """
+    columns = []
+    for k in range(len(p)):
+        step = np.sqrt(np.finfo(np.float64).eps) * max(abs(p[k]), 1.0)
+        shifted = p.copy()
+        shifted[k] += step
+        columns.append((np.asarray(model(x, *shifted), dtype=np.float64) - f) / step)
+    return np.column_stack(columns)
+
+
+def nonlinear(model, x, y, p0, jacobian=None, method='lm', max_iterations=100, tolerance=1e-10):
+    """
+    Нелинейная подгонка y ≈ model(x, *p) методом Гаусса — Ньютона или Левенберга — Марквардта.
+
+    :param model: Функция model(x, *p), векторно вычисляющая модель над массивом x (float64).
+    :param x: Значения аргумента (последовательность, массив NumPy или UDecimalArray).
+    :param y: Точки: последовательность величин UDecimal или UDecimalArray.
+    :param p0: Начальные значения параметров (числа или величины UDecimal).
+    :param jacobian: Функция jacobian(x, *p), возвращающая матрицу n×k производных модели
+                     по параметрам; по умолчанию — конечные разности.
+    :param method: 'lm' (Левенберг — Марквардт) или 'gauss-newton'.
+    :param max_iterations: Наибольшее число итераций.
+    :param tolerance: Относительное изменение χ² или шага, при котором итерации прекращаются.
+    :return: FitResult.
+    """
+    if method not in ('lm', 'gauss-newton'):
+        raise ValueError(f"Неизвестный метод подгонки: {method!r}.")
+    x = _abscissae(x)
+    data = _Data(y)
+    if len(x) != len(data):
+        raise ValueError("Длины аргумента и точек не совпадают.")
+    p = np.array([float(v.value) if isinstance(v, UDecimal) else float(v) for v in p0])
+    _check_size(data, len(p))
+
+    def evaluate(p):
+        f = np.broadcast_to(np.asarray(model(x, *p), dtype=np.float64), x.shape[:1])
+        return f, data.whiten(data.values - f)
+
+    def derivatives(p, f):
+        if jacobian is None:
+            return data.whiten(_differences(model, x, p, f))
+        return data.whiten(np.asarray(jacobian(x, *p), dtype=np.float64).reshape(len(x), len(p)))
+
+    f, residuals = evaluate(p)
+    chi2 = residuals @ residuals
+    damping = 1e-3 if method == 'lm' else 0.0
+    for iteration in range(1, max_iterations + 1):
+        j = derivatives(p, f)
+        normal = j.T @ j
+        gradient = j.T @ residuals
+        while True:
+            # Демпфирование Марквардта масштабируется диагональю Jᵀ·J
+            step = np.linalg.lstsq(normal + damping * np.diag(np.diag(normal)), gradient, rcond=None)[0]
+            trial = p + step
+            f_trial, r_trial = evaluate(trial)
+            chi2_trial = r_trial @ r_trial
+            if method == 'gauss-newton' or (np.isfinite(chi2_trial) and chi2_trial <= chi2):
+                damping /= 10
+                break
+            damping *= 10
+            if damping > 1e16:
+                # Шаг, уменьшающий χ², не найден: минимум достигнут с точностью округления
+                return _result(data, p, derivatives(p, f), residuals, iteration)
+        change = chi2 - chi2_trial
+        p, f, residuals, chi2 = trial, f_trial, r_trial, chi2_trial
+        if not np.isfinite(chi2):
+            raise ValueError("Модель вернула нечисловые значения.")
+        if abs(change) <= tolerance * max(chi2, np.finfo(np.float64).tiny) or \
+                np.linalg.norm(step) <= tolerance * (np.linalg.norm(p) + tolerance):
+            return _result(data, p, derivatives(p, f), residuals, iteration)
+    raise RuntimeError(f"Подгонка не сошлась за {max_iterations} итераций.")
@@ -0,0 +1,243 @@
+# formatting.py
+
+"""
+Форматирование величин с округлением по значащим цифрам неопределённости.
+
+Спецификация формата (f"{x:.2u}", format(x, spec)):
+
+    [[заполнитель]выравнивание][ширина][.цифры]u[S][e|n]
+
+    u   значение ± неопределённость; неопределённость округляется до заданного числа
+        значащих цифр (по умолчанию 2), значение — до того же десятичного разряда:
+        1.2345 ± 0.0012
+    S   краткая запись с неопределённостью в последних разрядах: 1.2345(12)
+    e   научная запись: (1.2345 ± 0.0012)e+03, 1.2345(12)e+03
+    n   инженерная запись (порядок кратен трём): (12.345 ± 0.012)e+03
+
+Выравнивание и ширина применяются ко всей строке. Любая другая спецификация (например,
+'.3f' или '.2e') применяется отдельно к значению и к неопределённости, а пустая
+спецификация совпадает с str(x).
+
+Округление выполняется методом quantize над Decimal с точностью, достаточной для
+результата, поэтому полная запись значения (110 цифр в бэкенде по умолчанию) не строится.
+"""
+
+from decimal import Context as DecimalContext, Decimal, ROUND_HALF_EVEN
+import functools
+import os
+import re
+
+from .backends import as_decimal
+from .udecimal import UDecimal
+
+_SPEC = re.compile(r'(?:(?P<fill>.)?(?P<align>[<>^=]))?(?P<width>\d+)?(?:\.(?P<digits>\d+))?u(?P<flags>[Sen]*)\Z', re.S)
+
+# Число строк, накапливаемых перед записью в файл
+_CHUNK = 10000
+
+
+class _Spec:
+    """
+    Разобранная спецификация формата с типом 'u'.
+    """
+    __slots__ = ('align', 'digits', 'concise', 'notation')
+
+    def __init__(self, match):
+        # Ширина применяется ко всей строке; по умолчанию выравнивание по правому краю, как у чисел
+        width = match['width']
+        self.align = f"{match['fill'] or ''}{match['align'] or '>'}{width}" if width else None
+        digits = match['digits']
+        self.digits = 2 if digits is None else int(digits)
+        if self.digits < 1:
+            raise ValueError("Число значащих цифр неопределённости должно быть положительным.")
+        flags = match['flags']
+        if len(set(flags)) != len(flags) or ('e' in flags and 'n' in flags):
+            raise ValueError(f"Недопустимая спецификация формата: {match.string!r}.")
+        self.concise = 'S' in flags
+        self.notation = 'e' if 'e' in flags else 'n' if 'n' in flags else None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse(spec):
+    """
+    Разбирает спецификацию формата; для спецификаций без типа 'u' возвращает None.
+    """
+    match = _SPEC.match(spec)
+    return None if match is None else _Spec(match)
+
+
+@functools.lru_cache(maxsize=None)
+def _quantum(exponent):
+    return Decimal((0, (1,), exponent))
+
+
+def _exponent(exponent):
+    return f"e{exponent:+03d}"
+
+
+def _round(value, uncertainty, digits):
+    """
+    Округляет неопределённость до digits значащих цифр, а значение — до того же разряда.
+
+    :return: Округлённые значение и неопределённость (Decimal) и показатель младшего разряда.
+    """
+    magnitude = uncertainty.adjusted()
+    low = magnitude - digits + 1
+    # Точность контекста — число цифр результата, а не исходного значения
+    prec = max(value.adjusted() - low + 2, digits + 2) if value else digits + 2
+    context = DecimalContext(prec=prec, rounding=ROUND_HALF_EVEN)
+    rounded = uncertainty.quantize(_quantum(low), context=context)
+    if rounded.adjusted() > magnitude:
+        # 0.0999 → 0.100: после округления цифр стало больше, сдвигаем разряд
+        low += 1
+        context.prec += 1
+        rounded = uncertainty.quantize(_quantum(low), context=context)
+    return value.quantize(_quantum(low), context=context), rounded, low
+
+
+def _fixed(x):
+    return format(x, 'f')
+
+
+def _concise(value, uncertainty, low):
+    """
+    Краткая запись 1.2345(12): неопределённость в единицах младшего разряда значения.
+    """
+    if low >= 0:
+        return f"{_fixed(value)}({_fixed(uncertainty)})"
+    return f"{_fixed(value)}({int(uncertainty.scaleb(-low))})"
+
+
+def _render(value, uncertainty, spec):
+    """
+    Строка величины по разобранной спецификации с типом 'u'.
+
+    :param value: Значение (число любого поддерживаемого бэкендами типа).
+    :param uncertainty: Неопределённость.
+    :param spec: Экземпляр _Spec.
+    """
+    value = as_decimal(value)
+    uncertainty = abs(as_decimal(uncertainty))
+    if not uncertainty or not uncertainty.is_finite() or not value.is_finite():
+        # Точное значение: неопределённость не задаёт разряд округления
+        text = f"{_fixed(value) if value.is_finite() else value} ± {uncertainty}"
+    else:
+        shift = 0
+        if spec.notation is not None:
+            shift = max(value.adjusted() if value else uncertainty.adjusted(), uncertainty.adjusted())
+            if spec.notation == 'n':
+                shift -= shift % 3
+            value = value.scaleb(-shift)
+            uncertainty = uncertainty.scaleb(-shift)
+        value, uncertainty, low = _round(value, uncertainty, spec.digits)
+        if spec.concise:
+            text = _concise(value, uncertainty, low)
+            if spec.notation is not None:
+                text += _exponent(shift)
+        else:
+            text = f"{_fixed(value)} ± {_fixed(uncertainty)}"
+            if spec.notation is not None:
+                text = f"({text}){_exponent(shift)}"
+    if spec.align is not None:
+        text = format(text, spec.align)
+    return text
+
+
+def format_value(value, uncertainty, spec='.2u'):
+    """
+    Форматирует пару (значение, неопределённость) по спецификации формата (см. описание модуля).
+
+    :param value: Значение (Decimal, float, int, str, mpf или значение бэкенда 'fixed').
+    :param uncertainty: Неопределённость.
+    :param spec: Спецификация формата.
+    :return: Строка.
+    """
+    parsed = _parse(spec)
+    if parsed is None:
+        if not spec:
+            return f"{value} ± {uncertainty}"
+        return f"{format(value, spec)} ± {format(uncertainty, spec)}"
+    return _render(value, uncertainty, parsed)
+
+
+def _pairs(column):
+    """
+    Пары (значение, неопределённость) элементов столбца: UDecimalArray читается из
+    буферов без создания величин UDecimal.
+    """
+    # Проверка по атрибутам, чтобы не импортировать модуль массивов (и NumPy)
+    if hasattr(column, 'values') and hasattr(column, 'uncertainties'):
+        values = column.values
+        uncertainties = column.uncertainties
+        if values.dtype != object:
+            # float64 → float: Decimal(float) точно представляет двоичное значение
+            return zip(values.tolist(), uncertainties.tolist())
+        return zip(values, uncertainties)
+    return ((item.value, item.uncertainty) if isinstance(item, UDecimal) else (item, None) for item in column)
+
+
+def iterformat(items, spec='.2u'):
+    """
+    Лениво форматирует последовательность величин.
+
+    :param items: Итерируемая последовательность UDecimal или массив UDecimalArray.
+    :param spec: Спецификация формата.
+    :return: Генератор строк.
+    """
+    for value, uncertainty in _pairs(items):
+        yield format_value(value, uncertainty, spec)
+
+
+def _cell(value, uncertainty, spec, parsed, split, delimiter):
+    if uncertainty is None:
+        return str(value)
+    if not split:
+        if parsed is None:
+            return format_value(value, uncertainty, spec)
+        return _render(value, uncertainty, parsed)
+    if parsed is None and spec:
+        # Обычная спецификация (например, '.3f') применяется к каждой ячейке, как в format_value
+        return f"{format(value, spec)}{delimiter}{format(uncertainty, spec)}"
+    # Значение и неопределённость в отдельных ячейках, округлённые по одному разряду
+    value = as_decimal(value)
+    uncertainty = abs(as_decimal(uncertainty))
+    if parsed is not None and uncertainty and uncertainty.is_finite() and value.is_finite():
+        value, uncertainty, _ = _round(value, uncertainty, parsed.digits)
+    return f"{_fixed(value)}{delimiter}{_fixed(uncertainty)}"
+
+
+def write(file, *columns, spec='.2u', delimiter=',', header=None, split=False):
+    """
+    Построчно записывает таблицу величин в текстовый файл (CSV или текст) с ограниченным
+    расходом памяти: строки формируются блоками и сразу записываются.
+
+    :param file: Путь к файлу или текстовый файловый объект.
+    :param columns: Столбцы: итерируемые последовательности UDecimal (в том числе генераторы),
+                    массивы UDecimalArray или последовательности прочих значений (подписей),
+                    которые записываются через str().
+    :param spec: Спецификация формата величин.
+    :param delimiter: Разделитель ячеек.
+    :param header: Последовательность заголовков столбцов или None.
+    :param split: Записывать значение и неопределённость в отдельные ячейки.
+    :return: Число записанных строк (без заголовка).
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'w', encoding='utf-8', newline='') as f:
+            return write(f, *columns, spec=spec, delimiter=delimiter, header=header, split=split)
+    parsed = _parse(spec)
+    if header is not None:
+        file.write(delimiter.join(header) + '\n')
+    rows = zip(*(_pairs(column) for column in columns))
+    count = 0
+    lines = []
+    for row in rows:
+        lines.append(delimiter.join(_cell(value, uncertainty, spec, parsed, split, delimiter)
+                                    for value, uncertainty in row))
+        if len(lines) == _CHUNK:
+            file.write('\n'.join(lines) + '\n')
+            count += len(lines)
+            lines.clear()
+    if lines:
+        file.write('\n'.join(lines) + '\n')
+        count += len(lines)
+    return count
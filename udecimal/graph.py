@@ -0,0 +1,228 @@
+# graph.py
+
+# Ленивый граф выражений: узлы хранят операцию и операнды, значения вычисляются
+# прямым проходом при первом обращении, а производные по базовым переменным —
+# одним обратным проходом (reverse mode) от запрошенного результата.
+#
+# Узлы могут быть общими для нескольких потоков (устранение общих подвыражений),
+# поэтому проходы допускают одновременное вычисление тех же узлов другим потоком:
+# частные производные записываются раньше значения, производные раньше сброса _node,
+# а ссылка на узел читается один раз.
+
+
+class _Node:
+    """
+    Операция ленивого графа.
+
+    :ivar kind: Имя операции (ключ в KERNELS).
+    :ivar args: Операнды: экземпляры UDecimal или «сырые» константы бэкенда.
+    :ivar mask: Для каждого операнда — является ли он экземпляром UDecimal.
+    :ivar partials: Частные производные по операндам, заполняются прямым проходом.
+    """
+    __slots__ = ('kind', 'args', 'mask', 'partials')
+
+    def __init__(self, kind, args, mask):
+        self.kind = kind
+        self.args = args
+        self.mask = mask
+        self.partials = None
+
+
+class _ReactiveNode(_Node):
+    """
+    Операция графа, построенного в реактивном режиме (см. udecimal.reactive).
+
+    В отличие от обычного узла не отбрасывается после вычисления производных: при изменении
+    базовой переменной значение, частные производные и карта производных величины
+    сбрасываются и вычисляются заново по тому же узлу.
+    """
+    __slots__ = ()
+
+
+def _require_positive(x, message):
+    if x <= 0:
+        raise ValueError(message)
+
+
+_LOG_DOMAIN = "Логарифм определён только для положительных чисел."
+_POW_DOMAIN = "Основание степени должно быть положительным числом для учёта неопределённости."
+
+
+# Локальные ядра: значение операции и частные производные по каждому операнду
+def _add(b, x, y):
+    return b.add(x, y), (b.one, b.one)
+
+
+def _sub(b, x, y):
+    return b.sub(x, y), (b.one, b.neg(b.one))
+
+
+def _mul(b, x, y):
+    return b.mul(x, y), (y, x)
+
+
+def _div(b, x, y):
+    value = b.div(x, y)
+    return value, (b.div(b.one, y), b.neg(b.div(value, y)))
+
+
+def _pow(b, x, p):
+    _require_positive(x, _POW_DOMAIN)
+    y, dy_dx, dy_dp = b.pow_d(x, p)
+    return y, (dy_dx, dy_dp)
+
+
+def _pow_constant(b, x, p):
+    _require_positive(x, _POW_DOMAIN)
+    y, dy_dx, _ = b.pow_d(x, p, exponent_derivative=False)
+    return y, (dy_dx, None)
+
+
+def _ln(b, x):
+    _require_positive(x, _LOG_DOMAIN)
+    y, d = b.ln_d(x)
+    return y, (d,)
+
+
+def _log10(b, x):
+    _require_positive(x, _LOG_DOMAIN)
+    y, d = b.log10_d(x)
+    return y, (d,)
+
+
+def _unary(name):
+    def kernel(b, x):
+        y, d = getattr(b, name)(x)
+        return y, (d,)
+    return kernel
+
+
+KERNELS = {
+    'add': _add,
+    'sub': _sub,
+    'mul': _mul,
+    'div': _div,
+    'pow': _pow,
+    'pow_constant': _pow_constant,
+    'ln': _ln,
+    'log10': _log10,
+    'exp': _unary('exp_d'),
+    'sin': _unary('sin_d'),
+    'cos': _unary('cos_d'),
+    'tan': _unary('tan_d'),
+}
+
+# Узлы других видов (udecimal.linalg) создаются с уже вычисленными значением и частными
+# производными, поэтому прямой проход их не вычисляет, а обратный проходит как обычно
+
+# Операции, результат которых не зависит от порядка операндов
+COMMUTATIVE = frozenset(('add', 'mul'))
+
+
+def _pending(item):
+    """
+    Узел, производные которого ещё не вычислены и выражаются через граф.
+    """
+    return item._node is not None and item._derivatives is None
+
+
+def evaluate(root):
+    """
+    Вычисляет значения всех невычисленных узлов подграфа root прямым проходом
+    (обход в глубину без рекурсии, каждый узел вычисляется один раз).
+    """
+    stack = [root]
+    while stack:
+        item = stack[-1]
+        node = item._node
+        if item._value is not None or node is None:
+            stack.pop()
+            continue
+        ready = True
+        for arg, variable in zip(node.args, node.mask):
+            if variable and arg._value is None:
+                stack.append(arg)
+                ready = False
+        if not ready:
+            continue
+        stack.pop()
+        backend = item._backend
+        convert = backend.convert
+        values = []
+        for arg, variable in zip(node.args, node.mask):
+            if variable:
+                value = arg._value
+                if arg._backend is not backend and arg._backend.raw_type is not backend.raw_type:
+                    value = convert(value)
+                values.append(value)
+            else:
+                values.append(arg)
+        value, node.partials = KERNELS[node.kind](backend, *values)
+        item._value = value
+
+
+def _topological(root):
+    """
+    Возвращает невычисленные узлы подграфа root в порядке от операндов к результату.
+    """
+    order = []
+    visited = set()
+    stack = [(root, False)]
+    while stack:
+        item, expanded = stack.pop()
+        if expanded:
+            order.append(item)
+            continue
+        node = item._node
+        if id(item) in visited or node is None:
+            continue
+        visited.add(id(item))
+        stack.append((item, True))
+        for arg, variable in zip(node.args, node.mask):
+            if variable and _pending(arg) and id(arg) not in visited:
+                stack.append((arg, False))
+    return order
+
+
+def sensitivities(root):
+    """
+    Вычисляет разреженную карту производных {лист: производная} для узла root
+    одним обратным проходом по графу.
+
+    Сопряжённые значения (adjoint) накапливаются в узлах графа; на границе графа —
+    базовых переменных и величин с уже известными производными — они умножаются
+    на готовые карты производных один раз на каждую граничную величину.
+    """
+    evaluate(root)
+    backend = root._backend
+    mul = backend.mul
+    add = backend.add
+    adjoint = {id(root): backend.one}
+    boundary = {}  # {id: (величина, сопряжённое значение)}
+    for item in reversed(_topological(root)):
+        key = id(item)
+        a = adjoint.pop(key, None)
+        if a is None:
+            continue
+        node = item._node
+        if node is None:
+            # Производные узла уже вычислены другим потоком
+            boundary[key] = (item, add(boundary[key][1], a)) if key in boundary else (item, a)
+            continue
+        for arg, variable, partial in zip(node.args, node.mask, node.partials):
+            if not variable:
+                continue
+            contribution = mul(a, partial)
+            key = id(arg)
+            if _pending(arg):
+                adjoint[key] = add(adjoint[key], contribution) if key in adjoint else contribution
+            elif key in boundary:
+                boundary[key] = (arg, add(boundary[key][1], contribution))
+            else:
+                boundary[key] = (arg, contribution)
+    result = {}
+    for arg, a in boundary.values():
+        for leaf, d in arg._operand(backend)[1].items():
+            term = mul(a, d)
+            result[leaf] = add(result[leaf], term) if leaf in result else term
+    return result
@@ -0,0 +1,268 @@
+# instrumentation.py
+
+import functools
+import sys
+import threading
+import time
+
+from . import backends
+from .backends import DecimalBackend, MpmathBackend, _MpmathFunctions
+from .registry import CovarianceRegistry, default_registry
+from .udecimal import UDecimal
+
+# Операторы и функции UDecimal: имя метода -> имя в статистике.
+# __radd__ и __rmul__ делегируют __add__ и __mul__ и учитываются через них.
+_OPERATIONS = {
+    '__add__': 'add',
+    '__sub__': 'sub',
+    '__rsub__': 'rsub',
+    '__mul__': 'mul',
+    '__truediv__': 'truediv',
+    '__rtruediv__': 'rtruediv',
+    '__pow__': 'pow',
+    'ln': 'ln',
+    'exp': 'exp',
+    'log10': 'log10',
+    'sin': 'sin',
+    'cos': 'cos',
+    'tan': 'tan',
+}
+
+# Функции, вычисляемые через mpmath в бэкендах 'decimal' и 'mpmath'
+_MPMATH_FUNCTIONS = (
+    'ln', 'log10', 'exp', 'sin', 'cos', 'tan', 'pow',
+    'ln_d', 'exp_d', 'log10_d', 'sin_d', 'cos_d', 'tan_d', 'pow_d',
+)
+
+
+def _bucket(size):
+    """
+    Корзина гистограммы по степеням двойки: '0', '1', '2-3', '4-7', ...
+    """
+    if size < 2:
+        return str(size)
+    low = 1 << (size.bit_length() - 1)
+    return f"{low}-{2 * low - 1}"
+
+
+class Statistics:
+    """
+    Сбор статистики вычислений UDecimal.
+
+    При включении методы UDecimal, функции бэкендов и хранилища ковариаций
+    заменяются обёртками, а при выключении восстанавливаются, поэтому в выключенном
+    состоянии инструментирование ничего не стоит. Можно использовать как менеджер
+    контекста: with udecimal.stats(): ...
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._patches = None  # [(объект, атрибут, исходное значение)] при включённом сборе
+        self.reset()
+
+    @property
+    def enabled(self):
+        """
+        Включён ли сбор статистики.
+        """
+        return self._patches is not None
+
+    def reset(self):
+        """
+        Обнуляет собранную статистику.
+        """
+        with self._lock:
+            self._operations = {}
+            self._timings = {}
+            self._contributors = {}
+            self._covariance_lookups = {}
+            self._created = 0
+
+    def snapshot(self):
+        """
+        Возвращает копию собранной статистики в виде словаря.
+        """
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'operations': dict(self._operations),
+                'timings': {name: dict(item) for name, item in self._timings.items()},
+                'contributors': dict(self._contributors),
+                'covariance_lookups': dict(self._covariance_lookups),
+                'id_map': {'created': self._created, 'live': len(UDecimal.id_map)},
+            }
+
+    def to_json(self, **kwargs):
+        """
+        Возвращает снимок статистики в формате JSON.
+
+        :param kwargs: Параметры json.dumps.
+        """
+        import json
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def enable(self):
+        """
+        Включает сбор статистики.
+        """
+        if self.enabled:
+            return self
+        self._patches = []
+        for method, name in _OPERATIONS.items():
+            self._patch(UDecimal, method, self._count_operation(getattr(UDecimal, method), name))
+        self._patch(UDecimal, '__init__', self._count_creation(UDecimal.__init__))
+        self._patch(UDecimal, '_from_leaf', classmethod(self._count_creation(UDecimal._from_leaf.__func__)))
+        for name in _MPMATH_FUNCTIONS:
+            self._patch(_MpmathFunctions, name, self._timed(getattr(_MpmathFunctions, name), f'mpmath.{name}'))
+        for backend in list(backends._INSTANCES):
+            self._patch_sqrt(backend)
+        for cls in (DecimalBackend, MpmathBackend):
+            self._patch(cls, '__init__', self._instrument_backend(cls.__init__))
+        self._patch(CovarianceRegistry, 'entries', self._count_lookups(CovarianceRegistry.entries))
+        return self
+
+    def disable(self):
+        """
+        Выключает сбор статистики и восстанавливает исходные функции.
+        """
+        if not self.enabled:
+            return self
+        for owner, attribute, original in reversed(self._patches):
+            if original is None:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+        self._patches = None
+        return self
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def _patch(self, owner, attribute, replacement):
+        # Для классов сохраняется только собственный атрибут, чтобы не перенести
+        # унаследованную функцию в подкласс при восстановлении
+        if isinstance(owner, type):
+            original = owner.__dict__.get(attribute)
+        else:
+            original = getattr(owner, attribute)
+        self._patches.append((owner, attribute, original))
+        setattr(owner, attribute, replacement)
+
+    def _patch_sqrt(self, backend):
+        name = 'decimal.sqrt' if isinstance(backend, DecimalBackend) else 'mpmath.sqrt'
+        self._patch(backend, 'sqrt', self._timed(backend.sqrt, name))
+
+    def _count_operation(self, func, name):
+        statistics = self
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            result = func(*args)
+            derivatives = getattr(result, '_derivatives', None)
+            with statistics._lock:
+                operations = statistics._operations
+                operations[name] = operations.get(name, 0) + 1
+                if derivatives is not None:
+                    bucket = _bucket(len(derivatives))
+                    histogram = statistics._contributors
+                    histogram[bucket] = histogram.get(bucket, 0) + 1
+            return result
+        return wrapper
+
+    def _count_creation(self, func):
+        statistics = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            with statistics._lock:
+                statistics._created += 1
+            return result
+        return wrapper
+
+    def _timed(self, func, name):
+        statistics = self
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                with statistics._lock:
+                    item = statistics._timings.get(name)
+                    if item is None:
+                        item = statistics._timings[name] = {'calls': 0, 'seconds': 0.0}
+                    item['calls'] += 1
+                    item['seconds'] += elapsed
+        return wrapper
+
+    def _instrument_backend(self, init):
+        statistics = self
+
+        @functools.wraps(init)
+        def wrapper(backend, *args, **kwargs):
+            init(backend, *args, **kwargs)
+            if statistics.enabled:
+                statistics._patch_sqrt(backend)
+        return wrapper
+
+    def _count_lookups(self, func):
+        statistics = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            bucket = _bucket(len(result))
+            with statistics._lock:
+                histogram = statistics._covariance_lookups
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+            return result
+        return wrapper
+
+
+_statistics = Statistics()
+
+
+def stats():
+    """
+    Возвращает общий сборщик статистики вычислений UDecimal.
+
+    Пример:
+        udecimal.stats().enable()
+        ...
+        print(udecimal.stats().to_json(indent=2))
+    """
+    return _statistics
+
+
+def memory_report():
+    """
+    Оценка памяти, занимаемой базовыми переменными и хранилищем ковариаций.
+
+    Перед подсчётом из хранилища удаляются ковариации переменных, уже удалённых сборщиком.
+
+    :return: Словарь: число живых базовых переменных и оценка их объёма, сведения
+             о хранилище ковариаций (см. CovarianceRegistry.memory) и общий объём в байтах.
+    """
+    covariances = default_registry.memory()
+    live = 0
+    size = 0
+    for key in list(UDecimal.id_map):
+        variable = UDecimal.id_map.get(key)
+        if variable is None:
+            continue
+        live += 1
+        size += sys.getsizeof(variable) + sys.getsizeof(variable._value) + sys.getsizeof(variable._leaf)
+        if variable._derivatives is not None:
+            size += sys.getsizeof(variable._derivatives)
+    return {
+        'variables': {'live': live, 'bytes': size},
+        'covariances': covariances,
+        'bytes': size + covariances['bytes'],
+    }
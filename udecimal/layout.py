@@ -0,0 +1,45 @@
+# layout.py
+
+# Разбор структуры аргументов и результатов: величины UDecimal (в том числе во вложенных
+# списках и кортежах) заменяются местами Slot и подставляются обратно по номерам.
+# Используется при передаче величин в рабочие процессы (parallel) и при трассировке
+# функций (compiler).
+
+from .udecimal import UDecimal
+
+
+class Slot:
+    """
+    Место величины UDecimal в структуре аргументов или результатов.
+    """
+    __slots__ = ('index',)
+
+    def __init__(self, index):
+        self.index = index
+
+
+def extract(obj, values):
+    """
+    Заменяет величины UDecimal в obj (в том числе во вложенных списках и кортежах) местами Slot.
+
+    :param obj: Величина, число или вложенная структура из списков и кортежей.
+    :param values: Список, в который добавляются найденные величины.
+    :return: Структура той же формы с местами Slot вместо величин.
+    """
+    if isinstance(obj, UDecimal):
+        values.append(obj)
+        return Slot(len(values) - 1)
+    if type(obj) in (tuple, list):
+        return type(obj)(extract(item, values) for item in obj)
+    return obj
+
+
+def insert(obj, values):
+    """
+    Подставляет values[i] на места Slot(i) в структуре, полученной от extract.
+    """
+    if isinstance(obj, Slot):
+        return values[obj.index]
+    if type(obj) in (tuple, list):
+        return type(obj)(insert(item, values) for item in obj)
+    return obj
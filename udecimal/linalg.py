@@ -0,0 +1,454 @@
+# linalg.py
+
+# Линейная алгебра над матрицами величин UDecimal: произведение, решение систем,
+# обращение и определитель. Значения вычисляются одной матричной операцией NumPy
+# (float64 для бэкенда 'float', иначе Decimal в dtype=object), а неопределённости —
+# по аналитическим производным матричных операций:
+#   d(AB) = dA·B + A·dB,  d(A⁻¹) = -A⁻¹·dA·A⁻¹,  dx = A⁻¹·(db - dA·x),  d det A = tr(adj A·dA).
+# Ковариация результатов вычисляется как J·C·Jᵀ, где J — якобиан по элементам входных
+# матриц, а C — их ковариационная матрица.
+
+from decimal import Decimal, localcontext as decimal_localcontext
+
+import numpy as np
+
+from .backends import DecimalBackend, as_decimal, resolve_backend
+from .context import get_backend
+from .graph import _Node
+from .registry import default_registry
+from .udecimal import UDecimal
+
+
+class _Linear(_Node):
+    """
+    Узел ленивого графа для элемента результата матричной операции.
+
+    Значение элемента вычислено сразу, а частные производные по элементам входных матриц
+    хранятся отрезками строк якобиана и преобразуются в тип бэкенда только при вычислении
+    карты производных (обратным проходом, см. udecimal.graph.sensitivities). Поэтому
+    результат с десятками тысяч входных элементов создаётся без построения их карт производных.
+
+    :ivar segments: Отрезки (элементы, маска, строка якобиана): операнды узла — их объединение.
+    :ivar convert: Преобразование производной в тип бэкенда результата.
+    """
+    __slots__ = ('segments', 'convert')
+
+    def __init__(self, segments, convert):
+        self.kind = 'linear'
+        self.segments = segments
+        self.convert = convert
+
+    @property
+    def args(self):
+        return tuple(item for items, _, _ in self.segments for item in items)
+
+    @property
+    def mask(self):
+        return tuple(variable for _, mask, _ in self.segments for variable in mask)
+
+    @property
+    def partials(self):
+        convert = self.convert
+        return [convert(d) for _, _, row in self.segments for d in row.tolist()]
+
+
+def _work_backend(backend):
+    """
+    Бэкенд Decimal, в котором вычисляются матричные операции для бэкенда, отличного от 'float'.
+    """
+    if isinstance(backend, DecimalBackend):
+        return backend
+    return resolve_backend('decimal', max(backend.digits, resolve_backend('decimal').digits))
+
+
+class _Operand:
+    """
+    Входная матрица: элементы (величины UDecimal или числа) и их значения в рабочем типе.
+
+    :ivar items: Элементы матрицы построчно.
+    :ivar mask: Для каждого элемента — является ли он экземпляром UDecimal.
+    :ivar values: Значения элементов (массив float64 или Decimal той же формы).
+    """
+    __slots__ = ('items', 'mask', 'values')
+
+    def __init__(self, matrix, backend, work, dims):
+        array = np.asarray(matrix, dtype=object)
+        if array.ndim not in dims:
+            raise ValueError("Ожидается матрица." if dims == (2,) else "Ожидается вектор или матрица.")
+        self.items = tuple(array.ravel().tolist())
+        self.mask = tuple(isinstance(item, UDecimal) for item in self.items)
+        raw = [item.value if variable else backend.convert(item) for item, variable in zip(self.items, self.mask)]
+        if work is None:
+            values = np.array(raw, dtype=np.float64)
+        else:
+            values = np.empty(len(raw), dtype=object)
+            values[:] = [as_decimal(value) for value in raw]
+        self.values = values.reshape(array.shape)
+
+
+def _square(operand):
+    shape = operand.values.shape
+    if shape[0] != shape[1]:
+        raise ValueError("Матрица должна быть квадратной.")
+    return shape[0]
+
+
+def _invert(a, work):
+    """
+    Обращает матрицу Decimal (dtype=object) методом Гаусса — Жордана с выбором главного элемента.
+
+    :param a: Квадратная матрица Decimal.
+    :param work: Бэкенд Decimal, задающий точность.
+    :return: Обратная матрица и определитель.
+    """
+    n = len(a)
+    identity = np.full((n, n), Decimal(0), dtype=object)
+    np.fill_diagonal(identity, Decimal(1))
+    m = np.concatenate((a, identity), axis=1)
+    det = Decimal(1)
+    with decimal_localcontext(work.context):
+        for c in range(n):
+            p = c + int(np.argmax(np.abs(m[c:, c])))
+            if m[p, c] == 0:
+                raise np.linalg.LinAlgError("Матрица вырождена.")
+            if p != c:
+                m[[c, p]] = m[[p, c]]
+                det = -det
+            pivot = m[c, c]
+            det *= pivot
+            m[c] = m[c] / pivot
+            factors = m[:, c].copy()
+            factors[c] = 0
+            m -= np.outer(factors, m[c])
+    return m[:, n:], det
+
+
+def _determinant(a, work):
+    """
+    Определитель матрицы Decimal методом Гаусса с выбором главного элемента (без обращения).
+    """
+    m = a.copy()
+    n = len(m)
+    det = Decimal(1)
+    with decimal_localcontext(work.context):
+        for c in range(n):
+            p = c + int(np.argmax(np.abs(m[c:, c])))
+            if m[p, c] == 0:
+                return Decimal(0)
+            if p != c:
+                m[[c, p]] = m[[p, c]]
+                det = -det
+            det *= m[c, c]
+            m[c + 1:] -= np.outer(m[c + 1:, c] / m[c, c], m[c])
+    return det
+
+
+def _cofactors(a, work):
+    """
+    Определитель и матрица алгебраических дополнений (adj A)ᵀ, то есть d det A / dA.
+
+    Для невырожденной матрицы дополнения равны det A · A⁻ᵀ. Вырожденная матрица имеет
+    определитель 0, но её дополнения определены: для float64 они вычисляются по сингулярному
+    разложению A = U·S·Vᵀ как det U · det V · U·adj S·Vᵀ, где adj S = diag(Π_{j≠i} s_j),
+    а для Decimal — как определители миноров.
+    """
+    if work is None:
+        value = np.linalg.det(a)
+        u, singular, vt = np.linalg.svd(a)
+        ones = np.ones(1)
+        before = np.concatenate((ones, np.cumprod(singular[:-1])))
+        after = np.concatenate((np.cumprod(singular[:0:-1])[::-1], ones))
+        sign = np.sign(np.linalg.det(u) * np.linalg.det(vt))
+        return value, sign * (u * (before * after)) @ vt
+    try:
+        inverse, value = _invert(a, work)
+    except np.linalg.LinAlgError:
+        pass
+    else:
+        with decimal_localcontext(work.context):
+            return value, value * inverse.T
+    n = len(a)
+    cofactors = np.empty((n, n), dtype=object)
+    rows = np.arange(n)
+    for k in range(n):
+        for l in range(n):
+            minor = a[np.ix_(rows != k, rows != l)]
+            cofactors[k, l] = _determinant(minor, work) if (k + l) % 2 == 0 else -_determinant(minor, work)
+    return Decimal(0), cofactors
+
+
+def _inverse(a, work):
+    """
+    Обратная матрица и определитель в рабочем типе (для float64 определитель не вычисляется).
+    """
+    if work is None:
+        return np.linalg.inv(a), None
+    return _invert(a, work)
+
+
+def _independent(items, mask, backend):
+    """
+    Являются ли элементы различными базовыми переменными без заданных между ними ковариаций.
+    """
+    leaves = [item._leaf for item, variable in zip(items, mask) if variable]
+    if any(leaf is None for leaf in leaves):
+        return False
+    ids = {leaf.id for leaf in leaves}
+    return len(ids) == len(leaves) and not (default_registry and default_registry.entries(backend, ids))
+
+
+def _leaf_space(jacobian, items, mask, backend, work):
+    """
+    Переводит якобиан по элементам входных матриц в якобиан по листам J·S, где S —
+    разреженная матрица чувствительностей элементов к листам.
+
+    :return: Якобиан по листам и список листов, соответствующих его столбцам.
+    """
+    convert = float if work is None else as_decimal
+    rows, columns, coefficients = [], [], []
+    index = {}
+    leaves = []
+    single = True  # Каждый элемент — отдельная базовая переменная
+    for p, (item, variable) in enumerate(zip(items, mask)):
+        if not variable:
+            continue
+        if item._leaf is not None:
+            derivatives = ((item._leaf, None),)
+        else:
+            derivatives = item._operand(backend)[1].items()
+            single = False
+        for leaf, d in derivatives:
+            column = index.get(leaf)
+            if column is None:
+                column = index[leaf] = len(leaves)
+                leaves.append(leaf)
+            elif single:
+                single = False
+            rows.append(p)
+            columns.append(column)
+            coefficients.append(1 if d is None else convert(d))
+    if single:
+        return (jacobian if len(rows) == len(items) else jacobian[:, rows]), leaves
+    order = np.argsort(columns, kind='stable')
+    columns = np.asarray(columns)[order]
+    terms = jacobian[:, np.asarray(rows)[order]]
+    weights = np.empty(len(order), dtype=terms.dtype)
+    weights[:] = [coefficients[k] for k in order]
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    return np.add.reduceat(terms * weights, starts, axis=1), leaves
+
+
+def _propagate(jacobian, leaves, backend, work, full):
+    """
+    Ковариация результатов J·C·Jᵀ по якобиану относительно листов (full) или только её диагональ.
+
+    C — ковариационная матрица листов: дисперсии на диагонали и ненулевые ковариации из хранилища.
+    """
+    convert = float if work is None else as_decimal
+    variances = np.empty(len(leaves), dtype=jacobian.dtype)
+    variances[:] = [convert(leaf.uncertainty) ** 2 for leaf in leaves]
+    entries = []
+    if default_registry:
+        index = {leaf.id: k for k, leaf in enumerate(leaves)}
+        entries = [(index[i], index[j], convert(c)) for i, j, c in default_registry.entries(backend, index)]
+    if full:
+        result = (jacobian * variances) @ jacobian.T
+    else:
+        result = (jacobian * jacobian) @ variances
+    if entries:
+        first, second, values = zip(*entries)
+        weights = np.empty(len(values), dtype=jacobian.dtype)
+        weights[:] = values
+        left = jacobian[:, list(first)] * weights
+        right = jacobian[:, list(second)]
+        # Хранится только верхний треугольник, поэтому каждая пара учитывается дважды
+        if full:
+            term = left @ right.T
+            result = result + term + term.T
+        else:
+            result = result + 2 * (left * right).sum(axis=1)
+    return result
+
+
+def _uncertainties(variances, work):
+    if work is None:
+        return np.sqrt(np.maximum(variances, 0)).tolist()
+    with decimal_localcontext(work.context):
+        return [max(v, 0).sqrt() for v in variances]
+
+
+def _result(values, nodes, uncertainties, covariance, shape, backend, work):
+    """
+    Создаёт элементы результата и собирает их в массив NumPy (dtype=object) заданной формы.
+
+    :param values: Значения элементов в рабочем типе (построчно).
+    :param nodes: Для каждого элемента — отрезки (элементы, маска, строка якобиана), см. _Linear.
+    :param uncertainties: Неопределённости элементов в рабочем типе или None, если они
+                          вычисляются по производным при первом обращении.
+    :param covariance: Совместная ковариационная матрица или None.
+    """
+    convert = backend.convert
+    values = values.ravel().tolist()
+    items = []
+    for k, (value, segments) in enumerate(zip(values, nodes)):
+        item = UDecimal._derived(convert(value), None, backend)
+        item._node = _Linear(segments, convert)
+        if uncertainties is not None:
+            item._uncertainty = convert(uncertainties[k])
+        items.append(item)
+    result = np.empty(len(items), dtype=object)
+    result[:] = items
+    result = result.reshape(shape) if shape else result[0]
+    if covariance is None:
+        return result
+    if work is not None:
+        covariance = np.frompyfunc(convert, 1, 1)(covariance)
+    return result, covariance
+
+
+def _dense(jacobian, values, args, mask, shape, backend, work, covariance):
+    """
+    Результат операции с плотным якобианом по всем элементам входных матриц.
+    """
+    with decimal_localcontext(work.context if work is not None else None):
+        projected, leaves = _leaf_space(jacobian, args, mask, backend, work)
+        joint = _propagate(projected, leaves, backend, work, covariance)
+        diagonal = joint.diagonal() if covariance else joint
+    nodes = [((args, mask, row),) for row in jacobian]
+    return _result(values, nodes, _uncertainties(diagonal, work), joint if covariance else None,
+                   shape, backend, work)
+
+
+def _context():
+    backend = get_backend()
+    work = None if backend.raw_type is float else _work_backend(backend)
+    return backend, work
+
+
+def matmul(a, b, covariance=False):
+    """
+    Произведение матриц величин A·B.
+
+    Каждый элемент результата зависит только от строки A и столбца B, поэтому якобиан
+    строится целиком только для совместной ковариации или коррелированных элементов.
+
+    :param a: Матрица n×m (вложенные списки или массив NumPy) из величин UDecimal или чисел.
+    :param b: Матрица m×p.
+    :param covariance: Вернуть также совместную ковариационную матрицу элементов результата.
+    :return: Массив NumPy n×p (dtype=object) из величин UDecimal; при covariance=True —
+             пара (результат, ковариационная матрица (n·p)×(n·p) элементов в порядке ravel()).
+    """
+    backend, work = _context()
+    a = _Operand(a, backend, work, (2,))
+    b = _Operand(b, backend, work, (2,))
+    (n, m), (m2, p) = a.values.shape, b.values.shape
+    if m != m2:
+        raise ValueError("Размеры матриц не согласованы.")
+    args = a.items + b.items
+    mask = a.mask + b.mask
+    with decimal_localcontext(work.context if work is not None else None):
+        values = a.values @ b.values
+        rows_a = [(a.items[i * m:(i + 1) * m], a.mask[i * m:(i + 1) * m], a.values[i]) for i in range(n)]
+        columns_b = [(b.items[j::p], b.mask[j::p], b.values[:, j]) for j in range(p)]
+        # Элемент C_ij зависит от строки i матрицы A (производные B_kj) и столбца j матрицы B (производные A_ik)
+        nodes = [((ia, ma, bj), (jb, mb, ai)) for ia, ma, ai in rows_a for jb, mb, bj in columns_b]
+        joint = None
+        if covariance:
+            # dC_ij/dA_ik = B_kj, dC_ij/dB_kj = A_ik
+            zero = 0.0 if work is None else Decimal(0)
+            jacobian = np.full((n * p, n * m + m * p), zero, dtype=a.values.dtype)
+            i, j, k = np.meshgrid(np.arange(n), np.arange(p), np.arange(m), indexing='ij')
+            jacobian[i * p + j, i * m + k] = b.values[k, j]
+            jacobian[i * p + j, n * m + k * p + j] = a.values[i, k]
+            projected, leaves = _leaf_space(jacobian, args, mask, backend, work)
+            joint = _propagate(projected, leaves, backend, work, True)
+            uncertainties = _uncertainties(joint.diagonal(), work)
+        elif _independent(args, mask, backend):
+            # var(C_ij) = Σ_k B_kj²·var(A_ik) + A_ik²·var(B_kj)
+            convert = float if work is None else as_decimal
+            zero = 0.0 if work is None else Decimal(0)
+            variances = np.empty(len(args), dtype=a.values.dtype)
+            variances[:] = [convert(item.uncertainty) ** 2 if variable else zero for item, variable in zip(args, mask)]
+            va = variances[:n * m].reshape(n, m)
+            vb = variances[n * m:].reshape(m, p)
+            uncertainties = _uncertainties((va @ (b.values * b.values) + (a.values * a.values) @ vb).ravel(), work)
+        else:
+            # Коррелированные элементы: неопределённости вычисляются по производным при обращении
+            uncertainties = None
+    return _result(values, nodes, uncertainties, joint, (n, p), backend, work)
+
+
+def solve(a, b, covariance=False):
+    """
+    Решение системы линейных уравнений A·x = b.
+
+    Производные: dx = A⁻¹·(db - dA·x), то есть dx_i/db_k = (A⁻¹)_ik и dx_i/dA_kl = -(A⁻¹)_ik·x_l.
+
+    :param a: Квадратная матрица n×n из величин UDecimal или чисел.
+    :param b: Вектор длины n или матрица n×k правых частей.
+    :param covariance: Вернуть также совместную ковариационную матрицу элементов решения.
+    :return: Массив NumPy (dtype=object) формы b из величин UDecimal; при covariance=True —
+             пара (решение, ковариационная матрица элементов в порядке ravel()).
+    """
+    backend, work = _context()
+    a = _Operand(a, backend, work, (2,))
+    b = _Operand(b, backend, work, (1, 2))
+    n = _square(a)
+    shape = b.values.shape
+    if shape[0] != n:
+        raise ValueError("Размеры матрицы и правой части не согласованы.")
+    rhs = b.values.reshape(n, -1)
+    k = rhs.shape[1]
+    with decimal_localcontext(work.context if work is not None else None):
+        inverse, _ = _inverse(a.values, work)
+        x = np.linalg.solve(a.values, rhs) if work is None else inverse @ rhs
+        # Якобиан по элементам A: строка (i, c), столбец (r, l) — -(A⁻¹)_ir · x_lc
+        da = -(inverse[:, None, :, None] * x.T[None, :, None, :]).reshape(n * k, n * n)
+        # Якобиан по элементам b: строка (i, c), столбец (r, c') — (A⁻¹)_ir · δ_cc'
+        db = (inverse[:, None, :, None] * np.eye(k, dtype=np.int64)[None, :, None, :]).reshape(n * k, n * k)
+    jacobian = np.concatenate((da, db), axis=1)
+    return _dense(jacobian, x, a.items + b.items, a.mask + b.mask, shape, backend, work, covariance)
+
+
+def inv(a, covariance=False):
+    """
+    Обратная матрица величин.
+
+    Производные: d(A⁻¹) = -A⁻¹·dA·A⁻¹, то есть d(A⁻¹)_ij/dA_kl = -(A⁻¹)_ik·(A⁻¹)_lj.
+    Каждый элемент результата зависит от всех n² элементов A, поэтому якобиан имеет
+    n⁴ элементов.
+
+    :param a: Квадратная матрица n×n из величин UDecimal или чисел.
+    :param covariance: Вернуть также совместную ковариационную матрицу элементов результата.
+    :return: Массив NumPy n×n (dtype=object) из величин UDecimal; при covariance=True —
+             пара (результат, ковариационная матрица n²×n² элементов в порядке ravel()).
+    """
+    backend, work = _context()
+    a = _Operand(a, backend, work, (2,))
+    n = _square(a)
+    with decimal_localcontext(work.context if work is not None else None):
+        inverse, _ = _inverse(a.values, work)
+        jacobian = -(inverse[:, None, :, None] * inverse.T[None, :, None, :]).reshape(n * n, n * n)
+    return _dense(jacobian, inverse, a.items, a.mask, (n, n), backend, work, covariance)
+
+
+def det(a, covariance=False):
+    """
+    Определитель матрицы величин.
+
+    Производные: d det A / dA_kl — алгебраическое дополнение элемента A_kl, для невырожденной
+    матрицы равное det A · (A⁻¹)_lk. Вырожденная матрица допускается: определитель равен 0,
+    а его производные остаются определёнными.
+
+    :param a: Квадратная матрица n×n из величин UDecimal или чисел.
+    :param covariance: Вернуть также матрицу 1×1 с дисперсией определителя.
+    :return: Величина UDecimal; при covariance=True — пара (величина, матрица 1×1).
+    """
+    backend, work = _context()
+    a = _Operand(a, backend, work, (2,))
+    n = _square(a)
+    with decimal_localcontext(work.context if work is not None else None):
+        value, cofactors = _cofactors(a.values, work)
+        jacobian = cofactors.reshape(1, n * n)
+    values = np.array([value], dtype=a.values.dtype)
+    return _dense(jacobian, values, a.items, a.mask, (), backend, work, covariance)
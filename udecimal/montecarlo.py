@@ -0,0 +1,167 @@
+# montecarlo.py
+
+from concurrent.futures import ProcessPoolExecutor
+import warnings
+
+import numpy as np
+
+from .registry import default_registry, set_covariance_matrix
+from .udecimal import UDecimal
+
+
+class Samples(np.ndarray):
+    """
+    Массив выборок входной величины (float64).
+
+    Поддерживает методы UDecimal (ln, log10, exp, sin, cos, tan, sqrt), поэтому функцию,
+    написанную для UDecimal, можно без изменений вычислить над выборками.
+    """
+
+    def ln(self):
+        return np.log(self)
+
+    def log10(self):
+        return np.log10(self)
+
+    def exp(self):
+        return np.exp(self)
+
+    def sin(self):
+        return np.sin(self)
+
+    def cos(self):
+        return np.cos(self)
+
+    def tan(self):
+        return np.tan(self)
+
+    def sqrt(self):
+        return np.sqrt(self)
+
+
+def _factor(covariance):
+    """
+    Множитель L ковариационной матрицы (C = L·Lᵀ): разложение Холецкого или,
+    для вырожденной матрицы, спектральное разложение.
+    """
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        w, v = np.linalg.eigh(covariance)
+        if w.min() < -1e-12 * max(w.max(), 0):
+            raise ValueError("Ковариационная матрица не является положительно полуопределённой.") from None
+        return v * np.sqrt(np.clip(w, 0, None))
+
+
+def _chunk(func, mean, factor, size, seed):
+    """
+    Вычисляет функцию над одним блоком выборок и возвращает его статистики:
+    число конечных выборок, средние, матрицу сумм произведений отклонений, число выходов
+    функции и число отброшенных выборок с неконечными значениями.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    draws = mean + rng.standard_normal((size, len(mean))) @ factor.T
+    args = [np.ascontiguousarray(draws[:, i]).view(Samples) for i in range(len(mean))]
+    result = func(*args)
+    outputs = result if isinstance(result, (tuple, list)) else (result,)
+    values = np.column_stack([np.broadcast_to(np.asarray(out, dtype=np.float64), (size,)) for out in outputs])
+    values = values[np.isfinite(values).all(axis=1)]
+    count = len(values)
+    if not count:
+        width = values.shape[1]
+        return 0, np.zeros(width), np.zeros((width, width)), len(outputs), size
+    centre = values.mean(axis=0)
+    deviations = values - centre
+    return count, centre, deviations.T @ deviations, len(outputs), size - count
+
+
+def _merge(a, b):
+    """
+    Объединяет статистики двух блоков (формула Чана для параллельного расчёта дисперсии).
+    """
+    na, ma, sa = a
+    nb, mb, sb = b
+    if not na:
+        return b
+    if not nb:
+        return a
+    n = na + nb
+    delta = mb - ma
+    return n, ma + delta * (nb / n), sa + sb + np.outer(delta, delta) * (na * nb / n)
+
+
+def propagate(func, inputs, samples=100000, chunk_size=10000, seed=None, workers=None, nonfinite='raise'):
+    """
+    Распространяет неопределённость методом Монте-Карло.
+
+    Выборки входных величин генерируются из многомерного нормального распределения
+    с ковариациями из хранилища (через разложение Холецкого), функция вычисляется
+    векторно над блоками выборок, а статистики блоков объединяются потоково, поэтому
+    расход памяти ограничен размером блока.
+
+    :param func: Функция входных величин; получает массивы выборок Samples и возвращает
+                 массив или кортеж массивов.
+    :param inputs: Последовательность входных величин UDecimal.
+    :param samples: Общее число выборок.
+    :param chunk_size: Число выборок в блоке.
+    :param seed: Начальное значение генератора; результат воспроизводим при любом числе процессов.
+    :param workers: Число процессов для вычисления блоков (по умолчанию — в текущем процессе).
+    :param nonfinite: Обработка выборок, на которых функция вернула inf или nan:
+                      'raise' — исключение ValueError с числом таких выборок,
+                      'drop' — выборки отбрасываются с предупреждением RuntimeWarning,
+                      в котором указано их число (оценки становятся смещёнными).
+    :return: UDecimal или список UDecimal (если функция возвращает кортеж) с выборочными
+             средними и стандартными отклонениями; ковариации между результатами
+             регистрируются в хранилище ковариаций.
+    """
+    inputs = list(inputs)
+    if samples < 2:
+        raise ValueError("Число выборок должно быть не меньше 2.")
+    if chunk_size < 1:
+        raise ValueError("Размер блока должен быть положительным.")
+    if nonfinite not in ('raise', 'drop'):
+        raise ValueError("Параметр nonfinite должен быть 'raise' или 'drop'.")
+    mean = np.array([float(x.value) for x in inputs])
+    covariance = default_registry.covariance_matrix(inputs).astype(np.float64)
+    factor = _factor(covariance)
+    sizes = [chunk_size] * (samples // chunk_size)
+    if samples % chunk_size:
+        sizes.append(samples % chunk_size)
+    # Независимые потоки случайных чисел для каждого блока
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(func, mean, factor, size, child) for size, child in zip(sizes, seeds)]
+    if workers is None or workers <= 1:
+        results = (_chunk(*task) for task in tasks)
+        total = _accumulate(results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            total = _accumulate(executor.map(_chunk, *zip(*tasks)))
+    count, centre, sums, width, dropped = total
+    if dropped:
+        message = "Функция вернула неконечные значения на {} из {} выборок.".format(dropped, samples)
+        if nonfinite == 'raise':
+            raise ValueError(message)
+        warnings.warn(message + " Выборки отброшены.", RuntimeWarning, stacklevel=2)
+    if count < 2:
+        raise ValueError("Недостаточно конечных значений функции для оценки неопределённости.")
+    result_covariance = sums / (count - 1)
+    outputs = [UDecimal(repr(float(m)), repr(float(np.sqrt(result_covariance[i, i]))))
+               for i, m in enumerate(centre)]
+    if width == 1:
+        return outputs[0]
+    set_covariance_matrix(outputs, result_covariance)
+    return outputs
+
+
+def _accumulate(results):
+    """
+    Последовательно объединяет статистики блоков в порядке их номеров.
+    """
+    total = None
+    width = 0
+    dropped = 0
+    for count, centre, sums, width, skipped in results:
+        chunk = (count, centre, sums)
+        total = chunk if total is None else _merge(total, chunk)
+        dropped += skipped
+    return total + (width, dropped)
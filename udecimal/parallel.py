@@ -0,0 +1,83 @@
+# parallel.py
+
+"""
+Параллельное вычисление функции над наборами величин UDecimal в пуле процессов.
+
+Аргументы каждого блока вызовов сериализуются одним набором (см. serialization), поэтому
+вместе с ними в рабочий процесс передаётся подматрица ковариаций их базовых переменных.
+Результаты блока возвращаются тем же способом: их производные выражаются через исходные
+листы родительского процесса и через листы, созданные в рабочем процессе, а ковариации
+новых листов регистрируются в хранилище родителя. Поэтому корреляции между результатами
+разных вызовов и с исходными величинами сохраняются.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+
+from . import serialization
+from .context import getcontext, localcontext
+from .layout import extract, insert
+
+
+def _pack(obj):
+    values = []
+    layout = extract(obj, values)
+    return layout, serialization.dumps(values)
+
+
+def _unpack(layout, data):
+    return insert(layout, serialization.loads(data))
+
+
+def _settings():
+    """
+    Параметры активного контекста для воспроизведения в рабочем процессе.
+    """
+    context = getcontext()
+    backend = context.backend
+    prec = None if backend.name == 'float' else backend.digits
+    return backend.name, prec, context.lazy, context.reactive
+
+
+def _run(func, settings, layout, data):
+    """
+    Вычисляет функцию над блоком наборов аргументов в рабочем процессе.
+    """
+    backend, prec, lazy, reactive = settings
+    with localcontext(backend=backend, prec=prec, lazy=lazy, reactive=reactive):
+        calls = _unpack(layout, data)
+        return _pack([func(*args) for args in calls])
+
+
+def map(func, *iterables, workers=None, chunksize=None):
+    """
+    Вычисляет func над наборами аргументов в пуле процессов, как встроенная map.
+
+    Рабочие процессы используют бэкенд, точность и режимы (lazy, reactive) активного
+    контекста. Величины UDecimal в аргументах и результатах (в том числе во вложенных
+    списках и кортежах) передаются вместе с их ковариациями.
+
+    :param func: Функция верхнего уровня модуля (должна передаваться через pickle).
+    :param iterables: Последовательности аргументов; i-й вызов получает i-е элементы каждой.
+    :param workers: Число процессов (по умолчанию — число процессоров; 1 — без пула).
+    :param chunksize: Число вызовов в одной задаче (по умолчанию — около четырёх задач на процесс).
+    :return: Список результатов в порядке аргументов.
+    """
+    calls = list(zip(*iterables))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(calls) <= 1:
+        return [func(*args) for args in calls]
+    if chunksize is None:
+        chunksize = math.ceil(len(calls) / (4 * workers))
+    if chunksize < 1:
+        raise ValueError("Размер блока должен быть положительным.")
+    settings = _settings()
+    tasks = [_pack(calls[start:start + chunksize]) for start in range(0, len(calls), chunksize)]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        futures = [executor.submit(_run, func, settings, layout, data) for layout, data in tasks]
+        for future in futures:
+            results.extend(_unpack(*future.result()))
+    return results
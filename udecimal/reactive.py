@@ -0,0 +1,138 @@
+# reactive.py
+
+# Реактивный режим: граф зависимостей величин, построенных в контексте reactive=True.
+# Для каждой величины хранятся обратные рёбра — слабые ссылки на величины, в операндах
+# которых она участвует. UDecimal.update изменяет базовую переменную на месте и обходит
+# её конус зависимостей: сбрасываются карты производных (переменная получает новый лист)
+# и вычисленные неопределённости, а при изменении значения — и значения. Пересчёт
+# выполняется лениво при обращении (прямым и обратным проходом по графу, см.
+# udecimal.graph) и затрагивает только сброшенные узлы, поэтому работа на одно изменение
+# пропорциональна размеру затронутого конуса, а не всей модели.
+
+from collections import deque
+import threading
+import weakref
+
+
+class DependencyGraph:
+    """
+    Обратные рёбра реактивного графа: {id операнда: {id зависимой величины: слабая ссылка}}.
+
+    Регистрация выполняется под блокировкой. Зависимые величины хранятся по слабым ссылкам:
+    когда величина удаляется сборщиком, ссылка ставится в очередь, а её рёбра удаляются при
+    следующей регистрации или обходе (как в udecimal.registry.CovarianceRegistry).
+
+    Обновления и чтение зависимых величин из разных потоков должны упорядочиваться
+    вызывающим кодом: пересчёт одновременно с обновлением может вернуть значение,
+    вычисленное по частично сброшенному графу.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Блокировка изменений
+        self._dependents = {}  # {id операнда: {id зависимой величины: слабая ссылка}}
+        self._dead = deque()  # Слабые ссылки удалённых величин, ожидающие очистки
+
+    def __len__(self):
+        """
+        Число хранимых рёбер.
+        """
+        with self._lock:
+            self._prune()
+            return sum(len(refs) for refs in self._dependents.values())
+
+    def register(self, item):
+        """
+        Регистрирует величину как зависимую от её операндов.
+
+        :param item: Экземпляр UDecimal с узлом реактивного графа.
+        """
+        node = item._node
+        operands = tuple(dict.fromkeys(arg.id for arg, variable in zip(node.args, node.mask) if variable))
+        ref = weakref.KeyedRef(item, self._on_dead, (item.id, operands))
+        with self._lock:
+            self._prune()
+            dependents = self._dependents
+            for key in operands:
+                refs = dependents.get(key)
+                if refs is None:
+                    dependents[key] = {item.id: ref}
+                else:
+                    refs[item.id] = ref
+
+    def _on_dead(self, ref):
+        # Вызывается сборщиком в произвольном потоке, поэтому только ставит ссылку в очередь
+        self._dead.append(ref)
+
+    def _prune(self):
+        dead = self._dead
+        dependents = self._dependents
+        while dead:
+            ref = dead.popleft()
+            item_id, operands = ref.key
+            for key in operands:
+                refs = dependents.get(key)
+                if refs is not None and refs.get(item_id) is ref:
+                    del refs[item_id]
+                    if not refs:
+                        del dependents[key]
+
+    def dependents(self, item):
+        """
+        Возвращает живые величины, непосредственно зависящие от item.
+
+        :param item: Экземпляр UDecimal.
+        :return: Список экземпляров UDecimal.
+        """
+        refs = self._dependents.get(item.id)
+        if not refs:
+            return []
+        return [d for d in (ref() for ref in list(refs.values())) if d is not None]
+
+    def invalidate(self, source, value):
+        """
+        Сбрасывает вычисленные данные величин, зависящих от базовой переменной source.
+
+        :param source: Изменённая базовая переменная.
+        :param value: Изменилось ли значение (иначе — только неопределённость).
+        """
+        if self._dead:
+            with self._lock:
+                self._prune()
+        direct = self.dependents(source)
+        # Копии переменной (например, из UDecimalArray.to_list) в операндах зависимых величин
+        # получают новые лист, значение и неопределённость
+        for item in direct:
+            for arg, variable in zip(item._node.args, item._node.mask):
+                if variable and arg.id == source.id and arg is not source:
+                    arg._leaf = source._leaf
+                    arg._value = source._value
+                    arg._uncertainty = source._uncertainty
+                    arg._derivatives = None
+        seen = {source.id}
+        stack = direct
+        while stack:
+            item = stack.pop()
+            if item.id in seen:
+                continue
+            seen.add(item.id)
+            if value:
+                if item._value is None:
+                    # Величина не вычислялась, поэтому не вычислялись и зависящие от неё
+                    continue
+                item._value = None
+            # Карты производных ссылаются на прежний лист переменной
+            item._derivatives = None
+            item._uncertainty = None
+            stack.extend(self.dependents(item))
+
+    def clear(self):
+        """
+        Удаляет все рёбра.
+        """
+        with self._lock:
+            self._dependents.clear()
+            self._dead.clear()
+
+
+# Граф зависимостей, используемый UDecimal
+default_graph = DependencyGraph()
@@ -0,0 +1,192 @@
+# reductions.py
+
+import threading
+import weakref
+
+from .context import getcontext
+from .registry import default_registry
+from .udecimal import UDecimal, _Leaf, _next_id
+
+
+class _Accumulator:
+    """
+    Однопроходный накопитель линейной комбинации Σ f_i · x_i.
+
+    Значение и карта производных обновляются на месте. Листы без хранимых ковариаций
+    отслеживаются по слабым ссылкам: когда лист удаляется сборщиком (например, показание,
+    полученное из генератора и больше нигде не используемое), его вклад в дисперсию
+    переносится в накопленную независимую дисперсию. Поэтому расход памяти не растёт
+    с длиной потока независимых величин.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.value = backend.zero
+        self.count = 0
+        self._strong = {}  # Листы с ковариациями: {лист: производная}
+        self._weak = {}  # Независимые листы: {id листа: [слабая ссылка, производная, неопределённость]}
+        self._folded = backend.zero  # Дисперсия удалённых независимых листов
+        self._finished = False
+        # Листы могут удаляться сборщиком в других потоках (и повторно входить в fold)
+        self._lock = threading.RLock()
+
+    def add(self, item, factor=None, value=True):
+        """
+        Добавляет к сумме factor · item.
+
+        :param item: Экземпляр UDecimal или число.
+        :param factor: Постоянный множитель в типе бэкенда (None означает единицу).
+        :param value: Добавлять ли значение (False — только производные).
+        """
+        backend = self.backend
+        mul = backend.mul
+        add = backend.add
+        self.count += 1
+        if not isinstance(item, UDecimal):
+            item_value = backend.convert(item)
+            self.value = add(self.value, item_value if factor is None else mul(item_value, factor))
+            return
+        item_value, derivatives = item._operand(backend)
+        if value:
+            self.value = add(self.value, item_value if factor is None else mul(item_value, factor))
+        strong = self._strong
+        weak = self._weak
+        for leaf, d in derivatives.items():
+            if factor is not None:
+                d = mul(d, factor)
+            if leaf in strong:
+                strong[leaf] = add(strong[leaf], d)
+                continue
+            entry = weak.get(leaf.id)
+            if entry is not None:
+                entry[1] = add(entry[1], d)
+            elif default_registry.involves(leaf.id):
+                strong[leaf] = d
+            else:
+                weak[leaf.id] = [weakref.ref(leaf, self._make_callback(leaf.id)), d, leaf.uncertainty]
+
+    def _make_callback(self, key):
+        def fold(_):
+            with self._lock:
+                if self._finished:
+                    return
+                _, d, uncertainty = self._weak.pop(key)
+                backend = self.backend
+                term = backend.mul(d, backend.convert(uncertainty))
+                self._folded = backend.add(self._folded, (backend.variance_mul or backend.mul)(term, term))
+        return fold
+
+    def result(self, scale=None):
+        """
+        Возвращает накопленную сумму, умноженную на scale, как производную величину.
+        """
+        backend = self.backend
+        with self._lock:
+            self._finished = True
+        derivatives = dict(self._strong)
+        for ref, d, _ in self._weak.values():
+            leaf = ref()
+            if leaf is not None:
+                derivatives[leaf] = d
+        value = self.value
+        folded = self._folded
+        if scale is not None:
+            value = backend.mul(value, scale)
+            derivatives = {leaf: backend.mul(d, scale) for leaf, d in derivatives.items()}
+            folded = backend.mul(folded, backend.mul(scale, scale))
+        if folded:
+            # Удалённые независимые листы заменяются одним новым независимым листом
+            sqrt = backend.variance_sqrt or backend.sqrt
+            derivatives[_Leaf(_next_id(), sqrt(folded))] = backend.one
+        return UDecimal._derived(value, derivatives, backend)
+
+
+def usum(iterable, start=0):
+    """
+    Сумма величин за один проход без промежуточных объектов.
+
+    :param iterable: Итерируемый объект или генератор экземпляров UDecimal и чисел.
+    :param start: Начальное значение суммы.
+    :return: Экземпляр UDecimal.
+    """
+    accumulator = _Accumulator(getcontext().backend)
+    accumulator.add(start)
+    for item in iterable:
+        accumulator.add(item)
+    return accumulator.result()
+
+
+def umean(iterable):
+    """
+    Среднее арифметическое величин за один проход.
+
+    :param iterable: Непустой итерируемый объект экземпляров UDecimal и чисел.
+    :return: Экземпляр UDecimal.
+    """
+    backend = getcontext().backend
+    accumulator = _Accumulator(backend)
+    for item in iterable:
+        accumulator.add(item)
+    if not accumulator.count:
+        raise ValueError("Среднее не определено для пустой последовательности.")
+    return accumulator.result(backend.div(backend.one, backend.convert(accumulator.count)))
+
+
+def uweighted_mean(iterable):
+    """
+    Среднее, взвешенное по обратным дисперсиям: Σ(x_i / u_i²) / Σ(1 / u_i²).
+
+    Веса считаются постоянными, поэтому для независимых величин неопределённость
+    результата равна 1 / sqrt(Σ 1 / u_i²).
+
+    :param iterable: Непустой итерируемый объект экземпляров UDecimal с ненулевыми неопределённостями.
+    :return: Экземпляр UDecimal.
+    """
+    backend = getcontext().backend
+    accumulator = _Accumulator(backend)
+    total_weight = backend.zero
+    for item in iterable:
+        if not isinstance(item, UDecimal):
+            raise TypeError("Взвешенное среднее определено только для экземпляров UDecimal.")
+        uncertainty = backend.convert(item.uncertainty)
+        if not uncertainty:
+            raise ValueError("Вес величины с нулевой неопределённостью не определён.")
+        weight = backend.div(backend.one, backend.mul(uncertainty, uncertainty))
+        total_weight = backend.add(total_weight, weight)
+        accumulator.add(item, weight)
+    if not accumulator.count:
+        raise ValueError("Среднее не определено для пустой последовательности.")
+    return accumulator.result(backend.div(backend.one, total_weight))
+
+
+def udot(a, b):
+    """
+    Скалярное произведение Σ a_i · b_i за один проход.
+
+    :param a: Итерируемый объект экземпляров UDecimal и чисел.
+    :param b: Итерируемый объект той же длины.
+    :return: Экземпляр UDecimal.
+    """
+    backend = getcontext().backend
+    accumulator = _Accumulator(backend)
+    mul = backend.mul
+    sentinel = object()
+    iterator_b = iter(b)
+    for x in a:
+        y = next(iterator_b, sentinel)
+        if y is sentinel:
+            raise ValueError("Последовательности должны иметь одинаковую длину.")
+        x_value = x._operand(backend)[0] if isinstance(x, UDecimal) else backend.convert(x)
+        y_value = y._operand(backend)[0] if isinstance(y, UDecimal) else backend.convert(y)
+        # d(x · y) = y · dx + x · dy; значение x · y добавляется один раз
+        if isinstance(x, UDecimal):
+            accumulator.add(x, y_value)
+            if isinstance(y, UDecimal):
+                accumulator.add(y, x_value, value=False)
+        elif isinstance(y, UDecimal):
+            accumulator.add(y, x_value)
+        else:
+            accumulator.add(mul(x_value, y_value))
+    if next(iterator_b, sentinel) is not sentinel:
+        raise ValueError("Последовательности должны иметь одинаковую длину.")
+    return accumulator.result()
@@ -0,0 +1,620 @@
+# registry.py
+
+from collections import deque
+from decimal import Decimal, localcontext as decimal_localcontext
+import sys
+import threading
+import weakref
+
+from .context import get_backend
+
+
+class CovarianceRegistry:
+    """
+    Централизованное хранилище ковариаций между базовыми переменными.
+
+    Попарно заданные ковариации хранятся разреженно в верхнем треугольнике
+    ({i: {j: c}} при i < j); матрицы, загруженные целиком, хранятся блоками
+    в формате CSR. Дисперсии (диагональ) хранятся в самих переменных.
+
+    Хранилище безопасно при использовании из нескольких потоков, в том числе в сборках
+    CPython без GIL. Изменения выполняются под блокировкой и не меняют опубликованные
+    строки: строка {j: c} и множество обратного индекса заменяются новыми объектами
+    (копирование при записи). Поэтому чтение, самая частая операция, выполняется без
+    блокировки и не конкурирует с другими потоками.
+
+    Листы, между которыми заданы ковариации, отслеживаются по слабым ссылкам. Когда лист
+    удаляется сборщиком, его идентификатор ставится в очередь, а его ковариации удаляются
+    при следующем изменении хранилища или чтении ковариаций (см. prune), поэтому записи
+    удалённых переменных не накапливаются.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Блокировка изменений
+        self._pairs = {}  # Верхний треугольник попарных ковариаций: {i: {j: c}}, i < j
+        self._lower = {}  # Обратный индекс попарных ковариаций: {j: frozenset(i)}, i < j
+        self._blocks = {}  # {id: (блок, локальный индекс)}
+        self._refs = {}  # Отслеживаемые листы: {id: слабая ссылка}
+        self._dead = deque()  # Идентификаторы удалённых листов, ожидающие очистки
+
+    def __bool__(self):
+        return bool(self._pairs or self._blocks)
+
+    def __len__(self):
+        """
+        Число хранимых ненулевых элементов верхнего треугольника.
+        """
+        with self._lock:
+            self._prune()
+            pairs = sum(len(row) for row in self._pairs.values())
+            blocks = {id(block): block for block, _ in self._blocks.values()}
+            return pairs + sum(len(block.data) for block in blocks.values())
+
+    def clear(self):
+        """
+        Удаляет все ковариации.
+        """
+        with self._lock:
+            self._pairs.clear()
+            self._lower.clear()
+            self._blocks.clear()
+            self._refs.clear()
+            self._dead.clear()
+
+    def track(self, *leaves):
+        """
+        Отслеживает удаление листов сборщиком, чтобы автоматически удалить их ковариации.
+
+        :param leaves: Листы (_Leaf), между которыми задаются ковариации.
+        """
+        refs = self._refs
+        for leaf in leaves:
+            if leaf.id not in refs:
+                refs[leaf.id] = weakref.KeyedRef(leaf, self._on_dead, leaf.id)
+
+    def _on_dead(self, ref):
+        # Вызывается сборщиком в произвольном потоке, поэтому только ставит лист в очередь
+        self._dead.append(ref.key)
+
+    def prune(self):
+        """
+        Удаляет ковариации листов, удалённых сборщиком.
+
+        :return: Число удалённых листов.
+        """
+        if not self._dead:
+            return 0
+        with self._lock:
+            return self._prune()
+
+    def _prune(self):
+        """
+        Очищает записи удалённых листов одним проходом. Вызывается под блокировкой.
+        """
+        dead = set()
+        while self._dead:
+            dead.add(self._dead.popleft())
+        if not dead:
+            return 0
+        pairs = self._pairs
+        lower = self._lower
+        rows = set()  # Строки верхнего треугольника, содержащие удалённые листы
+        columns = set()  # Записи обратного индекса, содержащие удалённые листы
+        for i in dead:
+            self._refs.pop(i, None)
+            self._blocks.pop(i, None)
+            row = pairs.pop(i, None)
+            if row:
+                columns.update(row)
+            rows.update(lower.pop(i, ()))
+        for k in rows - dead:
+            row = pairs.get(k)
+            if row is not None:
+                row = {j: c for j, c in row.items() if j not in dead}
+                if row:
+                    pairs[k] = row
+                else:
+                    del pairs[k]
+        for j in columns - dead:
+            entry = lower.get(j)
+            if entry is not None:
+                entry = entry - dead
+                if entry:
+                    lower[j] = entry
+                else:
+                    del lower[j]
+        return len(dead)
+
+    def memory(self):
+        """
+        Оценка памяти хранилища.
+
+        :return: Словарь: число попарных ковариаций, блоков и их элементов, отслеживаемых
+                 листов, листов, ожидающих очистки, и оценка объёма в байтах.
+        """
+        with self._lock:
+            self._prune()
+            size = sys.getsizeof(self._pairs) + sys.getsizeof(self._lower) + sys.getsizeof(self._blocks)
+            pairs = 0
+            for row in self._pairs.values():
+                pairs += len(row)
+                size += sys.getsizeof(row) + sum(sys.getsizeof(c) for c in row.values())
+            size += sum(sys.getsizeof(entry) for entry in self._lower.values())
+            blocks = {id(block): block for block, _ in self._blocks.values()}
+            size += sum(block.nbytes() for block in blocks.values())
+            ref_size = sys.getsizeof(weakref.KeyedRef(CovarianceRegistry, None, 0))
+            size += sys.getsizeof(self._refs) + len(self._refs) * ref_size
+            return {
+                'pairs': pairs,
+                'blocks': len(blocks),
+                'block_entries': sum(len(block.data) for block in blocks.values()),
+                'tracked_leaves': len(self._refs),
+                'pending': len(self._dead),
+                'bytes': size,
+            }
+
+    def involves(self, i):
+        """
+        Есть ли у листа i хотя бы одна хранимая ковариация.
+        """
+        return i in self._pairs or i in self._lower or i in self._blocks
+
+    def _unlink(self, i, j):
+        """
+        Удаляет попарную ковариацию (i, j), i < j, вместе с записью обратного индекса.
+        Вызывается под блокировкой.
+        """
+        row = self._pairs.get(i)
+        if row is None or j not in row:
+            return
+        if len(row) == 1:
+            del self._pairs[i]
+        else:
+            row = dict(row)
+            del row[j]
+            self._pairs[i] = row
+        lower = self._lower[j] - {i}
+        if lower:
+            self._lower[j] = lower
+        else:
+            del self._lower[j]
+
+    def _shared_block(self, i, j):
+        entry_i = self._blocks.get(i)
+        if entry_i is None:
+            return None
+        entry_j = self._blocks.get(j)
+        if entry_j is None or entry_j[0] is not entry_i[0]:
+            return None
+        return entry_i[0], entry_i[1], entry_j[1]
+
+    def set(self, backend, i, j, covariance):
+        """
+        Устанавливает ковариацию между листами с идентификаторами i и j.
+
+        :param backend: Бэкенд, в типе которого задана ковариация.
+        """
+        if i == j:
+            raise ValueError("Дисперсия задаётся неопределённостью переменной.")
+        covariance = backend.convert(covariance)
+        if i > j:
+            i, j = j, i
+        with self._lock:
+            self._prune()
+            shared = self._shared_block(i, j)
+            if shared is not None and shared[0].set(backend, shared[1], shared[2], covariance):
+                return
+            row = self._pairs.get(i)
+            row = dict(row) if row else {}
+            row[j] = covariance
+            self._pairs[i] = row
+            self._lower[j] = self._lower.get(j, frozenset()) | {i}
+
+    def set_many(self, backend, entries):
+        """
+        Устанавливает набор ковариаций одним изменением хранилища: каждая строка копируется
+        один раз, поэтому стоимость линейна по числу элементов.
+
+        :param backend: Бэкенд, в типе которого заданы ковариации.
+        :param entries: Итерируемый объект троек (i, j, ковариация).
+        """
+        rows = {}
+        convert = backend.convert
+        for i, j, covariance in entries:
+            if i == j:
+                raise ValueError("Дисперсия задаётся неопределённостью переменной.")
+            if i > j:
+                i, j = j, i
+            rows.setdefault(i, {})[j] = convert(covariance)
+        with self._lock:
+            self._prune()
+            lower = {}
+            for i, row in rows.items():
+                if self._blocks:
+                    for j in list(row):
+                        shared = self._shared_block(i, j)
+                        if shared is not None and shared[0].set(backend, shared[1], shared[2], row[j]):
+                            del row[j]
+                if not row:
+                    continue
+                current = self._pairs.get(i)
+                self._pairs[i] = {**current, **row} if current else row
+                for j in row:
+                    lower.setdefault(j, set()).add(i)
+            for j, ids in lower.items():
+                self._lower[j] = self._lower.get(j, frozenset()) | ids
+
+    def get(self, backend, i, j, default=None):
+        """
+        Возвращает ковариацию между листами i и j в типе бэкенда или default.
+        """
+        if i > j:
+            i, j = j, i
+        row = self._pairs.get(i)
+        if row is not None and j in row:
+            return backend.convert(row[j])
+        shared = self._shared_block(i, j)
+        if shared is not None:
+            value = shared[0].get(backend, shared[1], shared[2])
+            if value is not None:
+                return value
+        return default
+
+    def remove(self, i, j):
+        """
+        Удаляет ковариацию между листами i и j.
+        """
+        if i > j:
+            i, j = j, i
+        with self._lock:
+            self._prune()
+            self._unlink(i, j)
+            shared = self._shared_block(i, j)
+            if shared is not None:
+                shared[0].clear(shared[1], shared[2])
+
+    def transfer(self, backend, old, new, scale=None):
+        """
+        Переносит ковариации листа old на лист new (см. UDecimal.update); ковариации
+        старого листа сохраняются для величин, построенных из него.
+
+        :param backend: Бэкенд, в типе которого возвращаются и задаются ковариации.
+        :param old: Исходный лист (_Leaf).
+        :param new: Новый лист (_Leaf).
+        :param scale: Множитель ковариаций (отношение новой неопределённости к старой);
+            None — ковариации переносятся без изменения.
+        """
+        row = self.row(backend, old.id)
+        if not row:
+            return
+        if scale is not None:
+            mul = backend.mul
+            row = {j: mul(c, scale) for j, c in row.items()}
+        self.track(new)
+        self.set_many(backend, ((new.id, j, c) for j, c in row.items() if c))
+
+    def row(self, backend, i):
+        """
+        Возвращает все ненулевые ковариации листа i: {other_id: covariance}.
+        """
+        result = {}
+        entry = self._blocks.get(i)
+        if entry is not None:
+            result.update(entry[0].row(backend, entry[1]))
+        convert = backend.convert
+        pairs = self._pairs
+        row = pairs.get(i)
+        if row:
+            result.update((j, convert(c)) for j, c in row.items())
+        for k in self._lower.get(i, ()):
+            # Строка могла быть изменена другим потоком после чтения обратного индекса
+            c = pairs.get(k, {}).get(i)
+            if c is not None:
+                result[k] = convert(c)
+        return result
+
+    def entries(self, backend, ids):
+        """
+        Возвращает ненулевые ковариации (i, j, c), i < j, между листами из набора ids.
+
+        Стоимость пропорциональна числу листов и их ненулевых ковариаций.
+
+        :param backend: Бэкенд, в типе которого возвращаются ковариации.
+        :param ids: Множество или словарь идентификаторов листов.
+        """
+        if self._dead:
+            self.prune()
+        result = self._pair_entries(backend, ids)
+        for block, locals_ in self._block_groups(ids):
+            result.extend(block.entries(backend, locals_))
+        return result
+
+    def _pair_entries(self, backend, ids):
+        """
+        Попарно заданные ковариации (i, j, c), i < j, между листами из набора ids.
+        """
+        result = []
+        pairs = self._pairs
+        if pairs:
+            convert = backend.convert
+            for i in ids:
+                row = pairs.get(i)
+                if row:
+                    for j, c in row.items():
+                        if j in ids:
+                            result.append((i, j, convert(c)))
+        return result
+
+    def _block_groups(self, ids):
+        """
+        Группирует листы из набора ids по блокам: [(блок, отсортированные локальные индексы)].
+        Возвращаются только блоки, содержащие не менее двух листов набора.
+        """
+        if not self._blocks:
+            return []
+        groups = {}
+        for i in ids:
+            entry = self._blocks.get(i)
+            if entry is not None:
+                groups.setdefault(entry[0], []).append(entry[1])
+        return [(block, sorted(locals_)) for block, locals_ in groups.items() if len(locals_) > 1]
+
+    def _load(self, variables, matrix, correlation):
+        leaves = []
+        for variable in variables:
+            if variable._leaf is None:
+                raise ValueError("Ковариация может быть установлена только между базовыми переменными.")
+            leaves.append(variable._leaf)
+        ids = [leaf.id for leaf in leaves]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Переменные не должны повторяться.")
+        from .blocks import _Block
+        block = _Block(leaves, matrix, correlation)
+        # Новая матрица заменяет ранее заданные ковариации между этими переменными
+        members = set(ids)
+        self.track(*leaves)
+        with self._lock:
+            self._prune()
+            for i in ids:
+                row = self._pairs.get(i)
+                if row:
+                    for j in [j for j in row if j in members]:
+                        self._unlink(i, j)
+            for index, i in enumerate(ids):
+                self._blocks[i] = (block, index)
+        return leaves
+
+    def set_covariance_matrix(self, variables, matrix):
+        """
+        Загружает ковариационную матрицу набора базовых переменных.
+
+        Диагональ задаёт дисперсии: неопределённости переменных заменяются на sqrt(C_ii).
+        Производные величины вычисляют неопределённость по листам при первом обращении,
+        поэтому величины, уже выведенные из этих переменных, но ещё не прочитавшие свою
+        неопределённость, получат новые дисперсии и ковариации; уже вычисленные
+        неопределённости не пересчитываются.
+
+        :param variables: Последовательность базовых переменных UDecimal.
+        :param matrix: Симметричная матрица (массив NumPy или вложенные списки).
+        """
+        variables = list(variables)
+        from .blocks import _as_matrix, _check_symmetric
+        matrix = _as_matrix(matrix, len(variables))
+        _check_symmetric(matrix)
+        diagonal = matrix.diagonal()
+        if (diagonal < 0).any():
+            raise ValueError("Дисперсия не может быть отрицательной.")
+        leaves = self._load(variables, matrix, correlation=False)
+        for variable, leaf, variance in zip(variables, leaves, diagonal):
+            backend = variable._backend
+            variance = variance if type(variance) is Decimal else float(variance)
+            leaf.uncertainty = variable._uncertainty = backend.sqrt(backend.convert(variance))
+
+    def set_correlation_matrix(self, variables, correlation):
+        """
+        Загружает корреляционную матрицу набора базовых переменных.
+
+        Ковариации вычисляются как rho_ij * u_i * u_j по неопределённостям переменных.
+        Как и в set_covariance_matrix, новые ковариации учитываются производными величинами,
+        неопределённость которых ещё не вычислялась.
+
+        :param variables: Последовательность базовых переменных UDecimal.
+        :param correlation: Симметричная матрица коэффициентов корреляции с единицами на диагонали.
+        """
+        variables = list(variables)
+        from .blocks import _as_matrix, _check_symmetric
+        correlation = _as_matrix(correlation, len(variables))
+        _check_symmetric(correlation)
+        if not (correlation.diagonal() == 1).all():
+            raise ValueError("Диагональ корреляционной матрицы должна состоять из единиц.")
+        if (abs(correlation) > 1).any():
+            raise ValueError("Коэффициенты корреляции должны лежать в диапазоне [-1, 1].")
+        self._load(variables, correlation, correlation=True)
+
+    def covariance_matrix(self, results):
+        """
+        Вычисляет совместную ковариационную матрицу набора величин J·C·Jᵀ, где J — матрица
+        чувствительностей величин к листам, от которых они зависят, а C — ковариационная
+        матрица этих листов (дисперсии и ненулевые ковариации из хранилища).
+
+        Для бэкенда 'float' J собирается плотной матрицей float64 и произведение вычисляется
+        матричными операциями NumPy: блоки ковариаций хранилища входят плотными подматрицами,
+        а попарно заданные ковариации — порциями столбцов J. Для остальных бэкендов
+        вычисления выполняются в Decimal с разреженным J: каждый лист добавляет внешнее
+        произведение своего столбца, поэтому стоимость пропорциональна числу пар величин
+        с общими листами.
+
+        :param results: Последовательность экземпляров UDecimal (базовых или производных).
+        :return: Массив NumPy размера n×n в типе активного бэкенда
+                 (float64 для бэкенда 'float', иначе dtype=object).
+        """
+        return self._covariance(results, get_backend())
+
+    def _covariance(self, results, backend):
+        """
+        Ковариационная матрица величин в типе заданного бэкенда, см. covariance_matrix.
+        """
+        import numpy as np
+        results = list(results)
+        index = {}
+        leaves = []
+        rows, columns, derivatives = [], [], []
+        for r, result in enumerate(results):
+            for leaf, d in result._sensitivities().items():
+                column = index.get(leaf.id)
+                if column is None:
+                    column = index[leaf.id] = len(leaves)
+                    leaves.append(leaf)
+                rows.append(r)
+                columns.append(column)
+                derivatives.append(d)
+        if backend.raw_type is float:
+            if self._dead:
+                self.prune()
+            blocks = [([index[block.ids[k]] for k in locals_], block.dense(locals_))
+                      for block, locals_ in self._block_groups(index)]
+            return _dense_covariance(len(results), leaves, rows, columns, derivatives,
+                                     self._pair_entries(backend, index), blocks, index)
+        entries = self.entries(backend, index) if self else []
+        from .linalg import _work_backend
+        work = _work_backend(backend)
+        with decimal_localcontext(work.context):
+            matrix = _sparse_covariance(len(results), leaves, rows, columns, derivatives, entries, index, backend)
+        return np.frompyfunc(backend.convert, 1, 1)(matrix) if matrix.size else matrix
+
+    def correlation_matrix(self, results):
+        """
+        Вычисляет совместную корреляционную матрицу набора величин:
+        rho_ab = cov(a, b) / (u_a · u_b), см. covariance_matrix.
+
+        :param results: Последовательность экземпляров UDecimal (базовых или производных).
+        :return: Массив NumPy размера n×n в типе активного бэкенда; строки и столбцы величин
+                 с нулевой неопределённостью (констант) заполняются нулями.
+        """
+        import numpy as np
+        backend = get_backend()
+        matrix = self.covariance_matrix(results)
+        size = len(matrix)
+        if backend.raw_type is float:
+            sigma = np.sqrt(np.maximum(matrix.diagonal(), 0))
+            scale = np.outer(sigma, sigma)
+            result = np.divide(matrix, scale, out=np.zeros_like(matrix), where=scale > 0)
+            # Погрешность округления не должна выводить коэффициенты за пределы [-1, 1]
+            np.clip(result, -1, 1, out=result)
+            result[np.diag_indices(size)] = (sigma > 0).astype(np.float64)
+            return result
+        from .backends import as_decimal
+        from .linalg import _work_backend
+        work = _work_backend(backend)
+        result = np.full((size, size), backend.zero, dtype=object)
+        with decimal_localcontext(work.context):
+            covariance = np.frompyfunc(as_decimal, 1, 1)(matrix) if size else matrix
+            sigma = [max(v, 0).sqrt() for v in covariance.diagonal()]
+            for a in range(size):
+                if not sigma[a]:
+                    continue
+                result[a, a] = backend.one
+                for b in range(a + 1, size):
+                    if sigma[b]:
+                        rho = min(max(covariance[a, b] / (sigma[a] * sigma[b]), Decimal(-1)), Decimal(1))
+                        result[a, b] = result[b, a] = backend.convert(rho)
+        return result
+
+
+def _dense_covariance(size, leaves, rows, columns, derivatives, entries, blocks, index):
+    """
+    J·C·Jᵀ в float64 по плотной матрице чувствительностей J (size × число листов).
+
+    :param entries: Попарно заданные ковариации (i, j, c).
+    :param blocks: Для блоков хранилища — (столбцы J, плотная матрица ковариаций
+                   соответствующих листов без диагонали).
+    """
+    import numpy as np
+    jacobian = np.zeros((size, len(leaves)))
+    jacobian[rows, columns] = np.asarray(derivatives, dtype=np.float64)
+    variances = np.array([float(leaf.uncertainty) for leaf in leaves], dtype=np.float64) ** 2
+    result = (jacobian * variances) @ jacobian.T
+    for positions, matrix in blocks:
+        part = jacobian[:, positions]
+        result += part @ (matrix @ part.T)
+    if entries:
+        first, second, values = zip(*entries)
+        first = np.array([index[i] for i in first], dtype=np.intp)
+        second = np.array([index[j] for j in second], dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        # Попарные ковариации учитываются порциями, чтобы столбцы J не копировались целиком
+        step = max(1, (1 << 22) // max(size, 1))
+        term = np.zeros_like(result)
+        for start in range(0, len(values), step):
+            chunk = slice(start, start + step)
+            term += (jacobian[:, first[chunk]] * values[chunk]) @ jacobian[:, second[chunk]].T
+        # Хранится только верхний треугольник, поэтому каждая пара учитывается дважды
+        result += term + term.T
+    return result
+
+
+def _sparse_covariance(size, leaves, rows, columns, derivatives, entries, index, backend):
+    """
+    J·C·Jᵀ в Decimal (dtype=object) по столбцам разреженной матрицы чувствительностей.
+
+    Вызывается в контексте decimal рабочего бэкенда.
+    """
+    import numpy as np
+    from .backends import as_decimal
+    convert = backend.convert
+    result = np.full((size, size), Decimal(0), dtype=object)
+    # Столбцы J: для каждого листа — номера величин и производные по нему
+    order = sorted(range(len(rows)), key=columns.__getitem__)
+    members = [([], []) for _ in leaves]
+    for k in order:
+        member = members[columns[k]]
+        member[0].append(rows[k])
+        member[1].append(as_decimal(convert(derivatives[k])))
+    members = [(np.array(r, dtype=np.intp), np.array(d, dtype=object)) for r, d in members]
+    for leaf, (r, d) in zip(leaves, members):
+        u = as_decimal(convert(leaf.uncertainty))
+        if u:
+            result[np.ix_(r, r)] += np.outer(d * (u * u), d)
+    for i, j, c in entries:
+        ri, di = members[index[i]]
+        rj, dj = members[index[j]]
+        term = np.outer(di * as_decimal(c), dj)
+        result[np.ix_(ri, rj)] += term
+        result[np.ix_(rj, ri)] += term.T
+    return result
+
+
+# Хранилище ковариаций, используемое UDecimal
+default_registry = CovarianceRegistry()
+
+
+def set_covariance_matrix(variables, matrix):
+    """
+    Загружает ковариационную матрицу базовых переменных в общее хранилище.
+    См. CovarianceRegistry.set_covariance_matrix.
+    """
+    default_registry.set_covariance_matrix(variables, matrix)
+
+
+def set_correlation_matrix(variables, correlation):
+    """
+    Загружает корреляционную матрицу базовых переменных в общее хранилище.
+    См. CovarianceRegistry.set_correlation_matrix.
+    """
+    default_registry.set_correlation_matrix(variables, correlation)
+
+
+def covariance_matrix(results):
+    """
+    Вычисляет ковариационную матрицу набора величин.
+    См. CovarianceRegistry.covariance_matrix.
+    """
+    return default_registry.covariance_matrix(results)
+
+
+def correlation_matrix(results):
+    """
+    Вычисляет корреляционную матрицу набора величин.
+    См. CovarianceRegistry.correlation_matrix.
+    """
+    return default_registry.correlation_matrix(results)
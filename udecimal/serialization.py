@@ -0,0 +1,577 @@
+# serialization.py
+
+"""
+Сериализация величин UDecimal вместе с их чувствительностями и ковариациями.
+
+Набор величин записывается целиком: базовые переменные (листы), от которых зависят
+величины, их неопределённости, разреженные карты производных каждой величины и
+ковариации между листами. После загрузки корреляции внутри набора сохраняются.
+
+Листы идентифицируются парой (токен процесса, идентификатор), где процесс — тот, в
+котором лист был создан. При загрузке в этом процессе листы сопоставляются с живыми
+базовыми переменными, а в других процессах повторные загрузки используют одни и те же
+листы. Поэтому величины, сериализованные по отдельности (например, при передаче в
+рабочий процесс через pickle и обратно), остаются коррелированными.
+
+Двоичный формат (версия 1, все числа little-endian, секции выровнены по 8 байтам):
+
+    Заголовок (64 байта):
+        магическая строка b'UDEC', версия uint16, тип чисел uint8 (0 — float64,
+        1 — Decimal, 2 — mpmath, 3 — фиксированная точка), форма uint8 (0 — список, 1 — одна величина,
+        2 — UDecimalArray), токен записавшего процесса (16 байт), точность uint32,
+        число величин, листов, производных и ковариаций (uint64), число токенов uint32.
+    Секции:
+        sessions     bytes[токены × 16]  токены процессов, создавших листы
+        leaf_session uint32[листы]       номер токена листа
+        leaf_ids     int64[листы]        исходные идентификаторы листов
+        leaf_unc     ЧИСЛА[листы]        неопределённости листов
+        item_leaf    int64[величины]     номер листа базовой переменной или -1
+        item_value   ЧИСЛА[величины]     значения
+        sens_ptr     int64[величины + 1] границы карт производных (CSR)
+        sens_leaf    int64[производные]  номера листов
+        sens_value   ЧИСЛА[производные]  производные
+        cov_i, cov_j int64[ковариации]   номера листов (верхний треугольник)
+        cov_value    ЧИСЛА[ковариации]   ковариации
+
+    Столбец ЧИСЕЛ типа float64 — массив float64. Для остальных типов столбец состоит из
+    массивов flags uint8 (бит 0 — знак, бит 1 — специальное значение), exponent int64
+    (десятичный или двоичный порядок; для фиксированной точки — минус масштаб), offsets int64[n + 1] и блока коэффициентов
+    (целые числа без знака little-endian; для специальных значений — их строковая запись).
+
+Столбцы фиксированной ширины читаются без копирования, в том числе из файла,
+отображённого в память (load(path, mmap=True)). UDecimalArray восстанавливается
+непосредственно из столбцов, без создания величин UDecimal: значения и производные
+типа float64 остаются представлениями буфера.
+"""
+
+from decimal import Context as DecimalContext, Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN
+import io
+import json
+import os
+import struct
+import threading
+from weakref import WeakKeyDictionary, WeakValueDictionary
+
+import numpy as np
+
+from .backends import resolve_backend
+from .context import getcontext
+from .registry import default_registry
+from .udecimal import UDecimal, _Leaf, _id_watermark, _next_id
+
+_MAGIC = b'UDEC'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHBB16sI4QI')
+_HEADER_SIZE = 64
+
+_FLOAT, _DECIMAL, _MPMATH, _FIXED = 0, 1, 2, 3
+_KINDS = {'float': _FLOAT, 'decimal': _DECIMAL, 'mpmath': _MPMATH, 'fixed': _FIXED}
+_NAMES = {code: name for name, code in _KINDS.items()}
+_LIST, _SCALAR, _ARRAY = 0, 1, 2
+_SHAPES = {'list': _LIST, 'scalar': _SCALAR, 'array': _ARRAY}
+
+# Точный контекст для перевода коэффициентов Decimal в целые числа и обратно
+_EXACT = DecimalContext(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# Токен процесса: отличает идентификаторы листов разных процессов
+_SESSION = os.urandom(16)
+# Токены предков для листов, унаследованных при fork: [(наибольший идентификатор, токен)]
+# в порядке возрастания идентификаторов
+_INHERITED = []
+
+
+def _renew_session():
+    global _SESSION
+    # Листы, созданные до fork, сохраняют токен родителя, поэтому остаются сопоставимыми
+    # с его величинами (например, с константами модуля, захваченными функцией parallel.map)
+    _INHERITED.append((_id_watermark(), _SESSION))
+    _SESSION = os.urandom(16)
+
+
+if hasattr(os, 'register_at_fork'):
+    # Дочерний процесс продолжает счётчик идентификаторов родителя, поэтому получает свой токен
+    os.register_at_fork(after_in_child=_renew_session)
+
+
+def _session_of(leaf_id):
+    """
+    Токен процесса, создавшего лист текущего процесса с идентификатором leaf_id.
+    """
+    for watermark, session in _INHERITED:
+        if leaf_id <= watermark:
+            return session
+    return _SESSION
+
+# Листы, восстановленные при загрузке: {(токен, идентификатор): лист} и обратно
+_IMPORTED = WeakValueDictionary()
+_ORIGINS = WeakKeyDictionary()
+_IMPORT_LOCK = threading.Lock()
+# Записанные листы текущего процесса: {идентификатор: лист}. Позволяет сопоставить
+# лист при загрузке, даже если его базовая переменная уже удалена.
+_EXPORTED = WeakValueDictionary()
+
+
+def _origin(leaf):
+    """
+    Исходная идентичность листа: (токен процесса, идентификатор).
+    """
+    return _ORIGINS.get(leaf) or (_session_of(leaf.id), leaf.id)
+
+
+class _Table:
+    """
+    Столбцы сериализуемого набора величин: листы, номера листов базовых переменных,
+    значения, карты производных в формате CSR и ковариации между листами.
+    """
+    __slots__ = ('leaves', 'bases', 'raws', 'pointers', 'sens_leaf', 'sens_value', 'covariances')
+
+    def __init__(self, leaves, bases, raws, pointers, sens_leaf, sens_value, backend):
+        self.leaves = leaves
+        self.bases = bases
+        self.raws = raws
+        self.pointers = pointers
+        self.sens_leaf = sens_leaf
+        self.sens_value = sens_value
+        index = {leaf.id: number for number, leaf in enumerate(leaves)}
+        for leaf in leaves:
+            if leaf not in _ORIGINS:
+                _EXPORTED[leaf.id] = leaf
+        self.covariances = []
+        if default_registry:
+            for i, j, c in default_registry.entries(backend, index):
+                self.covariances.append((index[i], index[j], c))
+
+
+def _collect(values, backend):
+    """
+    Собирает листы, карты производных и ковариации набора величин.
+    """
+    from .array import UDecimalArray
+    if isinstance(values, UDecimalArray):
+        return _collect_array(values, backend)
+    leaves = {}  # {лист: номер}
+    bases, raws, counts, sens_leaf, sens_value = [], [], [], [], []
+    for value in values:
+        raw, derivatives = value._operand(backend)
+        for leaf, d in derivatives.items():
+            number = leaves.get(leaf)
+            if number is None:
+                number = leaves[leaf] = len(leaves)
+            sens_leaf.append(number)
+            sens_value.append(d)
+        bases.append(leaves[value._leaf] if value._leaf is not None else -1)
+        raws.append(raw)
+        counts.append(len(derivatives))
+    pointers = np.zeros(len(values) + 1, dtype='<i8')
+    np.cumsum(counts, out=pointers[1:])
+    return _Table(list(leaves), bases, raws, pointers, sens_leaf, sens_value, backend)
+
+
+def _collect_array(array, backend):
+    """
+    Собирает столбцы массива UDecimalArray напрямую из его буферов, без создания величин UDecimal.
+    """
+    leaves, bases, pointers, sens_leaf, sens_value = array._columns()
+    raws = array.values
+    if raws.dtype == object:
+        convert = backend.convert
+        raws = [convert(x) for x in raws]
+        sens_value = [convert(d) for d in sens_value]
+    return _Table(leaves, bases, raws, pointers, sens_leaf, sens_value, backend)
+
+
+def _shape_of(obj):
+    """
+    Форма объекта, набор величин (или сам массив UDecimalArray) и бэкенд их значений.
+    """
+    from .array import UDecimalArray, _decimal_backend
+    if isinstance(obj, UDecimal):
+        return _SCALAR, [obj], obj.backend
+    if isinstance(obj, UDecimalArray):
+        # Значения записываются в бэкенде, соответствующем типу хранения массива
+        return _ARRAY, obj, resolve_backend('float') if obj.dtype == np.float64 else _decimal_backend()
+    values = list(obj)
+    return _LIST, values, values[0].backend if values else getcontext().backend
+
+
+def _kind_and_prec(backend):
+    kind = _KINDS[backend.name]
+    return kind, 0 if kind == _FLOAT else backend.digits
+
+
+# Кодирование столбцов чисел
+def _encode_decimal(x):
+    if not x.is_finite():
+        return 3 if x.is_signed() else 2, 0, str(x).encode('ascii')
+    sign, _, exponent = x.as_tuple()
+    coefficient = int(_EXACT.scaleb(x.copy_abs(), -exponent))
+    return sign, exponent, coefficient.to_bytes((coefficient.bit_length() + 7) // 8, 'little')
+
+
+def _decode_decimal(flags, exponent, chunk):
+    if flags & 2:
+        return Decimal(chunk.decode('ascii'))
+    result = _EXACT.scaleb(Decimal(int.from_bytes(chunk, 'little')), exponent)
+    return result.copy_negate() if flags & 1 else result
+
+
+def _encode_mpf(x):
+    sign, man, exponent, _ = x._mpf_
+    if not man and exponent:
+        return 2, 0, str(x).encode('ascii')
+    return sign, exponent, man.to_bytes((man.bit_length() + 7) // 8, 'little')
+
+
+def _encode_fixed(x):
+    units = int(x)
+    return units < 0, -x.scale, abs(units).to_bytes((units.bit_length() + 7) // 8, 'little')
+
+
+_ENCODERS = {_DECIMAL: _encode_decimal, _MPMATH: _encode_mpf, _FIXED: _encode_fixed}
+
+
+def _numbers(kind, raw):
+    """
+    Кодирует последовательность чисел в столбец: список массивов и байтовых блоков.
+    """
+    if kind == _FLOAT:
+        return [np.asarray(raw, dtype='<f8')]
+    encode = _ENCODERS[kind]
+    flags = np.empty(len(raw), dtype='u1')
+    exponents = np.empty(len(raw), dtype='<i8')
+    offsets = np.zeros(len(raw) + 1, dtype='<i8')
+    chunks = []
+    position = 0
+    for k, x in enumerate(raw):
+        flags[k], exponents[k], chunk = encode(x)
+        chunks.append(chunk)
+        position += len(chunk)
+        offsets[k + 1] = position
+    return [flags, exponents, offsets, b''.join(chunks)]
+
+
+class _Reader:
+    """
+    Последовательное чтение секций двоичного формата из буфера.
+    """
+
+    def __init__(self, buffer, offset):
+        self.buffer = buffer
+        self.offset = offset
+
+    def array(self, dtype, count):
+        dtype = np.dtype(dtype)
+        result = np.frombuffer(self.buffer, dtype=dtype, count=count, offset=self.offset)
+        self.offset += _aligned(dtype.itemsize * count)
+        return result
+
+    def raw(self, size):
+        result = bytes(self.buffer[self.offset:self.offset + size])
+        self.offset += _aligned(size)
+        return result
+
+    def numbers(self, kind, count, backend):
+        if kind == _FLOAT:
+            return self.array('<f8', count)
+        flags = self.array('u1', count)
+        exponents = self.array('<i8', count)
+        offsets = self.array('<i8', count + 1)
+        blob = self.raw(int(offsets[-1]))
+        result = []
+        if kind == _DECIMAL:
+            for k in range(count):
+                result.append(_decode_decimal(flags[k], int(exponents[k]), blob[offsets[k]:offsets[k + 1]]))
+        elif kind == _FIXED:
+            raw_type = backend.raw_type
+            for k in range(count):
+                units = int.from_bytes(blob[offsets[k]:offsets[k + 1]], 'little')
+                result.append(raw_type(-units if flags[k] & 1 else units))
+        else:
+            mp = backend._mp
+            for k in range(count):
+                chunk = blob[offsets[k]:offsets[k + 1]]
+                if flags[k] & 2:
+                    result.append(mp.mpf(chunk.decode('ascii')))
+                else:
+                    man = int.from_bytes(chunk, 'little')
+                    result.append(mp.make_mpf((int(flags[k] & 1), man, int(exponents[k]), man.bit_length())))
+        return result
+
+
+def _aligned(size):
+    return (size + 7) & ~7
+
+
+def _write_sections(stream, sections):
+    for section in sections:
+        data = section.tobytes() if isinstance(section, np.ndarray) else section
+        stream.write(data)
+        stream.write(b'\0' * (_aligned(len(data)) - len(data)))
+
+
+def _dump_binary(obj, stream):
+    shape, values, backend = _shape_of(obj)
+    kind, prec = _kind_and_prec(backend)
+    table = _collect(values, backend)
+    leaves = table.leaves
+    covariances = table.covariances
+    origins = [_origin(leaf) for leaf in leaves]
+    sessions = {}
+    for session, _ in origins:
+        sessions.setdefault(session, len(sessions))
+    stream.write(_HEADER.pack(_MAGIC, _VERSION, kind, shape, _SESSION, prec,
+                              len(table.bases), len(leaves), len(table.sens_leaf), len(covariances), len(sessions)))
+    stream.write(b'\0' * (_HEADER_SIZE - _HEADER.size))
+    sections = [b''.join(sessions)]
+    sections.append(np.array([sessions[session] for session, _ in origins], dtype='<u4'))
+    sections.append(np.array([leaf_id for _, leaf_id in origins], dtype='<i8'))
+    sections += _numbers(kind, [backend.convert(leaf.uncertainty) for leaf in leaves])
+    sections.append(np.asarray(table.bases, dtype='<i8'))
+    sections += _numbers(kind, table.raws)
+    sections.append(np.asarray(table.pointers, dtype='<i8'))
+    sections.append(np.asarray(table.sens_leaf, dtype='<i8'))
+    sections += _numbers(kind, table.sens_value)
+    sections.append(np.array([i for i, _, _ in covariances], dtype='<i8'))
+    sections.append(np.array([j for _, j, _ in covariances], dtype='<i8'))
+    sections += _numbers(kind, [c for _, _, c in covariances])
+    _write_sections(stream, sections)
+
+
+def _restore_leaves(origins, uncertainties, backend):
+    """
+    Сопоставляет сохранённые листы с листами текущего процесса.
+
+    :param origins: Исходные идентичности листов (токен процесса, идентификатор).
+    """
+    leaves = []
+    for (session, leaf_id), uncertainty in zip(origins, uncertainties):
+        leaf = None
+        if session == _session_of(leaf_id):
+            leaf = _EXPORTED.get(leaf_id)
+            if leaf is None:
+                owner = UDecimal.id_map.get(leaf_id)
+                # После UDecimal.update переменная ссылается на новый лист
+                if owner is not None and owner._leaf is not None and owner._leaf.id == leaf_id:
+                    leaf = owner._leaf
+        if leaf is None:
+            key = (session, leaf_id)
+            with _IMPORT_LOCK:
+                # Под блокировкой: одновременные загрузки получают один и тот же лист
+                leaf = _IMPORTED.get(key)
+                if leaf is None:
+                    leaf = _IMPORTED[key] = _Leaf(_next_id(), backend.convert(uncertainty))
+                    _ORIGINS[leaf] = key
+        leaves.append(leaf)
+    return leaves
+
+
+def _register(backend, leaves, covariances):
+    """
+    Регистрирует ковариации восстановленных листов.
+    """
+    for i, j, c in covariances:
+        default_registry.track(leaves[i], leaves[j])
+        default_registry.set(backend, leaves[i].id, leaves[j].id, c)
+
+
+def _build(shape, backend, leaves, items, covariances):
+    """
+    Создаёт величины UDecimal по восстановленным листам и регистрирует ковариации.
+    """
+    _register(backend, leaves, covariances)
+    result = []
+    for base, value, sensitivities in items:
+        if base >= 0:
+            result.append(UDecimal._from_leaf(value, leaves[base], backend))
+        else:
+            result.append(UDecimal._derived(value, {leaves[k]: d for k, d in sensitivities}, backend))
+    if shape == _SCALAR:
+        return result[0]
+    return result
+
+
+def _build_array(backend, leaves, bases, values, pointers, sens_leaf, sens_value, covariances):
+    """
+    Создаёт UDecimalArray непосредственно из столбцов, без создания величин UDecimal.
+
+    Столбцы float64 передаются массиву без копирования; числа остальных типов
+    преобразуются в Decimal (dtype=object).
+    """
+    from .array import UDecimalArray
+    _register(backend, leaves, covariances)
+    if backend.raw_type is float:
+        values = np.asarray(values, dtype=np.float64)
+        sens_value = np.asarray(sens_value, dtype=np.float64)
+    else:
+        convert = backend.convert
+        values = np.array([convert(x) for x in values], dtype=object)
+        sens_value = np.array([convert(d) for d in sens_value], dtype=object)
+    return UDecimalArray._from_columns(values, leaves, bases, pointers, sens_leaf, sens_value)
+
+
+def _load_binary(buffer):
+    header = _HEADER.unpack_from(buffer, 0)
+    magic, version, kind, shape, _, prec, n_items, n_leaves, n_sens, n_cov, n_sessions = header
+    if magic != _MAGIC:
+        raise ValueError("Данные не являются сериализованными величинами UDecimal.")
+    if version != _VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата: {version}.")
+    # Нулевая точность означает точность по умолчанию, кроме масштаба фиксированной точки
+    backend = resolve_backend(_NAMES[kind], prec if kind == _FIXED else prec or None)
+    convert = backend.convert
+    reader = _Reader(buffer, _HEADER_SIZE)
+    table = reader.raw(16 * n_sessions)
+    sessions = [table[16 * k:16 * (k + 1)] for k in range(n_sessions)]
+    leaf_session = reader.array('<u4', n_leaves)
+    leaf_ids = reader.array('<i8', n_leaves)
+    origins = [(sessions[k], leaf_id) for k, leaf_id in zip(leaf_session.tolist(), leaf_ids.tolist())]
+    leaves = _restore_leaves(origins, reader.numbers(kind, n_leaves, backend), backend)
+    item_leaf = reader.array('<i8', n_items)
+    item_value = reader.numbers(kind, n_items, backend)
+    pointers = reader.array('<i8', n_items + 1)
+    sens_leaf = reader.array('<i8', n_sens)
+    sens_value = reader.numbers(kind, n_sens, backend)
+    cov_i = reader.array('<i8', n_cov).tolist()
+    cov_j = reader.array('<i8', n_cov).tolist()
+    cov_value = reader.numbers(kind, n_cov, backend)
+    covariances = [(i, j, convert(c)) for i, j, c in zip(cov_i, cov_j, cov_value)]
+    if shape == _ARRAY:
+        return _build_array(backend, leaves, item_leaf, item_value, pointers, sens_leaf, sens_value, covariances)
+    pointers = pointers.tolist()
+    sens_leaf = sens_leaf.tolist()
+    items = []
+    for k, (base, value) in enumerate(zip(item_leaf.tolist(), item_value)):
+        sensitivities = [(sens_leaf[p], convert(sens_value[p])) for p in range(pointers[k], pointers[k + 1])]
+        items.append((base, convert(value), sensitivities))
+    return _build(shape, backend, leaves, items, covariances)
+
+
+# JSON: числа Decimal и mpmath записываются строками без потери точности
+def _dump_json(obj):
+    shape, values, backend = _shape_of(obj)
+    kind, prec = _kind_and_prec(backend)
+    table = _collect(values, backend)
+    number = float if kind == _FLOAT else str
+    pointers = np.asarray(table.pointers).tolist()
+    sens_leaf = np.asarray(table.sens_leaf).tolist()
+    sens_value = table.sens_value
+    return {
+        'format': 'udecimal',
+        'version': _VERSION,
+        'backend': _NAMES[kind],
+        'prec': prec if kind == _FIXED else prec or None,
+        'shape': [name for name, code in _SHAPES.items() if code == shape][0],
+        'leaves': [
+            {'session': session.hex(), 'id': leaf_id, 'uncertainty': number(backend.convert(leaf.uncertainty))}
+            for leaf, (session, leaf_id) in zip(table.leaves, map(_origin, table.leaves))
+        ],
+        'values': [
+            {
+                'value': number(raw),
+                'leaf': base if base >= 0 else None,
+                'sensitivities': [[sens_leaf[p], number(sens_value[p])] for p in range(pointers[k], pointers[k + 1])],
+            }
+            for k, (base, raw) in enumerate(zip(np.asarray(table.bases).tolist(), table.raws))
+        ],
+        'covariances': [[i, j, number(c)] for i, j, c in table.covariances],
+    }
+
+
+def _load_json(document):
+    if document.get('format') != 'udecimal':
+        raise ValueError("Данные не являются сериализованными величинами UDecimal.")
+    if document.get('version') != _VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата: {document.get('version')}.")
+    backend = resolve_backend(document['backend'], document['prec'])
+    convert = backend.convert
+    leaves = _restore_leaves([(bytes.fromhex(leaf['session']), leaf['id']) for leaf in document['leaves']],
+                             [leaf['uncertainty'] for leaf in document['leaves']], backend)
+    covariances = [(i, j, convert(c)) for i, j, c in document['covariances']]
+    values = document['values']
+    if document['shape'] == 'array':
+        pointers = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum([len(item['sensitivities']) for item in values], out=pointers[1:])
+        sensitivities = [pair for item in values for pair in item['sensitivities']]
+        return _build_array(backend, leaves,
+                            np.array([-1 if item['leaf'] is None else item['leaf'] for item in values], dtype=np.int64),
+                            [item['value'] for item in values], pointers,
+                            np.array([leaf for leaf, _ in sensitivities], dtype=np.int64),
+                            [d for _, d in sensitivities], covariances)
+    items = [
+        (-1 if item['leaf'] is None else item['leaf'], convert(item['value']),
+         [(leaf, convert(d)) for leaf, d in item['sensitivities']])
+        for item in values
+    ]
+    return _build(_SHAPES[document['shape']], backend, leaves, items, covariances)
+
+
+def dumps(obj, format='binary'):
+    """
+    Сериализует величины вместе с их чувствительностями и ковариациями.
+
+    :param obj: Экземпляр UDecimal, последовательность UDecimal или UDecimalArray.
+    :param format: 'binary' (компактный двоичный формат) или 'json'.
+    :return: bytes для двоичного формата или str для JSON.
+    """
+    if format == 'json':
+        return json.dumps(_dump_json(obj))
+    if format != 'binary':
+        raise ValueError(f"Неизвестный формат: {format!r}.")
+    stream = io.BytesIO()
+    _dump_binary(obj, stream)
+    return stream.getvalue()
+
+
+def loads(data):
+    """
+    Восстанавливает величины, сериализованные функцией dumps.
+
+    :param data: bytes, bytearray или memoryview двоичного формата либо строка JSON.
+    :return: Объект той же формы, что и при сериализации.
+    """
+    if isinstance(data, str):
+        return _load_json(json.loads(data))
+    if bytes(data[:4]) != _MAGIC:
+        return _load_json(json.loads(bytes(data).decode('utf-8')))
+    return _load_binary(data)
+
+
+def dump(obj, file, format='binary'):
+    """
+    Записывает величины в файл.
+
+    :param obj: Экземпляр UDecimal, последовательность UDecimal или UDecimalArray.
+    :param file: Путь к файлу или файловый объект.
+    :param format: 'binary' или 'json'.
+    """
+    data = dumps(obj, format)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if hasattr(file, 'write'):
+        file.write(data)
+    else:
+        with open(file, 'wb') as f:
+            f.write(data)
+
+
+def load(file, mmap=False):
+    """
+    Читает величины из файла.
+
+    :param file: Путь к файлу или файловый объект.
+    :param mmap: Отобразить файл в память вместо чтения целиком (только для пути к файлу
+                 в двоичном формате).
+    """
+    if not hasattr(file, 'read'):
+        if mmap:
+            return loads(np.memmap(file, dtype='u1', mode='r'))
+        with open(file, 'rb') as f:
+            return loads(f.read())
+    return loads(file.read())
+
+
+def _restore(data):
+    """
+    Восстановление величины при распаковке pickle.
+    """
+    return loads(data)
@@ -1,21 +1,239 @@
 # udecimal.py
 
-from decimal import Decimal, getcontext
-import uuid
+from decimal import Decimal
+import itertools
+import sys
+import threading
 from weakref import WeakValueDictionary
-from mpmath import mp, ln as mpmath_ln, exp as mpmath_exp, sin as mpmath_sin, cos as mpmath_cos, tan as mpmath_tan, power as mpmath_power
 
-# Настраиваем mpmath для соответствия точности Decimal
-mp.dps = 110  # количество десятичных знаков, должно быть >= getcontext().prec
-getcontext().prec = 110  # Высокая точность для операций
+from .context import getcontext
+from .graph import COMMUTATIVE, _Node, _ReactiveNode, evaluate, sensitivities
+from .reactive import default_graph
+from .registry import default_registry
+
+
+# Идентификаторы выделяются блоками: блок определяет сегмент карты id_map
+_ID_BLOCK_BITS = 12
+_SHARDS = 64
+
+
+class _ThreadIds:
+    """
+    Выдача уникальных идентификаторов без общей блокировки на каждый вызов.
+
+    Каждый поток получает под блокировкой блок из 2**_ID_BLOCK_BITS идентификаторов
+    и затем выдаёт их из своего блока. Используется в сборках CPython без GIL, где
+    itertools.count не атомарен.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks = itertools.count(1)
+        self._local = threading.local()
+
+    def next(self):
+        local = self._local
+        try:
+            n = local.next
+        except AttributeError:
+            n = local.stop = 0
+        if n == local.stop:
+            with self._lock:
+                block = next(self._blocks)
+            n = block << _ID_BLOCK_BITS
+            local.stop = n + (1 << _ID_BLOCK_BITS)
+        local.next = n + 1
+        return n
+
+    def watermark(self):
+        """
+        Начинает новый блок для текущего потока и возвращает наибольший идентификатор,
+        который мог быть выдан до вызова. Вызывается в дочернем процессе после fork.
+        """
+        self._lock = threading.Lock()  # Блокировка могла быть захвачена другим потоком родителя
+        block = next(self._blocks)
+        local = self._local
+        local.next = block << _ID_BLOCK_BITS
+        local.stop = local.next + (1 << _ID_BLOCK_BITS)
+        return local.next - 1
+
+
+if getattr(sys, '_is_gil_enabled', lambda: True)():
+    # Монотонно возрастающий счётчик (дешевле uuid4); при GIL itertools.count атомарен
+    _next_id = itertools.count(1).__next__
+    _id_watermark = _next_id
+else:
+    _ids = _ThreadIds()
+    _next_id = _ids.next
+    _id_watermark = _ids.watermark
+
+
+class _ShardedWeakMap:
+    """
+    Слабая карта {идентификатор: UDecimal}, разделённая на сегменты по блокам
+    идентификаторов.
+
+    Каждая операция затрагивает один сегмент (WeakValueDictionary), а потоки создают
+    объекты с идентификаторами из разных блоков, поэтому в сборках без GIL потоки
+    практически не конкурируют за один словарь.
+    """
+
+    def __init__(self):
+        self.shards = tuple(WeakValueDictionary() for _ in range(_SHARDS))
+
+    def _shard(self, key):
+        return self.shards[(key >> _ID_BLOCK_BITS) % _SHARDS]
+
+    def add(self, value):
+        self.shards[(value.id >> _ID_BLOCK_BITS) % _SHARDS][value.id] = value
+
+    def get(self, key, default=None):
+        return self._shard(key).get(key, default)
+
+    def __getitem__(self, key):
+        return self._shard(key)[key]
+
+    def __setitem__(self, key, value):
+        self._shard(key)[key] = value
+
+    def __delitem__(self, key):
+        del self._shard(key)[key]
+
+    def __contains__(self, key):
+        return key in self._shard(key)
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def __iter__(self):
+        for shard in self.shards:
+            yield from list(shard.keys())
+
+    def clear(self):
+        for shard in self.shards:
+            shard.clear()
+
+
+class _Leaf:
+    """
+    Базовая (листовая) переменная, относительно которой хранятся чувствительности.
+
+    Объект переживает породивший его экземпляр UDecimal, пока на него ссылаются
+    производные величины, поэтому неопределённость листа остаётся доступной для
+    распространения неопределённости. Ковариации между листами хранятся в общем
+    хранилище (udecimal.registry) по идентификаторам листов.
+    """
+    __slots__ = ('id', 'uncertainty', '__weakref__')
+
+    def __init__(self, id, uncertainty):
+        self.id = id
+        self.uncertainty = uncertainty
+
+
+def _scale(backend, derivatives, factor):
+    """
+    Умножает все частные производные на множитель.
+
+    :param backend: Бэкенд, в котором выполняются вычисления.
+    :param derivatives: Разреженная карта {лист: производная}.
+    :param factor: Множитель (цепное правило).
+    :return: Новая карта производных.
+    """
+    mul = backend.mul
+    return {leaf: mul(d, factor) for leaf, d in derivatives.items()}
+
+
+def _combine(backend, da, fa, db, fb):
+    """
+    Вычисляет линейную комбинацию fa * da + fb * db двух разреженных карт производных.
+
+    Множитель None означает единицу. Стоимость пропорциональна числу задействованных
+    листов, а не длине истории вычислений.
+    """
+    mul = backend.mul
+    add = backend.add
+    result = dict(da) if fa is None else _scale(backend, da, fa)
+    for leaf, d in db.items():
+        if fb is not None:
+            d = mul(d, fb)
+        if leaf in result:
+            result[leaf] = add(result[leaf], d)
+        else:
+            result[leaf] = d
+    return result
+
+
+def _variance(backend, derivatives):
+    """
+    Вычисляет дисперсию Jᵀ·C·J по ненулевым элементам ковариационной матрицы листов.
+
+    :param backend: Бэкенд, в котором выполняются вычисления.
+    :param derivatives: Разреженная карта {лист: производная}.
+    :return: Дисперсия результата (в масштабе variance_mul бэкенда, если он задан).
+    """
+    convert = backend.convert
+    mul = backend.mul
+    add = backend.add
+    square = backend.variance_mul or mul
+    error = backend.variance_error
+    variance = backend.zero
+    # Сумма модулей слагаемых (для относительного порога eps) или оценка абсолютной
+    # ошибки округления (если бэкенд задаёт variance_error)
+    magnitude = backend.zero
+    for leaf, d in derivatives.items():
+        uncertainty = convert(leaf.uncertainty)
+        term = mul(d, uncertainty)
+        squared = square(term, term)
+        variance = add(variance, squared)
+        magnitude = add(magnitude, error(d, uncertainty, term) if error else squared)
+    # Сумма неотрицательных диагональных слагаемых не теряет точности: взаимное уничтожение
+    # возможно, только если есть отрицательные ковариационные слагаемые
+    cancelling = False
+    if default_registry:
+        index = {leaf.id: d for leaf, d in derivatives.items()}
+        # Хранится только верхний треугольник, поэтому каждая пара учитывается дважды
+        for i, j, covariance in default_registry.entries(backend, index):
+            factor = mul(index[i], index[j])
+            term = square(factor, covariance)
+            term = add(term, term)
+            variance = add(variance, term)
+            if term < 0:
+                cancelling = True
+            if error:
+                bound = error(index[i], index[j], factor, covariance)
+                magnitude = add(magnitude, add(bound, bound))
+            else:
+                magnitude = add(magnitude, backend.abs(term))
+    # При полной корреляции слагаемые взаимно уничтожаются с точностью до округления
+    if cancelling and backend.abs(variance) <= (magnitude if error else mul(magnitude, backend.eps)):
+        return backend.zero
+    if variance < 0:
+        raise ValueError("Ковариационная матрица не является положительно полуопределённой.")
+    return variance
+
 
 class UDecimal:
     """
     Класс для работы с десятичными числами, содержащими неопределённость и ковариации.
+
+    Каждый экземпляр хранит разреженную карту частных производных относительно базовых
+    (листовых) переменных. Неопределённость производной величины вычисляется при первом
+    обращении как sqrt(Jᵀ·C·J).
+
+    Значения хранятся в типе числового бэкенда активного контекста (см. udecimal.context);
+    операции выполняются в контексте, активном в момент вычисления. В ленивом режиме
+    контекста операции строят граф выражения (см. udecimal.graph), а значение и
+    неопределённость вычисляются при первом обращении.
     """
-    # Глобальная карта для отслеживания объектов по их ID с использованием слабых ссылок
-    id_map = WeakValueDictionary()
-    
+    __slots__ = ('id', '_value', '_backend', '_uncertainty', '_leaf', '_derivatives', '_node', '__weakref__')
+
+    # Глобальная карта базовых переменных по их ID; записи удаляются сами при сборке
+    # объекта, поэтому финализатор __del__ не нужен
+    id_map = _ShardedWeakMap()
+
+    # Узлы ленивого графа по ключу (операция, бэкенд, операнды) для устранения общих подвыражений
+    _expressions = WeakValueDictionary()
+
     def __init__(self, value, uncertainty=0):
         """
         Инициализация экземпляра UDecimal.
@@ -23,21 +241,233 @@ class UDecimal:
         :param value: Значение переменной (может быть строкой или Decimal).
         :param uncertainty: Неопределённость переменной (по умолчанию 0).
         """
-        self.id = uuid.uuid4()  # Уникальный идентификатор
-        self.value = Decimal(value)
-        self.uncertainty = Decimal(uncertainty)
-        if self.uncertainty < 0:
+        backend = getcontext().backend
+        self.id = _next_id()  # Уникальный идентификатор
+        self._value = backend.convert(value)
+        uncertainty = backend.convert(uncertainty)
+        if uncertainty < 0:
             raise ValueError("Неопределённость не может быть отрицательной.")
-        self.contributors = {self.id}  # Множество идентификаторов вкладов
-        self.covariances = {}  # Локальное хранилище ковариаций: {other_id: covariance}
-        UDecimal.id_map[self.id] = self  # Добавляем в глобальную карту
+        self._backend = backend
+        self._uncertainty = uncertainty
+        self._leaf = _Leaf(self.id, uncertainty)
+        self._derivatives = None  # Для базовой переменной карта {лист: 1} создаётся при первом использовании
+        self._node = None
+        UDecimal.id_map.add(self)  # Добавляем в глобальную карту
+
+    @classmethod
+    def _derived(cls, value, derivatives, backend):
+        """
+        Создаёт производную величину по значению и карте частных производных.
 
-    def __del__(self):
+        :param value: Значение результата операции.
+        :param derivatives: Разреженная карта {лист: производная}.
+        :param backend: Бэкенд, в котором получено значение.
+        :return: Новый экземпляр UDecimal.
         """
-        Удаление экземпляра из глобальной карты при уничтожении объекта.
+        result = cls.__new__(cls)
+        result.id = _next_id()
+        result._value = value
+        result._backend = backend
+        result._uncertainty = None  # Вычисляется лениво
+        result._leaf = None
+        result._derivatives = derivatives
+        result._node = None
+        return result
+
+    @classmethod
+    def _deferred(cls, context, kind, *args):
+        """
+        Создаёт узел ленивого графа или возвращает уже существующий узел
+        с той же операцией над теми же операндами.
+
+        В реактивном режиме узел регистрируется в графе зависимостей (udecimal.reactive);
+        реактивные и обычные ленивые узлы не смешиваются при устранении общих подвыражений.
+
+        :param context: Активный контекст: бэкенд, в котором будет вычислено значение, и режим.
+        :param kind: Имя операции.
+        :param args: Операнды: экземпляры UDecimal или числа.
+        :return: Экземпляр UDecimal без вычисленного значения.
         """
-        if self.id in UDecimal.id_map:
-            del UDecimal.id_map[self.id]
+        backend = context.backend
+        # Ключ операнда: идентификатор величины (для базовой переменной — её текущего листа,
+        # чтобы после update не возвращались узлы, построенные из прежнего листа)
+        # или кортеж с константой
+        if len(args) == 1:
+            mask = (True,)
+            x = args[0]
+            key = (kind, backend, x.id if x._leaf is None else x._leaf.id)
+        else:
+            x, y = args
+            mask = (isinstance(x, UDecimal), isinstance(y, UDecimal))
+            if not mask[0]:
+                x = backend.convert(x)
+            if not mask[1]:
+                y = backend.convert(y)
+            args = (x, y)
+            kx = (x.id if x._leaf is None else x._leaf.id) if mask[0] else (x,)
+            ky = (y.id if y._leaf is None else y._leaf.id) if mask[1] else (y,)
+            if kind in COMMUTATIVE and mask[0] and mask[1] and kx > ky:
+                kx, ky = ky, kx
+            key = (kind, backend, kx, ky)
+        reactive = context.reactive
+        if reactive:
+            key += (True,)
+        result = cls._expressions.get(key)
+        if result is not None:
+            return result
+        result = cls.__new__(cls)
+        result.id = _next_id()
+        result._value = None  # Вычисляется прямым проходом при первом обращении
+        result._backend = backend
+        result._uncertainty = None
+        result._leaf = None
+        result._derivatives = None
+        if reactive:
+            result._node = _ReactiveNode(kind, args, mask)
+            default_graph.register(result)
+        else:
+            result._node = _Node(kind, args, mask)
+        cls._expressions[key] = result
+        return result
+
+    @classmethod
+    def _from_leaf(cls, value, leaf, backend):
+        """
+        Создаёт базовую переменную поверх уже существующего листа.
+
+        Используется при преобразовании массивов в списки UDecimal, чтобы сохранить
+        идентичность листов и их ковариации.
+
+        :param value: Значение переменной.
+        :param leaf: Лист, которому соответствует переменная.
+        :param backend: Бэкенд, в котором хранится значение.
+        :return: Новый экземпляр UDecimal.
+        """
+        result = cls.__new__(cls)
+        result.id = leaf.id
+        result._value = value
+        result._backend = backend
+        result._uncertainty = backend.convert(leaf.uncertainty)
+        result._leaf = leaf
+        result._derivatives = None
+        result._node = None
+        UDecimal.id_map.add(result)
+        return result
+
+    @property
+    def value(self):
+        """
+        Значение величины.
+        """
+        if self._value is None:
+            evaluate(self)
+        return self._value
+
+    @property
+    def uncertainty(self):
+        """
+        Стандартная неопределённость величины.
+        """
+        if self._uncertainty is None:
+            backend = self._backend
+            sqrt = backend.variance_sqrt or backend.sqrt
+            self._uncertainty = sqrt(_variance(backend, self._sensitivities()))
+        return self._uncertainty
+
+    @property
+    def backend(self):
+        """
+        Бэкенд, в котором хранится значение величины.
+        """
+        return self._backend
+
+    @property
+    def covariances(self):
+        """
+        Явно заданные ковариации базовой переменной: {other_id: covariance}, где other_id —
+        идентификатор листа (совпадает с id переменной, если она не обновлялась, см. update).
+        """
+        if self._leaf is None:
+            return {}
+        return default_registry.row(self._backend, self._leaf.id)
+
+    @property
+    def contributors(self):
+        """
+        Множество идентификаторов базовых переменных, от которых зависит величина.
+        """
+        return {leaf.id for leaf in self._sensitivities()}
+
+    def _sensitivities(self):
+        """
+        Возвращает разреженную карту частных производных {лист: производная}.
+        """
+        if self._derivatives is None:
+            node = self._node
+            if node is None:
+                self._derivatives = {self._leaf: self._backend.one}
+            else:
+                self._derivatives = sensitivities(self)
+                if type(node) is not _ReactiveNode:
+                    self._node = None  # Значение и производные известны, граф больше не нужен
+        return self._derivatives
+
+    def _operand(self, backend):
+        """
+        Возвращает значение и производные, приведённые к указанному бэкенду.
+        """
+        value = self._value
+        if value is None:
+            value = self.value
+        if self._backend is backend or self._backend.raw_type is backend.raw_type:
+            return value, self._sensitivities()
+        convert = backend.convert
+        return convert(value), {leaf: convert(d) for leaf, d in self._sensitivities().items()}
+
+    def update(self, value=None, uncertainty=None):
+        """
+        Изменяет значение и (или) неопределённость базовой переменной на месте.
+
+        Переменная получает новый лист (идентификатор id сохраняется), на который переносятся
+        её ковариации; при изменении неопределённости ковариации масштабируются так, чтобы
+        коэффициенты корреляции не изменились. Величины, построенные из переменной в
+        реактивном режиме (Context(reactive=True)), помечаются для пересчёта и вычисляются
+        заново при следующем обращении; пересчитывается только зависящая от переменной часть
+        графа. Остальные величины ссылаются на прежний лист и остаются согласованным снимком
+        переменной до изменения: в том числе при совместном использовании с обновлённой
+        переменной они рассматриваются как зависящие от прежних значения и неопределённости.
+
+        :param value: Новое значение (по умолчанию не изменяется).
+        :param uncertainty: Новая неопределённость (по умолчанию не изменяется).
+        """
+        if self._leaf is None:
+            raise ValueError("Обновить можно только базовую переменную.")
+        if value is None and uncertainty is None:
+            return
+        backend = self._backend
+        old = self._leaf
+        if uncertainty is None:
+            uncertainty = old.uncertainty
+        else:
+            uncertainty = backend.convert(uncertainty)
+            if uncertainty < 0:
+                raise ValueError("Неопределённость не может быть отрицательной.")
+        if value is not None:
+            self._value = backend.convert(value)
+        leaf = _Leaf(_next_id(), uncertainty)
+        scale = None
+        if uncertainty != old.uncertainty:
+            # Ковариации листа с нулевой неопределённостью могут быть только нулевыми
+            scale = backend.div(uncertainty, old.uncertainty) if old.uncertainty else backend.zero
+        default_registry.transfer(backend, old, leaf, scale)
+        self._leaf = leaf
+        self._uncertainty = uncertainty
+        self._derivatives = None
+        default_graph.invalidate(self, value is not None)
+
+    def _require_leaf(self, other):
+        if self._leaf is None or other._leaf is None:
+            raise ValueError("Ковариация может быть установлена только между базовыми переменными.")
 
     # Методы для управления ковариациями
     def set_covariance(self, other, covariance):
@@ -49,19 +479,26 @@ class UDecimal:
         """
         if not isinstance(other, UDecimal):
             raise TypeError("Ковариация может быть установлена только с экземпляром UDecimal.")
-        self.covariances[other.id] = Decimal(covariance)
-        other.covariances[self.id] = Decimal(covariance)  # Симметричное хранение
+        self._require_leaf(other)
+        default_registry.track(self._leaf, other._leaf)
+        default_registry.set(self._backend, self._leaf.id, other._leaf.id, covariance)
 
     def get_covariance(self, other):
         """
         Получает ковариацию с другим экземпляром.
 
+        Для двух базовых переменных возвращается заданная в хранилище ковариация. Если хотя бы
+        одна из величин производная, ковариация вычисляется по чувствительностям к общим листам
+        с учётом ковариаций листов (см. udecimal.covariance_matrix).
+
         :param other: Экземпляр UDecimal, с которым запрашивается ковариация.
         :return: Значение ковариации или 0, если она не установлена.
         """
         if not isinstance(other, UDecimal):
             raise TypeError("Ковариация может быть получена только с экземпляром UDecimal.")
-        return self.covariances.get(other.id, Decimal('0'))
+        if self._leaf is None or other._leaf is None:
+            return self._backend.convert(default_registry._covariance([self, other], self._backend)[0, 1])
+        return default_registry.get(self._backend, self._leaf.id, other._leaf.id, self._backend.zero)
 
     def remove_covariance(self, other):
         """
@@ -71,208 +508,113 @@ class UDecimal:
         """
         if not isinstance(other, UDecimal):
             raise TypeError("Ковариация может быть удалена только с экземпляром UDecimal.")
-        self.covariances.pop(other.id, None)
-        other.covariances.pop(self.id, None)
-
-    # Метод для объединения вкладов
-    def combine_contributors(self, other):
-        """
-        Объединяет вкладные переменные текущего экземпляра с вкладными переменными другого экземпляра.
-
-        :param other: Экземпляр UDecimal, чьи вкладные переменные объединяются.
-        """
-        self.contributors = self.contributors.union(other.contributors)
+        if self._leaf is not None and other._leaf is not None:
+            default_registry.remove(self._leaf.id, other._leaf.id)
 
     # Арифметические операции
     def __add__(self, other):
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'add', self, other)
+        x, dx = self._operand(b)
         if isinstance(other, UDecimal):
-            value = self.value + other.value
-            var_x = self.uncertainty ** 2
-            var_y = other.uncertainty ** 2
-
-            # Суммируем все ковариации между вкладными переменными
-            sum_covariances = Decimal('0')
-            for c1 in self.contributors:
-                var1 = UDecimal.id_map.get(c1)
-                if var1:
-                    for c2 in other.contributors:
-                        var2 = UDecimal.id_map.get(c2)
-                        if var2:
-                            sum_covariances += var1.get_covariance(var2)
-            
-            variance = var_x + var_y + (2 * sum_covariances)
-            uncertainty = variance.sqrt()
-            result = UDecimal(value, uncertainty)
-
-            # Объединяем вкладные переменные
-            result.combine_contributors(other)
-            result.combine_contributors(self)
-            return result
+            y, dy = other._operand(b)
+            # Производные складываются: d(x + y) = dx + dy
+            return UDecimal._derived(b.add(x, y), _combine(b, dx, None, dy, None), b)
         else:
-            # Обработка сложения с числом
-            value = self.value + Decimal(other)
-            uncertainty = self.uncertainty
-            result = UDecimal(value, uncertainty)
-            result.contributors = self.contributors.copy()
-            return result
+            # Сложение с числом не меняет производных
+            return UDecimal._derived(b.add(x, b.convert(other)), dx, b)
 
     def __radd__(self, other):
         return self.__add__(other)
-    
+
     def __sub__(self, other):
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'sub', self, other)
+        x, dx = self._operand(b)
         if isinstance(other, UDecimal):
-            value = self.value - other.value
-            # Var(z) = Var(x) + Var(y) - 2*Cov(x,y)
-            variance = (self.uncertainty ** 2) + (other.uncertainty ** 2) - (2 * self.get_covariance(other))
-            uncertainty = variance.sqrt()
-            result = UDecimal(value, uncertainty)
-            # Объединяем вкладов
-            result.combine_contributors(other)
-            result.combine_contributors(self)
-            return result
+            y, dy = other._operand(b)
+            return UDecimal._derived(b.sub(x, y), _combine(b, dx, None, dy, b.neg(b.one)), b)
         else:
-            value = self.value - Decimal(other)
-            uncertainty = self.uncertainty
-            result = UDecimal(value, uncertainty)
-            result.contributors = self.contributors.copy()
-            return result
+            return UDecimal._derived(b.sub(x, b.convert(other)), dx, b)
 
     def __rsub__(self, other):
         if isinstance(other, UDecimal):
             return other.__sub__(self)
         else:
-            value = Decimal(other) - self.value
-            uncertainty = self.uncertainty
-            result = UDecimal(value, uncertainty)
-            result.contributors = self.contributors.copy()
-            return result
+            context = getcontext()
+            b = context.backend
+            if context.lazy:
+                return UDecimal._deferred(context, 'sub', other, self)
+            x, dx = self._operand(b)
+            return UDecimal._derived(b.sub(b.convert(other), x), _scale(b, dx, b.neg(b.one)), b)
 
     def __mul__(self, other):
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'mul', self, other)
+        x, dx = self._operand(b)
         if isinstance(other, UDecimal):
-            value = self.value * other.value
-            # Относительные неопределённости
-            rel_u1 = self.uncertainty / self.value
-            rel_u2 = other.uncertainty / other.value
-            # Ковариация относительных неопределённостей
-            cov_rel = self.get_covariance(other) / (self.value * other.value)
-            # Var(z) = (rel_u1)^2 + (rel_u2)^2 + 2*Cov(rel_u1, rel_u2)
-            rel_variance = (rel_u1 ** 2) + (rel_u2 ** 2) + (2 * cov_rel)
-            variance = rel_variance * (value ** 2)
-            uncertainty = variance.sqrt()
-            result = UDecimal(value, uncertainty)
-            # Объединяем вкладов
-            result.combine_contributors(other)
-            result.combine_contributors(self)
-            return result
+            y, dy = other._operand(b)
+            # d(x * y) = y * dx + x * dy
+            return UDecimal._derived(b.mul(x, y), _combine(b, dx, y, dy, x), b)
         else:
-            other = Decimal(other)
-            value = self.value * other
-            uncertainty = self.uncertainty * abs(other)
-            result = UDecimal(value, uncertainty)
-            result.contributors = self.contributors.copy()
-            return result
+            other = b.convert(other)
+            return UDecimal._derived(b.mul(x, other), _scale(b, dx, other), b)
 
     def __rmul__(self, other):
         return self.__mul__(other)
 
     def __truediv__(self, other):
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'div', self, other)
+        x, dx = self._operand(b)
         if isinstance(other, UDecimal):
-            value = self.value / other.value
-            # Относительные неопределённости
-            rel_u1 = self.uncertainty / self.value
-            rel_u2 = other.uncertainty / other.value
-            # Ковариация относительных неопределённостей
-            cov_rel = self.get_covariance(other) / (self.value * other.value)
-            # Var(z) = (rel_u1 ** 2) + (rel_u2 ** 2) - 2 * Cov(rel_u1, rel_u2)
-            rel_variance = (rel_u1 ** 2) + (rel_u2 ** 2) - (2 * cov_rel)
-            variance = rel_variance * (value ** 2)
-            uncertainty = variance.sqrt()
-            result = UDecimal(value, uncertainty)
-            # Объединяем вкладов
-            result.combine_contributors(other)
-            result.combine_contributors(self)
-            return result
+            y, dy = other._operand(b)
+            value = b.div(x, y)
+            # d(x / y) = dx / y - x / y^2 * dy
+            return UDecimal._derived(value, _combine(b, dx, b.div(b.one, y), dy, b.neg(b.div(value, y))), b)
         else:
-            other = Decimal(other)
-            value = self.value / other
-            uncertainty = self.uncertainty / abs(other)
-            result = UDecimal(value, uncertainty)
-            result.contributors = self.contributors.copy()
-            return result
+            other = b.convert(other)
+            return UDecimal._derived(b.div(x, other), _scale(b, dx, b.div(b.one, other)), b)
 
     def __rtruediv__(self, other):
         # Выполняем other / self
         if isinstance(other, UDecimal):
             return other.__truediv__(self)
         else:
-            other = Decimal(other)
-            value = other / self.value
-            # Относительные неопределённости
-            rel_u1 = Decimal('0')  # other имеет нулевую неопределённость
-            rel_u2 = self.uncertainty / self.value
-            # Ковариация относительных неопределённостей
-            # Создаём временный объект для 'other' с нулевой неопределённостью
-            temp_other = UDecimal(other, Decimal('0'))
-            # Устанавливаем ковариацию между temp_other и self как 0
-            temp_other.set_covariance(self, Decimal('0'))
-            cov_rel = temp_other.get_covariance(self) / (other * self.value)
-            # Var(z) = (rel_u1 ** 2) + (rel_u2 ** 2) - 2 * Cov(rel_u1, rel_u2)
-            rel_variance = (rel_u1 ** 2) + (rel_u2 ** 2) - (2 * cov_rel)
-            variance = (rel_variance) * (value ** 2)
-            uncertainty = variance.sqrt()
-            result = UDecimal(value, uncertainty)
-            result.contributors = self.contributors.copy()
-            return result
+            context = getcontext()
+            b = context.backend
+            if context.lazy:
+                return UDecimal._deferred(context, 'div', other, self)
+            x, dx = self._operand(b)
+            value = b.div(b.convert(other), x)
+            # d(c / x) = -c / x^2 * dx
+            return UDecimal._derived(value, _scale(b, dx, b.neg(b.div(value, x))), b)
 
     def __pow__(self, power):
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'pow' if isinstance(power, UDecimal) else 'pow_constant', self, power)
+        x, dx = self._operand(b)
+        if x <= 0:
+            raise ValueError("Основание степени должно быть положительным числом для учёта неопределённости.")
+
         if isinstance(power, UDecimal):
-            # y = x^p
-            x = self.value
-            p = power.value
-            dx = self.uncertainty
-            dp = power.uncertainty
-
-            if x <= 0:
-                raise ValueError("Основание степени должно быть положительным числом для учёта неопределённости.")
-
-            # Используем mpmath.power для вычисления x^p
-            y = Decimal(str(mpmath_power(mp.mpf(str(x)), mp.mpf(str(p)))))
-
-            # Частные производные
-            dy_dx = Decimal(str(mp.mpf(str(p)) * mpmath_power(mp.mpf(str(x)), mp.mpf(str(p - 1)))))
-            dy_dp = Decimal(str(y * mpmath_ln(mp.mpf(str(x)))))
-
-            # Ковариация между x и p
-            cov_x_p = self.get_covariance(power)
-
-            # Неопределённость
-            # Var(y) = (dy_dx * dx)^2 + (dy_dp * dp)^2 + 2 * dy_dx * dy_dp * Cov(x, p)
-            var_y = (dy_dx * dx) ** 2 + (dy_dp * dp) ** 2 + (2 * dy_dx * dy_dp * cov_x_p)
-            delta_y = var_y.sqrt()
-
-            result = UDecimal(y, delta_y)
-            # Объединяем вкладов
-            result.combine_contributors(power)
-            result.combine_contributors(self)
-            return result
+            # y = x^p; частные производные dy/dx = p * y / x, dy/dp = y * ln(x)
+            p, dp = power._operand(b)
+            y, dy_dx, dy_dp = b.pow_d(x, p)
+            return UDecimal._derived(y, _combine(b, dx, dy_dx, dp, dy_dp), b)
         else:
-            power = Decimal(power)
-            x = self.value
-            dx = self.uncertainty
-
-            if x <= 0:
-                raise ValueError("Основание степени должно быть положительным числом для учёта неопределённости.")
-
-            # Используем mpmath.power для вычисления x^power
-            y = Decimal(str(mpmath_power(mp.mpf(str(x)), mp.mpf(str(power)))))
-
-            # Относительная неопределённость
-            rel_uncertainty = abs(power) * (dx / x)
-            delta_y = abs(y) * rel_uncertainty
-
-            result = UDecimal(y, delta_y)
-            result.contributors = self.contributors.copy()
-            return result
+            y, dy_dx, _ = b.pow_d(x, b.convert(power), exponent_derivative=False)
+            return UDecimal._derived(y, _scale(b, dx, dy_dx), b)
 
     def sqrt(self):
         """
@@ -281,133 +623,148 @@ class UDecimal:
         :return: Новый экземпляр UDecimal, представляющий квадратный корень.
         """
         return self.__pow__(Decimal('0.5'))
-    
+
     # Методы сравнения
+    def _compare_value(self, other):
+        if isinstance(other, UDecimal):
+            return self._backend.convert(other.value)
+        return self._backend.convert(other)
+
     def __eq__(self, other):
         if isinstance(other, UDecimal):
-            return (self.value == other.value) and (self.uncertainty == other.uncertainty)
+            return (self.value == self._compare_value(other)) and (self.uncertainty == self._backend.convert(other.uncertainty))
         else:
-            return self.value == Decimal(other)
-    
+            return self.value == self._compare_value(other)
+
     def __ne__(self, other):
         return not self.__eq__(other)
-    
+
     def __lt__(self, other):
-        if isinstance(other, UDecimal):
-            return self.value < other.value
-        else:
-            return self.value < Decimal(other)
-    
+        return self.value < self._compare_value(other)
+
     def __le__(self, other):
-        if isinstance(other, UDecimal):
-            return self.value <= other.value
-        else:
-            return self.value <= Decimal(other)
-    
+        return self.value <= self._compare_value(other)
+
     def __gt__(self, other):
-        if isinstance(other, UDecimal):
-            return self.value > other.value
-        else:
-            return self.value > Decimal(other)
-    
+        return self.value > self._compare_value(other)
+
     def __ge__(self, other):
-        if isinstance(other, UDecimal):
-            return self.value >= other.value
-        else:
-            return self.value >= Decimal(other)
-    
+        return self.value >= self._compare_value(other)
+
     # Строковое представление
     def __str__(self):
         return f"{self.value} ± {self.uncertainty}"
-    
+
     def __repr__(self):
         return f"UDecimal(value={self.value}, uncertainty={self.uncertainty})"
-        
-    # Математические функции с использованием mpmath
+
+    def __format__(self, format_spec):
+        """
+        Форматирует величину по спецификации формата: '.2u' (значение ± неопределённость,
+        округлённые по двум значащим цифрам неопределённости), '.2uS' (1.2345(12)),
+        '.2ue' и '.2un' (научная и инженерная запись) или обычная спецификация чисел,
+        применяемая к значению и неопределённости (см. udecimal.formatting).
+        """
+        from .formatting import format_value
+        return format_value(self.value, self.uncertainty, format_spec)
+
+    # Сериализация
+    def __reduce__(self):
+        # Величина передаётся вместе с листами и ковариациями (см. udecimal.serialization)
+        from .serialization import _restore, dumps
+        return _restore, (dumps(self),)
+
+    # Математические функции
     def ln(self):
         """
         Вычисляет натуральный логарифм текущего экземпляра.
 
         :return: Новый экземпляр UDecimal, представляющий ln(x).
         """
-        if self.value <= 0:
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'ln', self)
+        x, dx = self._operand(b)
+        if x <= 0:
             raise ValueError("Логарифм определён только для положительных чисел.")
-        # Используем mpmath для вычисления ln
-        y = Decimal(str(mpmath_ln(mp.mpf(str(self.value)))))
-        dy = self.uncertainty / self.value
-        result = UDecimal(y, dy)
-        result.contributors = self.contributors.copy()
-        return result
-    
+        # d(ln x) = dx / x
+        y, dy_dx = b.ln_d(x)
+        return UDecimal._derived(y, _scale(b, dx, dy_dx), b)
+
     def exp(self):
         """
         Вычисляет экспоненту текущего экземпляра.
 
         :return: Новый экземпляр UDecimal, представляющий exp(x).
         """
-        # Используем mpmath для вычисления exp
-        y = Decimal(str(mpmath_exp(mp.mpf(str(self.value)))))
-        dy = y * self.uncertainty
-        result = UDecimal(y, dy)
-        result.contributors = self.contributors.copy()
-        return result
-    
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'exp', self)
+        x, dx = self._operand(b)
+        # d(exp x) = exp(x) * dx
+        y, dy_dx = b.exp_d(x)
+        return UDecimal._derived(y, _scale(b, dx, dy_dx), b)
+
     def log10(self):
         """
         Вычисляет десятичный логарифм текущего экземпляра.
 
         :return: Новый экземпляр UDecimal, представляющий log10(x).
         """
-        if self.value <= 0:
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'log10', self)
+        x, dx = self._operand(b)
+        if x <= 0:
             raise ValueError("Логарифм определён только для положительных чисел.")
-        # Используем mpmath для вычисления log10
-        y = Decimal(str(mpmath_ln(mp.mpf(str(self.value))) / mpmath_ln(mp.mpf('10'))))
-        dy = (self.uncertainty / self.value) / Decimal(str(mpmath_ln(mp.mpf('10'))))
-        result = UDecimal(y, dy)
-        result.contributors = self.contributors.copy()
-        return result
-    
+        # d(log10 x) = dx / (x * ln 10)
+        y, dy_dx = b.log10_d(x)
+        return UDecimal._derived(y, _scale(b, dx, dy_dx), b)
+
     def sin(self):
         """
         Вычисляет синус текущего экземпляра (в радианах).
 
         :return: Новый экземпляр UDecimal, представляющий sin(x).
         """
-        # Используем mpmath для вычисления sin
-        value_mpf = mp.mpf(str(self.value))
-        y = Decimal(str(mpmath_sin(value_mpf)))
-        dy = abs(Decimal(str(mpmath_cos(value_mpf)))) * self.uncertainty
-        result = UDecimal(y, dy)
-        result.contributors = self.contributors.copy()
-        return result
-    
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'sin', self)
+        x, dx = self._operand(b)
+        # d(sin x) = cos(x) * dx
+        y, dy_dx = b.sin_d(x)
+        return UDecimal._derived(y, _scale(b, dx, dy_dx), b)
+
     def cos(self):
         """
         Вычисляет косинус текущего экземпляра (в радианах).
 
         :return: Новый экземпляр UDecimal, представляющий cos(x).
         """
-        # Используем mpmath для вычисления cos
-        value_mpf = mp.mpf(str(self.value))
-        y = Decimal(str(mpmath_cos(value_mpf)))
-        dy = abs(Decimal(str(mpmath_sin(value_mpf)))) * self.uncertainty
-        result = UDecimal(y, dy)
-        result.contributors = self.contributors.copy()
-        return result
-    
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'cos', self)
+        x, dx = self._operand(b)
+        # d(cos x) = -sin(x) * dx
+        y, dy_dx = b.cos_d(x)
+        return UDecimal._derived(y, _scale(b, dx, dy_dx), b)
+
     def tan(self):
         """
         Вычисляет тангенс текущего экземпляра (в радианах).
 
         :return: Новый экземпляр UDecimal, представляющий tan(x).
         """
-        # Используем mpmath для вычисления tan
-        value_mpf = mp.mpf(str(self.value))
-        y = Decimal(str(mpmath_tan(value_mpf)))
-        cos_val = mpmath_cos(value_mpf)
-        if cos_val == 0:
-            raise ValueError("Тангенс не определён для данного значения.")
-        dy = self.uncertainty / (Decimal(str(cos_val)) ** 2)
-        result = UDecimal(y, dy)
-        result.contributors = self.contributors.copy()
-        return result
+        context = getcontext()
+        b = context.backend
+        if context.lazy:
+            return UDecimal._deferred(context, 'tan', self)
+        x, dx = self._operand(b)
+        # d(tan x) = dx / cos^2(x)
+        y, dy_dx = b.tan_d(x)
+        return UDecimal._derived(y, _scale(b, dx, dy_dx), b)